@@ -0,0 +1,65 @@
+"""Add folder_closure table for data-room hierarchy lookups.
+
+Revision ID: 20251122090000
+Revises: 4c02488ea178
+Create Date: 2025-11-22 09:00:00.000000
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251122090000"
+down_revision: Union[str, None] = "4c02488ea178"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "folder_closure",
+        sa.Column("ancestor_id", sa.String(length=36), nullable=False),
+        sa.Column("descendant_id", sa.String(length=36), nullable=False),
+        sa.Column("depth", sa.Integer(), nullable=False),
+        sa.Column("deal_id", sa.String(length=36), nullable=False),
+        sa.ForeignKeyConstraint(["ancestor_id"], ["folders.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["descendant_id"], ["folders.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["deal_id"], ["deals.id"]),
+        sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+    )
+    op.create_index(
+        "idx_folder_closure_descendant",
+        "folder_closure",
+        ["descendant_id", "depth"],
+    )
+    op.create_index(
+        "idx_folder_closure_deal_id",
+        "folder_closure",
+        ["deal_id"],
+    )
+
+    # Backfill every existing path from the adjacency list.
+    op.execute(
+        """
+        WITH RECURSIVE tree (ancestor_id, descendant_id, depth, deal_id) AS (
+            SELECT CAST(id AS VARCHAR(36)), CAST(id AS VARCHAR(36)), 0, deal_id
+            FROM folders
+            UNION ALL
+            SELECT tree.ancestor_id, CAST(child.id AS VARCHAR(36)), tree.depth + 1, child.deal_id
+            FROM tree
+            JOIN folders AS child ON child.parent_folder_id = tree.descendant_id
+        )
+        INSERT INTO folder_closure (ancestor_id, descendant_id, depth, deal_id)
+        SELECT ancestor_id, descendant_id, depth, deal_id FROM tree
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_folder_closure_deal_id", table_name="folder_closure")
+    op.drop_index("idx_folder_closure_descendant", table_name="folder_closure")
+    op.drop_table("folder_closure")
@@ -0,0 +1,51 @@
+"""Add deal_embeddings table for cached deal description vectors.
+
+Revision ID: 20251122100000
+Revises: 20251122090000
+Create Date: 2025-11-22 10:00:00.000000
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251122100000"
+down_revision: Union[str, None] = "20251122090000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "deal_embeddings",
+        sa.Column("deal_id", sa.String(length=36), nullable=False),
+        sa.Column("organization_id", sa.String(length=36), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("model", sa.String(length=100), nullable=False),
+        sa.Column("dimensions", sa.Integer(), nullable=False),
+        sa.Column("vector", sa.LargeBinary(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["deal_id"], ["deals.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"]),
+        sa.PrimaryKeyConstraint("deal_id"),
+    )
+    op.create_index(
+        "idx_deal_embeddings_organization_id",
+        "deal_embeddings",
+        ["organization_id"],
+    )
+    op.create_index(
+        "idx_deal_embeddings_content_hash",
+        "deal_embeddings",
+        ["content_hash", "model"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_deal_embeddings_content_hash", table_name="deal_embeddings")
+    op.drop_index("idx_deal_embeddings_organization_id", table_name="deal_embeddings")
+    op.drop_table("deal_embeddings")
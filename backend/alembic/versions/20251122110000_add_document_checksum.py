@@ -0,0 +1,30 @@
+"""Add checksum_sha256 column to documents.
+
+Revision ID: 20251122110000
+Revises: 20251122100000
+Create Date: 2025-11-22 11:00:00.000000
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251122110000"
+down_revision: Union[str, None] = "20251122100000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "documents",
+        sa.Column("checksum_sha256", sa.String(length=64), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("documents", "checksum_sha256")
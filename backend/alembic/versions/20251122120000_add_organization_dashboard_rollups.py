@@ -0,0 +1,47 @@
+"""Add organization_dashboard_rollups table for incrementally maintained dashboard counters.
+
+Revision ID: 20251122120000
+Revises: 20251122110000
+Create Date: 2025-11-22 12:00:00.000000
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251122120000"
+down_revision: Union[str, None] = "20251122110000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STAGES = ("sourcing", "evaluation", "due_diligence", "negotiation", "closing", "won", "lost")
+
+
+def _counter(name: str) -> sa.Column:
+    return sa.Column(name, sa.Integer(), nullable=False, server_default="0")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "organization_dashboard_rollups",
+        sa.Column("organization_id", sa.String(length=36), nullable=False),
+        _counter("deal_count"),
+        *(_counter(f"{stage}_deals") for stage in STAGES),
+        sa.Column("deal_value_total", sa.Numeric(precision=18, scale=2), nullable=False, server_default="0"),
+        _counter("deal_value_count"),
+        _counter("document_count"),
+        _counter("open_task_count"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("reconciled_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("organization_id"),
+    )
+    # Rows are seeded lazily on first read or write; the reconciliation task
+    # backfills the rest.
+
+
+def downgrade() -> None:
+    op.drop_table("organization_dashboard_rollups")
@@ -0,0 +1,141 @@
+"""Store document versions as keyframes plus compressed deltas.
+
+Revision ID: 20251123090000
+Revises: 20251122120000
+Create Date: 2025-11-23 09:00:00.000000
+"""
+from __future__ import annotations
+
+import difflib
+import json
+import zlib
+from typing import Any, List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251123090000"
+down_revision: Union[str, None] = "20251122120000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+versions = sa.table(
+    "document_versions",
+    sa.column("id"),
+    sa.column("document_id"),
+    sa.column("version_number", sa.Integer),
+    sa.column("content", sa.Text),
+    sa.column("delta", sa.LargeBinary),
+    sa.column("created_at", sa.DateTime),
+)
+
+# Frozen copy of the delta codec in app.services.document_version_store as of
+# this revision, so later changes to the service cannot alter the migration.
+KEYFRAME_INTERVAL = 10
+
+
+def _is_keyframe_number(version_number: int) -> bool:
+    return (version_number - 1) % KEYFRAME_INTERVAL == 0
+
+
+def _encode_delta(base: str, target: str) -> bytes:
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+    ops: List[Any] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append(target_lines[j1:j2])
+    return zlib.compress(json.dumps(ops, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def _apply_delta(base: str, delta: bytes) -> str:
+    base_lines = base.splitlines(keepends=True)
+    pieces: List[str] = []
+    for op_ in json.loads(zlib.decompress(delta)):
+        if op_ and isinstance(op_[0], int):
+            pieces.extend(base_lines[op_[0]:op_[1]])
+        else:
+            pieces.extend(op_)
+    return "".join(pieces)
+
+
+def _renumber_duplicates(bind) -> None:
+    """Give documents with repeated version numbers a gap-free 1..n sequence."""
+    duplicated = bind.execute(
+        sa.select(versions.c.document_id)
+        .group_by(versions.c.document_id, versions.c.version_number)
+        .having(sa.func.count() > 1)
+        .distinct()
+    ).scalars().all()
+    for document_id in duplicated:
+        rows = bind.execute(
+            sa.select(versions.c.id, versions.c.version_number)
+            .where(versions.c.document_id == document_id)
+            .order_by(versions.c.version_number, versions.c.created_at, versions.c.id)
+        ).all()
+        for number, row in enumerate(rows, start=1):
+            if row.version_number != number:
+                bind.execute(versions.update().where(versions.c.id == row.id).values(version_number=number))
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Every version is still a full copy here, so renumbering loses nothing
+    _renumber_duplicates(bind)
+
+    with op.batch_alter_table("document_versions") as batch_op:
+        batch_op.add_column(sa.Column("delta", sa.LargeBinary(), nullable=True))
+        batch_op.alter_column("content", existing_type=sa.Text(), nullable=True)
+        batch_op.create_unique_constraint(
+            "uq_document_versions_document_version", ["document_id", "version_number"]
+        )
+
+    # Compact existing history: keep every keyframe position as a full copy
+    # and replace the versions in between with deltas against their predecessor.
+    document_ids = bind.execute(sa.select(versions.c.document_id).distinct()).scalars().all()
+    for document_id in document_ids:
+        rows = bind.execute(
+            sa.select(versions.c.id, versions.c.version_number, versions.c.content)
+            .where(versions.c.document_id == document_id)
+            .order_by(versions.c.version_number)
+        ).all()
+        previous = None
+        for row in rows:
+            if previous is not None and not _is_keyframe_number(row.version_number):
+                delta = _encode_delta(previous, row.content)
+                if len(delta) < len(row.content.encode("utf-8")):
+                    bind.execute(
+                        versions.update()
+                        .where(versions.c.id == row.id)
+                        .values(content=None, delta=delta)
+                    )
+            previous = row.content
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    document_ids = bind.execute(
+        sa.select(versions.c.document_id).where(versions.c.content.is_(None)).distinct()
+    ).scalars().all()
+    for document_id in document_ids:
+        rows = bind.execute(
+            sa.select(versions.c.id, versions.c.content, versions.c.delta)
+            .where(versions.c.document_id == document_id)
+            .order_by(versions.c.version_number)
+        ).all()
+        previous = None
+        for row in rows:
+            content = row.content if row.content is not None else _apply_delta(previous, row.delta)
+            if row.content is None:
+                bind.execute(versions.update().where(versions.c.id == row.id).values(content=content))
+            previous = content
+
+    with op.batch_alter_table("document_versions") as batch_op:
+        batch_op.drop_constraint("uq_document_versions_document_version", type_="unique")
+        batch_op.alter_column("content", existing_type=sa.Text(), nullable=False)
+        batch_op.drop_column("delta")
@@ -0,0 +1,61 @@
+"""Add content-addressed storage blobs for deduplicated document files.
+
+Revision ID: 20251124090000
+Revises: 20251123090000
+Create Date: 2025-11-24 09:00:00.000000
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251124090000"
+down_revision: Union[str, None] = "20251123090000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _file_key_unique_constraints(inspector) -> list:
+    return [
+        constraint["name"]
+        for constraint in inspector.get_unique_constraints("documents")
+        if constraint["column_names"] == ["file_key"] and constraint["name"]
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "storage_blobs",
+        sa.Column("organization_id", sa.String(36), primary_key=True),
+        sa.Column("sha256", sa.String(64), primary_key=True),
+        sa.Column("file_key", sa.String(500), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index(
+        "ix_storage_blobs_org_file_key",
+        "storage_blobs",
+        ["organization_id", "file_key"],
+        unique=True,
+    )
+
+    # Several document versions may now point at the same blob.
+    inspector = sa.inspect(op.get_bind())
+    constraints = _file_key_unique_constraints(inspector)
+    with op.batch_alter_table("documents") as batch_op:
+        for name in constraints:
+            batch_op.drop_constraint(name, type_="unique")
+    op.create_index("ix_documents_file_key", "documents", ["file_key"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_documents_file_key", table_name="documents")
+    with op.batch_alter_table("documents") as batch_op:
+        batch_op.create_unique_constraint("documents_file_key_key", ["file_key"])
+    op.drop_index("ix_storage_blobs_org_file_key", table_name="storage_blobs")
+    op.drop_table("storage_blobs")
@@ -0,0 +1,45 @@
+"""Add ledger of sent PMI notifications.
+
+Revision ID: 20251125090000
+Revises: 20251124090000
+Create Date: 2025-11-25 09:00:00.000000
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20251125090000"
+down_revision: Union[str, None] = "20251124090000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "pmi_notification_log",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("organization_id", sa.String(36), sa.ForeignKey("organizations.id"), nullable=False),
+        sa.Column("notification_type", sa.String(32), nullable=False),
+        sa.Column("subject_id", sa.String(36), nullable=False),
+        sa.Column("dedupe_key", sa.String(64), nullable=False),
+        sa.Column("recipient_user_id", sa.String(36), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("sent_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index("ix_pmi_notification_log_organization_id", "pmi_notification_log", ["organization_id"])
+    op.create_index(
+        "uq_pmi_notification_log_subject",
+        "pmi_notification_log",
+        ["notification_type", "subject_id", "dedupe_key"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_pmi_notification_log_subject", table_name="pmi_notification_log")
+    op.drop_index("ix_pmi_notification_log_organization_id", table_name="pmi_notification_log")
+    op.drop_table("pmi_notification_log")
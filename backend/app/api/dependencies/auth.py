@@ -6,8 +6,11 @@ from typing import Callable, Any, TYPE_CHECKING
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from app.core.cache import LocalLRUCache
+from app.core.config import settings
 from app.core.security import AuthError, decode_clerk_jwt
 from app.db.session import get_db
 from app.models.user import User, UserRole, get_role_level
@@ -26,6 +29,12 @@ logger = logging.getLogger(__name__)
 
 http_bearer = HTTPBearer(auto_error=False)
 
+# Users resolved for a verified session, keyed by the session and the claims
+# they were checked against. Entries are tagged by user, organization and
+# session so Clerk webhooks can evict them; the short TTL bounds staleness for
+# changes made on other workers.
+_principal_cache = LocalLRUCache(max_entries=settings.principal_cache_max_entries)
+
 
 def _extract_claim(claims: dict[str, Any], *keys: str) -> str | None:
     for key in keys:
@@ -40,6 +49,61 @@ def _sanitize_claims(claims: dict[str, Any]) -> dict[str, Any]:
     return {key: claims[key] for key in allowed if key in claims}
 
 
+def _principal_cache_key(claims: dict[str, Any]) -> str | None:
+    session_id = _extract_claim(claims, "sid", "session_id")
+    if not session_id:
+        return None
+    org_claim = _extract_claim(claims, "org_id", "orgId", "organization_id", "organizationId")
+    role_claim = _extract_claim(claims, "org_role", "orgRole")
+    return f"principal:{session_id}:{claims['sub']}:{org_claim or ''}:{role_claim or ''}"
+
+
+def _principal_tags(clerk_user_id: str | None, organization_id: str | None, session_id: str | None) -> list[str]:
+    tags = []
+    if clerk_user_id:
+        tags.append(f"user:{clerk_user_id}")
+    if organization_id:
+        tags.append(f"org:{organization_id}")
+    if session_id:
+        tags.append(f"session:{session_id}")
+    return tags
+
+
+def _cache_principal(key: str, user: User, claims: dict[str, Any]) -> None:
+    snapshot = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+    _principal_cache.set(
+        key,
+        snapshot,
+        ttl=settings.principal_cache_ttl_seconds,
+        tags=_principal_tags(
+            user.clerk_user_id,
+            user.organization_id,
+            _extract_claim(claims, "sid", "session_id"),
+        ),
+    )
+
+
+def _attach_principal(db: Session, snapshot: dict[str, Any]) -> User:
+    """Rebuild a cached user inside ``db`` without emitting SQL."""
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def invalidate_principal_cache(
+    *,
+    clerk_user_id: str | None = None,
+    organization_id: str | None = None,
+    session_id: str | None = None,
+) -> int:
+    """Evict cached principals for a user, organization or session."""
+    return _principal_cache.invalidate_tags(_principal_tags(clerk_user_id, organization_id, session_id))
+
+
+def clear_principal_cache() -> None:
+    _principal_cache.clear()
+
+
 def _enforce_claim_integrity(user: User, claims: dict[str, Any], db: Session) -> None:
     org_claim = _extract_claim(claims, "org_id", "orgId", "organization_id", "organizationId")
     role_claim = _extract_claim(claims, "org_role", "orgRole")
@@ -93,7 +157,12 @@ def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(http_bearer),
     db: Session = Depends(get_db),
 ) -> User:
-    """Retrieve the current user based on Clerk JWT."""
+    """Retrieve the current user based on Clerk JWT.
+
+    The token is verified on every call. For tokens carrying a session id, the
+    user lookup and claim checks are then reused for
+    ``settings.principal_cache_ttl_seconds``.
+    """
 
     if credentials is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Authentication required")
@@ -107,11 +176,19 @@ def get_current_user(
     if not clerk_user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
 
+    cache_key = _principal_cache_key(claims)
+    if cache_key is not None:
+        cached = _principal_cache.get(cache_key)
+        if cached is not None:
+            return _attach_principal(db, cached.value)
+
     user = get_user_by_clerk_id(db, clerk_user_id)
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not registered")
 
     _enforce_claim_integrity(user, claims, db)
+    if cache_key is not None:
+        _cache_principal(cache_key, user, claims)
     return user
 
 
@@ -8,6 +8,7 @@ from fastapi import Depends, Header, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.api.dependencies.auth import get_current_user, is_master_admin
+from app.core.query_metrics import exclude_from_budget
 from app.db.session import get_db
 from app.models.organization import Organization
 from app.models.user import User, UserRole
@@ -70,6 +71,47 @@ def _fetch_user(db: Session, user_id: str) -> User:
     return user
 
 
+def _resolve_impersonation(
+    db: Session,
+    actor: User,
+    tenant_id: Optional[str],
+    customer_id: Optional[str],
+) -> tuple[Optional[Organization], Optional[User]]:
+    """Load the impersonated tenant/customer and record the impersonation."""
+    target_org: Optional[Organization] = None
+    target_customer: Optional[User] = None
+
+    if tenant_id:
+        target_org = _fetch_organization(db, tenant_id)
+
+    if customer_id:
+        target_customer = _fetch_user(db, customer_id)
+        if tenant_id:
+            if target_customer.organization_id != tenant_id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Customer does not belong to the specified tenant",
+                )
+        elif target_customer.organization_id:
+            # Infer tenant scope from the selected customer if not provided
+            target_org = target_org or _fetch_organization(db, target_customer.organization_id)
+
+    rbac_audit_service.log_impersonation(
+        db,
+        actor_user_id=actor.id,
+        organization_id=target_org.id if target_org else None,
+        tenant_id=str(target_org.id) if target_org else tenant_id,
+        customer_id=str(target_customer.id) if target_customer else customer_id,
+    )
+
+    # The audit commit expired the targets; reload them while still excluded
+    # from the budget rather than on first access in the route.
+    for target in (target_org, target_customer):
+        if target is not None:
+            db.refresh(target)
+    return target_org, target_customer
+
+
 def get_access_scope(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -97,38 +139,20 @@ def get_access_scope(
     target_org: Optional[Organization] = None
     target_customer: Optional[User] = None
 
-    if tenant_id:
-        target_org = _fetch_organization(db, tenant_id)
-
-    if customer_id:
-        target_customer = _fetch_user(db, customer_id)
-        if tenant_id:
-            if target_customer.organization_id != tenant_id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Customer does not belong to the specified tenant",
-                )
-        elif target_customer.organization_id:
-            # Infer tenant scope from the selected customer if not provided
-            target_org = target_org or _fetch_organization(db, target_customer.organization_id)
+    if tenant_id or customer_id:
+        # Impersonation costs the same few queries on every scoped route, so
+        # it is kept out of the routes' query budgets.
+        with exclude_from_budget():
+            target_org, target_customer = _resolve_impersonation(
+                db, current_user, tenant_id, customer_id
+            )
 
-    scope = AccessScope(
+    return AccessScope(
         actor=current_user,
         target_org=target_org,
         target_customer=target_customer,
     )
 
-    if (tenant_id or customer_id) and is_master_admin(current_user):
-        rbac_audit_service.log_impersonation(
-            db,
-            actor_user_id=current_user.id,
-            organization_id=target_org.id if target_org else None,
-            tenant_id=str(target_org.id) if target_org else tenant_id,
-            customer_id=str(target_customer.id) if target_customer else customer_id,
-        )
-
-    return scope
-
 
 def require_scoped_organization_id(
     scope: AccessScope = Depends(get_access_scope),
@@ -7,6 +7,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.api.dependencies.auth import get_current_user, require_min_role
+from app.core.query_metrics import query_budget
 from app.db.session import get_db
 from app.models.community import PostCategory, PostStatus, ReactionType, TargetType
 from app.models.user import User, UserRole
@@ -439,6 +440,7 @@ def moderate_content(
 
 
 @router.get("/moderation/flagged", response_model=list[FlaggedContent])
+@query_budget(4)
 def get_flagged_content(
     current_user: User = Depends(require_min_role(UserRole.admin)),
     db: Session = Depends(get_db),
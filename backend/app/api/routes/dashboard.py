@@ -1,4 +1,4 @@
-"""Tenant dashboard endpoints with cached metrics and summaries."""
+"""Tenant dashboard endpoints served from per-organization rollups and cached metrics."""
 from __future__ import annotations
 
 import json
@@ -7,24 +7,29 @@ from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from redis import asyncio as redis_async
-from sqlalchemy import desc, func, or_, select
-from sqlalchemy.orm import Session
+from sqlalchemy import desc, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies.auth import get_current_user
+from app.core import database
+from app.core.cache import get_or_compute, org_tag
 from app.core.config import settings
-from app.db.session import get_db
-from app.models.deal import Deal, DealStage
-from app.models.document import Document, DocumentAccessLog
+from app.core.query_metrics import query_budget
+from app.db.session import get_async_db
+from app.models.dashboard_rollup import OrganizationDashboardRollup
+from app.models.document import DocumentAccessLog
 from app.models.task import DealTask
 from app.models.user import User
+from app.services.dashboard_rollup_service import get_dashboard_rollup
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 METRICS_CACHE_TTL = 300
+METRICS_STALE_TTL = 60
 RECENT_ACTIVITY_LIMIT = 20
 UPCOMING_TASK_WINDOW_DAYS = 7
 
@@ -58,17 +63,14 @@ def _serialize_decimal(value: Optional[Decimal]) -> float:
     return float(value or 0)
 
 
-def _recent_activity_payload(db: Session, org_id: str, limit: int) -> List[Dict[str, Any]]:
-    logs = (
-        db.execute(
-            select(DocumentAccessLog)
-            .where(DocumentAccessLog.organization_id == org_id)
-            .order_by(desc(DocumentAccessLog.created_at))
-            .limit(limit)
-        )
-        .scalars()
-        .all()
+async def _recent_activity_payload(db: AsyncSession, org_id: str, limit: int) -> List[Dict[str, Any]]:
+    result = await db.execute(
+        select(DocumentAccessLog)
+        .where(DocumentAccessLog.organization_id == org_id)
+        .order_by(desc(DocumentAccessLog.created_at))
+        .limit(limit)
     )
+    logs = result.scalars().all()
     return [
         {
             "id": str(log.id),
@@ -81,20 +83,17 @@ def _recent_activity_payload(db: Session, org_id: str, limit: int) -> List[Dict[
     ]
 
 
-def _upcoming_tasks_payload(db: Session, org_id: str) -> List[Dict[str, Any]]:
+async def _upcoming_tasks_payload(db: AsyncSession, org_id: str) -> List[Dict[str, Any]]:
     horizon = datetime.now(timezone.utc) + timedelta(days=UPCOMING_TASK_WINDOW_DAYS)
-    tasks = (
-        db.execute(
-            select(DealTask)
-            .where(DealTask.organization_id == org_id)
-            .where(DealTask.status != "done")
-            .where(or_(DealTask.due_date.is_(None), DealTask.due_date <= horizon))
-            .order_by(DealTask.due_date.asc())
-            .limit(25)
-        )
-        .scalars()
-        .all()
+    result = await db.execute(
+        select(DealTask)
+        .where(DealTask.organization_id == org_id)
+        .where(DealTask.status != "done")
+        .where(or_(DealTask.due_date.is_(None), DealTask.due_date <= horizon))
+        .order_by(DealTask.due_date.asc())
+        .limit(25)
     )
+    tasks = result.scalars().all()
     return [
         {
             "id": task.id,
@@ -109,85 +108,58 @@ def _upcoming_tasks_payload(db: Session, org_id: str) -> List[Dict[str, Any]]:
     ]
 
 
-def _metrics_payload(db: Session, org_id: str) -> Dict[str, Any]:
-    deals_count = db.scalar(
-        select(func.count()).where(Deal.organization_id == org_id)
-    ) or 0
-    documents_count = db.scalar(
-        select(func.count()).where(Document.organization_id == org_id)
-    ) or 0
-    tasks_count = db.scalar(
-        select(func.count()).where(DealTask.organization_id == org_id, DealTask.status != "done")
-    ) or 0
-
+def _counts_payload(rollup: OrganizationDashboardRollup) -> Dict[str, Any]:
     return {
-        "deals_count": deals_count,
-        "documents_count": documents_count,
-        "tasks_count": tasks_count,
-        "recent_activity": _recent_activity_payload(db, org_id, limit=10),
+        "deals_count": rollup.deal_count,
+        "documents_count": rollup.document_count,
+        "tasks_count": rollup.open_task_count,
     }
 
 
-def _financial_summary(db: Session, org_id: str) -> Dict[str, Any]:
-    total_value = db.scalar(
-        select(func.coalesce(func.sum(Deal.deal_size), 0)).where(Deal.organization_id == org_id)
-    ) or Decimal("0")
-    avg_value = db.scalar(
-        select(func.coalesce(func.avg(Deal.deal_size), 0)).where(Deal.organization_id == org_id)
-    ) or Decimal("0")
-    open_deals = db.scalar(
-        select(func.count()).where(
-            Deal.organization_id == org_id,
-            Deal.stage.in_(
-                [
-                    DealStage.sourcing,
-                    DealStage.evaluation,
-                    DealStage.due_diligence,
-                    DealStage.negotiation,
-                    DealStage.closing,
-                ]
-            ),
-        )
-    ) or 0
-    won_deals = db.scalar(
-        select(func.count()).where(Deal.organization_id == org_id, Deal.stage == DealStage.won)
-    ) or 0
+def _financial_payload(rollup: OrganizationDashboardRollup) -> Dict[str, Any]:
+    return {
+        "total_deal_value": _serialize_decimal(rollup.deal_value_total),
+        "average_deal_value": _serialize_decimal(rollup.average_deal_value),
+        "active_deals": rollup.active_deals,
+        "won_deals": rollup.won_deals,
+    }
+
 
+async def _metrics_payload(db: AsyncSession, org_id: str) -> Dict[str, Any]:
+    rollup = await get_dashboard_rollup(db, org_id)
     return {
-        "total_deal_value": _serialize_decimal(total_value),
-        "average_deal_value": _serialize_decimal(avg_value),
-        "active_deals": open_deals,
-        "won_deals": won_deals,
+        **_counts_payload(rollup),
+        "recent_activity": await _recent_activity_payload(db, org_id, limit=10),
     }
 
 
 @router.get("/summary")
+@query_budget(2)
 async def get_dashboard_summary(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Return lightweight summary counts for the tenant dashboard."""
 
-    org_id = str(current_user.organization_id)
-    metrics = _metrics_payload(db, org_id)
-    financials = _financial_summary(db, org_id)
+    rollup = await get_dashboard_rollup(db, str(current_user.organization_id))
+    financials = _financial_payload(rollup)
 
     return {
         "deals": {
-            "total": metrics["deals_count"],
+            "total": rollup.deal_count,
             "active": financials["active_deals"],
             "won": financials["won_deals"],
         },
-        "documents": metrics["documents_count"],
-        "tasks": metrics["tasks_count"],
+        "documents": rollup.document_count,
+        "tasks": rollup.open_task_count,
         "financial": financials,
     }
 
 
 @router.get("/metrics")
+@query_budget(3)
 async def get_dashboard_metrics(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
 ):
     """Return cached dashboard metrics for the organization."""
 
@@ -195,56 +167,62 @@ async def get_dashboard_metrics(
     cache_key = f"dashboard:metrics:{org_id}"
     redis = await _get_redis_client()
 
-    if redis:
-        cached = await redis.get(cache_key)
-        if cached:
-            try:
-                return json.loads(cached)
-            except json.JSONDecodeError:
-                logger.debug("Discarding malformed cache payload for dashboard metrics")
-
-    payload = _metrics_payload(db, org_id)
-
-    if redis:
-        try:
-            await redis.setex(cache_key, METRICS_CACHE_TTL, json.dumps(payload))
-        except Exception as exc:  # pragma: no cover - network failure guard
-            logger.warning("Failed to cache dashboard metrics: %s", exc)
-
-    return payload
+    async def compute() -> str:
+        # A stale hit refreshes after the response is sent, so never reuse the
+        # request-scoped session here; each computation opens its own.
+        database.init_async_engine()
+        async with database.AsyncSessionLocal() as session:
+            payload = json.dumps(await _metrics_payload(session, org_id))
+            await session.commit()  # Keep a rollup seeded on first use
+            return payload
+
+    # Tagged so deal/document mutations evict it without waiting for the TTL;
+    # a stale payload is served while the refresh runs in the background.
+    payload, _ = await get_or_compute(
+        cache_key,
+        compute,
+        ttl=METRICS_CACHE_TTL,
+        tags=(org_tag(org_id, "deals"), org_tag(org_id, "documents")),
+        stale_ttl=METRICS_STALE_TTL,
+        redis=redis,
+    )
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("/recent-activity")
 @router.get("/activity")
+@query_budget(3)
 async def get_recent_activity(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     limit: int = RECENT_ACTIVITY_LIMIT,
 ):
     """Return the latest document access events for the organization."""
 
     org_id = str(current_user.organization_id)
     capped_limit = max(1, min(limit, RECENT_ACTIVITY_LIMIT))
-    return _recent_activity_payload(db, org_id, capped_limit)
+    return await _recent_activity_payload(db, org_id, capped_limit)
 
 
 @router.get("/tasks")
+@query_budget(3)
 async def get_upcoming_tasks(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Return upcoming tasks for the next week for the organization."""
 
     org_id = str(current_user.organization_id)
-    return _upcoming_tasks_payload(db, org_id)
+    return await _upcoming_tasks_payload(db, org_id)
 
 
 @router.get("/financial-summary")
+@query_budget(2)
 async def get_financial_summary(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Expose high-level financial metrics used on dashboards."""
 
-    org_id = str(current_user.organization_id)
-    return _financial_summary(db, org_id)
+    rollup = await get_dashboard_rollup(db, str(current_user.organization_id))
+    return _financial_payload(rollup)
@@ -6,11 +6,11 @@ from typing import Dict, Iterable, List, Optional
 from uuid import uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies.auth import require_feature
-from app.db.session import get_db
-from app.models.deal import Deal
+from app.db.session import get_async_db
 from app.models.deal_match import DealMatch, DealMatchAction, DealMatchCriteria
 from app.models.user import User
 from app.schemas.deal_match import (
@@ -22,6 +22,7 @@ from app.schemas.deal_match import (
     MatchCriteriaCreate,
     MatchCriteriaResponse,
 )
+from app.services import deal_service
 from app.services.deal_matching_service import DealMatchingService
 
 
@@ -38,7 +39,7 @@ def _decimal(value: Optional[float], default: float) -> Decimal:
 async def create_match_criteria(
     payload: MatchCriteriaCreate,
     current_user: User = Depends(require_feature("deal_matching")),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Create a saved matching criteria profile for the current organization."""
     criteria = DealMatchCriteria(
@@ -57,22 +58,21 @@ async def create_match_criteria(
     )
 
     db.add(criteria)
-    db.commit()
-    db.refresh(criteria)
+    await db.commit()
+    await db.refresh(criteria)
     return _serialize_criteria(criteria)
 
 
 @router.get("/match-criteria", response_model=List[MatchCriteriaResponse])
 async def list_match_criteria(
     current_user: User = Depends(require_feature("deal_matching")),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Return all saved criteria for the caller's organization."""
-    criteria = (
-        db.query(DealMatchCriteria)
-        .filter(DealMatchCriteria.organization_id == current_user.organization_id)
+    criteria = await db.scalars(
+        select(DealMatchCriteria)
+        .where(DealMatchCriteria.organization_id == current_user.organization_id)
         .order_by(DealMatchCriteria.created_at.desc())
-        .all()
     )
     return [_serialize_criteria(item) for item in criteria]
 
@@ -99,47 +99,31 @@ async def find_matches_for_deal(
     deal_id: str,
     request: FindMatchesRequest,
     current_user: User = Depends(require_feature("deal_matching")),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Calculate intelligent matches for a given deal."""
-    deal = (
-        db.query(Deal)
-        .filter(Deal.id == deal_id, Deal.organization_id == current_user.organization_id)
-        .first()
-    )
+    deal = await deal_service.get_deal_by_id_async(deal_id, current_user.organization_id, db)
     if deal is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deal not found")
 
     criteria_model = _build_ad_hoc_criteria(current_user, request.criteria)
 
-    candidate_query = (
-        db.query(Deal)
-        .filter(
-            Deal.organization_id == current_user.organization_id,
-            Deal.id != deal_id,
-            Deal.is_archived.is_(False),
-        )
-    )
     limit = request.limit or 10
-    candidates = candidate_query.limit(limit * 2).all()
-    candidate_map = {str(c.id): c for c in candidates}
-
     matching_service = DealMatchingService()
-    matches = await matching_service.find_matches(
+    matches = await matching_service.find_matches_in_organization(
+        db,
         criteria=criteria_model,
         target_deal=deal,
-        candidate_deals=candidates,
         top_n=limit,
         min_score=request.min_score or 0.0,
     )
 
     response_matches = []
     for match in matches:
-        candidate = candidate_map.get(match.deal_id)
         response_matches.append(
             {
                 "deal_id": match.deal_id,
-                "deal_name": candidate.name if candidate else match.deal_id,
+                "deal_name": match.deal.name or match.deal_id,
                 "score": match.score,
                 "confidence": match.confidence,
                 "explanation": match.explanation,
@@ -159,7 +143,7 @@ async def find_matches_for_deal(
         )
         db.add(db_match)
 
-    db.commit()
+    await db.commit()
 
     return {"matches": response_matches, "total_count": len(response_matches)}
 
@@ -168,24 +152,19 @@ async def find_matches_for_deal(
 async def list_deal_matches(
     deal_id: str,
     current_user: User = Depends(require_feature("deal_matching")),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Return stored matches for a deal owned by the current organization."""
-    deal = (
-        db.query(Deal)
-        .filter(Deal.id == deal_id, Deal.organization_id == current_user.organization_id)
-        .first()
-    )
+    deal = await deal_service.get_deal_by_id_async(deal_id, current_user.organization_id, db)
     if deal is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deal not found")
 
-    matches = (
-        db.query(DealMatch)
-        .filter(DealMatch.deal_id == deal_id)
+    matches = await db.scalars(
+        select(DealMatch)
+        .where(DealMatch.deal_id == deal_id)
         .order_by(DealMatch.match_score.desc())
-        .all()
     )
-    return matches
+    return matches.all()
 
 
 def _serialize_criteria(model: DealMatchCriteria) -> MatchCriteriaResponse:
@@ -211,14 +190,15 @@ async def record_match_action(
     match_id: str,
     payload: MatchActionCreate,
     current_user: User = Depends(require_feature("deal_matching")),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Record a user action on a deal match (view, save, pass, request_intro)."""
     # Verify match exists and belongs to user's organization
-    match = (
-        db.query(DealMatch)
-        .filter(DealMatch.id == match_id, DealMatch.organization_id == current_user.organization_id)
-        .first()
+    match = await db.scalar(
+        select(DealMatch).where(
+            DealMatch.id == match_id,
+            DealMatch.organization_id == current_user.organization_id,
+        )
     )
     if match is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Match not found")
@@ -241,8 +221,8 @@ async def record_match_action(
         match.status = "introduced"
         db.add(match)
 
-    db.commit()
-    db.refresh(action)
+    await db.commit()
+    await db.refresh(action)
 
     return MatchActionResponse(
         id=action.id,
@@ -4,11 +4,13 @@ from __future__ import annotations
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.dependencies.auth import get_current_user
 from app.api.dependencies.tenant_scope import require_scoped_organization_id
-from app.db.session import get_db
+from app.core.query_metrics import query_budget
+from app.db.session import get_async_db, get_db
 from app.models.user import User
 from app.models.deal import Deal
 from app.schemas.deal import DealCreate, DealListResponse, DealResponse, DealUpdate, DealStageUpdate
@@ -34,7 +36,8 @@ def create_deal(
 
 
 @router.get("", response_model=DealListResponse)
-def list_deals(
+@query_budget(4)
+async def list_deals(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
     stage: Optional[str] = Query(None, description="Filter by deal stage"),
@@ -43,14 +46,14 @@ def list_deals(
     include_archived: bool = Query(False, description="Include archived deals"),
     current_user: User = Depends(get_current_user),
     organization_id: str = Depends(require_scoped_organization_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     List all deals for the current user's organization.
 
     Supports pagination, filtering, and sorting.
     """
-    deals, total = deal_service.list_deals(
+    deals, total = await deal_service.list_deals_async(
         organization_id=organization_id,
         db=db,
         page=page,
@@ -70,18 +73,19 @@ def list_deals(
 
 
 @router.get("/{deal_id}", response_model=DealResponse)
-def get_deal(
+@query_budget(3)
+async def get_deal(
     deal_id: str,
     current_user: User = Depends(get_current_user),
     organization_id: str = Depends(require_scoped_organization_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get deal details by ID.
 
     Users can only view deals within their organization.
     """
-    deal = deal_service.get_deal_by_id(deal_id, organization_id, db)
+    deal = await deal_service.get_deal_by_id_async(deal_id, organization_id, db)
     if not deal:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Deal not found"
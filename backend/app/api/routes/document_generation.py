@@ -45,7 +45,9 @@ from app.schemas.document_generation import (
     DocumentVersionResponse,
     DocumentVersionSummary,
     DocumentVersionCreate,
+    DocumentVersionDiffResponse,
 )
+from app.services import document_version_store
 
 
 router = APIRouter(prefix="/document-generation", tags=["document-generation"])
@@ -700,16 +702,9 @@ def list_document_versions(
     if not document:
         raise HTTPException(status_code=404, detail="Generated document not found")
 
-    # Get versions
-    from sqlalchemy import select, desc
-    versions = db.scalars(
-        select(DocumentVersion)
-        .where(
-            DocumentVersion.document_id == document_id,
-            DocumentVersion.organization_id == organization_id,
-        )
-        .order_by(desc(DocumentVersion.version_number))
-    ).all()
+    # Get versions (metadata only; content and deltas stay unloaded)
+    from sqlalchemy import select
+    versions = document_version_store.list_versions(db, document.id, organization_id)
 
     # Resolve creator names in batch
     creator_ids = {str(version.created_by_user_id) for version in versions if version.created_by_user_id}
@@ -725,6 +720,7 @@ def list_document_versions(
     for version in versions:
         summaries.append(DocumentVersionSummary(
             id=version.id,
+            version_number=version.version_number,
             label=version.label or f"v{version.version_number}",
             created_at=version.created_at,
             created_by=creator_lookup.get(str(version.created_by_user_id)),
@@ -773,39 +769,65 @@ def restore_document_version(
     if not version:
         raise HTTPException(status_code=404, detail="Document version not found")
 
-    # Get latest version number
-    from sqlalchemy import desc
-    latest_version = db.scalar(
-        select(DocumentVersion)
-        .where(DocumentVersion.document_id == document_id)
-        .order_by(desc(DocumentVersion.version_number))
-        .limit(1)
-    )
-
     # Create new version with restored content
-    new_version_number = (latest_version.version_number + 1) if latest_version else 1
-    new_version = DocumentVersion(
-        document_id=document_id,
-        version_number=new_version_number,
-        content=version.content,
+    restored_content = document_version_store.get_version_content(db, version)
+    document_version_store.add_version(
+        db,
+        document_id=document.id,
+        content=restored_content,
         label=f"Restored from v{version.version_number}",
         summary=f"Restored from version {version.version_number}",
         organization_id=organization_id,
         created_by_user_id=current_user.id,
     )
-    db.add(new_version)
 
     # Update document content
-    document.generated_content = version.content
+    document.generated_content = restored_content
     document.updated_at = datetime.now(UTC)
 
     db.commit()
     db.refresh(document)
-    db.refresh(new_version)
 
     return GeneratedDocumentResponse.model_validate(document)
 
 
+@router.get("/documents/{document_id}/versions/diff", response_model=DocumentVersionDiffResponse)
+def diff_document_versions(
+    document_id: str,
+    from_version: int = Query(..., ge=1, description="Version number to diff from"),
+    to_version: int = Query(..., ge=1, description="Version number to diff to"),
+    context: int = Query(3, ge=0, le=50, description="Unchanged lines shown around each change"),
+    source_deal_id: Optional[str] = Query(None, description="Optional originating deal id"),
+    current_user: User = Depends(get_current_user),
+    organization_id: str = Depends(require_scoped_organization_id),
+    db: Session = Depends(get_db),
+):
+    """
+    Diff two versions of a document
+    
+    Returns a unified diff from ``from_version`` to ``to_version`` with
+    addition and deletion line counts.
+    """
+    document = DocumentGenerationService.get_generated_document(
+        db,
+        document_id=document_id,
+        organization_id=organization_id,
+        actor_user_id=current_user.id,
+        required_source_deal_id=source_deal_id,
+    )
+
+    if not document:
+        raise HTTPException(status_code=404, detail="Generated document not found")
+
+    diff = document_version_store.diff_versions(
+        db, document.id, from_version, to_version, context=context
+    )
+    if diff is None:
+        raise HTTPException(status_code=404, detail="Document version not found")
+
+    return DocumentVersionDiffResponse.model_validate(diff)
+
+
 # ============================================================================
 # Export Job Queue Endpoints
 # ============================================================================
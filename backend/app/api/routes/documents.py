@@ -1,7 +1,6 @@
 """Document and Folder API endpoints for secure data room functionality."""
 from __future__ import annotations
 
-import io
 import math
 from typing import List, Optional
 
@@ -16,15 +15,17 @@ from fastapi import (
     status,
 )
 from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.dependencies.auth import get_current_user
 from app.core.ownership import require_document_access
+from app.core.query_metrics import query_budget
 try:
     from app.api.dependencies.tenant_scope import require_scoped_organization_id as _tenant_scope_org_dependency
 except ImportError:  # pragma: no cover - dependency optional in some runtimes
     _tenant_scope_org_dependency = None
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db, run_db
 from app.models.user import User
 from app.models.document import Document
 from app.schemas.document import (
@@ -137,6 +138,7 @@ def create_folder(
 
 
 @router.get("/folders", response_model=List[FolderResponse])
+@query_budget(5)
 def list_folders(
     deal_id: str,
     parent_id: Optional[str] = Query(None, description="Parent folder id for lazy loading"),
@@ -238,13 +240,15 @@ def update_folder(
 def delete_folder(
     deal_id: str,
     folder_id: str,
+    recursive: bool = Query(False, description="Also delete empty subfolders"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
     Delete a folder (must be empty).
 
-    Folder cannot contain documents or subfolders.
+    Folder cannot contain documents. Subfolders are only removed when
+    ``recursive`` is set and none of them contain documents either.
     """
     organization_id = _require_user_organization(current_user)
 
@@ -264,6 +268,7 @@ def delete_folder(
             folder=folder,
             db=db,
             current_user=current_user,
+            recursive=recursive,
         )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -337,7 +342,7 @@ async def upload_document(
     file: UploadFile = File(...),
     folder_id: Optional[str] = Query(None, description="Folder ID to organize document"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Upload a document to the data room.
@@ -360,6 +365,7 @@ async def upload_document(
 
 
 @router.get("/documents", response_model=PaginatedDocuments)
+@query_budget(7)
 def list_documents(
     deal_id: str,
     page: int = Query(1, ge=1, description="Page number"),
@@ -413,28 +419,32 @@ async def bulk_download_documents(
     payload: BulkDownloadRequest,
     current_user: User = Depends(get_current_user),
     organization_id: str = Depends(require_scoped_organization_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Download multiple documents as a single ZIP archive (DEV-008)."""
 
     document_ids = [str(doc_id) for doc_id in payload.document_ids]
-    _validate_bulk_document_ids(
-        document_ids,
-        deal_id=deal_id,
-        organization_id=organization_id,
-        current_user=current_user,
-        db=db,
+    await run_db(
+        db,
+        lambda session: _validate_bulk_document_ids(
+            document_ids,
+            deal_id=deal_id,
+            organization_id=organization_id,
+            current_user=current_user,
+            db=session,
+        ),
     )
 
-    zip_bytes, filename = await document_service.bulk_download_documents(
+    zip_chunks, filename = await document_service.stream_bulk_download(
         db=db,
         document_ids=document_ids,
         organization_id=organization_id,
         current_user=current_user,
+        compression=payload.compression,
     )
 
     response = StreamingResponse(
-        io.BytesIO(zip_bytes),
+        zip_chunks,
         media_type="application/zip",
     )
     response.headers["Content-Disposition"] = f"attachment; filename=\"{filename}\""
@@ -565,27 +575,31 @@ async def download_document(
     request: Request,
     current_user: User = Depends(get_current_user),
     organization_id: str = Depends(require_scoped_organization_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Download a document file.
 
     Logs download access for audit trail.
     """
-    document = require_document_access(
-        document_id=document_id,
-        deal_id=deal_id,
-        organization_id=organization_id,
-        current_user=current_user,
-        db=db,
-    )
 
-    document_service.ensure_document_permission(
-        db=db,
-        document=document,
-        user=current_user,
-        minimum_level=PermissionLevel.VIEWER,
-    )
+    def _authorize(session: Session) -> Document:
+        document = require_document_access(
+            document_id=document_id,
+            deal_id=deal_id,
+            organization_id=organization_id,
+            current_user=current_user,
+            db=session,
+        )
+        document_service.ensure_document_permission(
+            db=session,
+            document=document,
+            user=current_user,
+            minimum_level=PermissionLevel.VIEWER,
+        )
+        return document
+
+    document = await run_db(db, _authorize)
 
     # Get file path from storage
     storage = get_storage_service()
@@ -601,13 +615,16 @@ async def download_document(
         )
 
     # Log download
-    document_service.log_document_access(
-        db=db,
-        document=document,
-        user=current_user,
-        action="download",
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent")
+    await run_db(
+        db,
+        lambda session: document_service.log_document_access(
+            db=session,
+            document=document,
+            user=current_user,
+            action="download",
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent")
+        ),
     )
 
     return FileResponse(
@@ -903,19 +920,22 @@ async def restore_document_version(
     version_id: str,
     current_user: User = Depends(get_current_user),
     organization_id: str = Depends(require_scoped_organization_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Restore a previous version of a document.
 
     Creates a new version with the content of the specified version.
     """
-    require_document_access(
-        document_id=document_id,
-        deal_id=deal_id,
-        organization_id=organization_id,
-        current_user=current_user,
-        db=db,
+    await run_db(
+        db,
+        lambda session: require_document_access(
+            document_id=document_id,
+            deal_id=deal_id,
+            organization_id=organization_id,
+            current_user=current_user,
+            db=session,
+        ),
     )
     restored_doc = await document_service.restore_document_version(
         db=db,
@@ -938,7 +958,7 @@ async def bulk_download_documents(
     request: BulkDownloadRequest,
     current_user: User = Depends(get_current_user),
     organization_id: str = Depends(require_scoped_organization_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Bulk download multiple documents as a ZIP file.
@@ -947,26 +967,28 @@ async def bulk_download_documents(
     Documents without permission are silently skipped.
     Returns 403 if no documents are accessible.
     """
-    from fastapi.responses import Response
-
     document_ids = [str(doc_id) for doc_id in request.document_ids]
-    _validate_bulk_document_ids(
-        document_ids,
-        deal_id=deal_id,
-        organization_id=organization_id,
-        current_user=current_user,
-        db=db,
+    await run_db(
+        db,
+        lambda session: _validate_bulk_document_ids(
+            document_ids,
+            deal_id=deal_id,
+            organization_id=organization_id,
+            current_user=current_user,
+            db=session,
+        ),
     )
 
-    zip_content, filename = await document_service.bulk_download_documents(
+    zip_chunks, filename = await document_service.stream_bulk_download(
         db=db,
         document_ids=document_ids,
         organization_id=organization_id,
         current_user=current_user,
+        compression=request.compression,
     )
 
-    return Response(
-        content=zip_content,
+    return StreamingResponse(
+        zip_chunks,
         media_type="application/zip",
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"'
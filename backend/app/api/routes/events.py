@@ -7,9 +7,6 @@ from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import select
-import csv
-import io
-import json
 
 from app.db.session import get_db
 from app.api.dependencies.auth import get_current_user
@@ -35,6 +32,7 @@ from app.schemas.event import (
 )
 from app.services.event_service import EventService
 from app.services.event_notification_service import send_registration_confirmation_email
+from app.utils.export_stream import csv_chunks, json_array_chunks, ndjson_chunks
 
 
 router = APIRouter(prefix="/events", tags=["events"])
@@ -612,23 +610,60 @@ def get_event_analytics(
 # Event Export Endpoints
 # ============================================================================
 
+_EXPORT_COLUMNS = (
+    ("Registration ID", "id"),
+    ("Attendee Name", "attendee_name"),
+    ("Attendee Email", "attendee_email"),
+    ("Attendee Phone", "attendee_phone"),
+    ("Ticket Name", "ticket_name"),
+    ("Payment Amount", "payment_amount"),
+    ("Payment Status", "payment_status"),
+    ("Status", "status"),
+    ("Checked In", "checked_in"),
+    ("Registered At", "registered_at"),
+)
+
+_EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _registration_export_record(row) -> dict:
+    return {
+        "id": row.id,
+        "attendee_name": row.attendee_name,
+        "attendee_email": row.attendee_email,
+        "attendee_phone": row.attendee_phone,
+        "ticket_name": row.ticket_name,
+        "payment_amount": str(row.payment_amount),
+        "payment_status": row.payment_status,
+        "status": row.status.value,
+        "checked_in": row.checked_in,
+        "registered_at": row.created_at.isoformat() if row.created_at else None,
+    }
+
+
+def _registration_csv_row(record: dict) -> list:
+    values = dict(record)
+    values["checked_in"] = "Yes" if record["checked_in"] else "No"
+    return [values[key] if values[key] is not None else "" for _, key in _EXPORT_COLUMNS]
+
+
 @router.get("/{event_id}/registrations/export")
 def export_registrations(
     event_id: str,
-    format: str = Query("csv", pattern="^(csv|json)$"),
+    format: str = Query("csv", pattern="^(csv|json|ndjson)$"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
-    Export event registrations as CSV or JSON
-    
-    Returns a file download of all registrations for an event.
-    """
-    from fastapi.responses import StreamingResponse
-    import csv
-    import io
-    import json
+    Export event registrations as CSV, JSON or NDJSON
 
+    Returns a file download of all registrations for an event. Rows are
+    streamed in keyset-paginated batches as they are encoded.
+    """
     # Verify event exists and belongs to user's organization
     event = EventService.get_event(
         db,
@@ -639,91 +674,29 @@ def export_registrations(
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
 
-    # Get registrations
-    registrations = EventService.list_registrations(
-        db,
-        event_id=event_id,
-        organization_id=current_user.organization_id,
+    # The request's session stays open until the response has been sent
+    records = (
+        _registration_export_record(row)
+        for row in EventService.iter_registration_export(
+            db,
+            event_id=event_id,
+            organization_id=current_user.organization_id,
+        )
     )
 
     if format == "csv":
-        # Generate CSV
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow([
-            "Registration ID",
-            "Attendee Name",
-            "Attendee Email",
-            "Attendee Phone",
-            "Ticket Name",
-            "Payment Amount",
-            "Payment Status",
-            "Status",
-            "Checked In",
-            "Registered At",
-        ])
-        
-        # Write data
-        for registration in registrations:
-            ticket_name = None
-            if registration.ticket_id:
-                from app.models.event import EventTicket
-                ticket = db.scalar(
-                    select(EventTicket).where(EventTicket.id == registration.ticket_id)
-                )
-                ticket_name = ticket.name if ticket else None
-            
-            writer.writerow([
-                registration.id,
-                registration.attendee_name,
-                registration.attendee_email,
-                registration.attendee_phone or "",
-                ticket_name or "",
-                str(registration.payment_amount),
-                registration.payment_status,
-                registration.status.value,
-                "Yes" if registration.checked_in else "No",
-                registration.created_at.isoformat(),
-            ])
-        
-        # Return CSV file
-        output.seek(0)
-        return StreamingResponse(
-            io.BytesIO(output.getvalue().encode("utf-8")),
-            media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename=event-{event_id}-registrations.csv"},
+        body = csv_chunks(
+            [header for header, _ in _EXPORT_COLUMNS],
+            (_registration_csv_row(record) for record in records),
         )
+    elif format == "ndjson":
+        body = ndjson_chunks(records)
     else:
-        # Generate JSON
-        registrations_data = []
-        for registration in registrations:
-            ticket_name = None
-            if registration.ticket_id:
-                from app.models.event import EventTicket
-                ticket = db.scalar(
-                    select(EventTicket).where(EventTicket.id == registration.ticket_id)
-                )
-                ticket_name = ticket.name if ticket else None
-            
-            registrations_data.append({
-                "id": registration.id,
-                "attendee_name": registration.attendee_name,
-                "attendee_email": registration.attendee_email,
-                "attendee_phone": registration.attendee_phone,
-                "ticket_name": ticket_name,
-                "payment_amount": str(registration.payment_amount),
-                "payment_status": registration.payment_status,
-                "status": registration.status.value,
-                "checked_in": registration.checked_in,
-                "registered_at": registration.created_at.isoformat(),
-            })
-        
-        # Return JSON file
-        return StreamingResponse(
-            io.BytesIO(json.dumps(registrations_data, indent=2).encode("utf-8")),
-            media_type="application/json",
-            headers={"Content-Disposition": f"attachment; filename=event-{event_id}-registrations.json"},
-        )
+        body = json_array_chunks(records)
+
+    return StreamingResponse(
+        body,
+        media_type=_EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=event-{event_id}-registrations.{format}"},
+    )
 
@@ -7,11 +7,12 @@ import uuid
 from pathlib import Path
 
 from fastapi import APIRouter, Body, Depends, File, HTTPException, Response, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.dependencies.auth import get_current_user, require_feature, is_master_admin
 from app.core import subscription
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db, run_db
 from app.models.user import User
 from app.schemas.podcast import (
     PodcastEpisodeCreate,
@@ -21,6 +22,7 @@ from app.schemas.podcast import (
     PodcastYouTubeUploadResponse,
 )
 from app.services import entitlement_service, podcast_service, quota_service, youtube_service
+from app.services.audio_chunking_service import format_srt
 from app.services.entitlement_service import (
     FeatureNotFoundError,
     get_feature_upgrade_cta,
@@ -43,7 +45,8 @@ async def transcribe_audio(audio_file_path: str, *, language: str = "en") -> str
         audio_file_path: Path to the audio file to transcribe
 
     Returns:
-        Transcribed text
+        Transcribed text; a ``Transcript`` whose ``words`` carry word-level
+        timestamps when Whisper returned them
 
     Raises:
         Exception: If Whisper API call fails
@@ -76,49 +79,53 @@ async def transcribe_audio(audio_file_path: str, *, language: str = "en") -> str
         file_size = os.path.getsize(file_path)
 
         # Handle large files with chunking (DEV-016 Phase 1.2)
-        from app.services.audio_chunking_service import get_audio_chunking_service
-        from pathlib import Path
+        from app.services.audio_chunking_service import (
+            get_audio_chunking_service,
+            transcript_from_response,
+        )
 
         chunking_service = get_audio_chunking_service()
 
         if chunking_service.needs_chunking(file_size):
             logger.info(f"Audio file ({file_size / 1024 / 1024:.1f}MB) exceeds 25MB limit, using chunking")
 
+            chunks = []
             try:
-                # Chunk the audio file
+                # Chunk the audio file in a single ffmpeg pass
                 audio_path = Path(file_path)
-                chunk_paths = await chunking_service.chunk_audio_file(audio_path)
+                chunks = await chunking_service.chunk_audio(audio_path)
 
-                # Transcribe all chunks and combine
+                # Transcribe chunks concurrently and stitch the overlaps
                 transcript = await chunking_service.transcribe_chunks(
-                    chunk_paths,
+                    chunks,
                     api_key,
                     language=language,
                 )
 
-                # Cleanup temporary chunk files
-                await chunking_service.cleanup_chunks(chunk_paths)
-
-                logger.info(f"Successfully transcribed {len(chunk_paths)} chunks, {len(transcript)} characters")
+                logger.info(f"Successfully transcribed {len(chunks)} chunks, {len(transcript)} characters")
 
                 return transcript
 
             except Exception as e:
                 logger.error(f"Chunked transcription failed: {e}")
                 raise ValueError(f"Failed to transcribe large file: {str(e)}")
+            finally:
+                # Cleanup temporary chunk files
+                await chunking_service.cleanup_chunks([chunk.path for chunk in chunks])
 
         # Normal transcription for files under 25MB
         with open(file_path, "rb") as audio_file:
             kwargs = {
                 "model": "whisper-1",
                 "file": audio_file,
-                "response_format": "text",
+                "response_format": "verbose_json",
+                "timestamp_granularities": ["word", "segment"],
             }
             if language:
                 kwargs["language"] = language
             response = await client.audio.transcriptions.create(**kwargs)
 
-        transcript = response if isinstance(response, str) else response.text
+        transcript = transcript_from_response(response)
 
         logger.info(f"Successfully transcribed {file_size / 1024:.1f}KB audio file, {len(transcript)} characters")
 
@@ -263,7 +270,9 @@ async def get_feature_access(
     }
 
 
-async def get_quota_summary(*, organization_id: str, tier: subscription.SubscriptionTier, db: Session) -> PodcastQuotaSummary:
+async def get_quota_summary(
+    *, organization_id: str, tier: subscription.SubscriptionTier, db: Session | AsyncSession
+) -> PodcastQuotaSummary:
     """Compute quota summary using shared service helpers."""
 
     return await quota_service.get_quota_summary(
@@ -281,7 +290,7 @@ async def get_quota_summary(*, organization_id: str, tier: subscription.Subscrip
 async def create_podcast_episode(
     payload: PodcastEpisodeCreate,
     current_user: User = Depends(require_feature("podcast_audio")),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> PodcastEpisodeResponse:
     """Create a new podcast episode guarded by tier access and quotas."""
 
@@ -300,16 +309,19 @@ async def create_podcast_episode(
             detail=str(exc),
         ) from exc
 
-    episode = podcast_service.create_episode(
-        db=db,
-        title=payload.title,
-        description=payload.description,
-        episode_number=payload.episode_number,
-        season_number=payload.season_number,
-        audio_file_url=str(payload.audio_file_url),
-        video_file_url=str(payload.video_file_url) if payload.video_file_url else None,
-        created_by=current_user.id,
-        organization_id=current_user.organization_id,
+    episode = await run_db(
+        db,
+        lambda session: podcast_service.create_episode(
+            db=session,
+            title=payload.title,
+            description=payload.description,
+            episode_number=payload.episode_number,
+            season_number=payload.season_number,
+            audio_file_url=str(payload.audio_file_url),
+            video_file_url=str(payload.video_file_url) if payload.video_file_url else None,
+            created_by=current_user.id,
+            organization_id=current_user.organization_id,
+        ),
     )
 
     await _increment_episode_usage(organization_id=current_user.organization_id, db=db)
@@ -324,7 +336,7 @@ async def create_podcast_episode(
 async def get_podcast_usage_summary(
     response: Response,
     current_user: User = Depends(require_feature("podcast_audio")),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> PodcastQuotaSummary:
     """Return quota summary for the current tenant's podcast usage."""
 
@@ -346,7 +358,7 @@ async def get_podcast_usage_summary(
     return summary
 
 
-async def _increment_episode_usage(organization_id: str, db: Session) -> None:
+async def _increment_episode_usage(organization_id: str, db: Session | AsyncSession) -> None:
     """Increment usage counts when possible, tolerating sync-only sessions."""
 
     try:
@@ -762,10 +774,20 @@ async def transcribe_episode_audio(
             db=db,
             episode_id=episode_id,
             organization_id=current_user.organization_id,
-            transcript=transcript,
+            transcript=str(transcript),
             transcript_language=requested_language,
         )
 
+        # Keep word timings so subtitle downloads get real cue times
+        if getattr(transcript, "words", None):
+            podcast_service.save_transcript_timestamps(
+                db=db,
+                episode_id=episode_id,
+                transcript_text=str(transcript),
+                language=requested_language,
+                timestamps=transcript.cues(),
+            )
+
         logger.info(
             "Audio transcribed successfully for episode %s by user %s",
             episode_id,
@@ -776,7 +798,7 @@ async def transcribe_episode_audio(
 
         return {
             "episode_id": episode_id,
-            "transcript": transcript,
+            "transcript": str(transcript),
             "transcript_language": requested_language,
             "word_count": word_count,
         }
@@ -869,9 +891,18 @@ async def download_transcript_srt(
             detail="Transcript not available. Please transcribe the episode first.",
         )
 
-    # Convert transcript to SRT format
-    # Simple implementation: split by sentences, assign timestamps
-    # In production, Whisper API provides word-level timestamps
+    # Use the cue times captured from Whisper's word-level timestamps
+    cues = podcast_service.get_transcript_timestamps(db=db, episode_id=episode_id)
+    if cues:
+        return Response(
+            content=format_srt(cues),
+            media_type="application/x-subrip",
+            headers={
+                "Content-Disposition": f'attachment; filename="episode_{episode_id}_transcript.srt"'
+            },
+        )
+
+    # Transcripts saved without timings: split by sentences, estimate timestamps
     lines = episode.transcript.split(". ")
     srt_content = []
     seconds_per_line = 10  # Estimate 10 seconds per sentence
@@ -22,6 +22,8 @@ from app.schemas.valuation import (
     ScenarioCreate,
     ScenarioResponse,
     ScenarioSummaryResponse,
+    SensitivityRequest,
+    SensitivityResponse,
     ValuationCreate,
     ValuationExportCreate,
     ValuationExportLogEntry,
@@ -30,6 +32,7 @@ from app.schemas.valuation import (
     ValuationUpdate,
 )
 from app.services import valuation_service
+from app.services.monte_carlo_engine import correlation_matrix
 
 router = APIRouter(prefix="/deals/{deal_id}/valuations", tags=["valuation"])
 
@@ -338,13 +341,45 @@ def run_monte_carlo(
             terminal_growth_rate=valuation.terminal_growth_rate or 0.02,
             iterations=payload.iterations,
             seed=payload.seed,
+            growth_volatility=payload.growth_volatility,
+            margin_volatility=payload.margin_volatility,
+            wacc_volatility=payload.wacc_volatility,
+            distribution=payload.distribution,
+            degrees_of_freedom=payload.degrees_of_freedom,
+            correlation=(
+                correlation_matrix(**payload.correlation.model_dump()) if payload.correlation else None
+            ),
+            histogram_bins=payload.histogram_bins,
         )
-    except ValueError as exc:  # pragma: no cover - defensive path
+    except ValueError as exc:
         _error(status.HTTP_422_UNPROCESSABLE_ENTITY, "INVALID_MONTE_CARLO", str(exc))
 
     return MonteCarloResponse(**result)
 
 
+@router.post("/{valuation_id}/sensitivity", response_model=SensitivityResponse)
+def run_sensitivity_analysis(
+    deal_id: str,
+    valuation_id: str,
+    payload: SensitivityRequest,
+    current_user: User = Depends(_require_growth_user),
+    db: Session = Depends(get_db),
+):
+    deal = require_deal_access(deal_id=deal_id, current_user=current_user, db=db)
+    valuation = _get_valuation(db=db, deal=deal, valuation_id=valuation_id)
+    try:
+        result = valuation_service.get_sensitivity_analysis(
+            valuation=valuation,
+            axes={driver: axis.resolve() for driver, axis in payload.axes.items()},
+        )
+    except valuation_service.InvalidBaseCaseError as exc:
+        _error(status.HTTP_400_BAD_REQUEST, "INVALID_BASE_CASE", str(exc))
+    except ValueError as exc:
+        _error(status.HTTP_422_UNPROCESSABLE_ENTITY, "INVALID_SENSITIVITY", str(exc))
+
+    return SensitivityResponse(**result)
+
+
 @router.post("/{valuation_id}/exports", response_model=ValuationExportResponse, status_code=status.HTTP_202_ACCEPTED)
 def trigger_export(
     deal_id: str,
@@ -7,6 +7,7 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
+from app.api.dependencies.auth import invalidate_principal_cache
 from app.core.security import verify_webhook_signature
 from app.core.subscription import clear_tier_cache
 from app.db.session import get_db
@@ -48,6 +49,7 @@ async def handle_clerk_webhook(request: Request, db: Session = Depends(get_db))
                 user_service.create_user_from_clerk(db, data)
         else:
             user_service.delete_user(db, clerk_user_id)
+        invalidate_principal_cache(clerk_user_id=clerk_user_id)
     elif event_type in {"organization.created", "organization.updated"}:
         try:
             organization = organization_service.upsert_from_clerk(db, data)
@@ -55,6 +57,7 @@ async def handle_clerk_webhook(request: Request, db: Session = Depends(get_db))
             raise HTTPException(status_code=500, detail=str(exc)) from exc
 
         clear_tier_cache(organization.id)
+        invalidate_principal_cache(organization_id=organization.id)
     elif event_type == "organization.deleted":
         organization_id = data.get("id")
         if not organization_id:
@@ -62,11 +65,14 @@ async def handle_clerk_webhook(request: Request, db: Session = Depends(get_db))
 
         organization_service.deactivate_organization(db, organization_id)
         clear_tier_cache(organization_id)
+        invalidate_principal_cache(organization_id=organization_id)
     elif event_type in {"session.created", "session.ended"}:
         user_service.update_last_login(
             db,
             data.get("user_id", ""),
             _parse_datetime(data.get("last_active_at")),
         )
+        if event_type == "session.ended" and data.get("id"):
+            invalidate_principal_cache(session_id=data["id"])
 
     return {"status": "processed"}
@@ -4,47 +4,220 @@ Redis HTTP Response Caching Module
 Provides decorators and utilities for caching HTTP responses in Redis.
 Follows multi-tenant architecture with organization-scoped cache keys.
 
+All Redis I/O goes through ``redis.asyncio`` so cache lookups never block the
+event loop. Cached entries can be registered under one or more *tags*
+(``tag:org:{id}:deals``); mutations invalidate a tag, which deletes exactly
+the keys registered under it instead of scanning the keyspace.
+
+Reads go through two tiers: a small per-process LRU with a short TTL in front
+of Redis. Concurrent misses for the same key are coalesced into a single
+computation, and entries may opt into stale-while-revalidate so callers get
+the previous value while a background task refreshes it.
+
 Usage:
-    from app.core.cache import cached_response
+    from app.core.cache import cached_response, DEALS_TAG
 
     @router.get("/deals")
-    @cached_response(ttl=300)  # 5 minutes
+    @cached_response(ttl=300, tags=[DEALS_TAG])  # 5 minutes
     async def get_deals(
+        request: Request,
         current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
+        db: Session = Depends(get_db)
     ):
         # This response will be cached per organization
-        return await deal_service.get_deals(db, current_user.organization_id)
+        return deal_service.list_deals(...)
+
+    # In the service layer, after committing a mutation:
+    invalidate_tags_soon(org_tag(organization_id, "deals"))
 """
 
+import asyncio
 import hashlib
 import json
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
 from functools import wraps
-from typing import Any, Callable, Optional
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 from fastapi import Request, Response
-from redis import Redis
+from redis import asyncio as redis_async
 from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Redis client (will be initialized in lifespan)
-_redis_client: Optional[Redis] = None
-
+STATS_HITS_KEY = "cache:stats:hits"
+STATS_MISSES_KEY = "cache:stats:misses"
+TAG_KEY_PREFIX = "tag:"
+
+# Raises a key's TTL to ARGV[1] seconds but never lowers it. EXPIRE's GT/NX
+# options would do this natively, but they need Redis >= 7.
+EXTEND_TTL_SCRIPT = """
+if redis.call('TTL', KEYS[1]) < tonumber(ARGV[1]) then
+    return redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return 0
+"""
 
-def get_redis_client() -> Optional[Redis]:
-    """Get the global Redis client instance."""
+# Tag templates understood by ``cached_response``; placeholders are filled
+# from the current user and the request's path parameters.
+DEALS_TAG = "org:{organization_id}:deals"
+DOCUMENTS_TAG = "org:{organization_id}:documents"
+
+# Hit/miss counters are buffered in-process and flushed with a single
+# pipelined INCRBY once this many events have accumulated (or piggy-backed on
+# the next cache write), rather than costing a round trip per request.
+STATS_FLUSH_THRESHOLD = 50
+
+# In-process tier. Entries are only trusted for a few seconds so that
+# invalidations issued by other workers are picked up quickly.
+LOCAL_CACHE_MAX_ENTRIES = 1024
+LOCAL_CACHE_TTL = 5.0
+
+# Values returned alongside cached payloads by ``get_or_compute``.
+CACHE_LOCAL = "LOCAL"
+CACHE_HIT = "HIT"
+CACHE_STALE = "STALE"
+CACHE_MISS = "MISS"
+
+# Redis client (lazily initialized on first use)
+_redis_client: Optional[redis_async.Redis] = None
+_pending_stats: Dict[str, int] = {STATS_HITS_KEY: 0, STATS_MISSES_KEY: 0}
+_background_tasks: Set[asyncio.Task] = set()
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+@dataclass
+class _LocalEntry:
+    value: Any
+    fresh_until: float
+    expires_at: float
+    tags: FrozenSet[str] = field(default_factory=frozenset)
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.monotonic()) < self.fresh_until
+
+
+class LocalLRUCache:
+    """Bounded per-process LRU tier with per-entry TTL and tag eviction."""
+
+    def __init__(self, max_entries: int = LOCAL_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _LocalEntry]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = defaultdict(set)
+        # Invalidation can arrive from a worker thread (see invalidate_tags_soon).
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, *, allow_stale: bool = False) -> Optional[_LocalEntry]:
+        """Return the entry for ``key`` if it is fresh (or merely stale when allowed)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if now >= entry.expires_at:
+                self._remove(key)
+                return None
+            if not allow_stale and not entry.is_fresh(now):
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        *,
+        ttl: float,
+        stale_ttl: float = 0,
+        tags: Iterable[str] = (),
+    ) -> None:
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        now = time.monotonic()
+        entry = _LocalEntry(
+            value=value,
+            fresh_until=now + ttl,
+            expires_at=now + ttl + max(stale_ttl, 0),
+            tags=frozenset(tags),
+        )
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            for tag in entry.tags:
+                self._tags[tag].add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Evict every entry registered under any of ``tags``."""
+        with self._lock:
+            keys: Set[str] = set()
+            for tag in tags:
+                keys.update(self._tags.pop(tag, ()))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            members = self._tags.get(tag)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._tags[tag]
+
+
+_local_cache = LocalLRUCache()
+
+
+def get_local_cache() -> LocalLRUCache:
+    """Return this process's in-memory cache tier."""
+    return _local_cache
+
+
+def _build_client() -> redis_async.Redis:
+    return redis_async.from_url(
+        settings.redis_url,
+        decode_responses=True,
+        socket_connect_timeout=5,
+        socket_timeout=5,
+    )
+
+
+def get_redis_client() -> Optional[redis_async.Redis]:
+    """Get the global async Redis client instance.
+
+    Creating the client does not open a connection; the first command does.
+    """
     global _redis_client
     if _redis_client is None and settings.redis_url:
         try:
-            _redis_client = Redis.from_url(
-                settings.redis_url,
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5,
-            )
-            # Test connection
-            _redis_client.ping()
+            _redis_client = _build_client()
             logger.info("Redis client initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Redis client: {e}")
@@ -52,6 +225,21 @@ def get_redis_client() -> Optional[Redis]:
     return _redis_client
 
 
+async def close_redis_client() -> None:
+    """Flush buffered stats and close the global Redis client."""
+    global _redis_client
+    client = _redis_client
+    if client is None:
+        return
+    try:
+        await _flush_stats(client)
+        await client.aclose()
+    except Exception as e:
+        logger.warning(f"Failed to close Redis client cleanly: {e}")
+    finally:
+        _redis_client = None
+
+
 def generate_cache_key(
     endpoint: str,
     organization_id: str,
@@ -87,10 +275,345 @@ def generate_cache_key(
     return ":".join(key_parts)
 
 
+def org_tag(organization_id: Any, resource: str) -> str:
+    """Return the tag grouping cached ``resource`` views for an organization."""
+    return f"org:{organization_id}:{resource}"
+
+
+def tag_key(tag: str) -> str:
+    """Return the Redis set key holding the cache keys registered under ``tag``."""
+    return f"{TAG_KEY_PREFIX}{tag}"
+
+
+def _record_stat(key: str) -> None:
+    _pending_stats[key] += 1
+
+
+def _queue_pending_stats(pipe) -> None:
+    """Move buffered hit/miss counts onto ``pipe`` and reset the buffer."""
+    for key, count in _pending_stats.items():
+        if count:
+            pipe.incrby(key, count)
+            _pending_stats[key] = 0
+
+
+async def _flush_stats(redis: redis_async.Redis) -> None:
+    if not any(_pending_stats.values()):
+        return
+    async with redis.pipeline(transaction=False) as pipe:
+        _queue_pending_stats(pipe)
+        await pipe.execute()
+
+
+async def _maybe_flush_stats(redis: redis_async.Redis) -> None:
+    if sum(_pending_stats.values()) < STATS_FLUSH_THRESHOLD:
+        return
+    try:
+        await _flush_stats(redis)
+    except Exception as e:
+        logger.warning(f"Failed to flush cache stats: {e}")
+
+
+async def store_tagged(
+    key: str,
+    value: str,
+    ttl: int,
+    tags: Iterable[str] = (),
+    redis: Optional[redis_async.Redis] = None,
+) -> bool:
+    """
+    Store ``value`` under ``key`` and register the key under each tag.
+
+    The write, the tag-set updates and any buffered stats counters go out in a
+    single pipeline. Tag sets expire with their longest-lived entry, so they
+    neither outlive everything they point at nor vanish while entries remain.
+
+    Returns:
+        True if the value was written
+    """
+    redis = redis or get_redis_client()
+    if not redis:
+        return False
+
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.setex(key, ttl, value)
+        for tag in tags:
+            pipe.sadd(tag_key(tag), key)
+            # Only ever extend a tag's TTL so a short-lived entry cannot
+            # expire a set longer-lived ones rely on.
+            pipe.eval(EXTEND_TTL_SCRIPT, 1, tag_key(tag), ttl)
+        _queue_pending_stats(pipe)
+        await pipe.execute()
+    return True
+
+
+async def invalidate_cache_tags(
+    *tags: str,
+    redis: Optional[redis_async.Redis] = None,
+) -> int:
+    """
+    Delete every cache key registered under any of ``tags``.
+
+    Cost is proportional to the number of tagged keys; the keyspace is never
+    scanned.
+
+    Args:
+        tags: Tags such as ``org_tag(org_id, "deals")``
+        redis: Optional client override (defaults to the shared client)
+
+    Returns:
+        Number of cache keys deleted
+    """
+    _local_cache.invalidate_tags(tags)
+    redis = redis or get_redis_client()
+    if not redis or not tags:
+        return 0
+
+    tag_keys = [tag_key(tag) for tag in tags]
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for key in tag_keys:
+                pipe.smembers(key)
+            members = await pipe.execute()
+
+        cache_keys: Set[str] = set()
+        for keys in members:
+            cache_keys.update(keys or ())
+
+        deleted = 0
+        async with redis.pipeline(transaction=False) as pipe:
+            if cache_keys:
+                pipe.delete(*cache_keys)
+            pipe.delete(*tag_keys)
+            results = await pipe.execute()
+        if cache_keys:
+            deleted = int(results[0] or 0)
+        logger.info(f"Invalidated {deleted} cache keys for tags: {', '.join(tags)}")
+        return deleted
+    except Exception as e:
+        logger.error(f"Failed to invalidate cache tags {tags}: {e}")
+        return 0
+
+
+async def _invalidate_with_private_client(tags: Sequence[str]) -> int:
+    # The shared client's connection pool is bound to the application loop,
+    # so a throwaway loop needs its own client.
+    client = _build_client()
+    try:
+        return await invalidate_cache_tags(*tags, redis=client)
+    finally:
+        await client.aclose()
+
+
+def _spawn(coro: Awaitable[Any]) -> asyncio.Task:
+    """Run ``coro`` in the background, keeping a reference until it finishes."""
+    task = asyncio.ensure_future(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_task_done)
+    return task
+
+
+def _background_task_done(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background cache task failed: {task.exception()}")
+
+
+async def _single_flight(key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+    """Run ``factory`` once per key; concurrent callers await the same result."""
+    pending = _inflight.get(key)
+    if pending is not None:
+        return await asyncio.shield(pending)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result = await factory()
+    except BaseException as exc:
+        future.set_exception(exc)
+        future.exception()  # mark retrieved when nobody else was waiting
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
+
+
+async def _compute_and_store(
+    key: str,
+    compute: Callable[[], Awaitable[Optional[str]]],
+    *,
+    ttl: int,
+    tags: Sequence[str],
+    stale_ttl: int,
+    local_ttl: float,
+    redis: Optional[redis_async.Redis],
+) -> Tuple[Optional[str], str]:
+    _record_stat(STATS_MISSES_KEY)
+    value = await compute()
+    if value is None:
+        return None, CACHE_MISS
+
+    if redis:
+        try:
+            await store_tagged(key, value, ttl + stale_ttl, tags, redis=redis)
+        except Exception as e:
+            logger.error(f"Failed to cache response: {e}")
+    _local_cache.set(key, value, ttl=min(local_ttl, ttl), stale_ttl=stale_ttl, tags=tags)
+    return value, CACHE_MISS
+
+
+async def _load(
+    key: str,
+    compute: Callable[[], Awaitable[Optional[str]]],
+    *,
+    ttl: int,
+    tags: Sequence[str],
+    stale_ttl: int,
+    local_ttl: float,
+    redis: Optional[redis_async.Redis],
+) -> Tuple[Optional[str], str]:
+    """Read through Redis, falling back to ``compute`` on a miss."""
+    options = dict(ttl=ttl, tags=tags, stale_ttl=stale_ttl, local_ttl=local_ttl, redis=redis)
+
+    if redis:
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.pttl(key)
+                value, remaining_ms = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Cache operation failed: {e}")
+            value, remaining_ms = None, None
+
+        if value is not None:
+            _record_stat(STATS_HITS_KEY)
+            await _maybe_flush_stats(redis)
+            # Entries are written with ttl + stale_ttl; the last stale_ttl
+            # seconds of their life are the stale window.
+            remaining = remaining_ms / 1000 if remaining_ms and remaining_ms > 0 else ttl
+            fresh_for = remaining - stale_ttl
+            if fresh_for > 0:
+                _local_cache.set(
+                    key, value, ttl=min(local_ttl, fresh_for), stale_ttl=stale_ttl, tags=tags
+                )
+                return value, CACHE_HIT
+            _spawn(_single_flight(f"{key}:refresh", lambda: _compute_and_store(key, compute, **options)))
+            return value, CACHE_STALE
+
+    return await _compute_and_store(key, compute, **options)
+
+
+async def get_or_compute(
+    key: str,
+    compute: Callable[[], Awaitable[Optional[str]]],
+    *,
+    ttl: int,
+    tags: Sequence[str] = (),
+    stale_ttl: int = 0,
+    local_ttl: float = LOCAL_CACHE_TTL,
+    redis: Optional[redis_async.Redis] = None,
+) -> Tuple[Optional[str], str]:
+    """
+    Return the cached value for ``key``, computing and storing it on a miss.
+
+    Lookups try the in-process tier, then Redis. Concurrent misses for the
+    same key within a process share one ``compute`` call. With ``stale_ttl``
+    set, a value past its TTL but within the stale window is returned
+    immediately while a background task refreshes it; ``compute`` then runs
+    after the caller has returned, so it must not use request-scoped state.
+
+    Args:
+        key: Cache key
+        compute: Coroutine factory producing the serialized value, or None
+            when the result must not be cached
+        ttl: Freshness lifetime in seconds
+        tags: Tags to register the entry under
+        stale_ttl: Extra seconds a stale value may be served while refreshing
+        local_ttl: Upper bound on how long the in-process tier trusts a value
+        redis: Optional client override (defaults to the shared client)
+
+    Returns:
+        Tuple of (value, one of CACHE_LOCAL/CACHE_HIT/CACHE_STALE/CACHE_MISS)
+    """
+    redis = redis or get_redis_client()
+    options = dict(ttl=ttl, tags=tags, stale_ttl=stale_ttl, local_ttl=local_ttl, redis=redis)
+
+    entry = _local_cache.get(key, allow_stale=stale_ttl > 0)
+    if entry is not None:
+        _record_stat(STATS_HITS_KEY)
+        if redis:
+            await _maybe_flush_stats(redis)
+        if entry.is_fresh():
+            return entry.value, CACHE_LOCAL
+        # Revalidate through Redis, which is usually still fresh.
+        _spawn(_single_flight(key, lambda: _load(key, compute, **options)))
+        return entry.value, CACHE_STALE
+
+    return await _single_flight(key, lambda: _load(key, compute, **options))
+
+
+def invalidate_tags_soon(*tags: str) -> None:
+    """
+    Invalidate ``tags`` from synchronous service code.
+
+    The local tier is evicted immediately. For Redis, inside the event loop
+    the invalidation is scheduled as a task; from a threadpool worker it runs
+    on the loop via ``anyio``; with no loop at all (scripts, Celery) it runs to
+    completion on a private client.
+    """
+    if not tags:
+        return
+    _local_cache.invalidate_tags(tags)
+    if not settings.redis_url:
+        return
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if loop is not None:
+        _spawn(invalidate_cache_tags(*tags))
+        return
+
+    try:
+        from anyio import from_thread
+
+        from_thread.run(invalidate_cache_tags, *tags)
+        return
+    except RuntimeError:
+        pass  # not an anyio worker thread
+
+    try:
+        asyncio.run(_invalidate_with_private_client(tags))
+    except Exception as e:
+        logger.error(f"Failed to invalidate cache tags {tags}: {e}")
+
+
+def _format_tags(
+    templates: Sequence[str],
+    *,
+    organization_id: str,
+    user_id: str,
+    path_params: Dict[str, Any],
+) -> List[str]:
+    context = {**path_params, "organization_id": organization_id, "user_id": user_id}
+    tags = []
+    for template in templates:
+        try:
+            tags.append(template.format(**context))
+        except KeyError as e:
+            logger.warning(f"Cache tag {template!r} references unknown field {e}")
+    return tags
+
+
 def cached_response(
     ttl: int = 300,
     user_specific: bool = False,
     bypass_header: str = "X-Cache-Bypass",
+    tags: Sequence[str] = (),
 ):
     """
     Decorator for caching FastAPI endpoint responses in Redis.
@@ -100,22 +623,31 @@ def cached_response(
     - Configurable TTL per endpoint
     - Optional user-specific caching
     - Cache bypass via header
-    - Automatic cache invalidation on non-GET requests
+    - Tag registration for targeted invalidation on mutations
+    - In-process tier and request coalescing
+
+    Stale-while-revalidate is deliberately not offered here: the refresh would
+    re-run the endpoint after the response is sent, with request-scoped
+    dependencies (DB session, Request) already closed. Endpoints that want it
+    call ``get_or_compute`` with a ``compute`` that opens its own resources.
 
     Args:
         ttl: Time-to-live in seconds (default: 300 = 5 minutes)
         user_specific: If True, cache separately per user (default: False)
         bypass_header: Header name to bypass cache (default: "X-Cache-Bypass")
+        tags: Tag templates the entry is registered under; ``{organization_id}``,
+            ``{user_id}`` and path parameters are substituted per request
 
     Usage:
-        @router.get("/deals")
-        @cached_response(ttl=300)
-        async def get_deals(
+        @router.get("/deals/{deal_id}")
+        @cached_response(ttl=300, tags=[DEALS_TAG, "deal:{deal_id}"])
+        async def get_deal(
+            deal_id: str,
             request: Request,
             current_user: User = Depends(get_current_user),
-            db: AsyncSession = Depends(get_db)
+            db: Session = Depends(get_db)
         ):
-            return await deal_service.get_deals(db, current_user.organization_id)
+            return deal_service.get_deal_by_id(deal_id, current_user.organization_id, db)
 
     Example cache keys:
         - api:v1:deals:org-123:a3f2e1c7  (organization-scoped)
@@ -141,12 +673,6 @@ def cached_response(
             if request.method != "GET":
                 return await func(*args, **kwargs)
 
-            # Get Redis client
-            redis = get_redis_client()
-            if not redis:
-                logger.warning("Redis not available, skipping cache")
-                return await func(*args, **kwargs)
-
             # Generate cache key
             organization_id = str(current_user.organization_id)
             query_params = dict(request.query_params)
@@ -158,98 +684,65 @@ def cached_response(
                 query_params=query_params,
                 user_id=user_id,
             )
+            entry_tags = _format_tags(
+                tags,
+                organization_id=organization_id,
+                user_id=str(current_user.id),
+                path_params=dict(request.path_params),
+            )
+            computed: Dict[str, Any] = {}
 
-            try:
-                # Try to get cached response
-                cached_data = redis.get(cache_key)
-
-                if cached_data:
-                    logger.debug(f"Cache HIT: {cache_key}")
-                    # Increment cache hit counter
-                    redis.incr("cache:stats:hits")
-
-                    # Parse and return cached response
-                    return Response(
-                        content=cached_data,
-                        media_type="application/json",
-                        headers={"X-Cache": "HIT"},
-                    )
-
-                # Cache miss - call the actual function
-                logger.debug(f"Cache MISS: {cache_key}")
-                redis.incr("cache:stats:misses")
-
+            async def compute() -> Optional[str]:
                 # Execute the endpoint function
                 result = await func(*args, **kwargs)
+                computed["result"] = result
+
+                # Serialize response
+                if hasattr(result, "model_dump_json"):
+                    # Pydantic model
+                    return result.model_dump_json()
+                if isinstance(result, (dict, list)):
+                    # Dict or list
+                    return json.dumps(result)
+                # Other types - skip caching
+                logger.warning(f"Cannot cache response type: {type(result)}")
+                return None
+
+            cached_data, outcome = await get_or_compute(
+                cache_key,
+                compute,
+                ttl=ttl,
+                tags=entry_tags,
+            )
 
-                # Cache the result
-                try:
-                    # Serialize response
-                    if hasattr(result, "model_dump_json"):
-                        # Pydantic model
-                        cached_content = result.model_dump_json()
-                    elif isinstance(result, (dict, list)):
-                        # Dict or list
-                        cached_content = json.dumps(result)
-                    else:
-                        # Other types - skip caching
-                        logger.warning(f"Cannot cache response type: {type(result)}")
-                        return result
-
-                    # Store in Redis with TTL
-                    redis.setex(cache_key, ttl, cached_content)
-                    logger.debug(f"Cached response for {cache_key} (TTL: {ttl}s)")
-
-                except Exception as e:
-                    logger.error(f"Failed to cache response: {e}")
-
-                return result
-
-            except Exception as e:
-                logger.error(f"Cache operation failed: {e}")
-                # Fallback to non-cached response
+            if "result" in computed:
+                # This request ran the endpoint itself
+                logger.debug(f"Cache MISS: {cache_key}")
+                return computed["result"]
+            if cached_data is None:
+                # Coalesced onto a computation whose result is not cacheable
                 return await func(*args, **kwargs)
 
+            logger.debug(f"Cache {outcome}: {cache_key}")
+            return Response(
+                content=cached_data,
+                media_type="application/json",
+                headers={
+                    "X-Cache": CACHE_STALE if outcome == CACHE_STALE else CACHE_HIT,
+                    "X-Cache-Tier": "local" if outcome == CACHE_LOCAL else "redis",
+                },
+            )
+
         return wrapper
     return decorator
 
 
-def invalidate_cache_pattern(pattern: str) -> int:
-    """
-    Invalidate all cache keys matching a pattern.
-
-    Useful for cache invalidation on POST/PUT/DELETE operations.
-
-    Args:
-        pattern: Redis key pattern (e.g., "api:v1:deals:org-123:*")
-
-    Returns:
-        Number of keys deleted
-
-    Example:
-        # Invalidate all deal caches for org-123
-        invalidate_cache_pattern("api:v1:deals:org-123:*")
-    """
-    redis = get_redis_client()
-    if not redis:
-        return 0
-
-    try:
-        keys = redis.keys(pattern)
-        if keys:
-            deleted = redis.delete(*keys)
-            logger.info(f"Invalidated {deleted} cache keys matching: {pattern}")
-            return deleted
-        return 0
-    except Exception as e:
-        logger.error(f"Failed to invalidate cache pattern {pattern}: {e}")
-        return 0
-
-
-def get_cache_stats() -> dict:
+async def get_cache_stats() -> dict:
     """
     Get cache performance statistics.
 
+    Buffered counters from this process are flushed before reading.
+
     Returns:
         Dictionary with hits, misses, hit rate
     """
@@ -258,8 +751,10 @@ def get_cache_stats() -> dict:
         return {"hits": 0, "misses": 0, "hit_rate": 0.0, "available": False}
 
     try:
-        hits = int(redis.get("cache:stats:hits") or 0)
-        misses = int(redis.get("cache:stats:misses") or 0)
+        await _flush_stats(redis)
+        hits_raw, misses_raw = await redis.mget(STATS_HITS_KEY, STATS_MISSES_KEY)
+        hits = int(hits_raw or 0)
+        misses = int(misses_raw or 0)
         total = hits + misses
         hit_rate = (hits / total * 100) if total > 0 else 0.0
 
@@ -275,9 +770,11 @@ def get_cache_stats() -> dict:
         return {"hits": 0, "misses": 0, "hit_rate": 0.0, "available": False}
 
 
-def reset_cache_stats():
+async def reset_cache_stats():
     """Reset cache statistics counters."""
+    for key in _pending_stats:
+        _pending_stats[key] = 0
     redis = get_redis_client()
     if redis:
-        redis.delete("cache:stats:hits", "cache:stats:misses")
+        await redis.delete(STATS_HITS_KEY, STATS_MISSES_KEY)
         logger.info("Cache statistics reset")
@@ -17,6 +17,14 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite:///./app.db"
+    db_pool_size: int = 10  # Persistent connections per engine (ignored for SQLite)
+    db_max_overflow: int = 20  # Extra connections allowed under burst load
+    db_pool_timeout: int = 30  # Seconds to wait for a pooled connection
+    db_pool_recycle: int = 1800  # Recycle connections older than this many seconds
+    db_pool_pre_ping: bool = True  # Validate connections before handing them out
+    query_metrics_enabled: bool = True  # Per-request query counts + Server-Timing header
+    slow_query_ms: float = 500.0  # Log statements slower than this
+    query_budget_strict: bool = False  # Raise when a route exceeds its @query_budget (tests)
 
     # Redis (for caching and task queue)
     redis_url: str = ""  # e.g., "redis://localhost:6379/0" or Render Redis URL
@@ -26,6 +34,8 @@ class Settings(BaseSettings):
     clerk_secret_key: str = ""
     clerk_webhook_secret: str = ""
     clerk_jwt_algorithm: str = "RS256"
+    principal_cache_ttl_seconds: float = 30.0  # Reuse a verified session's user for this long (0 disables)
+    principal_cache_max_entries: int = 10000
 
     # Security
     secret_key: str = "dev-secret-key-change-in-production"
@@ -53,6 +63,7 @@ class Settings(BaseSettings):
     stripe_secret_key: str = ""
     stripe_webhook_secret: str = ""
     stripe_publishable_key: str = ""
+    ticket_hold_seconds: int = 1800  # Reserve tickets for this long during Stripe checkout (Redis only; clamped to Stripe's 30 min - 24 h)
     
     # GoHighLevel CRM Integration (optional)
     gohighlevel_api_key: str = ""
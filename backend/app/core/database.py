@@ -1,10 +1,13 @@
 """Database connection and session management with lazy initialization."""
 from __future__ import annotations
 
-from collections.abc import Iterator
-from typing import Any, Callable
+from collections.abc import AsyncIterator, Iterator
+from typing import Any, Callable, TypeVar, Union
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession as AsyncDBSession
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
@@ -17,6 +20,42 @@ SessionLocal: sessionmaker | None = None
 _default_async_session_factory: Callable[[], Session] | None = None
 # Alias used by tests to patch session creation (see backend/tests/test_core_edge_cases.py)
 AsyncSession: Callable[[], Session] | None = None  # type: ignore
+# Native asyncio engine/sessions (asyncpg on Postgres, aiosqlite on SQLite)
+async_engine: AsyncEngine | None = None
+AsyncSessionLocal: async_sessionmaker[AsyncDBSession] | None = None
+
+SessionLike = Union[Session, AsyncDBSession]
+_T = TypeVar("_T")
+
+_ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "postgres": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def _pool_options(database_url: str) -> dict[str, Any]:
+    """Connection pool settings; SQLite keeps SQLAlchemy's own defaults."""
+    if database_url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def to_async_database_url(database_url: str) -> str:
+    """Map a sync database URL onto its asyncio driver (asyncpg / aiosqlite)."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for database backend {backend!r}")
+    url = url.set(drivername=_ASYNC_DRIVERS[backend])
+    if backend != "sqlite" and "sslmode" in url.query:
+        # asyncpg spells libpq's sslmode as ssl
+        query = dict(url.query)
+        query["ssl"] = query.pop("sslmode")
+        url = url.set(query=query)
+    return url.render_as_string(hide_password=False)
 
 
 def init_engine():
@@ -27,7 +66,12 @@ def init_engine():
     global engine, SessionLocal, AsyncSession, _default_async_session_factory
     if engine is None:
         connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
-        engine = create_engine(settings.database_url, future=True, connect_args=connect_args)
+        engine = create_engine(
+            settings.database_url,
+            future=True,
+            connect_args=connect_args,
+            **_pool_options(settings.database_url),
+        )
         SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
         # Expose a patchable alias so tests can force failure modes without reaching into private state
         AsyncSession = SessionLocal
@@ -89,6 +133,66 @@ def get_db() -> Iterator[Session]:
     return _DBSessionContext()
 
 
+def init_async_engine() -> AsyncEngine:
+    """Initialize the asyncio engine and session factory (lazy)."""
+    global async_engine, AsyncSessionLocal
+    if async_engine is None:
+        async_engine = create_async_engine(
+            to_async_database_url(settings.database_url),
+            **_pool_options(settings.database_url),
+        )
+        # Objects stay usable after commit: lazy refreshes would need an await.
+        AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    return async_engine
+
+
+async def get_async_db() -> AsyncIterator[AsyncDBSession]:
+    """Provide a transactional AsyncSession; queries never block the event loop."""
+    init_async_engine()
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database session not initialized")
+
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+
+async def run_db(db: SessionLike, fn: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+    """Run synchronous ORM code ``fn(session, *args, **kwargs)`` on either session type.
+
+    For an AsyncSession this goes through ``run_sync``: SQLAlchemy executes ``fn`` on
+    a greenlet whose I/O awaits the async driver, so existing Session-based helpers
+    can be reused without blocking the event loop. A plain Session is called directly.
+    """
+    if isinstance(db, AsyncDBSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return fn(db, *args, **kwargs)
+
+
+def _describe_pool(bound_engine) -> dict[str, Any] | None:
+    if bound_engine is None:
+        return None
+    pool = bound_engine.pool
+    description: dict[str, Any] = {"class": type(pool).__name__, "status": pool.status()}
+    for metric in ("size", "checkedin", "checkedout", "overflow"):
+        reader = getattr(pool, metric, None)
+        if callable(reader):
+            description[metric] = reader()
+    return description
+
+
+def pool_status() -> dict[str, Any]:
+    """Connection pool occupancy for the sync and async engines."""
+    return {
+        "sync": _describe_pool(engine),
+        "async": _describe_pool(async_engine.sync_engine if async_engine is not None else None),
+    }
+
+
 def init_db() -> None:
     """Create database tables when running in development/debug mode."""
     init_engine()
@@ -99,3 +203,12 @@ def close_db() -> None:
     """Dispose of the engine."""
     if engine:
         engine.dispose()
+
+
+async def close_async_db() -> None:
+    """Dispose of the asyncio engine and its pooled connections."""
+    global async_engine, AsyncSessionLocal
+    if async_engine is not None:
+        await async_engine.dispose()
+        async_engine = None
+        AsyncSessionLocal = None
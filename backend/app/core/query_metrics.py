@@ -0,0 +1,315 @@
+"""
+Per-request SQL query instrumentation.
+
+SQLAlchemy ``before_cursor_execute``/``after_cursor_execute`` listeners on
+:class:`~sqlalchemy.engine.Engine` time every statement - sync engines and the
+``sync_engine`` behind the asyncpg/aiosqlite engine alike - and charge it to
+the current request's :class:`QueryStats`. The stats object travels in a
+context variable, which thread-pool hops (sync routes and dependencies) and
+SQLAlchemy's greenlet bridge both inherit.
+
+:class:`QueryMetricsMiddleware` opens that scope for every HTTP request, adds
+a ``Server-Timing`` header (query count, total DB time, slowest statement) and
+folds the numbers into per-route aggregates served next to ``/health``.
+
+Routes may declare how many queries they are expected to issue::
+
+    @router.get("/summary")
+    @query_budget(8)
+    async def get_dashboard_summary(...): ...
+
+Exceeding the budget logs a warning; with ``settings.query_budget_strict``
+enabled (as in the test suite) it raises :class:`QueryBudgetExceeded`, so an
+N+1 regression fails the route's tests. Constant-cost work shared by many
+routes (tenant impersonation auditing, for instance) can run under
+:func:`exclude_from_budget` so it shows up in the timings without eating into
+each route's budget. Arbitrary code can be measured with :func:`capture_queries`.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_PREVIEW_CHARS = 200
+_START_TIMES_KEY = "query_metrics_start_times"
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a route issues more queries than it declared."""
+
+
+def _preview(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > STATEMENT_PREVIEW_CHARS:
+        return statement[: STATEMENT_PREVIEW_CHARS - 3] + "..."
+    return statement
+
+
+@dataclass
+class QueryStats:
+    """Queries issued within one scope (a request or a :func:`capture_queries` block)."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: Optional[str] = None
+    statements: List[str] = field(default_factory=list)
+    keep_statements: bool = False
+    excluded: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_ms += elapsed_ms
+            if self.slowest_statement is None or elapsed_ms > self.slowest_ms:
+                self.slowest_ms = elapsed_ms
+                self.slowest_statement = _preview(statement)
+            if self.keep_statements:
+                self.statements.append(_preview(statement))
+
+    @property
+    def budgeted_count(self) -> int:
+        """Queries charged against the route's budget."""
+        return self.count - self.excluded
+
+    def server_timing(self) -> str:
+        """Render as a ``Server-Timing`` header value."""
+        return (
+            f'db;dur={self.total_ms:.2f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_ms:.2f}"
+        )
+
+
+@dataclass
+class RouteQueryMetrics:
+    """Process-wide aggregate for one route."""
+
+    requests: int = 0
+    queries: int = 0
+    db_ms: float = 0.0
+    max_queries: int = 0
+    slowest_ms: float = 0.0
+    slowest_statement: Optional[str] = None
+    budget: Optional[int] = None
+    budget_violations: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "queries": self.queries,
+            "avg_queries": round(self.queries / self.requests, 2) if self.requests else 0.0,
+            "max_queries": self.max_queries,
+            "db_ms": round(self.db_ms, 2),
+            "avg_db_ms": round(self.db_ms / self.requests, 2) if self.requests else 0.0,
+            "slowest_ms": round(self.slowest_ms, 2),
+            "slowest_statement": self.slowest_statement,
+            "budget": self.budget,
+            "budget_violations": self.budget_violations,
+        }
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_captures: List[QueryStats] = []
+_captures_lock = threading.Lock()
+_route_metrics: Dict[str, RouteQueryMetrics] = {}
+_route_metrics_lock = threading.Lock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_START_TIMES_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    start_times = conn.info.get(_START_TIMES_KEY)
+    if not start_times:
+        return
+    elapsed_ms = (time.perf_counter() - start_times.pop()) * 1000
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+    if _captures:
+        with _captures_lock:
+            captures = list(_captures)
+        for capture in captures:
+            capture.record(statement, elapsed_ms)
+
+    if elapsed_ms >= settings.slow_query_ms:
+        logger.warning("Slow query (%.1f ms): %s", elapsed_ms, _preview(statement))
+
+
+def _handle_error(exception_context) -> None:
+    # A failed statement never reaches after_cursor_execute; drop its start time.
+    connection = exception_context.connection
+    if connection is None:
+        return
+    start_times = connection.info.get(_START_TIMES_KEY)
+    if start_times:
+        start_times.pop()
+
+
+_LISTENERS = (
+    ("before_cursor_execute", _before_cursor_execute),
+    ("after_cursor_execute", _after_cursor_execute),
+    ("handle_error", _handle_error),
+)
+
+
+def install_query_instrumentation() -> None:
+    """Attach the timing listeners to every engine (idempotent)."""
+    for name, listener in _LISTENERS:
+        if not event.contains(Engine, name, listener):
+            event.listen(Engine, name, listener)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Charge queries issued in the current context to a fresh :class:`QueryStats`."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def capture_queries(*, keep_statements: bool = True) -> Iterator[QueryStats]:
+    """Record every query issued by any thread while the block runs.
+
+    Intended for tests, where the application may run on a different thread
+    (``TestClient``) than the code measuring it.
+    """
+    install_query_instrumentation()
+    stats = QueryStats(keep_statements=keep_statements)
+    with _captures_lock:
+        _captures.append(stats)
+    try:
+        yield stats
+    finally:
+        with _captures_lock:
+            _captures.remove(stats)
+
+
+@contextmanager
+def exclude_from_budget() -> Iterator[None]:
+    """Leave queries issued in the block out of the current request's budget."""
+    stats = _current_stats.get()
+    before = stats.count if stats is not None else 0
+    try:
+        yield
+    finally:
+        if stats is not None:
+            stats.excluded += stats.count - before
+
+
+def query_budget(max_queries: int) -> Callable[[_F], _F]:
+    """Declare the maximum number of queries a route is expected to issue."""
+    if max_queries < 0:
+        raise ValueError("max_queries must be non-negative")
+
+    def decorator(endpoint: _F) -> _F:
+        endpoint.__query_budget__ = max_queries  # type: ignore[attr-defined]
+        return endpoint
+
+    return decorator
+
+
+def check_query_budget(stats: QueryStats, max_queries: int, *, label: str = "block") -> None:
+    """Raise :class:`QueryBudgetExceeded` if ``stats`` went over ``max_queries``."""
+    if stats.budgeted_count > max_queries:
+        detail = f"{label} issued {stats.budgeted_count} queries (budget {max_queries})"
+        if stats.statements:
+            detail += ":\n" + "\n".join(f"  {statement}" for statement in stats.statements)
+        raise QueryBudgetExceeded(detail)
+
+
+def _route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None) or getattr(route, "path_format", None)
+    return f"{scope.get('method', 'GET')} {path or '<unmatched>'}"
+
+
+def _route_budget(scope: Scope) -> Optional[int]:
+    return getattr(scope.get("endpoint"), "__query_budget__", None)
+
+
+def _record_request(label: str, stats: QueryStats, budget: Optional[int]) -> None:
+    with _route_metrics_lock:
+        metrics = _route_metrics.setdefault(label, RouteQueryMetrics())
+        metrics.requests += 1
+        metrics.queries += stats.count
+        metrics.db_ms += stats.total_ms
+        metrics.max_queries = max(metrics.max_queries, stats.count)
+        if stats.slowest_statement is not None and stats.slowest_ms >= metrics.slowest_ms:
+            metrics.slowest_ms = stats.slowest_ms
+            metrics.slowest_statement = stats.slowest_statement
+        metrics.budget = budget
+        if budget is not None and stats.budgeted_count > budget:
+            metrics.budget_violations += 1
+
+
+def get_query_metrics() -> Dict[str, Dict[str, Any]]:
+    """Per-route query aggregates, busiest (by total DB time) first."""
+    with _route_metrics_lock:
+        snapshot = {label: metrics.as_dict() for label, metrics in _route_metrics.items()}
+    return dict(sorted(snapshot.items(), key=lambda item: item[1]["db_ms"], reverse=True))
+
+
+def reset_query_metrics() -> None:
+    with _route_metrics_lock:
+        _route_metrics.clear()
+
+
+class QueryMetricsMiddleware:
+    """ASGI middleware that scopes query stats to each HTTP request."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        install_query_instrumentation()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.query_metrics_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    self._enforce_budget(scope, stats)
+                    MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                _record_request(_route_label(scope), stats, _route_budget(scope))
+
+    @staticmethod
+    def _enforce_budget(scope: Scope, stats: QueryStats) -> None:
+        budget = _route_budget(scope)
+        if budget is None or stats.budgeted_count <= budget:
+            return
+        message = f"{_route_label(scope)} issued {stats.budgeted_count} queries (budget {budget})"
+        if settings.query_budget_strict:
+            raise QueryBudgetExceeded(message)
+        logger.warning("Query budget exceeded: %s", message)
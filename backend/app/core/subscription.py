@@ -1,7 +1,9 @@
 """Subscription tier management and Clerk integration.
 
 This module handles fetching subscription tier information from Clerk
-organization metadata and provides caching for performance.
+organization metadata and provides caching for performance: a per-process
+dict in front of a Redis entry shared by all workers, with one reused Clerk
+client.
 """
 import os
 import time
@@ -11,6 +13,7 @@ import logging
 
 from clerk_backend_api import Clerk
 
+from app.core.cache import get_or_compute, invalidate_tags_soon, org_tag
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -44,19 +47,89 @@ class ClerkAPIError(Exception):
     pass
 
 
-# In-memory cache for tier data
+# In-process tier cache in front of the shared Redis entry
 # Format: {org_id: {"tier": SubscriptionTier, "timestamp": float}}
 _tier_cache: Dict[str, Dict] = {}
 CACHE_TTL_SECONDS = 300  # 5 minutes
+# Workers trust their own copy only briefly, so invalidations issued by the
+# Clerk webhook on another worker (which clear Redis) are picked up quickly.
+LOCAL_CACHE_TTL_SECONDS = 30
+TIER_CACHE_KEY_PREFIX = "subscription:tier:"
 _BYPASS_ENV_FLAG = "CLERK_BYPASS_TIERS"
 
+# Shared Clerk SDK client (lazily initialized on first use)
+_clerk_client: Optional[Clerk] = None
+
+
+def get_clerk_client() -> Clerk:
+    """Return the process-wide Clerk client, creating it on first use.
+
+    The SDK keeps an HTTP connection pool per client, so reusing one avoids a
+    fresh TLS handshake on every tier lookup.
+    """
+    global _clerk_client
+    if _clerk_client is None:
+        _clerk_client = Clerk(bearer_auth=settings.clerk_secret_key)
+    return _clerk_client
+
+
+def reset_clerk_client() -> None:
+    """Drop the shared Clerk client (tests, secret rotation)."""
+    global _clerk_client
+    _clerk_client = None
+
+
+def _tier_tag(organization_id: str) -> str:
+    return org_tag(organization_id, "subscription")
+
+
+def _remember_tier(organization_id: str, tier: SubscriptionTier) -> SubscriptionTier:
+    _tier_cache[organization_id] = {
+        "tier": tier,
+        "timestamp": time.time(),
+    }
+    return tier
+
+
+async def _fetch_tier_from_clerk(organization_id: str) -> str:
+    try:
+        org = await get_clerk_client().organizations.get(organization_id)
+    except Exception as e:
+        logger.error(
+            f"Failed to fetch organization {organization_id} from Clerk: {e}",
+            exc_info=True,
+        )
+        raise ClerkAPIError(
+            f"Failed to fetch organization {organization_id} from Clerk: {str(e)}"
+        ) from e
+
+    # Extract tier from public_metadata
+    tier_value = None
+    if org.public_metadata:
+        tier_value = org.public_metadata.get("subscription_tier")
+
+    # Validate and convert to enum
+    if tier_value and tier_value in [t.value for t in SubscriptionTier]:
+        tier = SubscriptionTier(tier_value)
+        logger.info(f"Fetched tier {tier.value} for organization {organization_id}")
+    else:
+        tier = SubscriptionTier.STARTER
+        logger.warning(
+            f"Invalid or missing subscription_tier for organization {organization_id}, "
+            f"defaulting to STARTER. Metadata: {org.public_metadata}"
+        )
+    return tier.value
+
 
 async def get_organization_tier(organization_id: str) -> SubscriptionTier:
     """
     Fetch subscription tier from Clerk organization metadata.
 
-    Implements caching with 5-minute TTL to reduce Clerk API calls.
-    Defaults to STARTER tier if metadata is missing or invalid.
+    Lookups go through an in-process cache, then a Redis entry shared by all
+    workers (when Redis is configured), and only then Clerk. Redis entries
+    live for 5 minutes, local copies for 30 seconds, and concurrent misses for
+    the same organization share a single Clerk call. Defaults to STARTER tier if metadata is missing or
+    invalid.
 
     Args:
         organization_id: Clerk organization ID
@@ -80,7 +153,7 @@ async def get_organization_tier(organization_id: str) -> SubscriptionTier:
     cached_data = _tier_cache.get(organization_id)
     if cached_data:
         cache_age = time.time() - cached_data["timestamp"]
-        if cache_age < CACHE_TTL_SECONDS:
+        if cache_age < LOCAL_CACHE_TTL_SECONDS:
             logger.debug(f"Cache hit for organization {organization_id} (age: {cache_age:.1f}s)")
             return cached_data["tier"]
         else:
@@ -89,62 +162,32 @@ async def get_organization_tier(organization_id: str) -> SubscriptionTier:
     # Allow tests/dev environments to bypass Clerk via env flag
     bypass_flag = os.getenv(_BYPASS_ENV_FLAG, "").strip().lower()
     if bypass_flag in {"1", "true", "yes"}:
-        tier = SubscriptionTier.STARTER
-        _tier_cache[organization_id] = {
-            "tier": tier,
-            "timestamp": time.time(),
-        }
         logger.debug(
             "Bypassing Clerk lookup for organization %s in %s environment",
             organization_id,
             settings.environment,
         )
-        return tier
+        return _remember_tier(organization_id, SubscriptionTier.STARTER)
 
-    # Fetch from Clerk API
-    try:
-        clerk = Clerk(bearer_auth=settings.clerk_secret_key)
-        org = await clerk.organizations.get(organization_id)
-
-        # Extract tier from public_metadata
-        tier_value = None
-        if org.public_metadata:
-            tier_value = org.public_metadata.get("subscription_tier")
-
-        # Validate and convert to enum
-        if tier_value and tier_value in [t.value for t in SubscriptionTier]:
-            tier = SubscriptionTier(tier_value)
-            logger.info(f"Fetched tier {tier.value} for organization {organization_id}")
-        else:
-            tier = SubscriptionTier.STARTER
-            logger.warning(
-                f"Invalid or missing subscription_tier for organization {organization_id}, "
-                f"defaulting to STARTER. Metadata: {org.public_metadata}"
-            )
-
-        # Cache the result
-        _tier_cache[organization_id] = {
-            "tier": tier,
-            "timestamp": time.time(),
-        }
-
-        return tier
-
-    except Exception as e:
-        logger.error(
-            f"Failed to fetch organization {organization_id} from Clerk: {e}",
-            exc_info=True,
-        )
-        raise ClerkAPIError(
-            f"Failed to fetch organization {organization_id} from Clerk: {str(e)}"
-        ) from e
+    # Shared Redis entry, falling back to a single-flight Clerk fetch. The
+    # in-process dict above is the local tier, so get_or_compute keeps none.
+    tier_value, _ = await get_or_compute(
+        f"{TIER_CACHE_KEY_PREFIX}{organization_id}",
+        lambda: _fetch_tier_from_clerk(organization_id),
+        ttl=CACHE_TTL_SECONDS,
+        tags=[_tier_tag(organization_id)],
+        local_ttl=0,
+    )
+    return _remember_tier(organization_id, SubscriptionTier(tier_value))
 
 
 def clear_tier_cache(organization_id: Optional[str] = None) -> None:
     """
     Clear the tier cache for one or all organizations.
 
-    Useful for testing or when tier data needs immediate refresh.
+    Clearing a single organization also drops its shared Redis entry, so
+    every worker sees the change. Clearing everything only resets this
+    process; Redis entries then age out with their TTL.
 
     Args:
         organization_id: Optional specific organization ID to clear.
@@ -158,6 +201,7 @@ def clear_tier_cache(organization_id: Optional[str] = None) -> None:
         if organization_id in _tier_cache:
             del _tier_cache[organization_id]
             logger.debug(f"Cleared tier cache for organization {organization_id}")
+        invalidate_tags_soon(_tier_tag(organization_id))
     else:
         _tier_cache.clear()
         logger.debug("Cleared all tier cache")
@@ -2,6 +2,24 @@
 from __future__ import annotations
 
 # Re-export from core.database for backward compatibility
-from app.core.database import SessionLocal, engine, get_db, init_engine
+from app.core.database import (
+    AsyncSessionLocal,
+    SessionLocal,
+    engine,
+    get_async_db,
+    get_db,
+    init_async_engine,
+    init_engine,
+    run_db,
+)
 
-__all__ = ["engine", "SessionLocal", "get_db", "init_engine"]
+__all__ = [
+    "engine",
+    "SessionLocal",
+    "AsyncSessionLocal",
+    "get_db",
+    "get_async_db",
+    "init_engine",
+    "init_async_engine",
+    "run_db",
+]
@@ -11,12 +11,15 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import AsyncGenerator
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import api_router
+from app.api.dependencies.auth import get_current_master_admin_user
+from app.core.cache import close_redis_client
 from app.core.config import settings
-from app.core.database import close_db, init_db
+from app.core.database import close_async_db, close_db, init_db, pool_status
+from app.core.query_metrics import QueryMetricsMiddleware, get_query_metrics
 
 
 @asynccontextmanager
@@ -27,7 +30,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         init_db()  # Create tables in development
     yield
     # Shutdown
+    await close_redis_client()
     close_db()
+    await close_async_db()
 
 
 def create_application() -> FastAPI:
@@ -38,6 +43,9 @@ def create_application() -> FastAPI:
         lifespan=lifespan,
     )
 
+    # Per-request query counts/DB time (Server-Timing); CORS stays outermost
+    application.add_middleware(QueryMetricsMiddleware)
+
     # CORS middleware
     application.add_middleware(
         CORSMiddleware,
@@ -80,3 +88,13 @@ async def health_check() -> dict[str, str | bool]:
         "redis_configured": bool(settings.redis_url),
         "storage_path_ready": storage_path_ready,
     }
+
+
+@app.get("/health/db", dependencies=[Depends(get_current_master_admin_user)])
+async def database_health() -> dict[str, object]:
+    """Connection pool occupancy and per-route query metrics for this worker (master admins only)."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "pools": pool_status(),
+        "routes": get_query_metrics(),
+    }
@@ -10,7 +10,7 @@ from .financial_ratio import FinancialRatio
 from .financial_narrative import FinancialNarrative
 
 # Now import Deal (has FK relationships to financial models)
-from .deal import Deal, DealStage, PipelineStage
+from .deal import Deal, DealEmbedding, DealStage, PipelineStage
 from .pipeline_template import PipelineTemplate, PipelineTemplateStage
 from .document import Document, Folder, DocumentPermission, DocumentAccessLog
 from .subscription import Subscription, Invoice, SubscriptionTier, SubscriptionStatus
@@ -22,6 +22,8 @@ from .valuation import (
     ValuationExportLog,
 )
 from .task import DealTask, TaskTemplate, TaskAutomationRule, TaskAutomationLog
+from .dashboard_rollup import OrganizationDashboardRollup
+from .storage_blob import StorageBlob
 from .pmi import (
     PMIProject,
     PMIWorkstream,
@@ -30,6 +32,7 @@ from .pmi import (
     PMIMetric,
     PMIRisk,
     PMIDayOneChecklist,
+    PMINotificationLog,
     PMIProjectStatus,
     PMIWorkstreamStatus,
     PMIWorkstreamType,
@@ -123,12 +126,14 @@ __all__ = [
     "FinancialRatio",
     "FinancialNarrative",
     "Deal",
+    "DealEmbedding",
     "DealStage",
     "PipelineStage",
     "PipelineTemplate",
     "PipelineTemplateStage",
     "Document",
     "Folder",
+    "FolderClosure",
     "DocumentPermission",
     "DocumentAccessLog",
     "Subscription",
@@ -144,6 +149,8 @@ __all__ = [
     "TaskTemplate",
     "TaskAutomationRule",
     "TaskAutomationLog",
+    "OrganizationDashboardRollup",
+    "StorageBlob",
     # PMI Module
     "PMIProject",
     "PMIWorkstream",
@@ -152,6 +159,7 @@ __all__ = [
     "PMIMetric",
     "PMIRisk",
     "PMIDayOneChecklist",
+    "PMINotificationLog",
     "PMIProjectStatus",
     "PMIWorkstreamStatus",
     "PMIWorkstreamType",
@@ -0,0 +1,301 @@
+"""Per-organization dashboard counters maintained alongside the source rows.
+
+One ``organization_dashboard_rollups`` row per organization holds the figures
+the dashboard shows: deal counts (total and per stage), deal value totals,
+active document count and open task count. Session flush hooks turn every ORM
+insert, update and delete of a :class:`Deal`, :class:`Document` or
+:class:`DealTask` into counter deltas and apply them with ``col = col + n``
+statements inside the same transaction, so the rollup commits or rolls back
+with the change that caused it.
+
+Writes that bypass the ORM (bulk ``query.delete()``, database-level cascades)
+are not seen by the hooks; ``dashboard_rollup_service.reconcile_dashboard_rollups``
+recomputes the counters from the source tables periodically to repair drift.
+"""
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Optional, Set
+
+from sqlalchemy import Column, DateTime, Integer, Numeric, String, event, func, inspect, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.models.deal import Deal, DealStage
+from app.models.document import Document
+from app.models.task import DealTask
+
+_SESSION_INFO_KEY = "dashboard_rollup_changes"
+_NO_VALUE = object()
+
+STAGE_COLUMNS: Dict[DealStage, str] = {stage: f"{stage.value}_deals" for stage in DealStage}
+OPEN_DEAL_STAGES = (
+    DealStage.sourcing,
+    DealStage.evaluation,
+    DealStage.due_diligence,
+    DealStage.negotiation,
+    DealStage.closing,
+)
+COUNTER_COLUMNS = (
+    "deal_count",
+    *STAGE_COLUMNS.values(),
+    "deal_value_total",
+    "deal_value_count",
+    "document_count",
+    "open_task_count",
+)
+
+
+class OrganizationDashboardRollup(Base):
+    """Dashboard counters for one organization."""
+
+    __tablename__ = "organization_dashboard_rollups"
+
+    organization_id = Column(String(36), primary_key=True)
+    deal_count = Column(Integer, nullable=False, default=0)
+    sourcing_deals = Column(Integer, nullable=False, default=0)
+    evaluation_deals = Column(Integer, nullable=False, default=0)
+    due_diligence_deals = Column(Integer, nullable=False, default=0)
+    negotiation_deals = Column(Integer, nullable=False, default=0)
+    closing_deals = Column(Integer, nullable=False, default=0)
+    won_deals = Column(Integer, nullable=False, default=0)
+    lost_deals = Column(Integer, nullable=False, default=0)
+    deal_value_total = Column(Numeric(precision=18, scale=2), nullable=False, default=0)
+    deal_value_count = Column(Integer, nullable=False, default=0)  # Deals with a deal_size
+    document_count = Column(Integer, nullable=False, default=0)  # Unarchived documents
+    open_task_count = Column(Integer, nullable=False, default=0)  # Tasks not yet done
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    reconciled_at = Column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def active_deals(self) -> int:
+        return sum(getattr(self, STAGE_COLUMNS[stage]) for stage in OPEN_DEAL_STAGES)
+
+    @property
+    def average_deal_value(self) -> Decimal:
+        if not self.deal_value_count:
+            return Decimal("0")
+        return Decimal(self.deal_value_total) / self.deal_value_count
+
+    def counters(self) -> Dict[str, Any]:
+        return {column: getattr(self, column) for column in COUNTER_COLUMNS}
+
+    def __repr__(self) -> str:
+        return (
+            f"<OrganizationDashboardRollup(organization_id={self.organization_id}, "
+            f"deals={self.deal_count}, documents={self.document_count}, tasks={self.open_task_count})>"
+        )
+
+
+def empty_counters() -> Dict[str, Any]:
+    counters: Dict[str, Any] = {column: 0 for column in COUNTER_COLUMNS}
+    counters["deal_value_total"] = Decimal("0")
+    return counters
+
+
+def compute_rollups(
+    connection: Connection,
+    organization_ids: Optional[Iterable[str]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Recompute counters from the source tables (three grouped queries).
+
+    Organizations without any deals, documents or tasks are omitted.
+    """
+    org_filter = list(organization_ids) if organization_ids is not None else None
+
+    def scoped(query, column):
+        return query.where(column.in_(org_filter)) if org_filter is not None else query
+
+    rollups: Dict[str, Dict[str, Any]] = defaultdict(empty_counters)
+
+    deal_rows = connection.execute(
+        scoped(
+            select(
+                Deal.organization_id,
+                Deal.stage,
+                func.count(),
+                func.coalesce(func.sum(Deal.deal_size), 0),
+                func.count(Deal.deal_size),
+            ),
+            Deal.organization_id,
+        ).group_by(Deal.organization_id, Deal.stage)
+    )
+    for organization_id, stage, count, value_total, value_count in deal_rows:
+        counters = rollups[organization_id]
+        counters["deal_count"] += count
+        counters[STAGE_COLUMNS[DealStage(stage)]] += count
+        counters["deal_value_total"] += Decimal(value_total or 0)
+        counters["deal_value_count"] += value_count
+
+    document_rows = connection.execute(
+        scoped(
+            select(Document.organization_id, func.count()).where(Document.archived_at.is_(None)),
+            Document.organization_id,
+        ).group_by(Document.organization_id)
+    )
+    for organization_id, count in document_rows:
+        rollups[organization_id]["document_count"] = count
+
+    task_rows = connection.execute(
+        scoped(
+            select(DealTask.organization_id, func.count()).where(DealTask.status != "done"),
+            DealTask.organization_id,
+        ).group_by(DealTask.organization_id)
+    )
+    for organization_id, count in task_rows:
+        rollups[organization_id]["open_task_count"] = count
+
+    return dict(rollups)
+
+
+def _insert_if_absent(connection: Connection, values: Dict[str, Any]) -> bool:
+    """Insert a rollup row unless one exists; return whether this call created it."""
+    table = OrganizationDashboardRollup.__table__
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    result = connection.execute(
+        insert(table).values(**values).on_conflict_do_nothing(index_elements=["organization_id"])
+    )
+    return result.rowcount == 1
+
+
+def write_snapshot(connection: Connection, organization_id: str, counters: Dict[str, Any]) -> None:
+    """Replace an organization's counters with freshly computed ones."""
+    table = OrganizationDashboardRollup.__table__
+    now = datetime.now(timezone.utc)
+    values = {**counters, "updated_at": now, "reconciled_at": now}
+    result = connection.execute(
+        table.update().where(table.c.organization_id == organization_id).values(**values)
+    )
+    if result.rowcount == 0:
+        _insert_if_absent(connection, {"organization_id": organization_id, **values})
+
+
+def _apply_delta(connection: Connection, organization_id: str, delta: Counter) -> None:
+    table = OrganizationDashboardRollup.__table__
+    changes = {table.c[column]: table.c[column] + amount for column, amount in delta.items() if amount}
+    if not changes:
+        return
+    changes[table.c.updated_at] = datetime.now(timezone.utc)
+    update = table.update().where(table.c.organization_id == organization_id).values(changes)
+    if connection.execute(update).rowcount:
+        return
+
+    # First change for this organization: seed the row from the source tables,
+    # which already include this flush. If another transaction seeded it
+    # first, its snapshot predates our change, so apply the delta on top.
+    snapshot = compute_rollups(connection, [organization_id]).get(organization_id, empty_counters())
+    now = datetime.now(timezone.utc)
+    seeded = _insert_if_absent(
+        connection,
+        {"organization_id": organization_id, **snapshot, "updated_at": now, "reconciled_at": now},
+    )
+    if not seeded:
+        connection.execute(update)
+
+
+# ---------------------------------------------------------------------------
+# Change tracking
+# ---------------------------------------------------------------------------
+
+
+def _deal_contribution(organization_id, stage, deal_size) -> Counter:
+    stage = DealStage(stage) if stage is not None else DealStage.sourcing
+    contribution = Counter({"deal_count": 1, STAGE_COLUMNS[stage]: 1})
+    if deal_size is not None:
+        contribution["deal_value_total"] = Decimal(deal_size)
+        contribution["deal_value_count"] = 1
+    return contribution
+
+
+def _document_contribution(organization_id, archived_at) -> Counter:
+    return Counter({"document_count": 1 if archived_at is None else 0})
+
+
+def _task_contribution(organization_id, status) -> Counter:
+    return Counter({"open_task_count": 1 if status != "done" else 0})
+
+
+_TRACKED = {
+    Deal: (("organization_id", "stage", "deal_size"), _deal_contribution),
+    Document: (("organization_id", "archived_at"), _document_contribution),
+    DealTask: (("organization_id", "status"), _task_contribution),
+}
+
+
+def _previous_value(target, attribute: str):
+    history = inspect(target).attrs[attribute].history
+    if not history.has_changes():
+        return getattr(target, attribute)
+    if history.deleted:
+        return history.deleted[0]
+    # Overwritten without the old value ever being loaded.
+    return _NO_VALUE
+
+
+class _RollupChanges:
+    def __init__(self) -> None:
+        self.deltas: Dict[str, Counter] = defaultdict(Counter)
+        self.recompute: Set[str] = set()
+
+    def add(self, organization_id: Optional[str], contribution: Counter, sign: int) -> None:
+        if organization_id is None:
+            return
+        delta = self.deltas[str(organization_id)]
+        for column, amount in contribution.items():
+            delta[column] += sign * amount
+
+    def track(self, target, *, inserted: bool = False, deleted: bool = False) -> None:
+        attributes, contribution = _TRACKED[type(target)]
+        current = [getattr(target, attribute) for attribute in attributes]
+        if inserted:
+            self.add(current[0], contribution(*current), +1)
+            return
+        previous = [_previous_value(target, attribute) for attribute in attributes]
+        if deleted:
+            self.add(previous[0], contribution(*previous), -1)
+            return
+        if previous == current:
+            return
+        if _NO_VALUE in previous:
+            for organization_id in (previous[0], current[0]):
+                if organization_id is not None and organization_id is not _NO_VALUE:
+                    self.recompute.add(str(organization_id))
+            return
+        self.add(previous[0], contribution(*previous), -1)
+        self.add(current[0], contribution(*current), +1)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_rollup_changes(session: Session, flush_context, instances) -> None:
+    changes = _RollupChanges()
+    for target in session.new:
+        if type(target) in _TRACKED:
+            changes.track(target, inserted=True)
+    for target in session.dirty:
+        if type(target) in _TRACKED and session.is_modified(target, include_collections=False):
+            changes.track(target)
+    for target in session.deleted:
+        if type(target) in _TRACKED:
+            changes.track(target, deleted=True)
+    session.info[_SESSION_INFO_KEY] = changes
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_rollup_changes(session: Session, flush_context) -> None:
+    changes: Optional[_RollupChanges] = session.info.pop(_SESSION_INFO_KEY, None)
+    if changes is None or not (changes.deltas or changes.recompute):
+        return
+    connection = session.connection()
+    if changes.recompute:
+        snapshots = compute_rollups(connection, changes.recompute)
+        for organization_id in changes.recompute:
+            write_snapshot(connection, organization_id, snapshots.get(organization_id, empty_counters()))
+    for organization_id, delta in changes.deltas.items():
+        if organization_id not in changes.recompute:
+            _apply_delta(connection, organization_id, delta)
@@ -6,7 +6,19 @@ import uuid
 from datetime import datetime, timezone
 from decimal import Decimal
 
-from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Index, Numeric, String, Text
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    Numeric,
+    String,
+    Text,
+)
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -109,6 +121,12 @@ class Deal(Base):
         back_populates="deal",
         cascade="all, delete-orphan",
     )
+    embedding = relationship(
+        "DealEmbedding",
+        back_populates="deal",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
 
     # Indexes for performance
     __table_args__ = (
@@ -151,3 +169,34 @@ class PipelineStage(Base):
         return f"PipelineStage(id={self.id!s}, name={self.name!r}, order={self.order!s})"
 
 
+class DealEmbedding(Base):
+    """Cached description embedding for a deal, used by deal matching.
+
+    ``content_hash`` identifies the text that was embedded, so the vector is
+    only recomputed when the description changes (or the model does).
+    """
+
+    __tablename__ = "deal_embeddings"
+
+    deal_id = Column(String(36), ForeignKey("deals.id", ondelete="CASCADE"), primary_key=True)
+    organization_id = Column(String(36), ForeignKey("organizations.id"), nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    model = Column(String(100), nullable=False)
+    dimensions = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # float32, little-endian
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+        nullable=False,
+    )
+
+    deal = relationship("Deal", back_populates="embedding")
+
+    __table_args__ = (
+        Index("idx_deal_embeddings_organization_id", "organization_id"),
+        Index("idx_deal_embeddings_content_hash", "content_hash", "model"),
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover - repr aid
+        return f"DealEmbedding(deal_id={self.deal_id!s}, model={self.model!r}, dimensions={self.dimensions})"
@@ -12,6 +12,11 @@ from sqlalchemy import (
     CheckConstraint,
     Text,
     JSON,
+    event,
+    inspect,
+    literal,
+    select,
+    true,
 )
 from sqlalchemy.orm import relationship, foreign
 from sqlalchemy.sql import func
@@ -66,6 +71,119 @@ class Folder(Base):
         return f"<Folder(id={self.id}, name='{self.name}', deal_id={self.deal_id})>"
 
 
+class FolderClosure(Base):
+    """Transitive closure of the folder hierarchy (ancestor, descendant, depth).
+
+    Every folder has a depth-0 row pointing at itself plus one row per
+    ancestor, so ancestor chains, subtrees and subtree counts resolve with a
+    single indexed lookup instead of walking ``parent_folder_id`` row by row.
+    Rows are maintained by the mapper events below.
+    """
+
+    __tablename__ = "folder_closure"
+
+    ancestor_id = Column(
+        String(36), ForeignKey("folders.id", ondelete="CASCADE"), primary_key=True
+    )
+    descendant_id = Column(
+        String(36), ForeignKey("folders.id", ondelete="CASCADE"), primary_key=True
+    )
+    depth = Column(Integer, nullable=False)
+    deal_id = Column(String(36), ForeignKey("deals.id"), nullable=False)
+
+    __table_args__ = (
+        Index("idx_folder_closure_descendant", "descendant_id", "depth"),
+        Index("idx_folder_closure_deal_id", "deal_id"),
+    )
+
+    def __repr__(self):
+        return (
+            f"<FolderClosure(ancestor_id={self.ancestor_id}, "
+            f"descendant_id={self.descendant_id}, depth={self.depth})>"
+        )
+
+
+def _attach_subtree(connection, *, folder_id: str, parent_id: str) -> None:
+    """Link every node under ``folder_id`` to every ancestor of ``parent_id``."""
+
+    closure = FolderClosure.__table__
+    above = closure.alias("above")
+    below = closure.alias("below")
+    connection.execute(
+        closure.insert().from_select(
+            ["ancestor_id", "descendant_id", "depth", "deal_id"],
+            select(
+                above.c.ancestor_id,
+                below.c.descendant_id,
+                above.c.depth + below.c.depth + 1,
+                below.c.deal_id,
+            )
+            .select_from(above.join(below, true()))
+            .where(
+                above.c.descendant_id == parent_id,
+                below.c.ancestor_id == folder_id,
+            ),
+        )
+    )
+
+
+@event.listens_for(Folder, "after_insert")
+def _folder_closure_after_insert(mapper, connection, target) -> None:
+    closure = FolderClosure.__table__
+    folder_id = str(target.id)
+    connection.execute(
+        closure.insert().values(
+            ancestor_id=folder_id,
+            descendant_id=folder_id,
+            depth=0,
+            deal_id=str(target.deal_id),
+        )
+    )
+    if target.parent_folder_id:
+        connection.execute(
+            closure.insert().from_select(
+                ["ancestor_id", "descendant_id", "depth", "deal_id"],
+                select(
+                    closure.c.ancestor_id,
+                    literal(folder_id),
+                    closure.c.depth + 1,
+                    literal(str(target.deal_id)),
+                ).where(closure.c.descendant_id == str(target.parent_folder_id)),
+            )
+        )
+
+
+@event.listens_for(Folder, "after_update")
+def _folder_closure_after_update(mapper, connection, target) -> None:
+    if not inspect(target).attrs.parent_folder_id.history.has_changes():
+        return
+
+    closure = FolderClosure.__table__
+    folder_id = str(target.id)
+    subtree = select(closure.c.descendant_id).where(closure.c.ancestor_id == folder_id)
+
+    # Detach the subtree from its previous ancestors, keeping internal paths.
+    connection.execute(
+        closure.delete().where(
+            closure.c.descendant_id.in_(subtree.scalar_subquery()),
+            closure.c.ancestor_id.not_in(subtree.scalar_subquery()),
+        )
+    )
+    if target.parent_folder_id:
+        _attach_subtree(connection, folder_id=folder_id, parent_id=str(target.parent_folder_id))
+
+
+@event.listens_for(Folder, "before_delete")
+def _folder_closure_before_delete(mapper, connection, target) -> None:
+    closure = FolderClosure.__table__
+    folder_id = str(target.id)
+    connection.execute(
+        closure.delete().where(
+            (closure.c.ancestor_id == folder_id) | (closure.c.descendant_id == folder_id)
+        )
+    )
+
+
 class Document(Base):
     """Document model for secure file storage and management."""
 
@@ -73,8 +191,9 @@ class Document(Base):
 
     id = Column(GUID, primary_key=True, default=uuid.uuid4)
     name = Column(String(255), nullable=False)  # Original filename
-    file_key = Column(String(500), nullable=False, unique=True)  # Storage key
+    file_key = Column(String(500), nullable=False, index=True)  # Storage key; shared by duplicate uploads (see StorageBlob)
     file_size = Column(BigInteger, nullable=False)  # Bytes
+    checksum_sha256 = Column(String(64), nullable=True)  # Hex digest computed while streaming the upload
     file_type = Column(String(100), nullable=False)  # MIME type
     deal_id = Column(String(36), ForeignKey("deals.id"), nullable=False)
     folder_id = Column(String(36), ForeignKey("folders.id"), nullable=True)
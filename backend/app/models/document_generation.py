@@ -3,7 +3,7 @@ Document Generation Models
 Feature: F-009 Automated Document Generation
 """
 from datetime import datetime, UTC
-from sqlalchemy import Column, String, Text, JSON, ForeignKey, Integer, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, JSON, ForeignKey, Integer, DateTime, LargeBinary, UniqueConstraint, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 import uuid
 import enum
@@ -128,13 +128,20 @@ class DocumentAISuggestion(Base):
 
 
 class DocumentVersion(Base):
-    """Version history for a generated document"""
+    """
+    Version history for a generated document
+
+    Keyframe versions hold the full ``content``; the others hold only a
+    compressed ``delta`` against the previous version (see
+    app.services.document_version_store).
+    """
     __tablename__ = "document_versions"
 
     id = Column(GUID, primary_key=True, default=uuid.uuid4)
     document_id = Column(GUID, ForeignKey("generated_documents.id", ondelete="CASCADE"), nullable=False)
     version_number = Column(Integer, nullable=False)
-    content = Column(Text, nullable=False)
+    content = Column(Text, nullable=True)  # Full snapshot (keyframes only)
+    delta = Column(LargeBinary, nullable=True)  # Compressed diff against the previous version
     label = Column(String)  # Optional version label (e.g., "v1.0", "Final")
     summary = Column(Text)  # Optional version summary
 
@@ -148,6 +155,11 @@ class DocumentVersion(Base):
     # Relationships
     document = relationship("GeneratedDocument", back_populates="versions")
 
+    __table_args__ = (
+        # Deltas are rebuilt in version_number order, so numbers must not repeat
+        UniqueConstraint("document_id", "version_number", name="uq_document_versions_document_version"),
+    )
+
     def __repr__(self):
         return f"<DocumentVersion(id={self.id}, document_id={self.document_id}, version_number={self.version_number})>"
 
@@ -460,3 +460,39 @@ class PMIDayOneChecklist(Base):
     def __repr__(self) -> str:
         return f"PMIDayOneChecklist(id={self.id!s}, item={self.item!r}, status={self.status.value!r})"
 
+
+
+class PMINotificationLog(Base):
+    """
+    Ledger of PMI notifications already sent.
+
+    The scheduled scanners skip any (notification_type, subject_id, dedupe_key)
+    recorded here, so a reminder goes out once per milestone window, risk
+    severity, missed synergy target or Day 1 warning instead of on every run.
+    """
+
+    __tablename__ = "pmi_notification_log"
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    organization_id = Column(String(36), ForeignKey("organizations.id"), nullable=False, index=True)
+    notification_type = Column(String(32), nullable=False)
+    subject_id = Column(String(36), nullable=False)
+    dedupe_key = Column(String(64), nullable=False)
+    recipient_user_id = Column(String(36), ForeignKey("users.id"), nullable=True)
+    sent_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    __table_args__ = (
+        Index(
+            "uq_pmi_notification_log_subject",
+            "notification_type",
+            "subject_id",
+            "dedupe_key",
+            unique=True,
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"PMINotificationLog(type={self.notification_type!r}, subject_id={self.subject_id!s}, "
+            f"key={self.dedupe_key!r})"
+        )
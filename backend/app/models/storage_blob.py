@@ -0,0 +1,32 @@
+"""Content-addressed storage blobs shared by data room documents.
+
+Each row is one physical file, identified by the SHA-256 of its bytes within an
+organization, with a count of the ``documents`` rows that point at it. Uploads
+of content the organization already stores only add a reference; the file is
+deleted when the last reference is released.
+"""
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, func
+
+from app.db.base import Base
+
+
+class StorageBlob(Base):
+    """One stored file and the number of documents referencing it."""
+
+    __tablename__ = "storage_blobs"
+
+    organization_id = Column(String(36), primary_key=True)
+    sha256 = Column(String(64), primary_key=True)
+    file_key = Column(String(500), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_storage_blobs_org_file_key", "organization_id", "file_key", unique=True),
+    )
+
+    def __repr__(self) -> str:
+        return f"<StorageBlob(organization_id={self.organization_id}, sha256={self.sha256}, refs={self.ref_count})>"
@@ -201,6 +201,11 @@ class BulkDownloadRequest(BaseModel):
     """Schema for bulk download request."""
 
     document_ids: List[UUID] = Field(..., min_length=1, max_length=100)
+    compression: str = Field(
+        "auto",
+        pattern="^(auto|deflate|store)$",
+        description="auto stores already-compressed files (PDFs, images) and deflates the rest",
+    )
 
 
 class BulkDeleteRequest(BaseModel):
@@ -222,6 +222,7 @@ class DocumentVersionResponse(DocumentVersionBase):
 class DocumentVersionSummary(BaseModel):
     """Schema for document version summary (list view)"""
     id: Union[str, UUID]
+    version_number: Optional[int] = None
     label: str
     created_at: datetime
     created_by: Optional[str] = None
@@ -235,6 +236,17 @@ class DocumentVersionSummary(BaseModel):
         return str(value) if value else None
 
 
+class DocumentVersionDiffResponse(BaseModel):
+    """Schema for a unified diff between two document versions"""
+    from_version: int
+    to_version: int
+    additions: int
+    deletions: int
+    diff: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 # ============================================================================
 # Export Job Schemas
 # ============================================================================
@@ -6,7 +6,7 @@ This module defines request/response schemas for valuation endpoints.
 from datetime import datetime
 from typing import List, Optional, Literal
 
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
 
 
 # Valuation Schemas
@@ -112,19 +112,99 @@ class ValuationExportLogEntry(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class SensitivityAxis(BaseModel):
+    """Values for one sensitivity driver: explicit ``values`` or an evenly spaced range."""
+
+    values: Optional[List[float]] = Field(default=None, min_length=1, max_length=200)
+    start: Optional[float] = None
+    stop: Optional[float] = None
+    steps: int = Field(default=11, ge=2, le=200)
+
+    @model_validator(mode="after")
+    def require_values_or_range(self) -> "SensitivityAxis":
+        if self.values is None and (self.start is None or self.stop is None):
+            raise ValueError("axis requires either values or start and stop")
+        return self
+
+    def resolve(self) -> List[float]:
+        if self.values is not None:
+            return self.values
+        span = self.stop - self.start
+        return [self.start + span * i / (self.steps - 1) for i in range(self.steps)]
+
+
+class SensitivityRequest(BaseModel):
+    """Request payload for a sensitivity grid over one or more DCF drivers."""
+
+    axes: dict[
+        Literal["discount_rate", "terminal_growth_rate", "terminal_ebitda_multiple", "revenue_growth"],
+        SensitivityAxis,
+    ] = Field(..., min_length=1)
+
+
+class SensitivityTornadoRow(BaseModel):
+    """Enterprise value swing across one driver's range, others held at base."""
+
+    metric: str
+    base_value: float
+    low_value: float
+    high_value: float
+    low_enterprise_value: Optional[float]
+    high_enterprise_value: Optional[float]
+    delta: float
+
+
+class SensitivityResponse(BaseModel):
+    """Sensitivity grid; ``enterprise_values`` nests one list level per axis, in request order."""
+
+    valuation_id: str
+    version: str
+    cached: bool
+    axes: dict[str, List[float]]
+    base_enterprise_value: float
+    enterprise_values: list
+    tornado: List[SensitivityTornadoRow]
+
+
+class MonteCarloCorrelation(BaseModel):
+    """Pairwise correlations between the growth, margin and WACC shocks."""
+
+    growth_margin: float = Field(default=0.0, ge=-1.0, le=1.0)
+    growth_wacc: float = Field(default=0.0, ge=-1.0, le=1.0)
+    margin_wacc: float = Field(default=0.0, ge=-1.0, le=1.0)
+
+
 class MonteCarloRequest(BaseModel):
     """Request payload for Monte Carlo valuation simulation."""
 
-    iterations: int = Field(default=100, ge=1, le=10000)
+    iterations: int = Field(default=100, ge=1, le=1_000_000)
     seed: Optional[int] = Field(default=None)
+    growth_volatility: float = Field(default=0.05, ge=0.0, le=1.0, description="Std dev of annual growth shocks")
+    margin_volatility: float = Field(default=0.0, ge=0.0, le=1.0, description="Std dev of annual margin shocks")
+    wacc_volatility: float = Field(default=0.0, ge=0.0, le=0.5, description="Std dev of the per-path WACC shock")
+    distribution: Literal["normal", "lognormal", "student_t"] = "normal"
+    degrees_of_freedom: float = Field(default=5.0, gt=2.0, le=100.0, description="Student-t degrees of freedom")
+    correlation: Optional[MonteCarloCorrelation] = None
+    histogram_bins: int = Field(default=50, ge=1, le=500)
 
 
 class MonteCarloPercentiles(BaseModel):
     """Breakdown of percentile outcomes from Monte Carlo simulation."""
 
+    p5: float
     p10: float
+    p25: float
     p50: float
+    p75: float
     p90: float
+    p95: float
+
+
+class MonteCarloHistogram(BaseModel):
+    """Histogram of simulated enterprise values; ``bin_edges`` has one more entry than ``counts``."""
+
+    bin_edges: List[float]
+    counts: List[int]
 
 
 class MonteCarloResponse(BaseModel):
@@ -133,7 +213,11 @@ class MonteCarloResponse(BaseModel):
     iterations: int
     seed: Optional[int]
     mean_enterprise_value: float
+    std_enterprise_value: float
+    min_enterprise_value: float
+    max_enterprise_value: float
     percentiles: MonteCarloPercentiles
+    histogram: MonteCarloHistogram
 
 
 # Scenario Schemas
@@ -47,6 +47,7 @@ from .email_service import (
     render_template,
     queue_email,
     retry_failed_email,
+    send_template_batch,
 )
 
 __all__ = [
@@ -80,6 +81,7 @@ __all__ = [
     "render_template",
     "queue_email",
     "retry_failed_email",
+    "send_template_batch",
     "notification_service",
     "event_reminder_service",
     "pmi_service",
@@ -6,23 +6,286 @@ OpenAI Whisper API compliance. Uses ffmpeg for audio manipulation.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
-import subprocess
+import re
 import tempfile
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence, Union
 
 logger = logging.getLogger(__name__)
 
+Word = Dict[str, Any]
+Segment = Dict[str, Any]
+
+
+class Transcript(str):
+    """
+    Transcript text that also carries word and segment timestamps.
+
+    Behaves exactly like ``str`` for existing callers; ``words`` holds
+    ``{"word", "start", "end"}`` dicts and ``segments`` holds
+    ``{"start", "end", "text"}`` dicts, in seconds from the start of the file
+    (empty when the API returned no timings). Each word is spelled as in the
+    text, with its trailing punctuation, since Whisper's word timings omit it.
+    """
+
+    words: List[Word]
+    segments: List[Segment]
+
+    def __new__(
+        cls,
+        text: str,
+        words: Optional[List[Word]] = None,
+        segments: Optional[List[Segment]] = None,
+    ) -> "Transcript":
+        transcript = super().__new__(cls, text)
+        transcript.words = list(words or [])
+        transcript.segments = list(segments or [])
+        return transcript
+
+    def cues(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        """Group ``words`` into subtitle cues (see :func:`group_words_into_cues`)."""
+        kwargs.setdefault("boundaries", [segment["end"] for segment in self.segments])
+        return group_words_into_cues(self.words, **kwargs)
+
+
+@dataclass(frozen=True)
+class AudioChunk:
+    """A chunk file and the span of the source audio it covers, in seconds."""
+
+    path: Path
+    start: float
+    end: float
+
+
+def _field(item: Any, key: str) -> Any:
+    # The OpenAI SDK returns typed objects; tests and raw HTTP give dicts.
+    return item.get(key) if isinstance(item, dict) else getattr(item, key, None)
+
+
+def _response_text(response: Any) -> str:
+    if isinstance(response, str):
+        return response
+    return _field(response, "text") or ""
+
+
+def _response_words(response: Any, offset: float) -> List[Word]:
+    """Word timings from a verbose_json response, shifted by the chunk's start."""
+    words = None if isinstance(response, str) else _field(response, "words")
+    if not isinstance(words, list):
+        return []
+    shifted: List[Word] = []
+    for word in words:
+        text, start, end = _field(word, "word"), _field(word, "start"), _field(word, "end")
+        if not isinstance(text, str) or not isinstance(start, (int, float)):
+            continue
+        if not isinstance(end, (int, float)):
+            end = start
+        shifted.append({"word": text.strip(), "start": round(start + offset, 3), "end": round(end + offset, 3)})
+    return shifted
+
+
+def _response_segments(response: Any, offset: float) -> List[Segment]:
+    """Segment timings from a verbose_json response, shifted by the chunk's start."""
+    segments = None if isinstance(response, str) else _field(response, "segments")
+    if not isinstance(segments, list):
+        return []
+    shifted: List[Segment] = []
+    for segment in segments:
+        start, end, text = _field(segment, "start"), _field(segment, "end"), _field(segment, "text")
+        if not isinstance(start, (int, float)) or not isinstance(end, (int, float)):
+            continue
+        shifted.append({"start": round(start + offset, 3), "end": round(end + offset, 3), "text": (text or "").strip()})
+    return shifted
+
+
+def _align_words(text: str, words: Sequence[Word]) -> List[Optional[tuple[int, int]]]:
+    """
+    Locate each timed word in ``text``, in order.
+
+    Spans include punctuation attached to the word (``kenobi,`` or ``"Hello``)
+    but not the rest of a hyphenated or apostrophised token. Words that cannot
+    be found map to None.
+    """
+    spans: List[Optional[tuple[int, int]]] = []
+    position = 0
+    for word in words:
+        token = word["word"].strip()
+        pattern = re.compile(rf"(?<!\w){re.escape(token)}(?!\w)", re.IGNORECASE)
+        match = pattern.search(text, position) if token else None
+        if match is None:
+            spans.append(None)
+            continue
+        start, end = match.span()
+        before = start
+        while before > 0 and not text[before - 1].isspace() and not text[before - 1].isalnum():
+            before -= 1
+        if before == 0 or text[before - 1].isspace():
+            start = before
+        after = end
+        while after < len(text) and not text[after].isspace() and not text[after].isalnum():
+            after += 1
+        if after == len(text) or text[after].isspace():
+            end = after
+        spans.append((start, end))
+        position = end
+    return spans
+
+
+def transcript_from_response(response: Any, offset: float = 0.0) -> Transcript:
+    """Build a :class:`Transcript` from a Whisper response (text or verbose_json)."""
+    text = _response_text(response)
+    words = _response_words(response, offset)
+    for word, span in zip(words, _align_words(text, words)):
+        if span is not None:
+            word["word"] = text[span[0]:span[1]]
+    return Transcript(text, words, _response_segments(response, offset))
+
+
+def _clip_text(part: Transcript, first: int, last: int) -> str:
+    """The part's text from word ``first`` through word ``last``, punctuation kept."""
+    spans = _align_words(part, part.words)
+    start = 0 if first == 0 else spans[first][0] if spans[first] else None
+    end = len(part) if last == len(part.words) - 1 else spans[last][1] if spans[last] else None
+    if start is None or end is None:
+        return " ".join(word["word"] for word in part.words[first:last + 1])
+    return part[start:end].strip()
+
+
+def stitch_transcripts(parts: Sequence[Transcript], chunks: Sequence[Optional[AudioChunk]]) -> Transcript:
+    """
+    Combine per-chunk transcripts, dropping text repeated in chunk overlaps.
+
+    Each overlap is cut at its midpoint: the earlier chunk keeps words that
+    start before the cut and the later chunk keeps words from the cut on, so a
+    word spoken inside the overlap appears exactly once. Word timings only
+    locate the cut; the text kept is Whisper's own, with its punctuation.
+    Segments are kept by the chunk in which they end, since a segment running
+    into the end of a chunk was cut short by the chunk boundary. Chunks
+    without word timings are joined as plain text.
+    """
+    words: List[Word] = []
+    segments: List[Segment] = []
+    texts: List[str] = []
+    for index, part in enumerate(parts):
+        chunk = chunks[index]
+        previous = chunks[index - 1] if index else None
+        following = chunks[index + 1] if index + 1 < len(chunks) else None
+        if not part.words or chunk is None:
+            texts.append(part.strip())
+            words.extend(part.words)
+            segments.extend(part.segments)
+            continue
+        low = (chunk.start + previous.end) / 2 if previous else float("-inf")
+        high = (following.start + chunk.end) / 2 if following else float("inf")
+        kept = [i for i, word in enumerate(part.words) if low <= word["start"] < high]
+        if kept:
+            words.extend(part.words[i] for i in kept)
+            texts.append(_clip_text(part, kept[0], kept[-1]))
+        segments.extend(segment for segment in part.segments if low <= segment["end"] < high)
+    return Transcript(" ".join(text for text in texts if text), words, segments)
+
+
+def group_words_into_cues(
+    words: Sequence[Word],
+    *,
+    boundaries: Sequence[float] = (),
+    max_duration: float = 6.0,
+    max_words: int = 14,
+    max_gap: float = 1.5,
+) -> List[Dict[str, Any]]:
+    """
+    Group timed words into subtitle cues.
+
+    A cue ends at a segment boundary (an end time in ``boundaries``), at
+    sentence punctuation, after ``max_words`` words or ``max_duration``
+    seconds, or before a pause longer than ``max_gap``.
+
+    Returns:
+        ``{"time", "end", "text"}`` dicts, matching the ``timestamps`` shape
+        stored on :class:`~app.models.podcast.PodcastTranscript`
+    """
+    cues: List[Dict[str, Any]] = []
+    current: List[Word] = []
+    ends = sorted(boundaries)
+    next_end = 0
+
+    def flush() -> None:
+        if current:
+            cues.append({
+                "time": current[0]["start"],
+                "end": current[-1]["end"],
+                "text": " ".join(word["word"] for word in current),
+            })
+            current.clear()
+
+    for word in words:
+        crossed = False
+        while next_end < len(ends) and ends[next_end] <= word["start"]:
+            crossed = True
+            next_end += 1
+        if current and (
+            crossed
+            or word["start"] - current[-1]["end"] > max_gap
+            or word["end"] - current[0]["start"] > max_duration
+            or len(current) >= max_words
+        ):
+            flush()
+        current.append(word)
+        if word["word"].endswith((".", "?", "!")):
+            flush()
+    flush()
+    return cues
+
+
+def _srt_timestamp(seconds: float) -> str:
+    milliseconds = max(0, int(round(seconds * 1000)))
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
+
+
+def format_srt(cues: Sequence[Dict[str, Any]]) -> str:
+    """
+    Render ``{"time", "end", "text"}`` cues as a SubRip document.
+
+    Cues without an ``end`` (e.g. Whisper segments) run until the next cue.
+    """
+    blocks = []
+    for index, cue in enumerate(cues):
+        start = float(cue["time"])
+        end = cue.get("end")
+        if end is None:
+            end = cues[index + 1]["time"] if index + 1 < len(cues) else start + 5.0
+        end = max(float(end), start)
+        blocks.append(
+            f"{index + 1}\n{_srt_timestamp(start)} --> {_srt_timestamp(end)}\n{str(cue['text']).strip()}\n\n"
+        )
+    return "".join(blocks)
+
+
+def _retryable_errors() -> tuple:
+    try:
+        import openai
+    except ModuleNotFoundError:  # pragma: no cover - openai is a hard dependency
+        return ()
+    names = ("RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError")
+    errors = (getattr(openai, name, None) for name in names)
+    # Test suites may stub the openai module; only real exception classes count
+    return tuple(error for error in errors if isinstance(error, type) and issubclass(error, BaseException))
+
 
 class AudioChunkingService:
     """
     Service for chunking large audio files into Whisper API-compliant chunks.
 
     Whisper API has a 25MB file size limit. This service:
-    1. Splits large audio files into smaller chunks
-    2. Applies overlap between chunks to prevent word splitting
-    3. Transcribes chunks individually and combines results
+    1. Splits large audio files into overlapping chunks in one ffmpeg pass
+    2. Transcribes chunks concurrently (bounded, with retries)
+    3. Stitches the results, de-duplicating words in the overlaps
     4. Cleans up temporary chunk files after transcription
     """
 
@@ -30,6 +293,9 @@ class AudioChunkingService:
         self,
         max_chunk_size_bytes: int = 25 * 1024 * 1024,  # 25MB
         overlap_ms: int = 1000,  # 1 second overlap
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 1.0,
     ):
         """
         Initialize audio chunking service.
@@ -37,9 +303,15 @@ class AudioChunkingService:
         Args:
             max_chunk_size_bytes: Maximum chunk size in bytes (default: 25MB)
             overlap_ms: Overlap between chunks in milliseconds (default: 1000ms)
+            max_concurrency: Chunks transcribed at the same time (default: 4)
+            max_retries: Attempts per chunk for transient API errors (default: 3)
+            retry_backoff_seconds: Initial delay between attempts, doubled each retry
         """
         self.max_chunk_size_bytes = max_chunk_size_bytes
         self.overlap_ms = overlap_ms
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
 
     def needs_chunking(self, file_size_bytes: int) -> bool:
         """
@@ -61,15 +333,29 @@ class AudioChunkingService:
         """
         Split audio file into multiple chunks.
 
-        Uses ffmpeg to split audio file by duration to keep chunks under size limit.
-        Applies overlap between chunks to prevent cutting words mid-speech.
+        See :meth:`chunk_audio` for details; this returns only the chunk paths.
+        """
+        return [chunk.path for chunk in await self.chunk_audio(audio_path, format=format)]
+
+    async def chunk_audio(
+        self,
+        audio_path: Path,
+        format: str = "mp3"
+    ) -> List[AudioChunk]:
+        """
+        Split audio file into overlapping chunks with a single ffmpeg run.
+
+        ffmpeg reads the source once and writes every chunk as a separate
+        output (each with its own output-side ``-ss``/``-t``), so the file is
+        not re-read from the start for each chunk. Chunks overlap by
+        ``overlap_ms`` to prevent cutting words mid-speech.
 
         Args:
             audio_path: Path to the audio file to chunk
             format: Audio format (mp3, wav, m4a, etc.)
 
         Returns:
-            List of paths to chunk files
+            Chunks in playback order, with the time span each one covers
 
         Raises:
             FileNotFoundError: If audio file doesn't exist
@@ -99,47 +385,37 @@ class AudioChunkingService:
 
             # Create temporary directory for chunks
             temp_dir = Path(tempfile.mkdtemp(prefix="audio_chunks_"))
-            chunk_paths: List[Path] = []
-
-            # Split audio into chunks using ffmpeg
             overlap_seconds = self.overlap_ms / 1000.0
+            codec = "copy" if format == "mp3" else "libmp3lame"
 
+            chunks: List[AudioChunk] = []
+            cmd = ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y", "-i", str(audio_path)]
             for i in range(num_chunks):
-                start_time = max(0, i * chunk_duration - overlap_seconds)
-                chunk_path = temp_dir / f"chunk_{i}.{format}"
-
-                # Use ffmpeg to extract chunk
-                cmd = [
-                    "ffmpeg",
-                    "-i", str(audio_path),
-                    "-ss", str(start_time),
-                    "-t", str(chunk_duration + overlap_seconds),
-                    "-acodec", "copy" if format == "mp3" else "libmp3lame",
-                    "-y",  # Overwrite output file
-                    str(chunk_path)
+                start_time = max(0.0, i * chunk_duration - overlap_seconds)
+                end_time = min(duration, (i + 1) * chunk_duration + overlap_seconds)
+                chunk = AudioChunk(temp_dir / f"chunk_{i}.{format}", start_time, end_time)
+                cmd += [
+                    "-map", "0:a",
+                    "-ss", f"{start_time:.3f}",
+                    "-t", f"{end_time - start_time:.3f}",
+                    "-acodec", codec,
+                    str(chunk.path),
                 ]
+                chunks.append(chunk)
 
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    timeout=300  # 5 minute timeout
-                )
-
-                if result.returncode != 0:
-                    logger.error(f"ffmpeg chunk extraction failed: {result.stderr}")
-                    # Cleanup on failure
-                    await self.cleanup_chunks(chunk_paths)
-                    raise RuntimeError(f"Failed to extract chunk {i}: {result.stderr}")
+            returncode, _, stderr = await self._run(cmd, timeout=300 * num_chunks)
+            if returncode != 0:
+                logger.error(f"ffmpeg chunk extraction failed: {stderr}")
+                # Cleanup on failure
+                await self.cleanup_chunks([chunk.path for chunk in chunks])
+                raise RuntimeError(f"Failed to extract chunks: {stderr}")
 
-                chunk_paths.append(chunk_path)
-                logger.info(f"Created chunk {i + 1}/{num_chunks}: {chunk_path}")
+            logger.info(f"Created {num_chunks} chunks in {temp_dir}")
+            return chunks
 
-            return chunk_paths
-
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             logger.error("ffmpeg chunking timed out")
-            raise RuntimeError("Audio chunking timed out after 5 minutes")
+            raise RuntimeError("Audio chunking timed out")
         except FileNotFoundError:
             logger.error("ffmpeg not found - please install ffmpeg")
             raise RuntimeError(
@@ -149,6 +425,22 @@ class AudioChunkingService:
             logger.error(f"Audio chunking failed: {e}")
             raise
 
+    @staticmethod
+    async def _run(cmd: List[str], *, timeout: float) -> tuple[int, str, str]:
+        """Run a command without blocking the event loop."""
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        return process.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
+
     async def _get_audio_duration(self, audio_path: Path) -> float:
         """
         Get audio file duration using ffprobe.
@@ -171,71 +463,86 @@ class AudioChunkingService:
                 str(audio_path)
             ]
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            returncode, stdout, stderr = await self._run(cmd, timeout=30)
 
-            if result.returncode != 0:
-                raise RuntimeError(f"ffprobe failed: {result.stderr}")
+            if returncode != 0:
+                raise RuntimeError(f"ffprobe failed: {stderr}")
 
-            return float(result.stdout.strip())
+            return float(stdout.strip())
 
-        except (ValueError, subprocess.TimeoutExpired) as e:
+        except (ValueError, asyncio.TimeoutError) as e:
             logger.error(f"Failed to get audio duration: {e}")
             raise RuntimeError(f"Failed to determine audio duration: {e}")
 
     async def transcribe_chunks(
         self,
-        chunk_paths: List[Path],
+        chunks: Sequence[Union[Path, AudioChunk]],
         api_key: str,
         *,
         language: str = "en",
-    ) -> str:
+    ) -> Transcript:
         """
         Transcribe audio chunks using OpenAI Whisper API and combine results.
 
+        Up to ``max_concurrency`` chunks are transcribed at once; transient API
+        errors (rate limits, timeouts, 5xx) are retried with exponential
+        backoff. Word timestamps are shifted to the source file's timeline and
+        overlaps de-duplicated when the chunks' time spans are known.
+
         Args:
-            chunk_paths: List of paths to audio chunk files
+            chunks: Chunk paths, or :class:`AudioChunk` items from :meth:`chunk_audio`
             api_key: OpenAI API key
+            language: Spoken language hint passed to Whisper
 
         Returns:
-            Combined transcript text
+            Combined transcript text (a ``str``) with ``words`` timestamps
 
         Raises:
             Exception: If Whisper API call fails
         """
-        if not chunk_paths:
-            return ""
+        if not chunks:
+            return Transcript("")
 
         try:
             from openai import AsyncOpenAI
 
             client = AsyncOpenAI(api_key=api_key)
-            transcripts: List[str] = []
-
-            logger.info(f"Transcribing {len(chunk_paths)} audio chunks")
-
-            for i, chunk_path in enumerate(chunk_paths):
-                logger.info(f"Transcribing chunk {i + 1}/{len(chunk_paths)}: {chunk_path}")
-
-                with open(chunk_path, "rb") as audio_file:
-                    response = await client.audio.transcriptions.create(
-                        model="whisper-1",
-                        file=audio_file,
-                        response_format="text",
-                        language=language,
-                    )
-
-                transcript = response if isinstance(response, str) else response.text
-                transcripts.append(transcript)
-
-                logger.info(f"Chunk {i + 1} transcribed: {len(transcript)} characters")
-
-            # Combine transcripts with space separator
-            combined_transcript = " ".join(transcripts)
+            spans = [chunk if isinstance(chunk, AudioChunk) else None for chunk in chunks]
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            retryable = _retryable_errors()
+
+            logger.info(f"Transcribing {len(chunks)} audio chunks")
+
+            async def transcribe(index: int, chunk: Union[Path, AudioChunk]) -> Transcript:
+                chunk_path = chunk.path if isinstance(chunk, AudioChunk) else chunk
+                offset = chunk.start if isinstance(chunk, AudioChunk) else 0.0
+                async with semaphore:
+                    for attempt in range(1, self.max_retries + 1):
+                        try:
+                            with open(chunk_path, "rb") as audio_file:
+                                response = await client.audio.transcriptions.create(
+                                    model="whisper-1",
+                                    file=audio_file,
+                                    response_format="verbose_json",
+                                    timestamp_granularities=["word", "segment"],
+                                    language=language,
+                                )
+                            break
+                        except retryable as e:
+                            if attempt == self.max_retries:
+                                raise
+                            delay = self.retry_backoff_seconds * 2 ** (attempt - 1)
+                            logger.warning(
+                                f"Chunk {index + 1} attempt {attempt} failed ({e}); retrying in {delay:.1f}s"
+                            )
+                            await asyncio.sleep(delay)
+
+                transcript = transcript_from_response(response, offset)
+                logger.info(f"Chunk {index + 1} transcribed: {len(transcript)} characters")
+                return transcript
+
+            parts = await asyncio.gather(*(transcribe(i, chunk) for i, chunk in enumerate(chunks)))
+            combined_transcript = stitch_transcripts(parts, spans)
 
             logger.info(f"All chunks transcribed. Total: {len(combined_transcript)} characters")
 
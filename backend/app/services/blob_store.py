@@ -0,0 +1,235 @@
+"""
+Content-addressed, reference-counted file storage for the data room.
+
+Uploads are streamed to a temporary key while their SHA-256 is computed, then
+either moved to ``sha256-<digest>`` (first copy in the organization) or
+discarded in favour of the existing blob (duplicate). Each ``documents`` row
+pointing at a blob holds one reference in :class:`StorageBlob`; releasing the
+last reference deletes the file. Works with any storage service implementing
+``save_stream``/``move_file``/``delete_file``, so local and S3 storage share it.
+
+Blob rows change inside the caller's database transaction but files do not, so
+file side effects are collected in :class:`BlobChanges` and applied only once the
+transaction's outcome is known: unreferenced files are deleted after commit, and
+files created for new blobs are removed again if it rolls back.
+
+Documents uploaded before blobs existed have no ``storage_blobs`` row; they are
+treated as singly referenced and deleted on release, as before.
+"""
+from __future__ import annotations
+
+import logging
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterable, AsyncIterator, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLike, run_db
+from app.models.storage_blob import StorageBlob
+from app.services.storage_service import StorageServiceProtocol, StoredFile
+
+logger = logging.getLogger(__name__)
+
+CONTENT_KEY_PREFIX = "sha256-"
+
+
+def content_key(sha256: str) -> str:
+    """Storage key of the blob holding content with this digest."""
+    return f"{CONTENT_KEY_PREFIX}{sha256}"
+
+
+class BlobChanges:
+    """File operations of one transaction, deferred until it commits or rolls back."""
+
+    def __init__(self, storage: StorageServiceProtocol, organization_id: str) -> None:
+        self.storage = storage
+        self.organization_id = organization_id
+        self.created: List[str] = []
+        self.unreferenced: List[str] = []
+
+    @asynccontextmanager
+    async def transaction(self, db: SessionLike) -> AsyncIterator["BlobChanges"]:
+        """
+        Apply the collected file operations once the block's transaction ends.
+
+        The block must commit ``db`` itself. If it raises, the session is rolled
+        back and files created for new blobs are deleted; otherwise files whose
+        last reference was released are deleted.
+        """
+        try:
+            yield self
+        except BaseException:
+            await run_db(db, _rollback)
+            for file_key in self.created:
+                # A blob committed before the failure (or by a concurrent
+                # upload of the same content) still owns the file.
+                if not await run_db(db, _is_blob, self.organization_id, file_key):
+                    await self._delete(file_key)
+            raise
+        for file_key in self.unreferenced:
+            await self._delete(file_key)
+
+    async def _delete(self, file_key: str) -> None:
+        try:
+            await self.storage.delete_file(file_key, self.organization_id)
+        except Exception:  # pragma: no cover - storage deletion best effort
+            logger.warning("Failed to delete unreferenced file %s", file_key, exc_info=True)
+
+
+def _rollback(db: Session) -> None:
+    db.rollback()
+
+
+def _is_blob(db: Session, organization_id: str, file_key: str) -> bool:
+    return db.scalar(
+        select(StorageBlob.sha256).where(
+            StorageBlob.organization_id == organization_id,
+            StorageBlob.file_key == file_key,
+        )
+    ) is not None
+
+
+def _add_reference(db: Session, organization_id: str, sha256: str, size: int) -> Tuple[str, bool]:
+    """
+    Take a reference on the organization's blob for ``sha256``, creating it if needed.
+
+    Returns:
+        (file_key, created) where ``created`` is True if no blob existed yet
+    """
+    blobs = StorageBlob.__table__
+    for _ in range(2):
+        file_key = db.execute(
+            update(blobs)
+            .where(blobs.c.organization_id == organization_id, blobs.c.sha256 == sha256)
+            .values(ref_count=blobs.c.ref_count + 1)
+            .returning(blobs.c.file_key)
+        ).scalar_one_or_none()
+        if file_key is not None:
+            return file_key, False
+        try:
+            # Savepoint so losing an insert race does not roll back the caller's work
+            with db.begin_nested():
+                db.add(
+                    StorageBlob(
+                        organization_id=organization_id,
+                        sha256=sha256,
+                        file_key=content_key(sha256),
+                        size=size,
+                        ref_count=1,
+                    )
+                )
+            return content_key(sha256), True
+        except IntegrityError:
+            continue  # A concurrent upload created it; take a reference instead
+    raise RuntimeError(f"Could not reference blob {sha256}")
+
+
+def _reference_existing(db: Session, organization_id: str, file_key: str) -> bool:
+    """Add a reference to the blob stored at ``file_key``; False if it is not a blob."""
+    blobs = StorageBlob.__table__
+    return db.execute(
+        update(blobs)
+        .where(blobs.c.organization_id == organization_id, blobs.c.file_key == file_key)
+        .values(ref_count=blobs.c.ref_count + 1)
+        .returning(blobs.c.ref_count)
+    ).scalar_one_or_none() is not None
+
+
+def _drop_reference(db: Session, organization_id: str, file_key: str) -> bool:
+    """
+    Release one reference to ``file_key``.
+
+    Returns:
+        True if the file is no longer referenced and should be deleted
+    """
+    blobs = StorageBlob.__table__
+    remaining = db.execute(
+        update(blobs)
+        .where(blobs.c.organization_id == organization_id, blobs.c.file_key == file_key)
+        .values(ref_count=blobs.c.ref_count - 1)
+        .returning(blobs.c.ref_count)
+    ).scalar_one_or_none()
+    if remaining is None:
+        return True  # Legacy per-document file
+    if remaining > 0:
+        return False
+    blob = db.scalar(
+        select(StorageBlob).where(
+            StorageBlob.organization_id == organization_id,
+            StorageBlob.file_key == file_key,
+        )
+    )
+    if blob is not None:
+        db.delete(blob)
+        db.flush()
+    return True
+
+
+async def save_blob(
+    db: SessionLike,
+    changes: BlobChanges,
+    chunks: AsyncIterable[bytes],
+    *,
+    max_size: Optional[int] = None,
+    content_type: Optional[str] = None,
+) -> Tuple[str, StoredFile]:
+    """
+    Store an upload, reusing the organization's existing copy of identical content.
+
+    The reference is taken in the caller's transaction; commit it together
+    with the row that points at the returned key. A newly created file is
+    recorded in ``changes`` so a rollback removes it again.
+
+    Returns:
+        (file_key, stored) for the blob now holding the content
+
+    Raises:
+        FileTooLargeError: If the stream exceeds max_size
+    """
+    storage, organization_id = changes.storage, changes.organization_id
+    temp_key = f"upload-{uuid.uuid4().hex}.part"
+    stored = await storage.save_stream(
+        temp_key,
+        chunks,
+        organization_id,
+        max_size=max_size,
+        content_type=content_type,
+    )
+    file_key, created = await run_db(db, _add_reference, organization_id, stored.sha256, stored.size)
+    try:
+        if created:
+            await storage.move_file(temp_key, file_key, organization_id)
+            changes.created.append(file_key)
+        else:
+            logger.info("Deduplicated upload for organization %s (%s)", organization_id, stored.sha256)
+            await storage.delete_file(temp_key, organization_id)
+    except Exception:
+        await storage.delete_file(temp_key, organization_id)
+        raise
+    return file_key, stored
+
+
+async def add_reference(db: SessionLike, organization_id: str, file_key: str) -> bool:
+    """
+    Reference an already stored blob (e.g. restoring an old version).
+
+    Returns:
+        False if ``file_key`` is a legacy file that cannot be shared
+    """
+    return await run_db(db, _reference_existing, organization_id, file_key)
+
+
+async def release(db: SessionLike, changes: BlobChanges, file_key: str) -> bool:
+    """
+    Drop one reference to ``file_key``; the file is deleted once the transaction commits.
+
+    Returns:
+        True if the file is no longer referenced and has been scheduled for deletion
+    """
+    if not await run_db(db, _drop_reference, changes.organization_id, file_key):
+        return False
+    changes.unreferenced.append(file_key)
+    return True
@@ -3,10 +3,11 @@ Campaign Service
 
 Service for managing multi-channel outreach campaigns.
 """
+import logging
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_, or_, insert
 
 from app.models.master_admin import (
     AdminCampaign,
@@ -18,9 +19,18 @@ from app.models.master_admin import (
 from app.models.enums import CampaignType, CampaignStatus
 from app.models.user import User
 from app.models.organization import Organization
-from app.services.template_service import render_template
+from app.services.template_service import compile_template
 from app.services import master_admin_service
 
+logger = logging.getLogger(__name__)
+
+# Emails per send_email_batch_task message; keeps broker payloads well under 1 MB
+EMAIL_BATCH_SIZE = 100
+# Bind parameters per IN (...) lookup, below SQLite's 999-variable limit
+LOOKUP_CHUNK_SIZE = 500
+
+RecipientRow = Tuple[AdminCampaignRecipient, Optional[AdminProspect]]
+
 
 def create_campaign(
     campaign_data: Dict,
@@ -150,13 +160,8 @@ def execute_campaign(
     campaign.started_at = datetime.now(timezone.utc)
     db.commit()
     
-    # Get recipients
-    recipients_result = db.execute(
-        select(AdminCampaignRecipient).where(
-            AdminCampaignRecipient.campaign_id == campaign_id
-        )
-    )
-    recipients = list(recipients_result.scalars().all())
+    # Get recipients together with their prospects in one query
+    recipients = _load_recipients(campaign_id, db)
     
     if not recipients:
         campaign.status = CampaignStatus.SENT
@@ -187,39 +192,7 @@ def execute_campaign(
     
     # Integrate with LeadCapture: Create lead capture records for new contacts
     # This ensures all campaign recipients are tracked in the lead capture system
-    from app.models.master_admin import AdminLeadCapture
-    
-    for recipient in recipients:
-        prospect_result = db.execute(
-            select(AdminProspect).where(AdminProspect.id == recipient.prospect_id)
-        )
-        prospect = prospect_result.scalar_one_or_none()
-        
-        if prospect:
-            # Check if lead capture already exists for this prospect
-            # If not, create one linked to the campaign
-            # This integration ensures campaign activities are tracked in the lead capture system
-            from sqlalchemy import select as sql_select
-            existing_capture_result = db.execute(
-                sql_select(AdminLeadCapture).where(
-                    AdminLeadCapture.user_id == campaign.user_id,
-                    AdminLeadCapture.email == prospect.email
-                )
-            )
-            existing_capture = existing_capture_result.scalar_one_or_none()
-            
-            if not existing_capture and prospect.email:
-                # Create lead capture record for campaign tracking
-                lead_capture = AdminLeadCapture(
-                    user_id=campaign.user_id,
-                    name=prospect.name or "Unknown",
-                    email=prospect.email,
-                    phone=prospect.phone,
-                    company=prospect.company,
-                    source=f"campaign_{campaign.id}",
-                )
-                db.add(lead_capture)
-                db.commit()
+    _capture_recipient_leads(campaign, db)
     
     return {
         "sent_count": sent_count,
@@ -227,121 +200,186 @@ def execute_campaign(
     }
 
 
+def _load_recipients(campaign_id: int, db: Session) -> List[RecipientRow]:
+    """Load a campaign's recipients and their prospects with a single join."""
+    result = db.execute(
+        select(AdminCampaignRecipient, AdminProspect)
+        .outerjoin(AdminProspect, AdminProspect.id == AdminCampaignRecipient.prospect_id)
+        .where(AdminCampaignRecipient.campaign_id == campaign_id)
+        .order_by(AdminCampaignRecipient.id)
+    )
+    return [(recipient, prospect) for recipient, prospect in result.all()]
+
+
+def _contact_data(prospect: AdminProspect) -> Dict[str, str]:
+    """Template variables for a prospect."""
+    name_parts = prospect.name.split() if prospect.name else []
+    return {
+        "first_name": name_parts[0] if name_parts else "",
+        "last_name": name_parts[-1] if len(name_parts) > 1 else "",
+        "name": prospect.name or "",
+        "company": prospect.company or "",
+        "email": prospect.email or "",
+    }
+
+
+def _capture_recipient_leads(campaign: AdminCampaign, db: Session) -> None:
+    """Create lead capture records for recipients the campaign owner has not captured yet."""
+    from app.models.master_admin import AdminLeadCapture
+
+    # Read plain columns rather than the (now expired) prospect instances
+    rows = db.execute(
+        select(AdminProspect.name, AdminProspect.email, AdminProspect.phone, AdminProspect.company)
+        .join(AdminCampaignRecipient, AdminCampaignRecipient.prospect_id == AdminProspect.id)
+        .where(
+            AdminCampaignRecipient.campaign_id == campaign.id,
+            AdminProspect.email.isnot(None),
+        )
+        .order_by(AdminCampaignRecipient.id)
+    )
+    prospects = {}
+    for prospect in rows:
+        if prospect.email and prospect.email not in prospects:
+            prospects[prospect.email] = prospect
+    if not prospects:
+        return
+
+    emails = list(prospects)
+    existing = set()
+    for start in range(0, len(emails), LOOKUP_CHUNK_SIZE):
+        existing.update(
+            db.scalars(
+                select(AdminLeadCapture.email).where(
+                    AdminLeadCapture.user_id == campaign.user_id,
+                    AdminLeadCapture.email.in_(emails[start:start + LOOKUP_CHUNK_SIZE]),
+                )
+            )
+        )
+
+    new_leads = [
+        {
+            "user_id": campaign.user_id,
+            "name": prospect.name or "Unknown",
+            "email": email,
+            "phone": prospect.phone,
+            "company": prospect.company,
+            "source": f"campaign_{campaign.id}",
+        }
+        for email, prospect in prospects.items()
+        if email not in existing
+    ]
+    if new_leads:
+        db.execute(insert(AdminLeadCapture), new_leads)
+        db.commit()
+
+
 def _execute_email_campaign(
     campaign: AdminCampaign,
-    recipients: List[AdminCampaignRecipient],
+    recipients: List[RecipientRow],
     organization: Organization,
     db: Session
 ) -> int:
     """
-    Execute email campaign by sending emails to recipients.
+    Execute email campaign by queueing personalised emails in batches.
     
-    This is a placeholder - actual email sending would be done via
-    background tasks (Celery) or email service integration.
+    The template is compiled once, recipients are rendered in memory and
+    handed to ``send_email_batch_task`` in chunks of ``EMAIL_BATCH_SIZE``, and
+    the matching activity rows are written with one bulk insert.
     
     Args:
         campaign: Campaign instance
-        recipients: List of recipient instances
+        recipients: Recipients paired with their prospects
         organization: Organization instance
         db: Database session
         
     Returns:
         Number of emails sent
     """
-    sent_count = 0
-    
+    from app.tasks.campaign_tasks import send_email_batch_task
+
     # Get template if exists
-    template = None
+    render = None
     if campaign.template_id:
-        template_result = db.execute(
-            select(CampaignTemplate).where(CampaignTemplate.id == campaign.template_id)
-        )
-        template = template_result.scalar_one_or_none()
-    
-    for recipient in recipients:
-        # Get prospect
-        prospect_result = db.execute(
-            select(AdminProspect).where(AdminProspect.id == recipient.prospect_id)
-        )
-        prospect = prospect_result.scalar_one_or_none()
-        
+        template = db.get(CampaignTemplate, campaign.template_id)
+        if template:
+            render = compile_template(template)
+
+    queued_at = datetime.now(timezone.utc)
+    batch: List[Tuple[AdminCampaignRecipient, Dict]] = []
+    activities: List[Dict] = []
+
+    def flush_batch() -> None:
+        try:
+            send_email_batch_task.delay([email for _, email in batch])
+            sent = True
+        except Exception as e:
+            # Log error but continue with other batches
+            logger.error("Error queuing %d campaign emails: %s", len(batch), e)
+            sent = False
+        for recipient, _ in batch:
+            # Marked as queued (sent) or failed; delivery status arrives later
+            recipient.sent = sent
+            recipient.sent_at = queued_at if sent else recipient.sent_at
+        batch.clear()
+
+    for recipient, prospect in recipients:
         if not prospect or not prospect.email:
             continue
-        
-        # Precompute contact data for templating and analytics
-        contact_data = {
-            "first_name": prospect.name.split()[0] if prospect.name else "",
-            "last_name": prospect.name.split()[-1] if prospect.name and len(prospect.name.split()) > 1 else "",
-            "name": prospect.name or "",
-            "company": prospect.company or "",
-            "email": prospect.email or "",
-        }
 
-        # Render template if exists
+        # Precompute contact data for templating and analytics
+        contact_data = _contact_data(prospect)
         subject = campaign.subject
         content = campaign.content
 
-        if template:
+        if render:
             try:
-                rendered = render_template(template.id, contact_data, db)
+                rendered = render(contact_data)
                 subject = rendered["subject"]
                 content = rendered["content"]
             except Exception as e:
                 # Log error but continue
-                print(f"Error rendering template: {e}")
-        
-        # Send email via email service (queue for async processing)
-        if prospect.email:
-            try:
-                # Use Celery task for email queuing (better for production)
-                from app.tasks.campaign_tasks import queue_campaign_email_task
-                
-                # Queue email via Celery task
-                queue_campaign_email_task.delay(
-                    to_email=prospect.email,
-                    subject=subject,
-                    content=content,
-                    template_data={
-                        "subject": subject,
-                        "content": content,
-                        "first_name": contact_data.get("first_name", ""),
-                        "last_name": contact_data.get("last_name", ""),
-                        "company": contact_data.get("company", ""),
-                    }
-                )
-                
-                # Mark as queued (will be marked as sent when email is actually sent)
-                recipient.sent = True
-                recipient.sent_at = datetime.now(timezone.utc)
-            except Exception as e:
-                # Log error but continue with other recipients
-                print(f"Error queuing email for {prospect.email}: {e}")
-                # Mark as failed but don't stop campaign
-                recipient.sent = False
-        else:
-            # No email address, mark as skipped
-            recipient.sent = False
-        
-        # Track activity
-        activity = CampaignActivity(
-            organization_id=str(organization.id),
-            campaign_id=campaign.id,
-            contact_id=prospect.id,
-            activity_type="email_sent",
-            status="sent",
-            activity_metadata={"subject": subject},
-        )
-        db.add(activity)
-        
-        sent_count += 1
-    
+                logger.warning("Error rendering template for %s: %s", prospect.email, e)
+
+        batch.append((
+            recipient,
+            {
+                "to": prospect.email,
+                "subject": subject,
+                "content": content,
+                "template_name": "campaign_email",
+                "template_data": {
+                    "subject": subject,
+                    "content": content,
+                    "first_name": contact_data["first_name"],
+                    "last_name": contact_data["last_name"],
+                    "company": contact_data["company"],
+                },
+            },
+        ))
+        activities.append({
+            "organization_id": str(organization.id),
+            "campaign_id": campaign.id,
+            "contact_id": prospect.id,
+            "activity_type": "email_sent",
+            "status": "sent",
+            "activity_metadata": {"subject": subject},
+        })
+        if len(batch) >= EMAIL_BATCH_SIZE:
+            flush_batch()
+
+    if batch:
+        flush_batch()
+
+    # Track activity
+    if activities:
+        db.execute(insert(CampaignActivity), activities)
     db.commit()
-    return sent_count
+    return len(activities)
 
 
 def _execute_voice_campaign(
     campaign: AdminCampaign,
-    recipients: List[AdminCampaignRecipient],
+    recipients: List[RecipientRow],
     organization: Organization,
     db: Session
 ) -> int:
@@ -353,7 +391,7 @@ def _execute_voice_campaign(
     
     Args:
         campaign: Campaign instance
-        recipients: List of recipient instances
+        recipients: Recipients paired with their prospects
         organization: Organization instance
         db: Database session
         
@@ -365,21 +403,15 @@ def _execute_voice_campaign(
     
     initiated_count = 0
     
-    for recipient in recipients:
-        # Get prospect
-        prospect_result = db.execute(
-            select(AdminProspect).where(AdminProspect.id == recipient.prospect_id)
-        )
-        prospect = prospect_result.scalar_one_or_none()
-        
+    # Get agent ID from campaign settings
+    agent_id = campaign.settings.get("agent_id") if campaign.settings else None
+    if not agent_id:
+        return 0  # Skip if no agent configured
+    
+    for recipient, prospect in recipients:
         if not prospect or not prospect.phone:
             continue
         
-        # Get agent ID from campaign settings
-        agent_id = campaign.settings.get("agent_id") if campaign.settings else None
-        if not agent_id:
-            continue  # Skip if no agent configured
-        
         try:
             # Initiate voice call
             call_data = {
@@ -404,7 +436,7 @@ def _execute_voice_campaign(
             recipient.sent_at = datetime.now(timezone.utc)
         except Exception as e:
             # Log error but continue
-            print(f"Error initiating voice call: {e}")
+            logger.error("Error initiating voice call: %s", e)
             # Mark as failed but don't stop campaign
             recipient.sent = False
 
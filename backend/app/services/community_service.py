@@ -529,33 +529,29 @@ def get_flagged_content(organization_id: str, db: Session) -> list[dict]:
     Returns:
         List of flagged content items
     """
-    # Get flagged posts
-    flagged_posts = db.scalars(
-        select(Post).where(Post.organization_id == organization_id, Post.status == PostStatus.flagged)
-    ).all()
-
-    flagged_content = []
-    for post in flagged_posts:
-        # Count flags
-        flag_count = db.scalar(
-            select(func.count(ModerationAction.id)).where(
-                ModerationAction.target_type == TargetType.post,
-                ModerationAction.target_id == post.id,
-                ModerationAction.action_type == ModerationActionType.flag,
-            )
+    # Flag count and latest flag per post, aggregated in one grouped subquery
+    # instead of two queries per flagged post.
+    flags = (
+        select(
+            ModerationAction.target_id.label("target_id"),
+            func.count(ModerationAction.id).label("flag_count"),
+            func.max(ModerationAction.created_at).label("last_flagged_at"),
         )
-
-        # Get last flagged time
-        last_flag = db.scalar(
-            select(ModerationAction.created_at)
-            .where(
-                ModerationAction.target_type == TargetType.post,
-                ModerationAction.target_id == post.id,
-                ModerationAction.action_type == ModerationActionType.flag,
-            )
-            .order_by(ModerationAction.created_at.desc())
+        .where(
+            ModerationAction.target_type == TargetType.post,
+            ModerationAction.action_type == ModerationActionType.flag,
         )
+        .group_by(ModerationAction.target_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(Post, flags.c.flag_count, flags.c.last_flagged_at)
+        .outerjoin(flags, flags.c.target_id == Post.id)
+        .where(Post.organization_id == organization_id, Post.status == PostStatus.flagged)
+    ).all()
 
+    flagged_content = []
+    for post, flag_count, last_flag in rows:
         flagged_content.append({
             "target_type": "post",
             "target_id": post.id,
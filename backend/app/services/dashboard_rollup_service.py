@@ -0,0 +1,90 @@
+"""Read and reconcile the per-organization dashboard rollups."""
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLike, run_db
+from app.core.query_metrics import exclude_from_budget
+from app.models.dashboard_rollup import (
+    OrganizationDashboardRollup,
+    compute_rollups,
+    empty_counters,
+    write_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def seed_dashboard_rollup(db: Session, organization_id: str) -> OrganizationDashboardRollup:
+    """Create an organization's rollup row from the source tables."""
+    connection = db.connection()
+    counters = compute_rollups(connection, [organization_id]).get(organization_id, empty_counters())
+    write_snapshot(connection, organization_id, counters)
+    return OrganizationDashboardRollup(organization_id=organization_id, **counters)
+
+
+async def get_dashboard_rollup(db: SessionLike, organization_id: str) -> OrganizationDashboardRollup:
+    """Return the organization's counters, seeding the row on first use.
+
+    Warm reads are a single primary-key lookup. Seeding happens once per
+    organization and is kept out of the calling route's query budget.
+    """
+    rollup = await run_db(db, lambda session: session.get(OrganizationDashboardRollup, organization_id))
+    if rollup is not None:
+        return rollup
+    with exclude_from_budget():
+        return await run_db(db, seed_dashboard_rollup, organization_id)
+
+
+def reconcile_dashboard_rollups(
+    db: Session,
+    organization_ids: Optional[Iterable[str]] = None,
+) -> int:
+    """
+    Recompute rollups from the source tables and repair any that drifted.
+
+    Drift comes from writes the flush hooks cannot see, such as bulk deletes
+    and database-level cascades.
+
+    Args:
+        db: Database session
+        organization_ids: Restrict reconciliation to these organizations
+            (default: every organization with a rollup or any source rows)
+
+    Returns:
+        Number of rollup rows that were corrected
+    """
+    scope = list(organization_ids) if organization_ids is not None else None
+    connection = db.connection()
+    expected = compute_rollups(connection, scope)
+
+    query = select(OrganizationDashboardRollup)
+    if scope is not None:
+        query = query.where(OrganizationDashboardRollup.organization_id.in_(scope))
+    existing = {rollup.organization_id: rollup for rollup in db.scalars(query)}
+
+    corrected = 0
+    now = datetime.now(timezone.utc)
+    for organization_id in sorted(set(expected) | set(existing)):
+        counters = expected.get(organization_id, empty_counters())
+        rollup = existing.get(organization_id)
+        if rollup is not None and rollup.counters() == counters:
+            rollup.reconciled_at = now
+            continue
+        if rollup is not None:
+            logger.warning(
+                "Dashboard rollup drift for organization %s: stored=%s expected=%s",
+                organization_id,
+                rollup.counters(),
+                counters,
+            )
+        write_snapshot(connection, organization_id, counters)
+        corrected += 1
+
+    db.commit()
+    return corrected
@@ -0,0 +1,237 @@
+"""Deal description embeddings: backends, persistent cache and batch scoring."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Protocol, Sequence
+
+import numpy as np
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session
+
+try:  # pragma: no cover - production path relies on OpenAI client
+    import openai  # type: ignore
+except ImportError:  # pragma: no cover - tests use the local backend
+    class _OpenAIStub:  # pylint: disable=too-few-public-methods
+        class Embedding:  # type: ignore
+            @staticmethod
+            def create(*_args, **_kwargs):
+                raise RuntimeError('OpenAI SDK not installed; use HashingEmbeddingBackend')
+
+    openai = _OpenAIStub()  # type: ignore
+
+from app.core.config import settings
+from app.models.deal import Deal, DealEmbedding
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = 'text-embedding-3-small'
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+class EmbeddingBackend(Protocol):
+    """Turns a batch of texts into a ``(len(texts), dimensions)`` matrix."""
+
+    model_name: str
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        ...
+
+
+class OpenAIEmbeddingBackend:
+    """Embeddings from the OpenAI API, requested in as few calls as possible."""
+
+    def __init__(self, model: str = DEFAULT_EMBEDDING_MODEL, batch_size: int = 512) -> None:
+        self.model = model
+        self.batch_size = batch_size
+        self.model_name = f'openai:{model}'
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows: List[List[float]] = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = list(texts[start:start + self.batch_size])
+            response = openai.Embedding.create(input=batch, model=self.model)  # type: ignore[operator]
+            data = response['data']
+            if len(data) != len(batch):
+                raise ValueError(f'Expected {len(batch)} embeddings, received {len(data)}')
+            rows.extend(item['embedding'] for item in data)
+        return np.asarray(rows, dtype=np.float32)
+
+
+class HashingEmbeddingBackend:
+    """Deterministic bag-of-words embedding via signed feature hashing.
+
+    Needs no network access, so it backs tests, local development and the
+    fallback path when the OpenAI API is unavailable.
+    """
+
+    def __init__(self, dimensions: int = 256) -> None:
+        self.dimensions = dimensions
+        self.model_name = f'local-hashing-{dimensions}'
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in _TOKEN_RE.findall(text.lower()):
+                digest = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'little')
+                sign = -1.0 if digest >> 63 else 1.0
+                matrix[row, digest % self.dimensions] += sign
+        return matrix
+
+
+def get_embedding_backend(model: str = DEFAULT_EMBEDDING_MODEL) -> EmbeddingBackend:
+    """Return the OpenAI backend when an API key is configured, else the local one."""
+    if settings.openai_api_key:
+        return OpenAIEmbeddingBackend(model)
+    return HashingEmbeddingBackend()
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of whitespace-normalised text, used as the cache key."""
+    return hashlib.sha256(' '.join(text.split()).encode('utf-8')).hexdigest()
+
+
+def cosine_scores(matrix: np.ndarray, vector: np.ndarray) -> np.ndarray:
+    """Cosine similarity of every row of ``matrix`` with ``vector``, mapped to [0, 1]."""
+    if matrix.size == 0:
+        return np.zeros(0, dtype=np.float32)
+    row_norms = np.linalg.norm(matrix, axis=1)
+    vector_norm = np.linalg.norm(vector)
+    denominator = row_norms * vector_norm
+    similarity = np.divide(
+        matrix @ vector,
+        denominator,
+        out=np.zeros(matrix.shape[0], dtype=np.float64),
+        where=denominator > 0,
+    )
+    scores = np.clip((similarity + 1) / 2, 0.0, 1.0)
+    # Zero vectors carry no signal; score them 0 rather than "neutral" 0.5.
+    scores[denominator == 0] = 0.0
+    return scores
+
+
+def _description(deal: Deal) -> str:
+    return (deal.description or '').strip()
+
+
+def _vector_from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype='<f4')
+
+
+def _vector_to_bytes(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype='<f4').tobytes()
+
+
+def _embed_unique(texts_by_hash: Dict[str, str], backend: EmbeddingBackend) -> Dict[str, np.ndarray]:
+    if not texts_by_hash:
+        return {}
+    digests = list(texts_by_hash)
+    matrix = backend.embed([texts_by_hash[digest] for digest in digests])
+    return dict(zip(digests, matrix))
+
+
+def embed_deals(
+    deals: Iterable[Deal],
+    backend: EmbeddingBackend,
+    db: Optional[Session] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Return description embeddings for ``deals`` keyed by deal id.
+
+    With a session, stored vectors whose content hash and model still match
+    are reused, identical descriptions share one vector, and everything
+    missing is embedded in a single backend call and written back (flushed,
+    not committed). Deals without a description are omitted.
+    """
+    hashes: Dict[str, str] = {}
+    texts_by_hash: Dict[str, str] = {}
+    deals_by_id: Dict[str, Deal] = {}
+    for deal in deals:
+        text = _description(deal)
+        if not text:
+            continue
+        deal_id = str(deal.id)
+        digest = content_hash(text)
+        hashes[deal_id] = digest
+        texts_by_hash.setdefault(digest, text)
+        deals_by_id[deal_id] = deal
+
+    if not hashes:
+        return {}
+    if db is None:
+        by_hash = _embed_unique(texts_by_hash, backend)
+        return {deal_id: by_hash[digest] for deal_id, digest in hashes.items()}
+
+    stored = {
+        row.deal_id: row
+        for row in db.scalars(
+            select(DealEmbedding).where(DealEmbedding.deal_id.in_(list(hashes)))
+        )
+    }
+    vectors: Dict[str, np.ndarray] = {}
+    stale: List[str] = []
+    for deal_id, digest in hashes.items():
+        row = stored.get(deal_id)
+        if row is not None and row.content_hash == digest and row.model == backend.model_name:
+            vectors[deal_id] = _vector_from_bytes(row.vector)
+        else:
+            stale.append(deal_id)
+
+    if not stale:
+        return vectors
+
+    wanted_hashes = {hashes[deal_id] for deal_id in stale}
+    by_hash: Dict[str, np.ndarray] = {
+        row.content_hash: _vector_from_bytes(row.vector)
+        for row in db.scalars(
+            select(DealEmbedding).where(
+                DealEmbedding.content_hash.in_(wanted_hashes),
+                DealEmbedding.model == backend.model_name,
+            )
+        )
+    }
+    by_hash.update(
+        _embed_unique(
+            {digest: texts_by_hash[digest] for digest in wanted_hashes if digest not in by_hash},
+            backend,
+        )
+    )
+
+    for deal_id in stale:
+        digest = hashes[deal_id]
+        vector = by_hash[digest]
+        vectors[deal_id] = vector
+
+        deal = deals_by_id[deal_id]
+        if not inspect(deal).persistent:
+            continue
+        row = stored.get(deal_id) or DealEmbedding(deal_id=deal_id, organization_id=deal.organization_id)
+        row.content_hash = digest
+        row.model = backend.model_name
+        row.dimensions = int(vector.shape[0])
+        row.vector = _vector_to_bytes(vector)
+        db.add(row)
+    db.flush()
+    return vectors
+
+
+def refresh_deal_embedding(
+    db: Session,
+    deal: Deal,
+    backend: Optional[EmbeddingBackend] = None,
+) -> None:
+    """Store the embedding for ``deal``'s current description, if it changed.
+
+    Failures are logged rather than raised: matching recomputes missing
+    vectors on demand, so a deal write must never fail because of them.
+    """
+    if not _description(deal):
+        if deal.embedding is not None:
+            db.delete(deal.embedding)
+        return
+    try:
+        embed_deals([deal], backend or get_embedding_backend(), db=db)
+    except Exception as exc:  # pragma: no cover - network/SDK issues
+        logger.warning('Unable to embed description for deal %s: %s', deal.id, exc)
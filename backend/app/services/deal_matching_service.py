@@ -3,26 +3,29 @@
 
 from __future__ import annotations
 
+import logging
 from decimal import Decimal
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence
 
 import numpy as np
-
-try:  # pragma: no cover - production path relies on OpenAI client
-    import openai  # type: ignore
-except ImportError:  # pragma: no cover - tests inject mock
-    class _OpenAIStub:  # pylint: disable=too-few-public-methods
-        class Embedding:  # type: ignore
-            @staticmethod
-            def create(*_args, **_kwargs):
-                raise RuntimeError('OpenAI SDK not installed; inject mock for tests')
-
-    openai = _OpenAIStub()  # type: ignore
-
 from pydantic import BaseModel, ConfigDict
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, load_only
 
+from app.core.database import SessionLike, run_db
 from app.models.deal import Deal
 from app.models.deal_match import DealMatchCriteria
+from app.services.deal_embedding_service import (
+    DEFAULT_EMBEDDING_MODEL,
+    EmbeddingBackend,
+    HashingEmbeddingBackend,
+    cosine_scores,
+    embed_deals,
+    get_embedding_backend,
+)
+from app.services.deal_vector_index import get_deal_vector_index
+
+logger = logging.getLogger(__name__)
 
 _DEFAULT_WEIGHTS: Dict[str, float] = {
     'industry': 0.35,
@@ -62,8 +65,13 @@ class MatchResult(BaseModel):
 class DealMatchingService:
     """Service responsible for calculating intelligent deal matches."""
 
-    def __init__(self, embedding_model: str = 'text-embedding-3-small') -> None:
+    def __init__(
+        self,
+        embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+        embedding_backend: Optional[EmbeddingBackend] = None,
+    ) -> None:
         self.embedding_model = embedding_model
+        self.embedding_backend = embedding_backend or get_embedding_backend(embedding_model)
 
     # ------------------------------------------------------------------
     # Scoring helpers
@@ -146,11 +154,7 @@ class DealMatchingService:
             return 0.0
 
         try:
-            response = openai.Embedding.create(  # type: ignore[operator]
-                input=[text1, text2],
-                model=self.embedding_model,
-            )
-            embeddings = [item['embedding'] for item in response['data']][:2]
+            embeddings = self.embedding_backend.embed([text1, text2])
         except Exception:  # pragma: no cover - network/SDK issues
             tokens1 = set(text1.lower().split())
             tokens2 = set(text2.lower().split())
@@ -164,6 +168,37 @@ class DealMatchingService:
         similarity = self._cosine_similarity(embeddings[0], embeddings[1])
         return max(min((similarity + 1) / 2, 1.0), 0.0)
 
+    def _calculate_description_scores(
+        self,
+        target_deal: Deal,
+        candidates: Sequence[Deal],
+        db: Optional[Session] = None,
+    ) -> Dict[str, float]:
+        """Score every candidate description against the target in one pass.
+
+        Embeddings come from the persistent cache when a session is given; the
+        target is embedded once and compared with all candidates through a
+        single matrix-vector product.
+        """
+        if not (target_deal.description or '').strip() or not candidates:
+            return {}
+
+        deals = [target_deal, *candidates]
+        try:
+            vectors = embed_deals(deals, self.embedding_backend, db=db)
+        except Exception as exc:  # pragma: no cover - network/SDK issues
+            logger.warning('Embedding backend failed, using local embeddings: %s', exc)
+            vectors = embed_deals(deals, HashingEmbeddingBackend())
+
+        target_vector = vectors.get(str(target_deal.id))
+        candidate_ids = [str(candidate.id) for candidate in candidates if str(candidate.id) in vectors]
+        if target_vector is None or not candidate_ids:
+            return {}
+
+        matrix = np.vstack([vectors[candidate_id] for candidate_id in candidate_ids])
+        scores = cosine_scores(matrix, target_vector)
+        return dict(zip(candidate_ids, scores.tolist()))
+
     def _calculate_weighted_score(
         self,
         component_scores: Dict[str, float],
@@ -191,9 +226,129 @@ class DealMatchingService:
             return 'medium'
         return 'low'
 
+    @staticmethod
+    def _matchable_industries(criteria_industries: Iterable[str]) -> set[str]:
+        """Every deal industry that ``_calculate_industry_match`` scores above zero."""
+        criteria_norm = {c.strip().lower() for c in criteria_industries if c}
+        matchable = set(criteria_norm)
+        for industry in criteria_norm:
+            matchable |= _RELATED_INDUSTRIES.get(industry, set())
+        for industry, related in _RELATED_INDUSTRIES.items():
+            if related & criteria_norm:
+                matchable.add(industry)
+        return matchable
+
+    def _prefilter_candidates(
+        self,
+        db: Session,
+        *,
+        criteria: DealMatchCriteria,
+        target_deal: Deal,
+    ) -> List[Deal]:
+        """Load the organization's deals that can score on the structured criteria.
+
+        Industry keeps exact and related industries; size keeps deals close
+        enough to the range to earn a non-zero size score. Geography has no
+        column (it is inferred from the description) so it is scored later.
+        """
+        query = (
+            select(Deal)
+            .options(
+                load_only(
+                    Deal.id,
+                    Deal.organization_id,
+                    Deal.name,
+                    Deal.industry,
+                    Deal.deal_size,
+                    Deal.description,
+                )
+            )
+            .where(
+                Deal.organization_id == target_deal.organization_id,
+                Deal.id != str(target_deal.id),
+                Deal.is_archived.is_(False),
+            )
+        )
+
+        industries = self._matchable_industries(criteria.industries or [])
+        if industries:
+            query = query.where(func.lower(func.trim(Deal.industry)).in_(industries))
+
+        if criteria.min_deal_size is not None and criteria.max_deal_size is not None:
+            lower, upper = sorted((Decimal(criteria.min_deal_size), Decimal(criteria.max_deal_size)))
+            if upper > 0:
+                # _calculate_size_match reaches zero two range-widths outside the range.
+                slack = max(upper - lower, Decimal(1)) * 2
+                query = query.where(Deal.deal_size.between(lower - slack, upper + slack))
+
+        return list(db.scalars(query))
+
+    def _indexed_description_scores(
+        self,
+        db: Session,
+        *,
+        target_deal: Deal,
+        candidates: Sequence[Deal],
+    ) -> Dict[str, float]:
+        """Score candidate descriptions via the organization's vector index."""
+        if not (target_deal.description or '').strip() or not candidates:
+            return {}
+
+        backend = self.embedding_backend
+        try:
+            target_vector = embed_deals([target_deal], backend, db=db).get(str(target_deal.id))
+            index = get_deal_vector_index(db, str(target_deal.organization_id), backend.model_name)
+            missing = [candidate for candidate in candidates if str(candidate.id) not in index]
+            if missing:
+                # Deals created before embeddings were stored; embedded once, then cached.
+                for deal_id, vector in embed_deals(missing, backend, db=db).items():
+                    index.upsert(deal_id, vector)
+        except Exception as exc:  # pragma: no cover - network/SDK issues
+            logger.warning('Vector index unavailable, scoring descriptions directly: %s', exc)
+            return self._calculate_description_scores(target_deal, candidates)
+
+        if target_vector is None:
+            return {}
+        return index.similarities(target_vector, (str(candidate.id) for candidate in candidates))
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
+    async def find_matches_in_organization(
+        self,
+        db: SessionLike,
+        *,
+        criteria: DealMatchCriteria,
+        target_deal: Deal,
+        top_n: Optional[int] = None,
+        min_score: float = 0.0,
+    ) -> List[MatchResult]:
+        """Rank every eligible deal in the target's organization.
+
+        Candidates are narrowed in SQL by the structured criteria, and their
+        descriptions are scored against the organization's in-memory vector
+        index, so the whole pipeline is considered without per-deal embedding
+        calls. With an AsyncSession the database segment runs via ``run_db``.
+        """
+
+        def _load_candidates(session: Session):
+            candidates = self._prefilter_candidates(session, criteria=criteria, target_deal=target_deal)
+            return candidates, self._indexed_description_scores(
+                session,
+                target_deal=target_deal,
+                candidates=candidates,
+            )
+
+        candidates, description_scores = await run_db(db, _load_candidates)
+        return await self.find_matches(
+            criteria=criteria,
+            target_deal=target_deal,
+            candidate_deals=candidates,
+            top_n=top_n,
+            min_score=min_score,
+            description_scores=description_scores,
+        )
+
     async def find_matches(
         self,
         *,
@@ -202,13 +357,18 @@ class DealMatchingService:
         candidate_deals: Iterable[Deal],
         top_n: Optional[int] = None,
         min_score: float = 0.0,
+        db: Optional[Session] = None,
+        description_scores: Optional[Dict[str, float]] = None,
     ) -> List[MatchResult]:
         results: List[MatchResult] = []
 
-        for candidate in candidate_deals:
-            if str(candidate.id) == str(target_deal.id):
-                continue
+        candidates = [
+            candidate for candidate in candidate_deals if str(candidate.id) != str(target_deal.id)
+        ]
+        if description_scores is None:
+            description_scores = self._calculate_description_scores(target_deal, candidates, db=db)
 
+        for candidate in candidates:
             industry_score = self._calculate_industry_match(candidate.industry, criteria.industries or [])
             size_score = self._calculate_size_match(
                 candidate.deal_size,
@@ -220,10 +380,7 @@ class DealMatchingService:
                 criteria.geographies or [],
             )
             geography_score = self._calculate_geography_match(geography_source, criteria.geographies)
-            description_score = await self._calculate_semantic_similarity(
-                candidate.description or '',
-                target_deal.description or '',
-            )
+            description_score = description_scores.get(str(candidate.id), 0.0)
 
             component_scores = {
                 'industry': industry_score,
@@ -4,12 +4,21 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import select, or_
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
+from app.core.cache import invalidate_tags_soon, org_tag
 from app.models.deal import Deal, DealStage
 from app.models.user import User
 from app.schemas.deal import DealCreate, DealUpdate
+from app.services.deal_embedding_service import refresh_deal_embedding
+
+
+def _invalidate_deal_caches(organization_id: str) -> None:
+    """Drop cached deal views for the organization after a mutation."""
+    invalidate_tags_soon(org_tag(organization_id, "deals"))
 
 
 def create_deal(deal_data: DealCreate, owner: User, db: Session) -> Deal:
@@ -36,8 +45,11 @@ def create_deal(deal_data: DealCreate, owner: User, db: Session) -> Deal:
         owner_id=str(owner.id),
     )
     db.add(deal)
+    db.flush()
+    refresh_deal_embedding(db, deal)
     db.commit()
     db.refresh(deal)
+    _invalidate_deal_caches(deal.organization_id)
     return deal
 
 
@@ -53,9 +65,16 @@ def get_deal_by_id(deal_id: str, organization_id: str, db: Session) -> Optional[
     Returns:
         Deal instance or None if not found
     """
-    return db.scalar(
-        select(Deal).where(Deal.id == deal_id, Deal.organization_id == organization_id)
-    )
+    return db.scalar(_deal_by_id_query(deal_id, organization_id))
+
+
+async def get_deal_by_id_async(deal_id: str, organization_id: str, db: AsyncSession) -> Optional[Deal]:
+    """Async variant of :func:`get_deal_by_id` for ``get_async_db`` routes."""
+    return await db.scalar(_deal_by_id_query(deal_id, organization_id))
+
+
+def _deal_by_id_query(deal_id: str, organization_id: str) -> Select:
+    return select(Deal).where(Deal.id == deal_id, Deal.organization_id == organization_id)
 
 
 def list_deals(
@@ -84,6 +103,38 @@ def list_deals(
     Returns:
         Tuple of (deal list, total count)
     """
+    query = _list_deals_query(organization_id, stage, search, sort, include_archived)
+    total = db.scalar(_count_query(query))
+    deals = list(db.scalars(_paginate(query, page, per_page)).all())
+
+    return deals, total or 0
+
+
+async def list_deals_async(
+    organization_id: str,
+    db: AsyncSession,
+    page: int = 1,
+    per_page: int = 20,
+    stage: Optional[str] = None,
+    search: Optional[str] = None,
+    sort: Optional[str] = None,
+    include_archived: bool = False,
+) -> tuple[list[Deal], int]:
+    """Async variant of :func:`list_deals` for ``get_async_db`` routes."""
+    query = _list_deals_query(organization_id, stage, search, sort, include_archived)
+    total = await db.scalar(_count_query(query))
+    deals = list((await db.scalars(_paginate(query, page, per_page))).all())
+
+    return deals, total or 0
+
+
+def _list_deals_query(
+    organization_id: str,
+    stage: Optional[str],
+    search: Optional[str],
+    sort: Optional[str],
+    include_archived: bool,
+) -> Select:
     # Base query
     query = select(Deal).where(Deal.organization_id == organization_id)
 
@@ -123,19 +174,16 @@ def list_deals(
         # Default sort: newest first
         query = query.order_by(Deal.created_at.desc())
 
-    # Get total count using scalar subquery
-    from sqlalchemy import func
+    return query
 
-    count_query = select(func.count()).select_from(query.subquery())
-    total = db.scalar(count_query)
 
-    # Apply pagination
-    offset = (page - 1) * per_page
-    query = query.offset(offset).limit(per_page)
+def _count_query(query: Select) -> Select:
+    return select(func.count()).select_from(query.subquery())
 
-    deals = list(db.scalars(query).all())
 
-    return deals, total or 0
+def _paginate(query: Select, page: int, per_page: int) -> Select:
+    offset = (page - 1) * per_page
+    return query.offset(offset).limit(per_page)
 
 
 def update_deal(
@@ -161,9 +209,12 @@ def update_deal(
     update_data = deal_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(deal, field, value)
+    if "description" in update_data:
+        refresh_deal_embedding(db, deal)
 
     db.commit()
     db.refresh(deal)
+    _invalidate_deal_caches(deal.organization_id)
     return deal
 
 
@@ -183,6 +234,7 @@ def update_deal_stage(
     deal.updated_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(deal)
+    _invalidate_deal_caches(deal.organization_id)
     return deal
 
 
@@ -206,6 +258,7 @@ def archive_deal(deal_id: str, organization_id: str, db: Session) -> Optional[De
     deal.archived_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(deal)
+    _invalidate_deal_caches(deal.organization_id)
     return deal
 
 
@@ -231,4 +284,5 @@ def unarchive_deal(deal_id: str, organization_id: str, db: Session) -> Optional[
     deal.archived_at = None
     db.commit()
     db.refresh(deal)
+    _invalidate_deal_caches(deal.organization_id)
     return deal
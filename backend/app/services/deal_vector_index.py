@@ -0,0 +1,149 @@
+"""In-process per-organization vector index over stored deal embeddings."""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.deal import DealEmbedding
+
+_INITIAL_CAPACITY = 64
+
+
+class DealVectorIndex:
+    """Flat (exact) cosine index for one organization and embedding model.
+
+    Vectors are kept unit-normalised in a single contiguous matrix, so scoring
+    any subset of deals is one gather plus one matrix-vector product. The
+    matrix grows geometrically and rows are updated in place, which makes
+    incremental syncs cheap. Exact search over a few thousand rows takes well
+    under a millisecond, so no approximate structure is needed at this scale.
+    """
+
+    def __init__(self, organization_id: str, model_name: str) -> None:
+        self.organization_id = organization_id
+        self.model_name = model_name
+        self._matrix: Optional[np.ndarray] = None
+        self._rows: Dict[str, int] = {}
+        self._synced_until: Optional[datetime] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, deal_id: object) -> bool:
+        return str(deal_id) in self._rows
+
+    def upsert(self, deal_id: str, vector: np.ndarray) -> None:
+        """Insert or replace the vector for ``deal_id``."""
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if norm > 0:
+            vector = vector / norm
+        with self._lock:
+            self._ensure_capacity(vector.shape[0])
+            row = self._rows.get(str(deal_id))
+            if row is None:
+                row = len(self._rows)
+                self._rows[str(deal_id)] = row
+            self._matrix[row] = vector
+
+    def sync(self, db: Session) -> int:
+        """Pull embeddings written since the last sync; returns rows applied."""
+        query = select(DealEmbedding.deal_id, DealEmbedding.vector, DealEmbedding.updated_at).where(
+            DealEmbedding.organization_id == self.organization_id,
+            DealEmbedding.model == self.model_name,
+        )
+        if self._synced_until is not None:
+            # ">=" re-reads rows sharing the watermark timestamp; upserts are idempotent.
+            query = query.where(DealEmbedding.updated_at >= self._synced_until)
+
+        applied = 0
+        for deal_id, vector, updated_at in db.execute(query):
+            self.upsert(deal_id, np.frombuffer(vector, dtype='<f4'))
+            if self._synced_until is None or updated_at > self._synced_until:
+                self._synced_until = updated_at
+            applied += 1
+        return applied
+
+    def similarities(self, vector: np.ndarray, deal_ids: Iterable[str]) -> Dict[str, float]:
+        """Cosine similarity (mapped to [0, 1]) between ``vector`` and each indexed deal."""
+        query = np.asarray(vector, dtype=np.float32)
+        query_norm = float(np.linalg.norm(query))
+        with self._lock:
+            ids: List[str] = []
+            rows: List[int] = []
+            for deal_id in deal_ids:
+                row = self._rows.get(str(deal_id))
+                if row is not None:
+                    ids.append(str(deal_id))
+                    rows.append(row)
+            if not rows or query_norm == 0 or self._matrix is None:
+                return {}
+            subset = self._matrix[rows]
+
+        similarity = subset @ (query / query_norm)
+        row_is_zero = ~subset.any(axis=1)
+        scores = np.clip((similarity + 1) / 2, 0.0, 1.0)
+        scores[row_is_zero] = 0.0
+        return dict(zip(ids, scores.tolist()))
+
+    def top_k(
+        self,
+        vector: np.ndarray,
+        k: int,
+        deal_ids: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Return the ``k`` most similar deals, optionally restricted to ``deal_ids``."""
+        if deal_ids is None:
+            with self._lock:
+                deal_ids = list(self._rows)
+        scores = self.similarities(vector, deal_ids)
+        if not scores or k <= 0:
+            return []
+        ids = list(scores)
+        values = np.fromiter(scores.values(), dtype=np.float64, count=len(ids))
+        k = min(k, len(ids))
+        best = np.argpartition(-values, k - 1)[:k]
+        best = best[np.argsort(-values[best], kind='stable')]
+        return [(ids[i], float(values[i])) for i in best]
+
+    def _ensure_capacity(self, dimensions: int) -> None:
+        if self._matrix is None:
+            self._matrix = np.zeros((_INITIAL_CAPACITY, dimensions), dtype=np.float32)
+            return
+        if self._matrix.shape[1] != dimensions:
+            raise ValueError(
+                f'Vector has {dimensions} dimensions; index for {self.model_name} uses {self._matrix.shape[1]}'
+            )
+        if len(self._rows) < self._matrix.shape[0]:
+            return
+        grown = np.zeros((self._matrix.shape[0] * 2, dimensions), dtype=np.float32)
+        grown[: self._matrix.shape[0]] = self._matrix
+        self._matrix = grown
+
+
+_indexes: Dict[Tuple[str, str], DealVectorIndex] = {}
+_registry_lock = threading.Lock()
+
+
+def get_deal_vector_index(db: Session, organization_id: str, model_name: str) -> DealVectorIndex:
+    """Return the organization's index for ``model_name``, synced with the database."""
+    key = (str(organization_id), model_name)
+    with _registry_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = DealVectorIndex(str(organization_id), model_name)
+    index.sync(db)
+    return index
+
+
+def reset_deal_vector_indexes() -> None:
+    """Drop every in-process index (used by tests and after bulk re-embeds)."""
+    with _registry_lock:
+        _indexes.clear()
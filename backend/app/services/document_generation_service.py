@@ -2,7 +2,6 @@
 Document Generation Service
 Feature: F-009 Automated Document Generation
 """
-import re
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 from sqlalchemy import select
@@ -23,7 +22,8 @@ from app.schemas.document_generation import (
     TemplateRenderRequest,
 )
 from app.core.config import settings
-from app.services import rbac_audit_service
+from app.services import document_version_store, rbac_audit_service
+from app.utils import template_engine
 
 
 class DocumentGenerationService:
@@ -158,9 +158,7 @@ class DocumentGenerationService:
     @staticmethod
     def extract_variables(template_content: str) -> List[str]:
         """Extract variable names from template content ({{variable_name}})"""
-        pattern = r'\{\{(\w+)\}\}'
-        variables = re.findall(pattern, template_content)
-        return list(set(variables))  # Remove duplicates
+        return template_engine.extract_variables(template_content)
 
     @staticmethod
     def render_template(
@@ -168,13 +166,20 @@ class DocumentGenerationService:
         variable_values: Dict[str, Any],
     ) -> str:
         """Replace {{variables}} in template with actual values"""
-        rendered = template_content
+        return template_engine.compile_template(template_content).render(variable_values)
 
-        for var_name, var_value in variable_values.items():
-            pattern = f'{{{{{var_name}}}}}'
-            rendered = rendered.replace(pattern, str(var_value))
-
-        return rendered
+    @staticmethod
+    def render_batch(
+        template: DocumentTemplate,
+        variable_sets: List[Dict[str, Any]],
+    ) -> List[str]:
+        """Render a stored template once per variable set, compiling it only once"""
+        return template_engine.render_many(
+            ("document_template", str(template.id)),
+            template.updated_at,
+            template.content,
+            variable_sets,
+        )
 
     @staticmethod
     def generate_document(
@@ -201,10 +206,10 @@ class DocumentGenerationService:
             raise ValueError(f"Missing required variables: {', '.join(missing_vars)}")
 
         # Render template
-        generated_content = DocumentGenerationService.render_template(
-            template.content,
-            render_request.variable_values,
-        )
+        generated_content = DocumentGenerationService.render_batch(
+            template,
+            [render_request.variable_values],
+        )[0]
 
         source_deal_id: Optional[str] = None
         if render_request.source_deal_id:
@@ -241,17 +246,15 @@ class DocumentGenerationService:
         db.flush()  # Flush to get the document ID
         
         # Create initial version snapshot
-        from app.models.document_generation import DocumentVersion
-        initial_version = DocumentVersion(
+        document_version_store.add_version(
+            db,
             document_id=generated.id,
-            version_number=1,
             content=generated_content,
             label="v1.0",
             summary="Initial version",
             organization_id=organization_id,
             created_by_user_id=generated_by_user_id,
         )
-        db.add(initial_version)
         
         db.commit()
         db.refresh(generated)
@@ -365,8 +368,6 @@ class DocumentGenerationService:
     ) -> Optional[GeneratedDocument]:
         """Update a generated document (content, status, file_path)"""
         from app.schemas.document_generation import GeneratedDocumentUpdate
-        from app.models.document_generation import DocumentVersion
-        from sqlalchemy import select, desc
         
         document = DocumentGenerationService.get_generated_document(
             db, document_id, organization_id, actor_user_id=user_id
@@ -378,26 +379,16 @@ class DocumentGenerationService:
         
         # If content is being updated, create a version snapshot first
         if "generated_content" in update_dict and update_dict["generated_content"] != document.generated_content:
-            # Get latest version number
-            latest_version = db.scalar(
-                select(DocumentVersion)
-                .where(DocumentVersion.document_id == document_id)
-                .order_by(desc(DocumentVersion.version_number))
-                .limit(1)
-            )
-            
-            # Create version snapshot of current content
-            new_version_number = (latest_version.version_number + 1) if latest_version else 1
-            version = DocumentVersion(
-                document_id=document_id,
-                version_number=new_version_number,
+            # Create version snapshot of current content (stored as a delta
+            # against the previous version between keyframes)
+            document_version_store.add_version(
+                db,
+                document_id=document.id,
                 content=document.generated_content,  # Save current content before update
-                label=f"v{new_version_number}",
                 summary="Auto-saved version",
                 organization_id=organization_id,
                 created_by_user_id=user_id or document.generated_by_user_id,
             )
-            db.add(version)
             
             # Update document content
             document.generated_content = update_dict["generated_content"]
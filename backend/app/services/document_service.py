@@ -2,16 +2,18 @@
 from __future__ import annotations
 
 import math
-import os
 from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from functools import partial
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from uuid import UUID, uuid4
 
 from fastapi import HTTPException, UploadFile, status
-from sqlalchemy import func, or_
+from sqlalchemy import func, or_, select
 from sqlalchemy.orm import Session, joinedload
 
+from app.core.cache import invalidate_tags_soon, org_tag
+from app.core.database import SessionLike, run_db
 from app.models.deal import Deal
 from app.models.document import (
     Document,
@@ -19,6 +21,7 @@ from app.models.document import (
     DocumentPermission,
     DocumentQuestion,
     Folder,
+    FolderClosure,
     QUESTION_STATUS_OPEN,
     QUESTION_STATUS_RESOLVED,
 )
@@ -41,7 +44,19 @@ from app.schemas.document import (
     PermissionCreate,
     PermissionResponse,
 )
-from app.services.storage_service import get_storage_service
+from app.services import blob_store
+from app.services.storage_service import (
+    FileTooLargeError,
+    StoredFile,
+    get_storage_service,
+    iter_upload_chunks,
+)
+from app.utils.zip_stream import (
+    COMPRESSION_AUTO,
+    ZipStreamEntry,
+    resolve_compress_type,
+    stream_zip,
+)
 
 
 _PERMISSION_RANK = {
@@ -102,27 +117,22 @@ def _resolve_folder_permission(
         return PermissionLevel.OWNER
 
     permission: Optional[str] = PermissionLevel.NONE
+    if folder is None:
+        return permission
 
-    current_folder = folder
-    while current_folder is not None:
-        folder_id_str = str(current_folder.id)
-        org_id_str = str(current_folder.organization_id)
-        perm = (
-            db.query(DocumentPermission)
-            .filter(
-                DocumentPermission.folder_id == folder_id_str,
-                DocumentPermission.user_id == str(user.id),
-                DocumentPermission.organization_id == org_id_str,
-            )
-            .one_or_none()
+    # One indexed lookup over the closure table covers the whole ancestor chain
+    inherited_levels = (
+        db.query(DocumentPermission.permission_level)
+        .join(FolderClosure, FolderClosure.ancestor_id == DocumentPermission.folder_id)
+        .filter(
+            FolderClosure.descendant_id == str(folder.id),
+            DocumentPermission.user_id == str(user.id),
+            DocumentPermission.organization_id == str(folder.organization_id),
         )
-        if perm:
-            permission = _max_permission(permission, perm.permission_level)
-
-        if current_folder.parent_folder_id:
-            current_folder = db.get(Folder, current_folder.parent_folder_id)
-        else:
-            current_folder = None
+        .all()
+    )
+    for (level,) in inherited_levels:
+        permission = _max_permission(permission, level)
 
     return permission or PermissionLevel.NONE
 
@@ -176,6 +186,153 @@ def _resolve_document_permission(
     return permission or PermissionLevel.NONE
 
 
+class _DealPermissionSnapshot:
+    """Set-based permission resolver for one (user, deal) pair.
+
+    Loads every grant the user holds inside the deal plus the folder parent map
+    in two queries, then resolves folder inheritance once per folder so listing
+    and bulk operations avoid per-document permission lookups.
+    """
+
+    def __init__(self, db: Session, *, deal: Deal, user: User) -> None:
+        self.deal = deal
+        self.user_id = str(user.id)
+        self.is_deal_owner = str(deal.owner_id) == self.user_id
+        self._folder_grants: dict[str, str] = {}
+        self._document_grants: dict[str, str] = {}
+        self._folder_parents: dict[str, Optional[str]] = {}
+        self._folder_cache: dict[str, str] = {}
+
+        if self.is_deal_owner:
+            return
+
+        deal_id = str(deal.id)
+        grants = (
+            db.query(
+                DocumentPermission.folder_id,
+                DocumentPermission.document_id,
+                DocumentPermission.permission_level,
+            )
+            .outerjoin(Folder, DocumentPermission.folder_id == Folder.id)
+            .outerjoin(Document, DocumentPermission.document_id == Document.id)
+            .filter(
+                DocumentPermission.user_id == self.user_id,
+                DocumentPermission.organization_id == str(deal.organization_id),
+                or_(Folder.deal_id == deal_id, Document.deal_id == deal_id),
+            )
+            .all()
+        )
+        for folder_id, document_id, level in grants:
+            if folder_id is not None:
+                key = str(folder_id)
+                self._folder_grants[key] = _max_permission(self._folder_grants.get(key), level)
+            elif document_id is not None:
+                key = str(document_id)
+                self._document_grants[key] = _max_permission(self._document_grants.get(key), level)
+
+        self._folder_parents = {
+            str(folder_id): str(parent_id) if parent_id else None
+            for folder_id, parent_id in (
+                db.query(Folder.id, Folder.parent_folder_id)
+                .filter(Folder.deal_id == deal_id)
+                .all()
+            )
+        }
+
+    @property
+    def has_grants(self) -> bool:
+        return bool(self._folder_grants or self._document_grants)
+
+    def folder_permission(self, folder_id: Optional[str]) -> str:
+        """Effective permission for a folder, inherited from its ancestors."""
+
+        if self.is_deal_owner:
+            return PermissionLevel.OWNER
+        if folder_id is None:
+            return PermissionLevel.NONE
+
+        key = str(folder_id)
+        if key in self._folder_cache:
+            return self._folder_cache[key]
+
+        # Walk up until we hit a resolved ancestor, then unwind the chain so
+        # every folder on the path is memoized for later lookups.
+        chain: list[str] = []
+        seen: set[str] = set()
+        inherited: str = PermissionLevel.NONE
+        current: Optional[str] = key
+        while current is not None and current not in seen:
+            if current in self._folder_cache:
+                inherited = self._folder_cache[current]
+                break
+            seen.add(current)
+            chain.append(current)
+            current = self._folder_parents.get(current)
+
+        for node in reversed(chain):
+            inherited = _max_permission(inherited, self._folder_grants.get(node)) or PermissionLevel.NONE
+            self._folder_cache[node] = inherited
+
+        return self._folder_cache[key]
+
+    def document_permission(self, document: Document) -> str:
+        """Effective permission for a document belonging to this deal."""
+
+        if self.is_deal_owner or str(document.uploaded_by) == self.user_id:
+            return PermissionLevel.OWNER
+
+        permission = self._document_grants.get(str(document.id), PermissionLevel.NONE)
+        if document.folder_id:
+            permission = _max_permission(permission, self.folder_permission(document.folder_id))
+        return permission or PermissionLevel.NONE
+
+    def visibility_clause(self, minimum_level: str = PermissionLevel.VIEWER):
+        """SQL criterion selecting documents that meet ``minimum_level``.
+
+        Returns ``None`` when every document in the deal is visible.
+        """
+
+        if self.is_deal_owner:
+            return None
+
+        threshold = _PERMISSION_RANK[_normalize_level(minimum_level)]
+        folder_ids = [
+            folder_id
+            for folder_id in self._folder_parents
+            if _PERMISSION_RANK[_normalize_level(self.folder_permission(folder_id))] >= threshold
+        ]
+        document_ids = [
+            document_id
+            for document_id, level in self._document_grants.items()
+            if _PERMISSION_RANK[_normalize_level(level)] >= threshold
+        ]
+
+        criteria = [Document.uploaded_by == self.user_id]
+        if folder_ids:
+            criteria.append(Document.folder_id.in_(folder_ids))
+        if document_ids:
+            criteria.append(Document.id.in_(document_ids))
+        return or_(*criteria)
+
+
+def _load_permission_snapshots(
+    db: Session,
+    *,
+    documents: List[Document],
+    user: User,
+) -> dict[str, _DealPermissionSnapshot]:
+    """Build one permission snapshot per deal referenced by ``documents``."""
+
+    deal_ids = {str(document.deal_id) for document in documents}
+    if not deal_ids:
+        return {}
+    deals = db.query(Deal).filter(Deal.id.in_(deal_ids)).all()
+    return {
+        str(deal.id): _DealPermissionSnapshot(db, deal=deal, user=user)
+        for deal in deals
+    }
+
+
 def _ensure_document_permission(
     db: Session,
     *,
@@ -242,6 +399,11 @@ def ensure_folder_owner_permission(
 ) -> None:
     _ensure_folder_owner_permission(db, folder=folder, user=user, deal=deal)
 
+def _invalidate_document_caches(organization_id: str) -> None:
+    """Drop cached data-room views for the organization after a mutation."""
+    invalidate_tags_soon(org_tag(organization_id, "documents"))
+
+
 def _ensure_deal_access(db: Session, deal_id: str, user: User) -> Deal:
     deal = db.get(Deal, deal_id)
     if deal is None or deal.organization_id != user.organization_id:
@@ -249,38 +411,21 @@ def _ensure_deal_access(db: Session, deal_id: str, user: User) -> Deal:
     return deal
 
 
-def _user_has_document_listing_access(db: Session, *, deal: Deal, user: User) -> bool:
+def _user_has_document_listing_access(
+    db: Session,
+    *,
+    deal: Deal,
+    user: User,
+    snapshot: Optional[_DealPermissionSnapshot] = None,
+) -> bool:
     """Return True when the user can list documents for the given deal."""
 
     if str(deal.owner_id) == str(user.id):
         return True
 
-    doc_perm_exists = (
-        db.query(DocumentPermission.id)
-        .join(Document, DocumentPermission.document_id == Document.id)
-        .filter(
-            DocumentPermission.user_id == str(user.id),
-            DocumentPermission.organization_id == str(deal.organization_id),
-            Document.deal_id == str(deal.id),
-        )
-        .first()
-        is not None
-    )
-    if doc_perm_exists:
-        return True
-
-    folder_perm_exists = (
-        db.query(DocumentPermission.id)
-        .join(Folder, DocumentPermission.folder_id == Folder.id)
-        .filter(
-            DocumentPermission.user_id == str(user.id),
-            DocumentPermission.organization_id == str(deal.organization_id),
-            Folder.deal_id == str(deal.id),
-        )
-        .first()
-        is not None
-    )
-    if folder_perm_exists:
+    if snapshot is None:
+        snapshot = _DealPermissionSnapshot(db, deal=deal, user=user)
+    if snapshot.has_grants:
         return True
 
     uploaded_exists = (
@@ -370,18 +515,78 @@ def create_folder(
     db.add(folder)
     db.commit()
     db.refresh(folder)
+    _invalidate_document_caches(folder.organization_id)
 
     return _folder_to_response(folder, document_count=0, children=[])
 
 
 async def upload_document(
-    db: Session,
+    db: SessionLike,
     *,
     file: UploadFile,
     deal_id: str,
     current_user: User,
     folder_id: Optional[str] = None,
 ) -> DocumentUploadResponse:
+    deal = await run_db(db, _authorize_upload, deal_id, folder_id, current_user)
+
+    if file.content_type not in ALLOWED_FILE_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unsupported file type",
+        )
+
+    # Multipart parsing records the size when it knows it; otherwise the
+    # limit is enforced while streaming below.
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="File size exceeds 50MB limit",
+        )
+
+    changes = blob_store.BlobChanges(get_storage_service(), current_user.organization_id)
+    async with changes.transaction(db):
+        # Identical content already in the organization's data room is stored once
+        try:
+            storage_key, stored = await blob_store.save_blob(
+                db,
+                changes,
+                iter_upload_chunks(file),
+                max_size=MAX_FILE_SIZE,
+                content_type=file.content_type,
+            )
+        except FileTooLargeError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="File size exceeds 50MB limit",
+            )
+
+        filename = file.filename or "document"
+        document = await run_db(
+            db,
+            _add_uploaded_version,
+            deal=deal,
+            folder_id=folder_id,
+            filename=filename,
+            storage_key=storage_key,
+            stored=stored,
+            content_type=file.content_type,
+            current_user=current_user,
+        )
+
+        await _trim_document_versions(
+            db,
+            base_document=document,
+            changes=changes,
+            max_versions=MAX_VERSIONS_PER_DOCUMENT,
+        )
+
+        response = await run_db(db, _commit_upload, document, current_user, "upload")
+    _invalidate_document_caches(current_user.organization_id)
+    return response
+
+
+def _authorize_upload(db: Session, deal_id: str, folder_id: Optional[str], current_user: User) -> Deal:
     deal = _ensure_deal_access(db, deal_id, current_user)
     folder = _ensure_folder_access(db, folder_id, deal)
 
@@ -403,35 +608,21 @@ async def upload_document(
                 status.HTTP_403_FORBIDDEN,
                 detail="Only deal owners can upload to the root data room",
             )
+    return deal
 
-    if file.content_type not in ALLOWED_FILE_TYPES:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Unsupported file type",
-        )
-
-    file.file.seek(0, os.SEEK_END)
-    file_size = file.file.tell()
-    file.file.seek(0)
-
-    if file_size > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="File size exceeds 50MB limit",
-        )
-
-    storage = get_storage_service()
-    storage_key = storage.generate_file_key(
-        current_user.organization_id,
-        deal_id,
-        file.filename or "document",
-        current_user.id,
-    )
-
-    await storage.save_file(storage_key, file.file, current_user.organization_id)
 
+def _add_uploaded_version(
+    db: Session,
+    *,
+    deal: Deal,
+    folder_id: Optional[str],
+    filename: str,
+    storage_key: str,
+    stored: StoredFile,
+    content_type: Optional[str],
+    current_user: User,
+) -> Document:
     # Check for existing document with same name in same location (versioning)
-    filename = file.filename or "document"
     existing_docs_query = db.query(Document).filter(
         Document.name == filename,
         Document.deal_id == str(deal.id),
@@ -464,8 +655,9 @@ async def upload_document(
         id=str(uuid4()),
         name=filename,
         file_key=storage_key,
-        file_size=file_size,
-        file_type=file.content_type or "application/octet-stream",
+        file_size=stored.size,
+        checksum_sha256=stored.sha256,
+        file_type=content_type or "application/octet-stream",
         deal_id=str(deal.id),
         folder_id=folder_id,
         organization_id=current_user.organization_id,
@@ -476,16 +668,13 @@ async def upload_document(
     document.created_at = datetime.now(timezone.utc)
     db.add(document)
     db.flush()
-    document_id = document.id
+    return document
 
-    await _trim_document_versions(
-        db,
-        base_document=document,
-        storage=storage,
-        max_versions=MAX_VERSIONS_PER_DOCUMENT,
-    )
 
-    _log_access(db, document, current_user, action="upload")
+def _commit_upload(db: Session, document: Document, current_user: User, action: str) -> DocumentUploadResponse:
+    """Log the upload/restore, commit, and serialise the persisted document."""
+    document_id = document.id
+    _log_access(db, document, current_user, action=action)
     db.flush()
     db.commit()
 
@@ -518,14 +707,28 @@ async def upload_document(
 
 
 async def _trim_document_versions(
-    db: Session,
+    db: SessionLike,
     *,
     base_document: Document,
-    storage,
+    changes: blob_store.BlobChanges,
     max_versions: int,
 ) -> None:
     """Ensure only the most recent `max_versions` remain for a document."""
 
+    purge = await run_db(db, _reparent_kept_versions, base_document, max_versions)
+    if not purge:
+        return
+
+    # Files shared with other documents are kept until their last reference goes
+    for old_version in purge:
+        await blob_store.release(db, changes, old_version.file_key)
+
+    await run_db(db, _delete_versions, purge)
+
+
+def _reparent_kept_versions(db: Session, base_document: Document, max_versions: int) -> List[Document]:
+    """Re-root the versions that survive trimming and return the ones to purge."""
+
     versions_query = db.query(Document).filter(
         Document.name == base_document.name,
         Document.deal_id == base_document.deal_id,
@@ -545,7 +748,7 @@ async def _trim_document_versions(
     )
 
     if len(versions) <= max_versions:
-        return
+        return []
 
     # Ensure the freshly uploaded document is preserved before trimming
     def _sort_key(doc: Document):
@@ -564,14 +767,12 @@ async def _trim_document_versions(
         db.add(version)
 
     db.flush()
+    return purge
 
-    for old_version in purge:
-        try:
-            await storage.delete_file(old_version.file_key, base_document.organization_id)
-        except Exception:  # pragma: no cover - storage deletion best effort
-            pass
-        db.delete(old_version)
 
+def _delete_versions(db: Session, versions: List[Document]) -> None:
+    for version in versions:
+        db.delete(version)
     db.flush()
 
 
@@ -584,7 +785,8 @@ def list_documents(
     current_user: User,
 ) -> tuple[list[DocumentMetadata], int]:
     deal = _ensure_deal_access(db, deal_id, current_user)
-    if not _user_has_document_listing_access(db, deal=deal, user=current_user):
+    snapshot = _DealPermissionSnapshot(db, deal=deal, user=current_user)
+    if not _user_has_document_listing_access(db, deal=deal, user=current_user, snapshot=snapshot):
         raise HTTPException(
             status.HTTP_403_FORBIDDEN,
             detail="Insufficient permissions to list documents",
@@ -605,25 +807,26 @@ def list_documents(
     if not params.include_archived:
         query = query.filter(Document.archived_at.is_(None))
 
-    candidate_documents = query.order_by(Document.created_at.desc()).all()
-    accessible_documents: list[Document] = []
-    for document in candidate_documents:
-        permission = _resolve_document_permission(db, document=document, user=current_user)
-        if _PERMISSION_RANK[_normalize_level(permission)] >= _PERMISSION_RANK[PermissionLevel.VIEWER]:
-            accessible_documents.append(document)
+    accessible_query = query
+    visibility = snapshot.visibility_clause(PermissionLevel.VIEWER)
+    if visibility is not None:
+        accessible_query = query.filter(visibility)
 
-    total_candidates = len(candidate_documents)
-    accessible_total = len(accessible_documents)
+    accessible_total = accessible_query.count()
 
-    if accessible_total == 0 and total_candidates > 0:
+    if accessible_total == 0 and visibility is not None and query.first() is not None:
         raise HTTPException(
             status.HTTP_403_FORBIDDEN,
             detail="You do not have permission to view documents for this deal.",
         )
 
-    start_index = (params.page - 1) * params.per_page
-    end_index = start_index + params.per_page
-    page_documents = accessible_documents[start_index:end_index]
+    page_documents = (
+        accessible_query
+        .order_by(Document.created_at.desc(), Document.id.desc())
+        .offset((params.page - 1) * params.per_page)
+        .limit(params.per_page)
+        .all()
+    )
 
     question_counts: dict[str, int] = {}
     if page_documents:
@@ -689,23 +892,29 @@ def list_folders(
 
         children_map: dict[Optional[str], list[Folder]] = defaultdict(list)
         for folder in folders:
-            children_map[folder.parent_folder_id].append(folder)
-
-        def build_tree(parent: Optional[str]) -> list[FolderResponse]:
-            responses: list[FolderResponse] = []
-            for node in children_map.get(parent, []):
-                child_responses = build_tree(node.id)
-                responses.append(
-                    _folder_to_response(
-                        node,
-                        document_count=documents_per_folder.get(node.id, 0),
-                        children=child_responses,
-                        has_children=bool(child_responses),
-                    )
-                )
-            return responses
+            parent_key = str(folder.parent_folder_id) if folder.parent_folder_id else None
+            children_map[parent_key].append(folder)
+
+        # Breadth-first ordering, then assemble bottom-up so deep trees never
+        # depend on Python recursion depth.
+        ordered: list[Folder] = []
+        frontier = list(children_map.get(None, []))
+        while frontier:
+            ordered.extend(frontier)
+            frontier = [child for node in frontier for child in children_map.get(str(node.id), [])]
+
+        built: dict[str, FolderResponse] = {}
+        for node in reversed(ordered):
+            node_id = str(node.id)
+            child_responses = [built[str(child.id)] for child in children_map.get(node_id, [])]
+            built[node_id] = _folder_to_response(
+                node,
+                document_count=documents_per_folder.get(node_id, 0),
+                children=child_responses,
+                has_children=bool(child_responses),
+            )
 
-        return build_tree(None)
+        return [built[str(node.id)] for node in children_map.get(None, [])]
 
     # Lazy mode – return direct children (optionally filtered by search)
     query = base_query
@@ -809,6 +1018,20 @@ def update_folder(
         new_parent = db.get(Folder, str(folder_data.parent_folder_id))
         if new_parent is None or new_parent.deal_id != folder_model.deal_id:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Parent folder not found")
+        moves_into_own_subtree = (
+            db.query(FolderClosure.descendant_id)
+            .filter(
+                FolderClosure.ancestor_id == str(folder_model.id),
+                FolderClosure.descendant_id == str(new_parent.id),
+            )
+            .first()
+            is not None
+        )
+        if moves_into_own_subtree:
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                detail="Cannot move a folder into itself or one of its subfolders",
+            )
         parent_permission = _resolve_folder_permission(db, folder=new_parent, user=current_user, deal=deal)
         if _PERMISSION_RANK[_normalize_level(parent_permission)] < _PERMISSION_RANK[PermissionLevel.OWNER]:
             raise HTTPException(
@@ -823,6 +1046,7 @@ def update_folder(
     db.add(folder_model)
     db.commit()
     db.refresh(folder_model)
+    _invalidate_document_caches(folder_model.organization_id)
 
     folder_id_str = str(folder_model.id)
 
@@ -840,8 +1064,13 @@ def delete_folder(
     *,
     folder: FolderResponse,
     current_user: User,
+    recursive: bool = False,
 ) -> None:
-    """Delete a folder (must be empty - no documents or subfolders)."""
+    """Delete a folder that contains no documents.
+
+    Subfolders are only removed when ``recursive`` is set; the whole subtree is
+    then deleted with set-based statements driven by the folder closure table.
+    """
     folder_model = db.get(Folder, str(folder.id))
     if folder_model is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Folder not found")
@@ -853,25 +1082,57 @@ def delete_folder(
     _ensure_folder_owner_permission(db, folder=folder_model, user=current_user, deal=deal)
 
     folder_id_str = str(folder_model.id)
+    subtree_ids = (
+        select(FolderClosure.descendant_id)
+        .where(FolderClosure.ancestor_id == folder_id_str)
+        .scalar_subquery()
+    )
 
     doc_count = (
         db.query(func.count(Document.id))
-        .filter(Document.folder_id == folder_id_str)
+        .filter(Document.folder_id.in_(subtree_ids))
         .scalar()
     ) or 0
     if doc_count > 0:
         raise ValueError("Folder is not empty - contains documents")
 
     subfolder_count = (
-        db.query(func.count(Folder.id))
-        .filter(Folder.parent_folder_id == folder_id_str)
+        db.query(func.count(FolderClosure.descendant_id))
+        .filter(
+            FolderClosure.ancestor_id == folder_id_str,
+            FolderClosure.depth > 0,
+        )
         .scalar()
     ) or 0
-    if subfolder_count > 0:
+    if subfolder_count == 0:
+        organization_id = folder_model.organization_id
+        db.delete(folder_model)
+        db.commit()
+        _invalidate_document_caches(organization_id)
+        return
+
+    if not recursive:
         raise ValueError("Folder is not empty - contains subfolders")
 
-    db.delete(folder_model)
+    doomed_ids = [
+        row[0]
+        for row in db.query(FolderClosure.descendant_id)
+        .filter(FolderClosure.ancestor_id == folder_id_str)
+        .all()
+    ]
+    db.query(DocumentPermission).filter(
+        DocumentPermission.folder_id.in_(doomed_ids)
+    ).delete(synchronize_session=False)
+    db.query(FolderClosure).filter(
+        or_(
+            FolderClosure.descendant_id.in_(doomed_ids),
+            FolderClosure.ancestor_id.in_(doomed_ids),
+        )
+    ).delete(synchronize_session=False)
+    db.query(Folder).filter(Folder.id.in_(doomed_ids)).delete(synchronize_session=False)
     db.commit()
+    db.expire_all()
+    _invalidate_document_caches(deal.organization_id)
 
 
 def get_document_by_id(
@@ -924,6 +1185,7 @@ def archive_document(
 
     db.flush()
     db.commit()
+    _invalidate_document_caches(document.organization_id)
 
 
 def restore_document(
@@ -934,6 +1196,7 @@ def restore_document(
     document.archived_at = None
     db.add(document)
     db.commit()
+    _invalidate_document_caches(document.organization_id)
 
 
 def update_document_metadata(
@@ -978,6 +1241,7 @@ def update_document_metadata(
     db.add(document)
     db.commit()
     db.refresh(document)
+    _invalidate_document_caches(document.organization_id)
     return document
 
 
@@ -1462,7 +1726,7 @@ def get_document_versions(
 
 
 async def restore_document_version(
-    db: Session,
+    db: SessionLike,
     *,
     document_id: str,
     version_id: str,
@@ -1482,6 +1746,60 @@ async def restore_document_version(
     Returns:
         Newly created document version with restored content
     """
+    version_to_restore, current_doc, root_id, new_version_number = await run_db(
+        db, _load_restore_targets, document_id, version_id, organization_id
+    )
+
+    storage = get_storage_service()
+    changes = blob_store.BlobChanges(storage, organization_id)
+    async with changes.transaction(db):
+        if await blob_store.add_reference(db, organization_id, version_to_restore.file_key):
+            # Content-addressed file: the restored version shares it
+            new_storage_key = version_to_restore.file_key
+            stored = StoredFile(
+                location=version_to_restore.file_key,
+                size=version_to_restore.file_size,
+                sha256=version_to_restore.checksum_sha256,
+            )
+        else:
+            # Legacy per-document file: copy it into the blob store
+            new_storage_key, stored = await blob_store.save_blob(
+                db,
+                changes,
+                storage.iter_file(version_to_restore.file_key, organization_id),
+                content_type=version_to_restore.file_type,
+            )
+
+        # Create new document version
+        restored_document = Document(
+            id=str(uuid4()),
+            name=version_to_restore.name,
+            file_key=new_storage_key,
+            file_size=stored.size,
+            checksum_sha256=stored.sha256,
+            file_type=version_to_restore.file_type,
+            deal_id=current_doc.deal_id,
+            folder_id=current_doc.folder_id,
+            organization_id=organization_id,
+            uploaded_by=current_user.id,
+            version=new_version_number,
+            parent_document_id=root_id,
+        )
+        await run_db(db, _add_and_flush, restored_document)
+
+        await _trim_document_versions(
+            db,
+            base_document=restored_document,
+            changes=changes,
+            max_versions=20,
+        )
+
+        response = await run_db(db, _commit_upload, restored_document, current_user, "restore")
+    _invalidate_document_caches(organization_id)
+    return response
+
+
+def _load_restore_targets(db: Session, document_id: str, version_id: str, organization_id: str):
     # Get the version to restore
     version_to_restore = db.query(Document).filter(
         Document.id == version_id,
@@ -1508,175 +1826,163 @@ async def restore_document_version(
     ).order_by(Document.version.desc()).all()
 
     latest_version_number = all_versions[0].version if all_versions else 1
-    new_version_number = latest_version_number + 1
-
-    # Copy the file from the version to restore
-    storage = get_storage_service()
-    old_file_path = await storage.get_file_path(version_to_restore.file_key, organization_id)
-
-    # Generate new storage key for the restored version
-    new_storage_key = storage.generate_file_key(
-        organization_id,
-        current_doc.deal_id,
-        version_to_restore.name,
-        current_user.id,
-    )
-
-    # Copy the file content
-    with open(old_file_path, 'rb') as source_file:
-        await storage.save_file(new_storage_key, source_file, organization_id)
-
-    # Create new document version
-    restored_document = Document(
-        id=str(uuid4()),
-        name=version_to_restore.name,
-        file_key=new_storage_key,
-        file_size=version_to_restore.file_size,
-        file_type=version_to_restore.file_type,
-        deal_id=current_doc.deal_id,
-        folder_id=current_doc.folder_id,
-        organization_id=organization_id,
-        uploaded_by=current_user.id,
-        version=new_version_number,
-        parent_document_id=root_id,
-    )
-    db.add(restored_document)
-    db.flush()
+    return version_to_restore, current_doc, root_id, latest_version_number + 1
 
-    await _trim_document_versions(
-        db,
-        base_document=restored_document,
-        storage=storage,
-        max_versions=20,
-    )
 
-    _log_access(db, restored_document, current_user, action="restore")
+def _add_and_flush(db: Session, instance) -> None:
+    db.add(instance)
     db.flush()
 
-    db.commit()
-    persisted_document = db.get(Document, restored_document.id)
-
-    return DocumentUploadResponse(
-        id=_ensure_uuid(persisted_document.id),
-        name=persisted_document.name,
-        file_size=persisted_document.file_size,
-        file_type=persisted_document.file_type,
-        deal_id=str(persisted_document.deal_id),
-        folder_id=_ensure_uuid(persisted_document.folder_id),
-        organization_id=_ensure_uuid(persisted_document.organization_id),
-        uploaded_by=_ensure_uuid(persisted_document.uploaded_by),
-        version=persisted_document.version,
-        parent_document_id=_ensure_uuid(persisted_document.parent_document_id),
-        archived_at=persisted_document.archived_at,
-        created_at=persisted_document.created_at,
-        updated_at=persisted_document.updated_at,
-        uploader_name=_user_display_name(current_user),
-    )
-
 
 # =============================================================================
 # Bulk Operations (DEV-008 Phase 2)
 # =============================================================================
 
 
-async def bulk_download_documents(
+async def stream_bulk_download(
     *,
-    db: Session,
+    db: SessionLike,
     document_ids: List[str],
     organization_id: str,
     current_user: User,
-) -> Tuple[bytes, str]:
+    compression: str = COMPRESSION_AUTO,
+) -> Tuple[AsyncIterator[bytes], str]:
     """
-    Download multiple documents as a single ZIP archive.
+    Prepare a streaming ZIP archive for multiple documents.
 
-    Only includes documents the user has viewer permission for.
-    Silently skips documents without permission.
+    Permission checks, storage existence checks and audit logging all happen
+    up-front so callers can still fail with 403 before any bytes are sent.
+    File contents are then read block by block while the archive is
+    produced, keeping memory bounded regardless of archive size.
 
     Returns:
-        Tuple of (zip_content_bytes, filename)
+        Tuple of (async chunk iterator, filename)
     """
-    import io
-    import zipfile
-
     storage = get_storage_service()
-    zip_buffer = io.BytesIO()
     filename_counts: dict[str, int] = {}
-    added_any = False
-
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for doc_id in document_ids:
-            try:
-                # Get document and check permission
-                document = db.query(Document).filter(
-                    Document.id == doc_id,
-                    Document.organization_id == organization_id,
-                    Document.archived_at.is_(None),
-                ).first()
-
-                if not document:
-                    continue
-
-                # Check user has at least viewer permission
-                try:
-                    permission = _resolve_document_permission(
-                        db,
-                        document=document,
-                        user=current_user,
-                    )
-
-                    if _PERMISSION_RANK.get(_normalize_level(permission), 0) < _PERMISSION_RANK[PermissionLevel.VIEWER]:
-                        continue
-                except HTTPException:
-                    # User doesn't have permission, skip this document
-                    continue
-
-                # Read file from storage
-                try:
-                    file_path = await storage.get_file_path(document.file_key, organization_id)
-                except Exception:
-                    # Skip files that can't be retrieved
-                    continue
-
-                with open(file_path, 'rb') as f:
-                    file_content = f.read()
-
-                # Handle filename collisions
-                base_name = document.name
-                if base_name not in filename_counts:
-                    filename_counts[base_name] = 0
-                filename_counts[base_name] += 1
-
-                if filename_counts[base_name] > 1:
-                    # Add counter to duplicate filenames
-                    name_parts = base_name.rsplit('.', 1)
-                    if len(name_parts) == 2:
-                        unique_name = f"{name_parts[0]}_({filename_counts[base_name] - 1}).{name_parts[1]}"
-                    else:
-                        unique_name = f"{base_name}_({filename_counts[base_name] - 1})"
-                else:
-                    unique_name = base_name
+    entries: list[ZipStreamEntry] = []
+    included: list[Document] = []
 
-                # Add file to ZIP
-                zip_file.writestr(unique_name, file_content)
-                added_any = True
+    for document in await run_db(db, _viewable_documents, document_ids, organization_id, current_user):
+        try:
+            # Skip files that can't be retrieved
+            if not await storage.file_exists(document.file_key, organization_id):
+                continue
 
-                # Log bulk download action
-                _log_access(db, document, current_user, action="bulk_download")
+            # Handle filename collisions
+            base_name = document.name
+            if base_name not in filename_counts:
+                filename_counts[base_name] = 0
+            filename_counts[base_name] += 1
+
+            if filename_counts[base_name] > 1:
+                # Add counter to duplicate filenames
+                name_parts = base_name.rsplit('.', 1)
+                if len(name_parts) == 2:
+                    unique_name = f"{name_parts[0]}_({filename_counts[base_name] - 1}).{name_parts[1]}"
+                else:
+                    unique_name = f"{base_name}_({filename_counts[base_name] - 1})"
+            else:
+                unique_name = base_name
+
+            entries.append(
+                ZipStreamEntry(
+                    arcname=unique_name,
+                    open_chunks=partial(storage.iter_file, document.file_key, organization_id),
+                    compress_type=resolve_compress_type(document.file_type, compression),
+                )
+            )
+            included.append(document)
 
-            except Exception:
-                # Skip documents that fail (e.g., file not found, permission denied)
-                continue
+        except Exception:
+            # Skip documents that fail (e.g., file not found)
+            continue
 
-    if not added_any:
+    if not entries:
         raise HTTPException(
             status.HTTP_403_FORBIDDEN,
             detail="No documents available with your current permissions.",
         )
 
+    await run_db(db, _log_bulk_download, included, current_user)
+
+    return stream_zip(entries), "documents.zip"
+
+
+def _viewable_documents(
+    db: Session,
+    document_ids: List[str],
+    organization_id: str,
+    current_user: User,
+) -> List[Document]:
+    """Documents the user may view, in request order."""
+    candidates = (
+        db.query(Document)
+        .filter(
+            Document.id.in_(document_ids),
+            Document.organization_id == organization_id,
+            Document.archived_at.is_(None),
+        )
+        .all()
+    )
+    documents_by_id = {str(document.id): document for document in candidates}
+    if str(current_user.organization_id) == str(organization_id):
+        snapshots = _load_permission_snapshots(db, documents=candidates, user=current_user)
+    else:
+        snapshots = {}
+
+    viewable: List[Document] = []
+    for doc_id in document_ids:
+        try:
+            document = documents_by_id.get(str(doc_id))
+            if not document:
+                continue
+
+            # Check user has at least viewer permission
+            snapshot = snapshots.get(str(document.deal_id))
+            if snapshot is None:
+                continue
+            permission = snapshot.document_permission(document)
+            if _PERMISSION_RANK.get(_normalize_level(permission), 0) < _PERMISSION_RANK[PermissionLevel.VIEWER]:
+                continue
+        except Exception:
+            # Skip documents that fail (e.g., permission denied)
+            continue
+        viewable.append(document)
+    return viewable
+
+
+def _log_bulk_download(db: Session, documents: List[Document], current_user: User) -> None:
+    for document in documents:
+        _log_access(db, document, current_user, action="bulk_download")
     db.commit()
 
-    zip_buffer.seek(0)
-    return zip_buffer.getvalue(), "documents.zip"
+
+async def bulk_download_documents(
+    *,
+    db: SessionLike,
+    document_ids: List[str],
+    organization_id: str,
+    current_user: User,
+    compression: str = COMPRESSION_AUTO,
+) -> Tuple[bytes, str]:
+    """
+    Download multiple documents as a single in-memory ZIP archive.
+
+    Buffered wrapper around :func:`stream_bulk_download` for callers that need
+    the whole payload at once; HTTP routes stream instead.
+
+    Returns:
+        Tuple of (zip_content_bytes, filename)
+    """
+    chunks, filename = await stream_bulk_download(
+        db=db,
+        document_ids=document_ids,
+        organization_id=organization_id,
+        current_user=current_user,
+        compression=compression,
+    )
+    return b"".join([chunk async for chunk in chunks]), filename
 
 
 def bulk_delete_documents(
@@ -1701,23 +2007,30 @@ def bulk_delete_documents(
     failed_ids = []
     failed_reasons = {}
 
+    candidates = (
+        db.query(Document)
+        .filter(
+            Document.id.in_(document_ids),
+            Document.organization_id == organization_id,
+            Document.archived_at.is_(None),
+        )
+        .all()
+    )
+    documents_by_id = {str(document.id): document for document in candidates}
+    snapshots = _load_permission_snapshots(db, documents=candidates, user=current_user)
+
     for doc_id in document_ids:
         try:
-            # Get document
-            document = db.query(Document).filter(
-                Document.id == doc_id,
-                Document.organization_id == organization_id,
-                Document.archived_at.is_(None),
-            ).first()
+            document = documents_by_id.get(str(doc_id))
 
-            if not document:
+            if not document or document.archived_at is not None:
                 failed_ids.append(doc_id)
                 failed_reasons[doc_id] = "Document not found or already deleted"
                 continue
 
             # Check permission - only deal owner or uploader can delete
-            deal = db.get(Deal, document.deal_id)
-            is_deal_owner = deal and str(deal.owner_id) == str(current_user.id)
+            snapshot = snapshots.get(str(document.deal_id))
+            is_deal_owner = snapshot is not None and snapshot.is_deal_owner
             is_uploader = str(document.uploaded_by) == str(current_user.id)
 
             if not (is_deal_owner or is_uploader):
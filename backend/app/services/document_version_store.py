@@ -0,0 +1,288 @@
+"""
+Delta-compressed version history for generated documents.
+
+Every ``KEYFRAME_INTERVAL``-th version (1, 11, 21, ...) keeps its full content;
+the versions in between store only a zlib-compressed line diff against the
+previous version. Any version is rebuilt from its keyframe in at most
+``KEYFRAME_INTERVAL - 1`` delta applications.
+"""
+from __future__ import annotations
+
+import difflib
+import json
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import desc, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, defer
+
+from app.models.document_generation import DocumentVersion
+
+KEYFRAME_INTERVAL = 10
+# Times add_version re-reads the history after a concurrent writer took its number
+NUMBERING_ATTEMPTS = 5
+
+
+# ---------------------------------------------------------------------------
+# Delta codec
+# ---------------------------------------------------------------------------
+
+
+def encode_delta(base: str, target: str) -> bytes:
+    """
+    Encode ``target`` as edits to ``base``.
+
+    The payload is a JSON list of ``[start, end]`` line ranges to copy from
+    ``base`` and lists of new lines, compressed with zlib.
+    """
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+    ops: List[Any] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:
+            ops.append(target_lines[j1:j2])
+    return zlib.compress(json.dumps(ops, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def apply_delta(base: str, delta: bytes) -> str:
+    """Rebuild the content ``delta`` was encoded against ``base`` for."""
+    base_lines = base.splitlines(keepends=True)
+    pieces: List[str] = []
+    for op in json.loads(zlib.decompress(delta)):
+        if op and isinstance(op[0], int):
+            pieces.extend(base_lines[op[0]:op[1]])
+        else:
+            pieces.extend(op)
+    return "".join(pieces)
+
+
+def is_keyframe_number(version_number: int) -> bool:
+    return (version_number - 1) % KEYFRAME_INTERVAL == 0
+
+
+# ---------------------------------------------------------------------------
+# Reading versions
+# ---------------------------------------------------------------------------
+
+
+def _chain(db: Session, document_id: Any, version_number: int) -> Sequence[DocumentVersion]:
+    """Versions from the nearest keyframe at or below ``version_number`` up to it."""
+    keyframe_number = db.scalar(
+        select(func.max(DocumentVersion.version_number)).where(
+            DocumentVersion.document_id == document_id,
+            DocumentVersion.version_number <= version_number,
+            DocumentVersion.content.isnot(None),
+        )
+    )
+    if keyframe_number is None:
+        raise ValueError(f"Version {version_number} of document {document_id} has no keyframe")
+    return db.scalars(
+        select(DocumentVersion)
+        .where(
+            DocumentVersion.document_id == document_id,
+            DocumentVersion.version_number >= keyframe_number,
+            DocumentVersion.version_number <= version_number,
+        )
+        .order_by(DocumentVersion.version_number)
+    ).all()
+
+
+def _rebuild(chain: Sequence[DocumentVersion]) -> str:
+    content = chain[0].content
+    for version in chain[1:]:
+        content = version.content if version.content is not None else apply_delta(content, version.delta)
+    return content
+
+
+def get_version_content(db: Session, version: DocumentVersion) -> str:
+    """Return the full content of ``version``."""
+    if version.content is not None:
+        return version.content
+    return _rebuild(_chain(db, version.document_id, version.version_number))
+
+
+def get_content_by_number(db: Session, document_id: Any, version_number: int) -> Optional[str]:
+    """Return the full content of a version by number, or None if it does not exist."""
+    chain = _chain_or_none(db, document_id, version_number)
+    return _rebuild(chain) if chain else None
+
+
+def _chain_or_none(db: Session, document_id: Any, version_number: int) -> Optional[Sequence[DocumentVersion]]:
+    try:
+        chain = _chain(db, document_id, version_number)
+    except ValueError:
+        return None
+    if not chain or chain[-1].version_number != version_number:
+        return None
+    return chain
+
+
+def list_versions(db: Session, document_id: Any, organization_id: Any) -> Sequence[DocumentVersion]:
+    """Version rows newest first, without loading their content or deltas."""
+    return db.scalars(
+        select(DocumentVersion)
+        .options(defer(DocumentVersion.content), defer(DocumentVersion.delta))
+        .where(
+            DocumentVersion.document_id == document_id,
+            DocumentVersion.organization_id == organization_id,
+        )
+        .order_by(desc(DocumentVersion.version_number))
+    ).all()
+
+
+# ---------------------------------------------------------------------------
+# Writing versions
+# ---------------------------------------------------------------------------
+
+
+def _latest_version(db: Session, document_id: Any) -> Optional[DocumentVersion]:
+    return db.scalar(
+        select(DocumentVersion)
+        .where(DocumentVersion.document_id == document_id)
+        .order_by(desc(DocumentVersion.version_number))
+        .limit(1)
+    )
+
+
+def add_version(
+    db: Session,
+    *,
+    document_id: Any,
+    content: str,
+    organization_id: Any,
+    created_by_user_id: Any,
+    label: Optional[str] = None,
+    summary: Optional[str] = None,
+) -> DocumentVersion:
+    """
+    Append a version to a document's history.
+
+    Keyframe positions store the full content; other versions store a delta
+    against the previous version, unless the delta would not be smaller.
+    ``label`` defaults to ``v<number>``.
+
+    The version is flushed in a savepoint. If a concurrent writer took the
+    same number, the unique constraint rejects it and the version is rebuilt
+    against the new latest version, so a delta never has two possible bases.
+    """
+    for attempt in range(NUMBERING_ATTEMPTS):
+        latest = _latest_version(db, document_id)
+        version_number = (latest.version_number + 1) if latest else 1
+        version = DocumentVersion(
+            document_id=document_id,
+            version_number=version_number,
+            label=label or f"v{version_number}",
+            summary=summary,
+            organization_id=organization_id,
+            created_by_user_id=created_by_user_id,
+        )
+        delta = None
+        if latest is not None and not is_keyframe_number(version_number):
+            delta = encode_delta(get_version_content(db, latest), content)
+            if len(delta) >= len(content.encode("utf-8")):
+                delta = None
+        if delta is None:
+            version.content = content
+        else:
+            version.delta = delta
+        try:
+            with db.begin_nested():
+                db.add(version)
+        except IntegrityError:
+            if attempt == NUMBERING_ATTEMPTS - 1:
+                raise
+            continue
+        return version
+
+
+def compact_history(db: Session, document_id: Any) -> int:
+    """
+    Rewrite a document's stored full copies into keyframes and deltas.
+
+    Returns:
+        Number of versions converted to deltas
+    """
+    versions = db.scalars(
+        select(DocumentVersion)
+        .where(DocumentVersion.document_id == document_id)
+        .order_by(DocumentVersion.version_number)
+    ).all()
+    converted = 0
+    previous: Optional[str] = None
+    for position, version in enumerate(versions):
+        content = version.content if version.content is not None else apply_delta(previous, version.delta)
+        if position and version.content is not None and not is_keyframe_number(version.version_number):
+            delta = encode_delta(previous, content)
+            if len(delta) < len(content.encode("utf-8")):
+                version.delta = delta
+                version.content = None
+                converted += 1
+        previous = content
+    return converted
+
+
+# ---------------------------------------------------------------------------
+# Diffs
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class VersionDiff:
+    from_version: int
+    to_version: int
+    additions: int
+    deletions: int
+    diff: str
+
+
+def diff_versions(
+    db: Session,
+    document_id: Any,
+    from_version: int,
+    to_version: int,
+    *,
+    context: int = 3,
+) -> Optional[VersionDiff]:
+    """
+    Unified line diff between two versions of a document.
+
+    Both versions are rebuilt from a single ordered read when they share a
+    keyframe chain. Returns None if either version does not exist.
+    """
+    low, high = sorted((from_version, to_version))
+    chain = _chain_or_none(db, document_id, high)
+    if chain is None:
+        return None
+    contents: Dict[int, str] = {}
+    content: Optional[str] = None
+    for version in chain:
+        content = version.content if version.content is not None else apply_delta(content, version.delta)
+        contents[version.version_number] = content
+    if low not in contents:
+        low_content = get_content_by_number(db, document_id, low)
+        if low_content is None:
+            return None
+        contents[low] = low_content
+
+    lines = list(
+        difflib.unified_diff(
+            contents[from_version].splitlines(keepends=True),
+            contents[to_version].splitlines(keepends=True),
+            fromfile=f"v{from_version}",
+            tofile=f"v{to_version}",
+            n=context,
+        )
+    )
+    return VersionDiff(
+        from_version=from_version,
+        to_version=to_version,
+        additions=sum(1 for line in lines if line.startswith("+") and not line.startswith("+++")),
+        deletions=sum(1 for line in lines if line.startswith("-") and not line.startswith("---")),
+        # Keep the output line-oriented even when a side lacks a trailing newline
+        diff="".join(line if line.endswith("\n") else line + "\n" for line in lines),
+    )
@@ -2,6 +2,12 @@
 
 Provides outbound email sending, template rendering, and queue helpers that
 back the tests in `backend/tests/test_email_service.py`.
+
+Messages go through one long-lived :class:`EmailTransport` (a pooled
+``httpx.AsyncClient`` with keep-alive, a connection cap and a request rate
+limit). Templates are compiled once and cached until their files change, and
+:func:`send_template_batch` packs many recipients of one template into each
+provider request using SendGrid personalizations.
 """
 from __future__ import annotations
 
@@ -9,14 +15,19 @@ import json
 import logging
 import asyncio
 import os
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional, Sequence, Tuple
 
 import httpx
 from sqlalchemy.orm import Session
 
 from app.models.email_queue import EmailQueue
+from app.utils.template_engine import CompiledTemplate
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +39,238 @@ class EmailServiceError(Exception):
 EMAIL_TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates" / "emails"
 MAX_RETRY_ATTEMPTS = 3
 
+# Email templates use ``{{ { name } }}`` placeholders
+EMAIL_VARIABLE_PATTERN = re.compile(r"\{\{ \{ (\w+) \} \}\}")
+
+DEFAULT_PROVIDER_URL = "https://api.sendgrid.com/v3/mail/send"
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_REQUESTS_PER_SECOND = 10.0
+REQUEST_TIMEOUT_SECONDS = 10.0
+# SendGrid accepts at most 1,000 personalizations per mail/send request
+MAX_PERSONALIZATIONS = 1000
+
+SENDER = {"email": "notifications@apexdeliver.com", "name": "ApexDeliver"}
+
+
+# ---------------------------------------------------------------------------
+# Transport
+# ---------------------------------------------------------------------------
+
+
+class EmailTransport:
+    """
+    Pooled HTTP transport for the email provider API.
+
+    Connections are kept alive between messages, at most ``max_connections``
+    requests are in flight, and requests are spaced to stay under
+    ``requests_per_second``. An ``httpx.AsyncClient`` belongs to the event loop
+    it was created on, so a new client is opened when called from another loop
+    (e.g. successive Celery tasks that each run their own loop). Each client is
+    closed on its own loop: by :meth:`aclose` (tasks call :func:`close_transport`
+    before their loop ends), or at the latest when ``asyncio.run`` shuts the
+    loop down.
+    """
+
+    def __init__(
+        self,
+        *,
+        api_url: str = DEFAULT_PROVIDER_URL,
+        api_key: Optional[str] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        timeout: float = REQUEST_TIMEOUT_SECONDS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.api_url = api_url
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self.requests_per_second = requests_per_second
+        self.timeout = timeout
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._closer: Optional[AsyncGenerator[None, None]] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._rate_lock: Optional[asyncio.Lock] = None
+        self._next_slot = 0.0
+
+    async def _ensure_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._discard_client()
+            headers = {"Content-Type": "application/json"}
+            if self.api_key:
+                headers["Authorization"] = f"Bearer {self.api_key}"
+            client = httpx.AsyncClient(
+                headers=headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                transport=self._transport,
+            )
+            # The loop finalizes started async generators when it shuts down,
+            # which closes the client even if nobody calls aclose().
+            closer = _close_at_loop_shutdown(client)
+            await closer.__anext__()
+            self._client, self._closer, self._loop = client, closer, loop
+            self._semaphore = asyncio.Semaphore(self.max_connections)
+            self._rate_lock = asyncio.Lock()
+        return self._client
+
+    def _discard_client(self) -> None:
+        """Close the client of a previous loop, if that loop can still run it."""
+        closer, loop = self._closer, self._loop
+        self._client = self._closer = None
+        if closer is None or loop is None or loop.is_closed():
+            return  # Already closed when its loop shut down
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(closer.aclose(), loop)
+        else:
+            logger.debug("Email transport client left for its idle loop to finalize")
+
+    async def _wait_for_slot(self) -> None:
+        if self.requests_per_second <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        async with self._rate_lock:
+            now = loop.time()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1.0 / self.requests_per_second
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def post(self, payload: Dict[str, Any]) -> httpx.Response:
+        """Send one mail/send request, raising for non-2xx responses."""
+        client = await self._ensure_client()
+        async with self._semaphore:
+            await self._wait_for_slot()
+            response = await client.post(self.api_url, json=payload)
+        response.raise_for_status()
+        return response
+
+    async def aclose(self) -> None:
+        """Close the client; call from the loop that is using it."""
+        if self._loop is not asyncio.get_running_loop():
+            self._discard_client()
+            return
+        closer, self._client, self._closer = self._closer, None, None
+        if closer is not None:
+            await closer.aclose()
+
+
+async def _close_at_loop_shutdown(client: httpx.AsyncClient) -> AsyncGenerator[None, None]:
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+_transport: Optional[EmailTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> EmailTransport:
+    """Return the process-wide email transport, configured from the environment."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = EmailTransport(
+                api_url=os.getenv("EMAIL_PROVIDER_URL", DEFAULT_PROVIDER_URL),
+                api_key=os.getenv("SENDGRID_API_KEY") or os.getenv("RESEND_API_KEY"),
+                max_connections=int(os.getenv("EMAIL_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+                requests_per_second=float(os.getenv("EMAIL_REQUESTS_PER_SECOND", DEFAULT_REQUESTS_PER_SECOND)),
+            )
+        return _transport
+
+
+def set_transport(transport: Optional[EmailTransport]) -> None:
+    """Replace the shared transport (tests, or reconfiguration); None rebuilds it lazily."""
+    global _transport
+    with _transport_lock:
+        _transport = transport
+
+
+async def close_transport() -> None:
+    """Close the shared transport's connections; call before a task's event loop ends."""
+    if _transport is not None:
+        await _transport.aclose()
+
+
+# ---------------------------------------------------------------------------
+# Templates
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class EmailTemplate:
+    """Compiled HTML and optional plain-text bodies of an email template."""
+
+    html: CompiledTemplate
+    text: Optional[CompiledTemplate]
+
+    def render(self, data: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            "html_content": self.html.render(data),
+            "text_content": self.text.render(data) if self.text else "",
+        }
+
+
+_template_cache: Dict[str, Tuple[Tuple[int, Optional[int]], EmailTemplate]] = {}
+_template_cache_lock = threading.Lock()
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def load_template(template_name: str) -> EmailTemplate:
+    """
+    Return the compiled template, reading it from disk only when it changed.
+
+    Raises:
+        ValueError: If the HTML template does not exist
+    """
+    html_path = EMAIL_TEMPLATES_DIR / f"{template_name}.html"
+    text_path = EMAIL_TEMPLATES_DIR / f"{template_name}.txt"
+    version = (_mtime_ns(html_path), _mtime_ns(text_path))
+    if version[0] is None:
+        raise ValueError("Template not found")
+
+    with _template_cache_lock:
+        cached = _template_cache.get(template_name)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    text_source = text_path.read_text(encoding="utf-8") if version[1] is not None else None
+    template = EmailTemplate(
+        html=CompiledTemplate(html_path.read_text(encoding="utf-8"), EMAIL_VARIABLE_PATTERN),
+        text=CompiledTemplate(text_source, EMAIL_VARIABLE_PATTERN) if text_source is not None else None,
+    )
+    with _template_cache_lock:
+        _template_cache[template_name] = (version, template)
+    return template
+
+
+def clear_template_cache() -> None:
+    with _template_cache_lock:
+        _template_cache.clear()
+
+
+def _template_dict(template_data: Any) -> Dict[str, Any]:
+    if isinstance(template_data, str):
+        return json.loads(template_data) if template_data else {}
+    return template_data or {}
+
+
+# ---------------------------------------------------------------------------
+# Sending
+# ---------------------------------------------------------------------------
+
 
 async def send_email(
     *,
@@ -36,10 +279,7 @@ async def send_email(
     html_content: str,
     text_content: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Send an email via SendGrid/Resend (stubbed for TDD)."""
-
-    api_key = os.getenv("SENDGRID_API_KEY") or os.getenv("RESEND_API_KEY")
-    api_url = os.getenv("EMAIL_PROVIDER_URL", "https://api.sendgrid.com/v3/mail/send")
+    """Send an email via SendGrid/Resend over the shared transport."""
 
     payload = {
         "personalizations": [
@@ -48,7 +288,7 @@ async def send_email(
                 "subject": subject,
             }
         ],
-        "from": {"email": "notifications@apexdeliver.com", "name": "ApexDeliver"},
+        "from": SENDER,
         "content": [
             {"type": "text/html", "value": html_content},
         ],
@@ -57,22 +297,15 @@ async def send_email(
     if text_content:
         payload["content"].append({"type": "text/plain", "value": text_content})
 
-    headers = {
-        "Content-Type": "application/json",
-    }
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
-
     try:
-        response = await asyncio.get_running_loop().run_in_executor(None, lambda: httpx.post(api_url, headers=headers, json=payload, timeout=10))
-        response.raise_for_status()
+        response = await get_transport().post(payload)
         return {
             "status": "sent",
             "to_email": to_email,
             "subject": subject,
             "provider_status": response.status_code,
         }
-    except Exception as exc:  # pragma: no cover
+    except Exception as exc:
         logger.exception("Failed to send email", exc_info=exc)
         return {
             "status": "failed",
@@ -82,37 +315,130 @@ async def send_email(
         }
 
 
-async def render_template(*, template_name: str, template_data: Dict[str, Any]) -> Dict[str, str]:
-    """Render an email template from disk using naive replacement."""
+@dataclass
+class BatchRecipient:
+    """One recipient of a templated batch send."""
 
-    template_path_html = EMAIL_TEMPLATES_DIR / f"{template_name}.html"
-    template_path_txt = EMAIL_TEMPLATES_DIR / f"{template_name}.txt"
+    to_email: str
+    subject: str
+    template_data: Dict[str, Any] = field(default_factory=dict)
 
-    if not template_path_html.exists():
-        raise ValueError("Template not found")
 
-    html_content = template_path_html.read_text(encoding="utf-8")
-    text_content = template_path_txt.read_text(encoding="utf-8") if template_path_txt.exists() else ""
+def _substitution_token(name: str) -> str:
+    return f"[%{name}%]"
 
-    template_dict: Dict[str, Any]
-    if isinstance(template_data, str):
-        template_dict = json.loads(template_data) if template_data else {}
-    else:
-        template_dict = template_data or {}
 
-    def apply(template: str) -> str:
-        rendered = template
-        for key, value in template_dict.items():
-            # Replace {{ { key } }} pattern (with spaces)
-            # Need to match literal: {{ { event_name } }}
-            pattern = "{{ { " + key + " } }}"
-            rendered = rendered.replace(pattern, str(value))
-        return rendered
+def build_batch_payloads(
+    template: EmailTemplate,
+    recipients: Sequence[BatchRecipient],
+    *,
+    max_personalizations: int = MAX_PERSONALIZATIONS,
+) -> List[Dict[str, Any]]:
+    """
+    Pack ``recipients`` into as few provider requests as possible.
+
+    The template body is sent once per request with a substitution token in
+    place of each variable; every personalization carries the recipient's own
+    values. Variables a recipient has no value for keep their placeholder,
+    matching :func:`render_template`.
+    """
+    compiled = [template.html] + ([template.text] if template.text else [])
+    placeholders: Dict[str, str] = {}
+    for part in compiled:
+        for name, placeholder in zip(part.names, part.placeholders):
+            placeholders.setdefault(name, placeholder)
+    tokens = {name: _substitution_token(name) for name in placeholders}
+
+    content = [{"type": "text/html", "value": template.html.render(tokens)}]
+    if template.text:
+        text_value = template.text.render(tokens)
+        if text_value:
+            content.append({"type": "text/plain", "value": text_value})
+
+    payloads: List[Dict[str, Any]] = []
+    for start in range(0, len(recipients), max_personalizations):
+        personalizations = []
+        for recipient in recipients[start:start + max_personalizations]:
+            data = _template_dict(recipient.template_data)
+            personalization: Dict[str, Any] = {
+                "to": [{"email": recipient.to_email}],
+                "subject": recipient.subject,
+            }
+            if tokens:
+                personalization["substitutions"] = {
+                    token: str(data[name]) if name in data else placeholders[name]
+                    for name, token in tokens.items()
+                }
+            personalizations.append(personalization)
+        payloads.append({"personalizations": personalizations, "from": SENDER, "content": content})
+    return payloads
 
-    return {
-        "html_content": apply(html_content),
-        "text_content": apply(text_content),
-    }
+
+async def send_template_batch(
+    *,
+    template_name: str,
+    recipients: Sequence[BatchRecipient],
+) -> List[Dict[str, Any]]:
+    """
+    Send one template to many recipients.
+
+    Requests for successive chunks run concurrently, bounded by the transport.
+    When the provider rejects a request with a 4xx (e.g. for one invalid
+    address), it is split in halves and retried down to single recipients,
+    so only the rejected recipients fail.
+
+    Returns:
+        One result per recipient, in order, shaped like :func:`send_email`'s
+
+    Raises:
+        ValueError: If the template does not exist
+    """
+    template = load_template(template_name)
+    size = MAX_PERSONALIZATIONS
+    payloads = build_batch_payloads(template, recipients, max_personalizations=size)
+    transport = get_transport()
+
+    async def post(payload: Dict[str, Any], chunk: Sequence[BatchRecipient]) -> List[Dict[str, Any]]:
+        try:
+            response = await transport.post(payload)
+            outcome: Dict[str, Any] = {"status": "sent", "provider_status": response.status_code}
+        except Exception as exc:
+            if len(chunk) > 1 and _is_request_rejection(exc):
+                middle = len(chunk) // 2
+                personalizations = payload["personalizations"]
+                first, second = await asyncio.gather(
+                    post({**payload, "personalizations": personalizations[:middle]}, chunk[:middle]),
+                    post({**payload, "personalizations": personalizations[middle:]}, chunk[middle:]),
+                )
+                return first + second
+            logger.exception("Failed to send %d emails (%s)", len(chunk), template_name, exc_info=exc)
+            outcome = {"status": "failed", "error": str(exc)}
+        return [{**outcome, "to_email": r.to_email, "subject": r.subject} for r in chunk]
+
+    results = await asyncio.gather(
+        *(post(payload, recipients[index * size:(index + 1) * size]) for index, payload in enumerate(payloads))
+    )
+    return [result for chunk in results for result in chunk]
+
+
+def _is_request_rejection(exc: Exception) -> bool:
+    # A 4xx other than rate limiting means the provider refused something in
+    # the request itself; server and network errors say nothing about it.
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return False
+    status = exc.response.status_code
+    return 400 <= status < 500 and status != 429
+
+
+async def render_template(*, template_name: str, template_data: Dict[str, Any]) -> Dict[str, str]:
+    """Render an email template, compiling it on first use."""
+
+    return load_template(template_name).render(_template_dict(template_data))
+
+
+# ---------------------------------------------------------------------------
+# Queue
+# ---------------------------------------------------------------------------
 
 
 async def queue_email(
@@ -158,6 +484,17 @@ async def retry_failed_email(*, db: Session, email_id: str) -> Dict[str, Any]:
     return await process_email_entry(db=db, email=email)
 
 
+def _record_result(email: EmailQueue, result: Dict[str, Any], now: datetime) -> None:
+    email.retry_count += 1
+    email.updated_at = now
+    email.status = result.get("status", "failed")
+    if email.status == "failed":
+        email.error_message = result.get("error")
+    else:
+        email.sent_at = now
+        email.error_message = None
+
+
 async def process_email_entry(*, db: Session, email: EmailQueue) -> Dict[str, Any]:
     """Render, send, and persist delivery details for a queued email."""
 
@@ -172,16 +509,49 @@ async def process_email_entry(*, db: Session, email: EmailQueue) -> Dict[str, An
         text_content=rendered.get("text_content"),
     )
 
-    email.retry_count += 1
-    email.updated_at = datetime.now(timezone.utc)
-    email.status = result.get("status", "failed")
-    if email.status == "failed":
-        email.error_message = result.get("error")
-    else:
-        email.sent_at = datetime.now(timezone.utc)
-        email.error_message = None
+    _record_result(email, result, datetime.now(timezone.utc))
     db.add(email)
     db.commit()
 
     return result
 
+
+async def process_email_entries(*, db: Session, emails: Sequence[EmailQueue]) -> List[Dict[str, Any]]:
+    """
+    Send queued emails in per-template batches and persist every outcome.
+
+    Emails sharing a template go out through :func:`send_template_batch`;
+    templates are sent concurrently and all status updates are committed
+    together. A missing template fails its emails instead of raising.
+
+    Returns:
+        One result per email, in order
+    """
+    by_template: Dict[str, List[EmailQueue]] = defaultdict(list)
+    for email in emails:
+        by_template[email.template_name].append(email)
+
+    results: Dict[int, Dict[str, Any]] = {}
+
+    async def deliver(template_name: str, group: List[EmailQueue]) -> None:
+        try:
+            outcomes = await send_template_batch(
+                template_name=template_name,
+                recipients=[
+                    BatchRecipient(email.to_email, email.subject, email.get_template_data())
+                    for email in group
+                ],
+            )
+        except ValueError as exc:
+            outcomes = [{"status": "failed", "error": str(exc)} for _ in group]
+        for email, outcome in zip(group, outcomes):
+            results[id(email)] = outcome
+
+    await asyncio.gather(*(deliver(name, group) for name, group in by_template.items()))
+
+    now = datetime.now(timezone.utc)
+    for email in emails:
+        _record_result(email, results[id(email)], now)
+    db.commit()
+
+    return [results[id(email)] for email in emails]
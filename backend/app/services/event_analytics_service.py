@@ -0,0 +1,159 @@
+"""Event analytics aggregation and incremental maintenance (F-012)."""
+from __future__ import annotations
+
+from datetime import datetime, UTC
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.models.event import Event, EventAnalytics, EventRegistration, EventSession, RegistrationStatus
+
+# (registrations, attendees, revenue) contributed by one registration
+Contribution = Tuple[int, int, Decimal]
+
+_NONE: Contribution = (0, 0, Decimal("0"))
+
+
+def registration_contribution(registration: EventRegistration) -> Contribution:
+    """Return what a registration adds to its event's analytics."""
+    attended = 1 if registration.status == RegistrationStatus.ATTENDED else 0
+    revenue = Decimal(registration.payment_amount or 0) if registration.payment_status == "paid" else Decimal("0")
+    return (1, attended, revenue)
+
+
+def _empty_session_metrics() -> Dict[str, Any]:
+    return {"registrations": 0, "attendees": 0, "revenue": 0.0}
+
+
+def compute_event_metrics(db: Session, event_id: str) -> Dict[str, Any]:
+    """
+    Aggregate registrations, attendees and revenue for an event and its sessions.
+
+    Registrations are grouped by ``session_id`` in a single query; event totals
+    are the sum over all groups, including registrations without a session.
+    """
+    attended = case((EventRegistration.status == RegistrationStatus.ATTENDED, 1), else_=0)
+    paid = case((EventRegistration.payment_status == "paid", EventRegistration.payment_amount), else_=0)
+    rows = db.execute(
+        select(
+            EventRegistration.session_id,
+            func.count(EventRegistration.id),
+            func.coalesce(func.sum(attended), 0),
+            func.coalesce(func.sum(paid), 0),
+        )
+        .where(EventRegistration.event_id == event_id)
+        .group_by(EventRegistration.session_id)
+    ).all()
+
+    session_ids = db.scalars(select(EventSession.id).where(EventSession.event_id == event_id)).all()
+    session_metrics = {str(session_id): _empty_session_metrics() for session_id in session_ids}
+
+    total_registrations = 0
+    total_attendees = 0
+    total_revenue = Decimal("0.00")
+    for session_id, registrations, attendees, revenue in rows:
+        revenue = Decimal(revenue or 0)
+        total_registrations += registrations
+        total_attendees += int(attendees)
+        total_revenue += revenue
+        if session_id is not None and str(session_id) in session_metrics:
+            session_metrics[str(session_id)] = {
+                "registrations": registrations,
+                "attendees": int(attendees),
+                "revenue": float(revenue),
+            }
+
+    return {
+        "total_registrations": total_registrations,
+        "total_attendees": total_attendees,
+        "total_revenue": total_revenue,
+        "session_metrics": session_metrics,
+    }
+
+
+def rebuild_event_analytics(db: Session, event: Event) -> EventAnalytics:
+    """Recompute an event's analytics row from its registrations and commit it."""
+    metrics = compute_event_metrics(db, event.id)
+    analytics = db.scalar(
+        select(EventAnalytics).where(
+            EventAnalytics.event_id == event.id,
+            EventAnalytics.organization_id == event.organization_id,
+        )
+    )
+    if analytics is None:
+        analytics = EventAnalytics(
+            event_id=event.id,
+            organization_id=event.organization_id,
+            currency=event.currency,
+        )
+        db.add(analytics)
+
+    analytics.total_registrations = metrics["total_registrations"]
+    analytics.total_attendees = metrics["total_attendees"]
+    analytics.total_revenue = metrics["total_revenue"]
+    analytics.session_metrics = metrics["session_metrics"]
+    analytics.recorded_at = datetime.now(UTC)
+    db.commit()
+    db.refresh(analytics)
+    return analytics
+
+
+def _locked_analytics(db: Session, event_id: str) -> Optional[EventAnalytics]:
+    return db.scalar(
+        select(EventAnalytics).where(EventAnalytics.event_id == event_id).with_for_update()
+    )
+
+
+def apply_registration_change(
+    db: Session,
+    registration: EventRegistration,
+    before: Contribution = _NONE,
+    after: Optional[Contribution] = None,
+) -> None:
+    """
+    Fold one registration's change into its event's analytics row.
+
+    ``before`` is the registration's contribution prior to the change (nothing
+    for a new registration) and ``after`` defaults to its current one. The row
+    is updated in the caller's transaction; events whose analytics have not
+    been built yet are skipped, since the first read computes them in full.
+    """
+    after = registration_contribution(registration) if after is None else after
+    delta = tuple(new - old for new, old in zip(after, before))
+    if not any(delta):
+        return
+
+    analytics = _locked_analytics(db, registration.event_id)
+    if analytics is None:
+        return
+
+    registrations, attendees, revenue = delta
+    analytics.total_registrations = (analytics.total_registrations or 0) + registrations
+    analytics.total_attendees = (analytics.total_attendees or 0) + attendees
+    analytics.total_revenue = Decimal(analytics.total_revenue or 0) + revenue
+
+    if registration.session_id:
+        session_metrics = dict(analytics.session_metrics or {})
+        entry = dict(session_metrics.get(str(registration.session_id)) or _empty_session_metrics())
+        entry["registrations"] += registrations
+        entry["attendees"] += attendees
+        entry["revenue"] = float(Decimal(str(entry["revenue"])) + revenue)
+        session_metrics[str(registration.session_id)] = entry
+        analytics.session_metrics = session_metrics
+
+    analytics.recorded_at = datetime.now(UTC)
+
+
+def track_session(db: Session, session: EventSession, *, removed: bool = False) -> None:
+    """Add (or drop) a session's entry in its event's analytics row."""
+    analytics = _locked_analytics(db, session.event_id)
+    if analytics is None:
+        return
+    session_metrics = dict(analytics.session_metrics or {})
+    if removed:
+        session_metrics.pop(str(session.id), None)
+    else:
+        session_metrics.setdefault(str(session.id), _empty_session_metrics())
+    analytics.session_metrics = session_metrics
@@ -4,6 +4,7 @@ from __future__ import annotations
 import json
 import logging
 import os
+import time
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any, Dict, Optional
@@ -21,6 +22,7 @@ from app.models.event import (
 )
 from app.models.event_payment import EventPayment, EventPaymentReceipt, PaymentStatus
 from app.models.user import User
+from app.services import event_analytics_service, ticket_inventory_service
 
 logger = logging.getLogger(__name__)
 
@@ -113,6 +115,8 @@ async def create_checkout_session(
 ) -> Dict[str, Any]:
     event = _require_event(db, event_id)
     user = _require_user(db, user_id)
+    # Abandoned checkouts return their tickets here too, not only in the sweeper
+    await ticket_inventory_service.release_expired_holds(db)
     ticket = _find_ticket(db, event_id, ticket_type.lower())
     if not ticket:
         raise ValueError("Invalid ticket type")
@@ -121,10 +125,18 @@ async def create_checkout_session(
 
     available = None
     if ticket.quantity_available is not None:
-        available = ticket.quantity_available - ticket.quantity_sold
+        available = ticket.quantity_available - (ticket.quantity_sold or 0)
         if available < quantity:
             raise ValueError("Ticket sold out")
 
+    # With Redis available, take the tickets now and hold them for the
+    # checkout window; otherwise they are taken when the payment succeeds.
+    hold_tickets = ticket_inventory_service.holds_enabled()
+    if hold_tickets:
+        if ticket_inventory_service.reserve_tickets(db, ticket.id, quantity) is None:
+            raise ticket_inventory_service.TicketSoldOutError("Ticket sold out")
+        db.commit()  # Don't keep the ticket row locked during the Stripe call
+
     amount_cents = int(Decimal(ticket.price) * 100) * quantity
 
     metadata = {
@@ -136,6 +148,10 @@ async def create_checkout_session(
     }
 
     if stripe and STRIPE_SECRET_KEY:
+        session_options: Dict[str, Any] = {}
+        if hold_tickets:
+            # Stripe must not accept payment after the hold has been released
+            session_options['expires_at'] = int(time.time()) + ticket_inventory_service.checkout_window_seconds()
         try:
             checkout_session = stripe.checkout.Session.create(
                 payment_method_types=['card'],
@@ -157,9 +173,13 @@ async def create_checkout_session(
                 + f'/events/{event_id}/payment/cancel',
                 metadata=metadata,
                 customer_email=user.email,
+                **session_options,
             )
         except StripeError as exc:  # pragma: no cover
             logger.error("Stripe error creating checkout session: %s", exc)
+            if hold_tickets:
+                ticket_inventory_service.release_tickets(db, ticket.id, quantity)
+                db.commit()
             raise ValueError("Failed to create checkout session") from exc
     else:
         class _DummySession:
@@ -171,6 +191,17 @@ async def create_checkout_session(
         checkout_session = _DummySession()
 
     raw_intent = getattr(checkout_session, 'payment_intent', None) or checkout_session.id
+    if hold_tickets:
+        try:
+            held = await ticket_inventory_service.place_hold(str(raw_intent), ticket.id, quantity)
+        except Exception:
+            logger.exception("Failed to place ticket hold for %s", raw_intent)
+            held = False
+        if not held:
+            # Without a hold nothing would ever return the reserved tickets
+            ticket_inventory_service.release_tickets(db, ticket.id, quantity)
+            db.commit()
+            raise ValueError("Failed to create checkout session")
     payment = EventPayment(
         payment_intent_id=str(raw_intent),
         event_id=event_id,
@@ -263,6 +294,11 @@ async def handle_webhook(
         if payment:
             payment.status = PaymentStatus.FAILED
             db.commit()
+            ticket = _find_ticket(db, payment.event_id, payment.ticket_type)
+            if ticket:
+                await ticket_inventory_service.cancel_hold(
+                    db, payment.payment_intent_id, ticket.id, payment.quantity
+                )
         return {'status': 'failed', 'payment_intent_id': payment_intent_id}
 
     return {'status': 'unhandled', 'event_type': event_type}
@@ -286,6 +322,18 @@ async def assign_tickets(
     if not ticket:
         raise ValueError("Invalid ticket type")
 
+    # Tickets held at checkout are already taken; otherwise (no Redis, or the
+    # hold expired and was released) take them now.
+    if not await ticket_inventory_service.claim_hold(payment_intent_id, ticket.id, quantity):
+        if ticket_inventory_service.reserve_tickets(db, ticket.id, quantity) is None:
+            logger.error(
+                "Payment %s succeeded but fewer than %d %s tickets remain",
+                payment_intent_id,
+                quantity,
+                ticket.name,
+            )
+            raise ticket_inventory_service.TicketSoldOutError("Ticket sold out")
+
     registrations = []
     for _ in range(quantity):
         registration = EventRegistration(
@@ -305,7 +353,17 @@ async def assign_tickets(
         db.add(registration)
         registrations.append(registration)
 
-    ticket.quantity_sold = (ticket.quantity_sold or 0) + quantity
+    if registrations:
+        # Every ticket in the batch contributes the same registration and revenue
+        registrations_added, attendees_added, revenue_added = (
+            event_analytics_service.registration_contribution(registrations[0])
+        )
+        event_analytics_service.apply_registration_change(
+            db,
+            registrations[0],
+            after=(registrations_added * quantity, attendees_added * quantity, revenue_added * quantity),
+        )
+
     db.commit()
 
     return {
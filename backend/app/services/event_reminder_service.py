@@ -6,6 +6,7 @@ from typing import List
 import asyncio
 import logging
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.event import Event
@@ -52,7 +53,12 @@ def schedule_event_reminders(*, db: Session, event: Event, user_id: str) -> List
 
 
 def send_due_event_reminders(db: Session, limit: int = 50) -> int:
-    """Send reminder emails for reminders whose scheduled time has passed."""
+    """
+    Send reminder emails for reminders whose scheduled time has passed.
+
+    Events are loaded in one query and every due reminder goes out through a
+    single ``notification_service.send_notifications`` fan-out.
+    """
     now = datetime.now(UTC)
     due_reminders = (
         db.query(EventReminder)
@@ -64,49 +70,66 @@ def send_due_event_reminders(db: Session, limit: int = 50) -> int:
         .limit(limit)
         .all()
     )
+    if not due_reminders:
+        return 0
 
-    processed = 0
+    event_ids = {reminder.event_id for reminder in due_reminders}
+    events = {event.id: event for event in db.scalars(select(Event).where(Event.id.in_(event_ids)))}
+
+    outgoing: List[EventReminder] = []
+    items: List[notification_service.NotificationItem] = []
     for reminder in due_reminders:
-        try:
-            event = db.get(Event, reminder.event_id)
-            if not event:
-                reminder.status = "skipped"
-                reminder.error_message = "event missing"
-                continue
-
-            notification_type = _notification_type_for(reminder.reminder_type)
-            if not notification_type:
-                reminder.status = "skipped"
-                reminder.error_message = "unknown reminder type"
-                continue
-
-            data = {
-                "event_name": getattr(event, "name", "Event"),
-                "event_start": event.start_date.isoformat() if event.start_date else None,
-                "event_location": event.location or event.virtual_link or "Online",
-            }
-            asyncio.run(
-                notification_service.send_notification(
-                    db=db,
-                    notification_type=notification_type,
-                    user_id=reminder.user_id,
-                    data=data,
-                )
+        event = events.get(reminder.event_id)
+        if not event:
+            reminder.status = "skipped"
+            reminder.error_message = "event missing"
+            continue
+
+        notification_type = _notification_type_for(reminder.reminder_type)
+        if not notification_type:
+            reminder.status = "skipped"
+            reminder.error_message = "unknown reminder type"
+            continue
+
+        outgoing.append(reminder)
+        items.append(
+            notification_service.NotificationItem(
+                user_id=reminder.user_id,
+                notification_type=notification_type,
+                data={
+                    "event_name": getattr(event, "name", "Event"),
+                    "event_start": event.start_date.isoformat() if event.start_date else None,
+                    "event_location": event.location or event.virtual_link or "Online",
+                },
             )
+        )
+
+    try:
+        results = asyncio.run(notification_service.send_notifications(db=db, items=items)) if items else []
+    except Exception as exc:  # pragma: no cover
+        logger.exception("Failed to send %d event reminders", len(items))
+        results = [{"status": "failed", "error": str(exc)} for _ in items]
+
+    processed = 0
+    attempted_at = datetime.now(UTC)
+    for reminder, result in zip(outgoing, results):
+        status = result.get("status", "failed")
+        if status == "sent":
             reminder.status = "sent"
-            reminder.sent_at = datetime.now(UTC)
+            reminder.sent_at = attempted_at
             processed += 1
-        except Exception as exc:  # pragma: no cover
+        elif status == "skipped":
+            reminder.status = "skipped"
+            reminder.error_message = result.get("reason")
+        else:
             reminder.status = "failed"
-            reminder.error_message = str(exc)
-            logger.exception("Failed to send reminder %s", reminder.id)
-        finally:
-            reminder.attempts += 1
-            reminder.last_attempt_at = datetime.now(UTC)
-            db.add(reminder)
-
-    if due_reminders:
-        db.commit()
+            reminder.error_message = result.get("error")
+
+    for reminder in due_reminders:
+        reminder.attempts += 1
+        reminder.last_attempt_at = attempted_at
+
+    db.commit()
     return processed
 
 
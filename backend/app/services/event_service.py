@@ -1,10 +1,10 @@
 """Event Management Service (F-012)."""
 import logging
-from typing import List, Optional, Dict, Any
-from sqlalchemy import select, desc, func
+from typing import Iterator, List, Optional, Dict, Any
+from sqlalchemy import select, desc
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 from datetime import datetime, UTC
-from decimal import Decimal
 
 from app.models.event import (
     Event,
@@ -27,7 +27,8 @@ from app.schemas.event import (
     EventRegistrationCreate,
     EventRegistrationUpdate,
 )
-from app.services import event_reminder_service
+from app.services import event_analytics_service, event_reminder_service, ticket_inventory_service
+from app.utils.export_stream import iter_keyset
 
 logger = logging.getLogger(__name__)
 
@@ -178,6 +179,8 @@ class EventService:
             created_by_user_id=session_data.created_by_user_id,
         )
         db.add(session)
+        db.flush()
+        event_analytics_service.track_session(db, session)
         db.commit()
         db.refresh(session)
         return session
@@ -247,6 +250,7 @@ class EventService:
         if not session:
             return False
 
+        event_analytics_service.track_session(db, session, removed=True)
         db.delete(session)
         db.commit()
         return True
@@ -388,11 +392,6 @@ class EventService:
             if not ticket:
                 raise ValueError(f"Ticket {registration_data.ticket_id} not found")
 
-            # Check ticket availability
-            if ticket.quantity_available is not None:
-                if ticket.quantity_sold >= ticket.quantity_available:
-                    raise ValueError(f"Ticket {ticket.name} is sold out")
-
         # Verify session exists if provided
         session = None
         if registration_data.session_id:
@@ -425,15 +424,12 @@ class EventService:
             organization_id=registration_data.organization_id,
             registered_by_user_id=registration_data.registered_by_user_id,
         )
+        # Take the ticket atomically; the check and increment are one UPDATE
+        if ticket and ticket_inventory_service.reserve_tickets(db, ticket.id) is None:
+            raise ticket_inventory_service.TicketSoldOutError(f"Ticket {ticket.name} is sold out")
         db.add(registration)
 
-        # Update ticket quantity sold if ticket provided
-        if ticket:
-            ticket.quantity_sold += 1
-            if ticket.quantity_available is not None:
-                if ticket.quantity_sold >= ticket.quantity_available:
-                    ticket.status = TicketStatus.SOLD_OUT
-
+        event_analytics_service.apply_registration_change(db, registration)
         db.commit()
         db.refresh(registration)
 
@@ -478,6 +474,45 @@ class EventService:
 
         return list(db.scalars(query).all())
 
+    @staticmethod
+    def iter_registration_export(
+        db: Session,
+        event_id: str,
+        organization_id: str,
+        batch_size: int = 1000,
+    ) -> Iterator[Row]:
+        """Stream an event's registrations with their ticket names, newest first.
+
+        Tickets are joined once and rows are fetched in keyset-paginated
+        batches, so memory use does not grow with the number of attendees.
+        """
+        statement = (
+            select(
+                EventRegistration.id,
+                EventRegistration.attendee_name,
+                EventRegistration.attendee_email,
+                EventRegistration.attendee_phone,
+                EventTicket.name.label("ticket_name"),
+                EventRegistration.payment_amount,
+                EventRegistration.payment_status,
+                EventRegistration.status,
+                EventRegistration.checked_in,
+                EventRegistration.created_at,
+            )
+            .outerjoin(EventTicket, EventTicket.id == EventRegistration.ticket_id)
+            .where(
+                EventRegistration.event_id == event_id,
+                EventRegistration.organization_id == organization_id,
+            )
+        )
+        return iter_keyset(
+            db,
+            statement,
+            (EventRegistration.created_at, EventRegistration.id),
+            batch_size=batch_size,
+            descending=True,
+        )
+
     @staticmethod
     def update_registration(
         db: Session,
@@ -495,6 +530,7 @@ class EventService:
         if not registration:
             return None
 
+        before = event_analytics_service.registration_contribution(registration)
         update_dict = update_data.model_dump(exclude_unset=True)
         for field, value in update_dict.items():
             if field == "status":
@@ -502,10 +538,14 @@ class EventService:
             elif field == "checked_in" and value:
                 registration.checked_in = True
                 registration.checked_in_at = datetime.now(UTC)
+                # Checking in records attendance unless a status is set explicitly
+                if "status" not in update_dict:
+                    registration.status = RegistrationStatus.ATTENDED
             else:
                 setattr(registration, field, value)
 
         registration.updated_at = datetime.now(UTC)
+        event_analytics_service.apply_registration_change(db, registration, before)
         db.commit()
         db.refresh(registration)
         return registration
@@ -526,19 +566,14 @@ class EventService:
         if not registration:
             return False
 
-        # Update ticket quantity sold if ticket provided
-        if registration.ticket_id:
-            ticket = db.scalar(
-                select(EventTicket).where(EventTicket.id == registration.ticket_id)
-            )
-            if ticket:
-                ticket.quantity_sold = max(0, ticket.quantity_sold - 1)
-                if ticket.status == TicketStatus.SOLD_OUT and ticket.quantity_available:
-                    if ticket.quantity_sold < ticket.quantity_available:
-                        ticket.status = TicketStatus.ACTIVE
+        # Return the ticket to inventory if one was taken
+        if registration.ticket_id and registration.status != RegistrationStatus.CANCELLED:
+            ticket_inventory_service.release_tickets(db, registration.ticket_id)
 
+        before = event_analytics_service.registration_contribution(registration)
         registration.status = RegistrationStatus.CANCELLED
         registration.updated_at = datetime.now(UTC)
+        event_analytics_service.apply_registration_change(db, registration, before)
         db.commit()
         return True
 
@@ -552,145 +587,23 @@ class EventService:
         event_id: str,
         organization_id: str,
     ) -> Optional[EventAnalytics]:
-        """Get or create event analytics"""
+        """Get event analytics, building them on first access.
+
+        Registration, check-in and payment changes keep the row current, so
+        reads do not re-aggregate registrations.
+        """
         # Verify event exists and belongs to organization
         event = EventService.get_event(db, event_id, organization_id)
         if not event:
             return None
 
-        # Get or create analytics
         analytics = db.scalar(
             select(EventAnalytics).where(
                 EventAnalytics.event_id == event_id,
                 EventAnalytics.organization_id == organization_id,
             )
         )
+        if analytics:
+            return analytics
 
-        if not analytics:
-            # Calculate metrics
-            total_registrations = db.scalar(
-                select(func.count(EventRegistration.id))
-                .where(EventRegistration.event_id == event_id)
-            ) or 0
-
-            total_attendees = db.scalar(
-                select(func.count(EventRegistration.id))
-                .where(
-                    EventRegistration.event_id == event_id,
-                    EventRegistration.status == RegistrationStatus.ATTENDED,
-                )
-            ) or 0
-
-            total_revenue = db.scalar(
-                select(func.sum(EventRegistration.payment_amount))
-                .where(
-                    EventRegistration.event_id == event_id,
-                    EventRegistration.payment_status == "paid",
-                )
-            ) or Decimal("0.00")
-
-            # Calculate session metrics
-            sessions = EventService.list_sessions(db, event_id, organization_id)
-            session_metrics = {}
-            for session in sessions:
-                session_registrations = db.scalar(
-                    select(func.count(EventRegistration.id))
-                    .where(EventRegistration.session_id == session.id)
-                ) or 0
-                session_attendees = db.scalar(
-                    select(func.count(EventRegistration.id))
-                    .where(
-                        EventRegistration.session_id == session.id,
-                        EventRegistration.status == RegistrationStatus.ATTENDED,
-                    )
-                ) or 0
-                session_revenue = db.scalar(
-                    select(func.sum(EventRegistration.payment_amount))
-                    .where(
-                        EventRegistration.session_id == session.id,
-                        EventRegistration.payment_status == "paid",
-                    )
-                ) or Decimal("0.00")
-
-                session_metrics[str(session.id)] = {
-                    "registrations": session_registrations,
-                    "attendees": session_attendees,
-                    "revenue": float(session_revenue),
-                }
-
-            # Create analytics record
-            analytics = EventAnalytics(
-                event_id=event_id,
-                total_registrations=total_registrations,
-                total_attendees=total_attendees,
-                total_revenue=total_revenue,
-                currency=event.currency,
-                session_metrics=session_metrics,
-                organization_id=organization_id,
-            )
-            db.add(analytics)
-            db.commit()
-            db.refresh(analytics)
-        else:
-            # Update existing analytics
-            total_registrations = db.scalar(
-                select(func.count(EventRegistration.id))
-                .where(EventRegistration.event_id == event_id)
-            ) or 0
-
-            total_attendees = db.scalar(
-                select(func.count(EventRegistration.id))
-                .where(
-                    EventRegistration.event_id == event_id,
-                    EventRegistration.status == RegistrationStatus.ATTENDED,
-                )
-            ) or 0
-
-            total_revenue = db.scalar(
-                select(func.sum(EventRegistration.payment_amount))
-                .where(
-                    EventRegistration.event_id == event_id,
-                    EventRegistration.payment_status == "paid",
-                )
-            ) or Decimal("0.00")
-
-            analytics.total_registrations = total_registrations
-            analytics.total_attendees = total_attendees
-            analytics.total_revenue = total_revenue
-            analytics.recorded_at = datetime.now(UTC)
-
-            # Update session metrics
-            sessions = EventService.list_sessions(db, event_id, organization_id)
-            session_metrics = {}
-            for session in sessions:
-                session_registrations = db.scalar(
-                    select(func.count(EventRegistration.id))
-                    .where(EventRegistration.session_id == session.id)
-                ) or 0
-                session_attendees = db.scalar(
-                    select(func.count(EventRegistration.id))
-                    .where(
-                        EventRegistration.session_id == session.id,
-                        EventRegistration.status == RegistrationStatus.ATTENDED,
-                    )
-                ) or 0
-                session_revenue = db.scalar(
-                    select(func.sum(EventRegistration.payment_amount))
-                    .where(
-                        EventRegistration.session_id == session.id,
-                        EventRegistration.payment_status == "paid",
-                    )
-                ) or Decimal("0.00")
-
-                session_metrics[str(session.id)] = {
-                    "registrations": session_registrations,
-                    "attendees": session_attendees,
-                    "revenue": float(session_revenue),
-                }
-
-            analytics.session_metrics = session_metrics
-            db.commit()
-            db.refresh(analytics)
-
-        return analytics
-
+        return event_analytics_service.rebuild_event_analytics(db, event)
@@ -5,8 +5,11 @@ Handles notification sending with preference checking.
 from __future__ import annotations
 
 import logging
-from typing import Optional, Dict, Any
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Iterable, List, Sequence
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.user_notification_preferences import UserNotificationPreferences
@@ -31,6 +34,9 @@ NOTIFICATION_PREFERENCE_MAP = {
     "security_alert": "security_alerts",
 }
 
+# Bound on IN-list sizes when prefetching users and preferences
+PREFETCH_CHUNK_SIZE = 500
+
 
 # ============================================================================
 # Notification Sending
@@ -105,11 +111,7 @@ async def _send_email_notification(
     template_name = _get_template_name(notification_type)
     
     # Prepare template data
-    template_data = {
-        "user_name": f"{user.first_name} {user.last_name}".strip() or user.email,
-        "user_email": user.email,
-        **data,
-    }
+    template_data = {**_user_template_data(user), **data}
     
     # Render template
     try:
@@ -135,6 +137,123 @@ async def _send_email_notification(
     return result
 
 
+def _user_template_data(user) -> Dict[str, Any]:
+    return {
+        "user_name": f"{user.first_name or ''} {user.last_name or ''}".strip() or user.email,
+        "user_email": user.email,
+    }
+
+
+# ============================================================================
+# Batched Fan-out
+# ============================================================================
+
+@dataclass
+class NotificationItem:
+    """One notification to deliver through :func:`send_notifications`."""
+
+    user_id: str
+    notification_type: str
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+def _chunks(values: Sequence[str], size: int = PREFETCH_CHUNK_SIZE) -> Iterable[Sequence[str]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _prefetch_users(db: Session, user_ids: Sequence[str]) -> Dict[str, Any]:
+    from app.models.user import User
+
+    users: Dict[str, Any] = {}
+    for chunk in _chunks(user_ids):
+        users.update((user.id, user) for user in db.scalars(select(User).where(User.id.in_(chunk))))
+    return users
+
+
+def _prefetch_preferences(db: Session, user_ids: Sequence[str]) -> Dict[str, UserNotificationPreferences]:
+    """Load preferences for ``user_ids``; users without any get unsaved all-enabled defaults."""
+    prefs: Dict[str, UserNotificationPreferences] = {}
+    for chunk in _chunks(user_ids):
+        prefs.update(
+            (row.user_id, row)
+            for row in db.scalars(
+                select(UserNotificationPreferences).where(UserNotificationPreferences.user_id.in_(chunk))
+            )
+        )
+    for user_id in user_ids:
+        if user_id not in prefs:
+            prefs[user_id] = _default_preferences(user_id)
+    return prefs
+
+
+async def send_notifications(
+    db: Session,
+    items: Sequence[NotificationItem],
+) -> List[Dict[str, Any]]:
+    """
+    Send many email notifications with a fixed number of queries.
+    
+    Users and their preferences are prefetched in bulk, and notifications
+    sharing a template are handed to ``email_service.send_template_batch``
+    together, so each template is rendered once per provider request rather
+    than once per recipient.
+    
+    Args:
+        db: Database session
+        items: Notifications to send
+        
+    Returns:
+        One result per item, in order, shaped like send_notification's
+    """
+    user_ids = list(dict.fromkeys(item.user_id for item in items))
+    users = _prefetch_users(db, user_ids)
+    prefs = _prefetch_preferences(db, [user_id for user_id in user_ids if user_id in users])
+    
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    batches: Dict[str, List[int]] = defaultdict(list)
+    recipients: Dict[int, email_service.BatchRecipient] = {}
+    
+    for index, item in enumerate(items):
+        user = users.get(item.user_id)
+        if user is None or not user.email:
+            results[index] = {'status': 'failed', 'error': f'User not found: {item.user_id}'}
+            continue
+        if not _preference_allows(prefs[item.user_id], item.notification_type):
+            results[index] = {
+                'status': 'skipped',
+                'reason': 'User preference disabled',
+                'notification_type': item.notification_type,
+            }
+            continue
+        recipients[index] = email_service.BatchRecipient(
+            to_email=user.email,
+            subject=_get_email_subject(item.notification_type, item.data),
+            template_data={**_user_template_data(user), **item.data},
+        )
+        batches[_get_template_name(item.notification_type)].append(index)
+    
+    # Persist defaults only now: committing earlier would expire the prefetched rows
+    defaults = [row for row in prefs.values() if row not in db]
+    if defaults:
+        db.add_all(defaults)
+        db.commit()
+    
+    for template_name, indexes in batches.items():
+        try:
+            outcomes = await email_service.send_template_batch(
+                template_name=template_name,
+                recipients=[recipients[index] for index in indexes],
+            )
+        except ValueError as e:
+            logger.error(f"Failed to render template {template_name}: {e}")
+            outcomes = [{'status': 'failed', 'error': f'Template error: {str(e)}'} for _ in indexes]
+        for index, outcome in zip(indexes, outcomes):
+            results[index] = outcome
+    
+    return results
+
+
 def _get_template_name(notification_type: str) -> str:
     """Get template name for notification type."""
     template_map = {
@@ -201,21 +320,30 @@ async def check_preferences(
     
     if not prefs:
         # Create default preferences (all enabled)
-        prefs = UserNotificationPreferences(
-            user_id=user_id,
-            email_enabled=True,
-            event_ticket_confirmation=True,
-            event_reminders=True,
-            community_comments=True,
-            community_reactions=True,
-            community_mentions=True,
-            system_updates=True,
-            security_alerts=True,
-        )
+        prefs = _default_preferences(user_id)
         db.add(prefs)
         db.commit()
         db.refresh(prefs)
     
+    return _preference_allows(prefs, notification_type)
+
+
+def _default_preferences(user_id: str) -> UserNotificationPreferences:
+    return UserNotificationPreferences(
+        user_id=user_id,
+        email_enabled=True,
+        event_ticket_confirmation=True,
+        event_reminders=True,
+        community_comments=True,
+        community_reactions=True,
+        community_mentions=True,
+        system_updates=True,
+        security_alerts=True,
+    )
+
+
+def _preference_allows(prefs: UserNotificationPreferences, notification_type: str) -> bool:
+    """Apply the global and per-type email switches."""
     # Check global email setting
     if not prefs.email_enabled:
         return False
@@ -5,12 +5,14 @@ Uses SendGrid for email delivery
 
 from __future__ import annotations
 
+import asyncio
 import httpx
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import Optional, List
+from decimal import Decimal
+from typing import Iterable, Optional, List, Sequence, Set, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import insert, select
 
 from app.core.config import get_settings
 from app.models.pmi import (
@@ -19,6 +21,7 @@ from app.models.pmi import (
     PMIRisk,
     PMISynergy,
     PMIDayOneChecklist,
+    PMINotificationLog,
     PMIRiskSeverity,
 )
 from app.models.user import User
@@ -27,6 +30,172 @@ from app.models.organization import Organization
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Ledger notification types
+MILESTONE_REMINDER = "milestone_reminder"
+RISK_ALERT = "risk_alert"
+SYNERGY_ALERT = "synergy_alert"
+DAY_ONE_WARNING = "day_one_warning"
+
+
+# ============================================================================
+# Messages
+# ============================================================================
+
+def milestone_reminder_message(
+    *,
+    owner_email: str,
+    milestone_name: str,
+    workstream_name: str,
+    target_date: datetime,
+    project_name: str,
+    days_until_due: int,
+) -> Tuple[str, str]:
+    """Subject and body of a milestone reminder."""
+    subject = f"PMI Milestone Reminder: {milestone_name} due in {days_until_due} days"
+    body = f"""
+Hello {owner_email},
+
+This is a reminder that the following PMI milestone is approaching:
+
+Milestone: {milestone_name}
+Workstream: {workstream_name}
+Due Date: {target_date.strftime('%Y-%m-%d')}
+Project: {project_name}
+
+Please ensure all necessary preparations are in place.
+
+Best regards,
+ApexDeliver PMI System
+"""
+    return subject, body
+
+
+def risk_alert_message(
+    *,
+    title: str,
+    severity: PMIRiskSeverity,
+    status,
+    project_name: str,
+    description: Optional[str],
+    mitigation_plan: Optional[str],
+) -> Tuple[str, str]:
+    """Subject and body of a risk escalation alert."""
+    subject = f"PMI Risk Alert: {title} - {severity.value.upper()} Severity"
+    body = f"""
+URGENT: Risk Escalation Alert
+
+A high-severity risk has been identified in your PMI project:
+
+Risk: {title}
+Severity: {severity.value.upper()}
+Status: {status.value}
+Project: {project_name}
+
+Description:
+{description or 'No description provided'}
+
+Mitigation Plan:
+{mitigation_plan or 'No mitigation plan yet'}
+
+Please review and take immediate action.
+
+Best regards,
+ApexDeliver PMI System
+"""
+    return subject, body
+
+
+def synergy_alert_message(
+    *,
+    name: str,
+    category,
+    planned_value: Decimal,
+    target_date: datetime,
+    status,
+    project_name: str,
+) -> Tuple[str, str]:
+    """Subject and body of a missed synergy target alert."""
+    subject = f"PMI Synergy Alert: {name} - Target Date Passed"
+    body = f"""
+Synergy Target Alert
+
+The following synergy has passed its target date without being realized:
+
+Synergy: {name}
+Category: {category.value}
+Planned Value: £{planned_value:,.2f}
+Target Date: {target_date.strftime('%Y-%m-%d')}
+Status: {status.value}
+Project: {project_name}
+
+Please review the status and update the realization plan.
+
+Best regards,
+ApexDeliver PMI System
+"""
+    return subject, body
+
+
+def day_one_warning_message(
+    *,
+    items: Sequence[Tuple[str, object]],
+    project_name: str,
+    day_one_date: datetime,
+    days_before: int,
+) -> Tuple[str, str]:
+    """Subject and body of a Day 1 warning for ``(item, category)`` pairs."""
+    incomplete_items = "\n".join([f"- {item} ({category.value})" for item, category in items])
+    
+    subject = f"PMI Day 1 Warning: {len(items)} incomplete items"
+    body = f"""
+Day 1 Readiness Warning
+
+Your PMI project's Day 1 is approaching in {days_before} day(s), but the following checklist items are not yet complete:
+
+{incomplete_items}
+
+Project: {project_name}
+Day 1 Date: {day_one_date.strftime('%Y-%m-%d')}
+
+Please complete these items before Day 1 to ensure a smooth transition.
+
+Best regards,
+ApexDeliver PMI System
+"""
+    return subject, body
+
+
+# ============================================================================
+# Sent-notification ledger
+# ============================================================================
+
+def sent_keys(db: Session, notification_type: str, subject_ids: Iterable[str]) -> Set[Tuple[str, str]]:
+    """``(subject_id, dedupe_key)`` pairs already notified for ``subject_ids``."""
+    subject_ids = list(subject_ids)
+    if not subject_ids:
+        return set()
+    rows = db.execute(
+        select(PMINotificationLog.subject_id, PMINotificationLog.dedupe_key).where(
+            PMINotificationLog.notification_type == notification_type,
+            PMINotificationLog.subject_id.in_(subject_ids),
+        )
+    ).all()
+    return {(row.subject_id, row.dedupe_key) for row in rows}
+
+
+def record_sent(db: Session, notification_type: str, entries: Sequence[dict]) -> None:
+    """
+    Add ledger rows for sent notifications (caller commits).
+
+    Each entry needs ``organization_id``, ``subject_id``, ``dedupe_key`` and
+    ``recipient_user_id``.
+    """
+    if entries:
+        db.execute(
+            insert(PMINotificationLog),
+            [{"notification_type": notification_type, **entry} for entry in entries],
+        )
+
 
 async def send_milestone_reminder(
     milestone_id: str,
@@ -79,24 +248,16 @@ async def send_milestone_reminder(
     if not owner or not owner.email:
         return False
     
-    subject = f"PMI Milestone Reminder: {milestone.name} due in {days_until_due} days"
-    body = f"""
-Hello {owner.email},
-
-This is a reminder that the following PMI milestone is approaching:
-
-Milestone: {milestone.name}
-Workstream: {workstream.name}
-Due Date: {milestone.target_date.strftime('%Y-%m-%d')}
-Project: {project.name}
-
-Please ensure all necessary preparations are in place.
-
-Best regards,
-ApexDeliver PMI System
-"""
+    subject, body = milestone_reminder_message(
+        owner_email=owner.email,
+        milestone_name=milestone.name,
+        workstream_name=workstream.name,
+        target_date=milestone.target_date,
+        project_name=project.name,
+        days_until_due=days_until_due,
+    )
     
-    return await _send_email(owner.email, subject, body)
+    return await send_plain_email(owner.email, subject, body)
 
 
 async def send_risk_escalation_alert(
@@ -140,30 +301,16 @@ async def send_risk_escalation_alert(
     if not owner or not owner.email:
         return False
     
-    subject = f"PMI Risk Alert: {risk.title} - {risk.severity.value.upper()} Severity"
-    body = f"""
-URGENT: Risk Escalation Alert
-
-A high-severity risk has been identified in your PMI project:
-
-Risk: {risk.title}
-Severity: {risk.severity.value.upper()}
-Status: {risk.status.value}
-Project: {project.name}
-
-Description:
-{risk.description or 'No description provided'}
-
-Mitigation Plan:
-{risk.mitigation_plan or 'No mitigation plan yet'}
-
-Please review and take immediate action.
-
-Best regards,
-ApexDeliver PMI System
-"""
+    subject, body = risk_alert_message(
+        title=risk.title,
+        severity=risk.severity,
+        status=risk.status,
+        project_name=project.name,
+        description=risk.description,
+        mitigation_plan=risk.mitigation_plan,
+    )
     
-    return await _send_email(owner.email, subject, body)
+    return await send_plain_email(owner.email, subject, body)
 
 
 async def send_synergy_target_alert(
@@ -206,25 +353,15 @@ async def send_synergy_target_alert(
             if not owner or not owner.email:
                 return False
             
-            subject = f"PMI Synergy Alert: {synergy.name} - Target Date Passed"
-            body = f"""
-Synergy Target Alert
-
-The following synergy has passed its target date without being realized:
-
-Synergy: {synergy.name}
-Category: {synergy.category.value}
-Planned Value: £{synergy.planned_value:,.2f}
-Target Date: {synergy.target_date.strftime('%Y-%m-%d')}
-Status: {synergy.status.value}
-Project: {project.name}
-
-Please review the status and update the realization plan.
-
-Best regards,
-ApexDeliver PMI System
-"""
-            return await _send_email(owner.email, subject, body)
+            subject, body = synergy_alert_message(
+                name=synergy.name,
+                category=synergy.category,
+                planned_value=synergy.planned_value,
+                target_date=synergy.target_date,
+                status=synergy.status,
+                project_name=project.name,
+            )
+            return await send_plain_email(owner.email, subject, body)
     
     return False
 
@@ -280,29 +417,17 @@ async def send_day_one_warning(
     if not owner or not owner.email:
         return False
     
-    incomplete_items = "\n".join([f"- {item.item} ({item.category.value})" for item in checklist_items])
-    
-    subject = f"PMI Day 1 Warning: {len(checklist_items)} incomplete items"
-    body = f"""
-Day 1 Readiness Warning
-
-Your PMI project's Day 1 is approaching in {days_before} day(s), but the following checklist items are not yet complete:
-
-{incomplete_items}
-
-Project: {project.name}
-Day 1 Date: {project.day_one_date.strftime('%Y-%m-%d')}
-
-Please complete these items before Day 1 to ensure a smooth transition.
-
-Best regards,
-ApexDeliver PMI System
-"""
+    subject, body = day_one_warning_message(
+        items=[(item.item, item.category) for item in checklist_items],
+        project_name=project.name,
+        day_one_date=project.day_one_date,
+        days_before=days_before,
+    )
     
-    return await _send_email(owner.email, subject, body)
+    return await send_plain_email(owner.email, subject, body)
 
 
-async def _send_email(to_email: str, subject: str, body: str) -> bool:
+async def send_plain_email(to_email: str, subject: str, body: str) -> bool:
     """Send email via SendGrid."""
     if not settings.sendgrid_api_key:
         return False
@@ -327,7 +452,9 @@ async def _send_email(to_email: str, subject: str, body: str) -> bool:
     }
     
     try:
-        response = httpx.post(
+        # Off the event loop so scanners can send several messages at once
+        response = await asyncio.to_thread(
+            httpx.post,
             "https://api.sendgrid.com/v3/mail/send",
             headers={
                 "Authorization": f"Bearer {settings.sendgrid_api_key}",
@@ -219,6 +219,43 @@ async def transcribe_episode(
     return transcript
 
 
+def save_transcript_timestamps(
+    *,
+    db: Session,
+    episode_id: str,
+    transcript_text: str,
+    language: str,
+    timestamps: List[dict],
+) -> PodcastTranscript:
+    """Store a timed transcript for an episode (used for subtitle exports)."""
+
+    transcript = PodcastTranscript(
+        id=str(uuid.uuid4()),
+        episode_id=episode_id,
+        transcript_text=transcript_text,
+        timestamps=timestamps,
+        language=language,
+    )
+    db.add(transcript)
+    db.commit()
+    return transcript
+
+
+def get_transcript_timestamps(*, db: Session, episode_id: str) -> List[dict]:
+    """Return the cue timestamps of the episode's latest timed transcript, if any."""
+
+    timestamps = db.scalar(
+        select(PodcastTranscript.timestamps)
+        .where(
+            PodcastTranscript.episode_id == episode_id,
+            PodcastTranscript.timestamps.isnot(None),
+        )
+        .order_by(desc(PodcastTranscript.created_at))
+        .limit(1)
+    )
+    return list(timestamps or [])
+
+
 def get_episode_analytics(
     *,
     db: Session,
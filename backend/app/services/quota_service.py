@@ -53,6 +53,15 @@ def _current_month_start() -> datetime:
     return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
 
+def _usage_month() -> datetime:
+    """Current month start as stored in ``PodcastUsage.month`` (naive UTC).
+
+    asyncpg rejects aware datetimes for ``timestamp without time zone``
+    parameters, so every usage query binds the naive value.
+    """
+    return _current_month_start().replace(tzinfo=None)
+
+
 async def _maybe_await(value):
     if inspect.isawaitable(value):
         return await value
@@ -127,9 +136,7 @@ async def increment_episode_count(organization_id: str, db: SessionLikeWithMock)
     if db is None:
         raise ValueError("Database session is required to increment usage")
 
-    current_month = _current_month_start()
-    if current_month.tzinfo is not None:
-        current_month = current_month.replace(tzinfo=None)
+    current_month = _usage_month()
     stmt = select(PodcastUsage).where(
         and_(
             PodcastUsage.organization_id == organization_id,
@@ -173,7 +180,7 @@ async def get_monthly_usage(organization_id: str, db: SessionLikeWithMock) -> in
 
 
 async def _query_usage_async(organization_id: str, db: AsyncSession | AsyncMock) -> int:
-    current_month = _current_month_start()
+    current_month = _usage_month()
     stmt = select(PodcastUsage.episode_count).where(
         and_(
             PodcastUsage.organization_id == organization_id,
@@ -188,7 +195,7 @@ async def _query_usage_async(organization_id: str, db: AsyncSession | AsyncMock)
 
 
 def _query_usage_sync(organization_id: str, db: Session) -> int:
-    current_month = _current_month_start()
+    current_month = _usage_month()
     stmt = select(PodcastUsage.episode_count).where(
         and_(
             PodcastUsage.organization_id == organization_id,
@@ -210,7 +217,7 @@ async def reset_monthly_usage(
     if db is None:
         raise ValueError("Database session is required to reset monthly usage")
 
-    current_month = _current_month_start()
+    current_month = _usage_month()
     stmt = select(PodcastUsage).where(
         and_(
             PodcastUsage.organization_id == organization_id,
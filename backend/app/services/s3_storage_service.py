@@ -1,17 +1,25 @@
 """S3/R2-compatible storage service for production file management."""
+import asyncio
 import hashlib
 import logging
 import uuid
-from typing import BinaryIO, Optional
+from typing import AsyncIterable, AsyncIterator, BinaryIO, Dict, List, Optional
 
 import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from app.core.config import get_settings
+from app.services.storage_service import FileTooLargeError, StoredFile, UploadDigest
 
 logger = logging.getLogger(__name__)
 
+# S3 requires every part but the last to be at least 5 MiB.
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+# Parts uploaded concurrently; also bounds buffered memory to roughly
+# MULTIPART_CONCURRENCY * MULTIPART_PART_SIZE per upload.
+MULTIPART_CONCURRENCY = 4
+
 
 class S3StorageService:
     """
@@ -109,8 +117,9 @@ class S3StorageService:
         s3_key = self._get_s3_key(organization_id, file_key)
 
         try:
-            # Upload file to S3/R2
-            self.client.upload_fileobj(
+            # Upload file to S3/R2 off the event loop
+            await asyncio.to_thread(
+                self.client.upload_fileobj,
                 file_stream,
                 self.bucket_name,
                 s3_key,
@@ -135,6 +144,155 @@ class S3StorageService:
             logger.error(f"Unexpected error during S3 upload: {str(e)}")
             raise IOError(f"Failed to save file {file_key}: {str(e)}")
 
+    async def save_stream(
+        self,
+        file_key: str,
+        chunks: AsyncIterable[bytes],
+        organization_id: str,
+        *,
+        max_size: Optional[int] = None,
+        content_type: Optional[str] = None
+    ) -> StoredFile:
+        """
+        Stream chunks to S3/R2, using a concurrent multipart upload for large bodies.
+
+        Bodies smaller than one part are sent with a single PutObject. Larger
+        ones are cut into MULTIPART_PART_SIZE parts, uploaded by worker
+        threads with at most MULTIPART_CONCURRENCY in flight, and the upload
+        is aborted if anything fails (including exceeding max_size).
+
+        Args:
+            file_key: Unique storage key
+            chunks: Async iterable of file content blocks
+            organization_id: Organization UUID
+            max_size: Abort with FileTooLargeError past this many bytes
+            content_type: MIME type; guessed from the key when omitted
+
+        Returns:
+            StoredFile with the S3 URI, size and SHA-256
+
+        Raises:
+            FileTooLargeError: If the stream exceeds max_size
+            IOError: If upload fails
+        """
+        s3_key = self._get_s3_key(organization_id, file_key)
+        object_args = {
+            'Bucket': self.bucket_name,
+            'Key': s3_key,
+            'ContentType': content_type or self._guess_content_type(file_key),
+            'Metadata': {
+                'organization_id': organization_id,
+                'file_key': file_key
+            },
+        }
+        digest = UploadDigest(max_size)
+        buffer = bytearray()
+        upload_id: Optional[str] = None
+        slots = asyncio.Semaphore(MULTIPART_CONCURRENCY)
+        tasks: List[asyncio.Task] = []
+
+        async def start_part(body: bytes) -> None:
+            nonlocal upload_id
+            if upload_id is None:
+                response = await asyncio.to_thread(self.client.create_multipart_upload, **object_args)
+                upload_id = response['UploadId']
+            await slots.acquire()
+            for task in tasks:
+                if task.done() and task.exception() is not None:
+                    slots.release()
+                    raise task.exception()
+            tasks.append(asyncio.create_task(
+                self._upload_part(s3_key, upload_id, len(tasks) + 1, body, slots)
+            ))
+
+        try:
+            async for chunk in chunks:
+                digest.update(chunk)
+                buffer += chunk
+                while len(buffer) >= MULTIPART_PART_SIZE:
+                    await start_part(bytes(buffer[:MULTIPART_PART_SIZE]))
+                    del buffer[:MULTIPART_PART_SIZE]
+
+            if upload_id is None:
+                await asyncio.to_thread(self.client.put_object, Body=bytes(buffer), **object_args)
+            else:
+                if buffer:
+                    await start_part(bytes(buffer))
+                parts = await asyncio.gather(*tasks)
+                await asyncio.to_thread(
+                    self.client.complete_multipart_upload,
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    UploadId=upload_id,
+                    MultipartUpload={'Parts': parts},
+                )
+        except BaseException as e:
+            await self._abort_multipart(s3_key, upload_id, tasks)
+            if isinstance(e, (FileTooLargeError, asyncio.CancelledError)):
+                raise
+            if isinstance(e, ClientError):
+                error_msg = e.response['Error']['Message']
+                logger.error(f"S3 streaming upload failed: {error_msg}")
+                raise IOError(f"Failed to upload file to S3: {error_msg}")
+            if isinstance(e, Exception):
+                logger.error(f"Unexpected error during S3 streaming upload: {str(e)}")
+                raise IOError(f"Failed to save file {file_key}: {str(e)}")
+            raise
+
+        logger.info(
+            f"File streamed successfully: s3://{self.bucket_name}/{s3_key} "
+            f"({digest.size} bytes, {len(tasks) or 1} part(s))"
+        )
+        return StoredFile(
+            location=f"s3://{self.bucket_name}/{s3_key}",
+            size=digest.size,
+            sha256=digest.hexdigest,
+        )
+
+    async def _upload_part(
+        self,
+        s3_key: str,
+        upload_id: str,
+        part_number: int,
+        body: bytes,
+        slots: asyncio.Semaphore
+    ) -> Dict[str, object]:
+        """Upload one multipart part in a worker thread and release its slot."""
+        try:
+            response = await asyncio.to_thread(
+                self.client.upload_part,
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=body,
+            )
+            return {'PartNumber': part_number, 'ETag': response['ETag']}
+        finally:
+            slots.release()
+
+    async def _abort_multipart(
+        self,
+        s3_key: str,
+        upload_id: Optional[str],
+        tasks: List[asyncio.Task]
+    ) -> None:
+        """Cancel in-flight parts and abort the multipart upload, if one was started."""
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if upload_id is None:
+            return
+        try:
+            await asyncio.to_thread(
+                self.client.abort_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+            )
+        except ClientError as e:
+            logger.warning(f"Failed to abort multipart upload {upload_id} for {s3_key}: {e}")
+
     async def get_file_path(
         self,
         file_key: str,
@@ -222,6 +380,44 @@ class S3StorageService:
                 raise FileNotFoundError(f"File not found in S3: {file_key}")
             raise
 
+    async def iter_file(
+        self,
+        file_key: str,
+        organization_id: str,
+        chunk_size: int = 256 * 1024
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream an object's body from S3/R2 in fixed-size blocks.
+
+        Args:
+            file_key: Storage key
+            organization_id: Organization UUID
+            chunk_size: Block size in bytes
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        s3_key = self._get_s3_key(organization_id, file_key)
+
+        try:
+            response = await asyncio.to_thread(
+                self.client.get_object, Bucket=self.bucket_name, Key=s3_key
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey'):
+                raise FileNotFoundError(f"File not found in S3: {file_key}")
+            raise
+
+        body = response['Body']
+        try:
+            while True:
+                chunk = await asyncio.to_thread(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
     async def delete_file(
         self,
         file_key: str,
@@ -255,6 +451,31 @@ class S3StorageService:
                 return False
             raise
 
+    async def move_file(
+        self,
+        source_key: str,
+        target_key: str,
+        organization_id: str
+    ) -> None:
+        """
+        Move an object within the organization's prefix (server-side copy, then delete).
+
+        Args:
+            source_key: Current storage key
+            target_key: New storage key (replaced if it exists)
+            organization_id: Organization UUID
+        """
+        source = self._get_s3_key(organization_id, source_key)
+        target = self._get_s3_key(organization_id, target_key)
+        await asyncio.to_thread(
+            self.client.copy_object,
+            Bucket=self.bucket_name,
+            Key=target,
+            CopySource={'Bucket': self.bucket_name, 'Key': source},
+        )
+        await asyncio.to_thread(self.client.delete_object, Bucket=self.bucket_name, Key=source)
+        logger.info(f"File moved in S3: {source} -> {target}")
+
     async def file_exists(
         self,
         file_key: str,
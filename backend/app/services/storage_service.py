@@ -1,12 +1,81 @@
 """File storage service for secure document management."""
+import asyncio
 import hashlib
-import shutil
+import os
+import tempfile
 import uuid
+from dataclasses import dataclass
 from pathlib import Path
-from typing import BinaryIO, Optional, Protocol
+from typing import AsyncIterable, AsyncIterator, BinaryIO, Optional, Protocol
+
+from fastapi import UploadFile
 
 from app.core.config import get_settings
 
+# Read size used when streaming request bodies and file objects into storage.
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class FileTooLargeError(ValueError):
+    """Raised while streaming once an upload exceeds its size limit."""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"File exceeds maximum size of {max_size} bytes")
+        self.max_size = max_size
+
+
+@dataclass(frozen=True)
+class StoredFile:
+    """Result of a streamed save: where it landed, its size and SHA-256."""
+
+    location: str
+    size: int
+    sha256: str
+
+
+class UploadDigest:
+    """Running byte count and SHA-256 for a stream, with an optional size cap."""
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size
+        self.size = 0
+        self._hash = hashlib.sha256()
+
+    def update(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.max_size is not None and self.size > self.max_size:
+            raise FileTooLargeError(self.max_size)
+        self._hash.update(chunk)
+
+    @property
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+async def iter_upload_chunks(
+    upload: UploadFile,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Yield an ``UploadFile`` body in chunks without reading it all into memory."""
+    await upload.seek(0)
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def iter_file_object(
+    file_stream: BinaryIO,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Yield a blocking file object's contents, reading in a worker thread."""
+    while True:
+        chunk = await asyncio.to_thread(file_stream.read, chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
 
 class StorageServiceProtocol(Protocol):
     """Protocol defining the storage service interface."""
@@ -30,6 +99,18 @@ class StorageServiceProtocol(Protocol):
         """Save file to storage."""
         ...
 
+    async def save_stream(
+        self,
+        file_key: str,
+        chunks: AsyncIterable[bytes],
+        organization_id: str,
+        *,
+        max_size: Optional[int] = None,
+        content_type: Optional[str] = None
+    ) -> StoredFile:
+        """Save an async byte stream, hashing and size-checking it on the fly."""
+        ...
+
     async def get_file_path(
         self,
         file_key: str,
@@ -38,6 +119,15 @@ class StorageServiceProtocol(Protocol):
         """Get file path for reading."""
         ...
 
+    def iter_file(
+        self,
+        file_key: str,
+        organization_id: str,
+        chunk_size: int = ...
+    ) -> AsyncIterator[bytes]:
+        """Stream file contents in fixed-size blocks."""
+        ...
+
     async def delete_file(
         self,
         file_key: str,
@@ -46,6 +136,15 @@ class StorageServiceProtocol(Protocol):
         """Delete file from storage."""
         ...
 
+    async def move_file(
+        self,
+        source_key: str,
+        target_key: str,
+        organization_id: str
+    ) -> None:
+        """Rename a stored file, replacing any file at target_key."""
+        ...
+
     async def file_exists(
         self,
         file_key: str,
@@ -128,19 +227,60 @@ class LocalStorageService:
         Raises:
             IOError: If file save fails
         """
+        stored = await self.save_stream(file_key, iter_file_object(file_stream), organization_id)
+        return stored.location
+
+    async def save_stream(
+        self,
+        file_key: str,
+        chunks: AsyncIterable[bytes],
+        organization_id: str,
+        *,
+        max_size: Optional[int] = None,
+        content_type: Optional[str] = None
+    ) -> StoredFile:
+        """
+        Stream chunks to a temporary file, then atomically rename it into place.
+
+        Readers never observe a partially written file, and a failed or
+        oversized upload leaves nothing behind.
+
+        Args:
+            file_key: Unique storage key
+            chunks: Async iterable of file content blocks
+            organization_id: Organization UUID
+            max_size: Abort with FileTooLargeError past this many bytes
+            content_type: Unused locally; accepted for interface parity
+
+        Returns:
+            StoredFile with the final path, size and SHA-256
+
+        Raises:
+            FileTooLargeError: If the stream exceeds max_size
+            IOError: If file save fails
+        """
         org_path = self._get_org_path(organization_id)
         file_path = org_path / file_key
+        digest = UploadDigest(max_size)
 
+        fd, temp_name = tempfile.mkstemp(prefix=f".{file_path.name}.", suffix=".part", dir=file_path.parent)
+        temp_path = Path(temp_name)
         try:
-            with open(file_path, 'wb') as f:
-                shutil.copyfileobj(file_stream, f)
-            return str(file_path)
+            with os.fdopen(fd, 'wb') as handle:
+                async for chunk in chunks:
+                    digest.update(chunk)
+                    await asyncio.to_thread(handle.write, chunk)
+                await asyncio.to_thread(_flush_and_sync, handle)
+            os.replace(temp_path, file_path)
+        except FileTooLargeError:
+            temp_path.unlink(missing_ok=True)
+            raise
         except Exception as e:
-            # Cleanup partial file if save failed
-            if file_path.exists():
-                file_path.unlink()
+            temp_path.unlink(missing_ok=True)
             raise IOError(f"Failed to save file {file_key}: {str(e)}")
 
+        return StoredFile(location=str(file_path), size=digest.size, sha256=digest.hexdigest)
+
     async def get_file_path(
         self,
         file_key: str,
@@ -164,6 +304,37 @@ class LocalStorageService:
             raise FileNotFoundError(f"File not found: {file_key}")
         return file_path
 
+    async def iter_file(
+        self,
+        file_key: str,
+        organization_id: str,
+        chunk_size: int = 256 * 1024
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream file contents in fixed-size blocks.
+
+        Reads happen in a worker thread so large files never block the event
+        loop, and only one block is held in memory at a time.
+
+        Args:
+            file_key: Storage key
+            organization_id: Organization UUID
+            chunk_size: Block size in bytes
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        file_path = await self.get_file_path(file_key, organization_id)
+        handle = await asyncio.to_thread(open, file_path, 'rb')
+        try:
+            while True:
+                chunk = await asyncio.to_thread(handle.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            handle.close()
+
     async def delete_file(
         self,
         file_key: str,
@@ -185,6 +356,23 @@ class LocalStorageService:
             return True
         return False
 
+    async def move_file(
+        self,
+        source_key: str,
+        target_key: str,
+        organization_id: str
+    ) -> None:
+        """
+        Atomically rename a stored file within the organization's directory.
+
+        Args:
+            source_key: Current storage key
+            target_key: New storage key (replaced if it exists)
+            organization_id: Organization UUID
+        """
+        org_path = self._get_org_path(organization_id)
+        os.replace(org_path / source_key, org_path / target_key)
+
     async def file_exists(
         self,
         file_key: str,
@@ -227,6 +415,11 @@ class LocalStorageService:
         return file_path.stat().st_size
 
 
+def _flush_and_sync(handle: BinaryIO) -> None:
+    handle.flush()
+    os.fsync(handle.fileno())
+
+
 # Backwards compatibility alias used across services/tests
 StorageService = LocalStorageService
 
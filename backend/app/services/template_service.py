@@ -4,12 +4,13 @@ Template Service
 Service for managing campaign templates with variable substitution.
 """
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 
 from app.models.master_admin import CampaignTemplate
 from app.models.user import User
+from app.utils import template_engine
 
 
 def extract_variables(content: str) -> List[str]:
@@ -24,9 +25,7 @@ def extract_variables(content: str) -> List[str]:
     Returns:
         List of unique variable names found in content
     """
-    pattern = r'\{\{(\w+)\}\}'
-    variables = re.findall(pattern, content)
-    return list(set(variables))  # Return unique variables
+    return template_engine.extract_variables(content)
 
 
 def validate_template(content: str) -> Tuple[bool, List[str]]:
@@ -60,6 +59,48 @@ def validate_template(content: str) -> Tuple[bool, List[str]]:
     return len(errors) == 0, errors
 
 
+def compile_template(template: CampaignTemplate) -> Callable[[Dict[str, str]], Dict[str, str]]:
+    """
+    Prepare a template once for rendering against many contacts.
+
+    Required variables are worked out up front and the subject and content
+    come from the shared compiled-template cache, so each render is a single
+    pass over pre-tokenized segments.
+
+    Args:
+        template: Template to compile
+
+    Returns:
+        Function taking contact data and returning rendered 'subject' and
+        'content'; it raises ValueError if required variables are missing
+    """
+    required_vars = template.variables or []
+    if not required_vars:
+        # Auto-detect if not set
+        required_vars = extract_variables(template.content or "")
+        if template.subject:
+            required_vars.extend(extract_variables(template.subject))
+        required_vars = list(set(required_vars))
+
+    subject = template_engine.get_compiled(
+        ("campaign_template", template.id, "subject"), template.updated_at, template.subject or ""
+    )
+    content = template_engine.get_compiled(
+        ("campaign_template", template.id, "content"), template.updated_at, template.content or ""
+    )
+
+    def render(contact_data: Dict[str, str]) -> Dict[str, str]:
+        missing = [var for var in required_vars if var not in contact_data]
+        if missing:
+            raise ValueError(f"Missing required variables: {', '.join(missing)}")
+        return {
+            "subject": subject.render(contact_data),
+            "content": content.render(contact_data),
+        }
+
+    return render
+
+
 def render_template(template_id: int, contact_data: Dict[str, str], db: Session) -> Dict[str, str]:
     """
     Render a template with contact data.
@@ -81,36 +122,34 @@ def render_template(template_id: int, contact_data: Dict[str, str], db: Session)
     if not template:
         raise ValueError(f"Template {template_id} not found")
     
-    # Get required variables
-    required_vars = template.variables or []
-    if not required_vars:
-        # Auto-detect if not set
-        required_vars = extract_variables(template.content or "")
-        if template.subject:
-            required_vars.extend(extract_variables(template.subject))
-        required_vars = list(set(required_vars))
-    
-    # Check for missing variables
-    missing = [var for var in required_vars if var not in contact_data]
-    if missing:
-        raise ValueError(f"Missing required variables: {', '.join(missing)}")
-    
-    # Render subject
-    rendered_subject = template.subject or ""
-    for var in required_vars:
-        if var in contact_data:
-            rendered_subject = rendered_subject.replace(f"{{{{{var}}}}}", str(contact_data[var]))
+    return compile_template(template)(contact_data)
+
+
+def render_template_batch(
+    template_id: int,
+    contacts: List[Dict[str, str]],
+    db: Session,
+) -> List[Dict[str, str]]:
+    """
+    Render a template once per contact.
     
-    # Render content
-    rendered_content = template.content or ""
-    for var in required_vars:
-        if var in contact_data:
-            rendered_content = rendered_content.replace(f"{{{{{var}}}}}", str(contact_data[var]))
+    Args:
+        template_id: ID of the template to render
+        contacts: Variable values for each contact
+        db: Database session
+        
+    Returns:
+        Rendered 'subject'/'content' dictionaries, in the order of ``contacts``
+        
+    Raises:
+        ValueError: If template not found or any contact is missing required variables
+    """
+    template = db.get(CampaignTemplate, template_id)
+    if not template:
+        raise ValueError(f"Template {template_id} not found")
     
-    return {
-        "subject": rendered_subject,
-        "content": rendered_content,
-    }
+    render = compile_template(template)
+    return [render(contact_data) for contact_data in contacts]
 
 
 def create_template(
@@ -0,0 +1,213 @@
+"""Atomic event ticket inventory with optional Redis-backed checkout holds (F-012)."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import List, Optional
+
+from redis import asyncio as redis_async
+from sqlalchemy import and_, case, func, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import get_redis_client
+from app.core.config import settings
+from app.models.event import EventTicket, TicketStatus
+
+logger = logging.getLogger(__name__)
+
+# Sorted set of active holds scored by expiry time. Members encode everything
+# needed to release a hold, so expired ones can be returned without a lookup.
+HOLDS_KEY = "ticket_holds:expiring"
+
+# Stripe only accepts a Checkout Session ``expires_at`` between 30 minutes and
+# 24 hours after the session is created. The minimum keeps a margin because
+# the expiry is computed before the API call.
+STRIPE_MIN_CHECKOUT_SECONDS = 30 * 60 + 120
+STRIPE_MAX_CHECKOUT_SECONDS = 24 * 60 * 60
+
+# Holds outlive the Stripe session, so a payment completed just before the
+# session expires still finds its tickets reserved.
+HOLD_GRACE_SECONDS = 5 * 60
+
+_tickets = EventTicket.__table__
+
+
+class TicketSoldOutError(ValueError):
+    """Raised when a ticket does not have enough remaining inventory."""
+
+
+def reserve_tickets(db: Session, ticket_id: str, quantity: int = 1) -> Optional[int]:
+    """
+    Atomically take ``quantity`` tickets from inventory.
+
+    A single conditional ``UPDATE ... RETURNING`` checks and increments
+    ``quantity_sold``, so concurrent buyers can never push it past
+    ``quantity_available``. The row lock lasts only until the caller commits.
+
+    Returns:
+        The new ``quantity_sold``, or None if not enough tickets remain
+    """
+    sold = func.coalesce(_tickets.c.quantity_sold, 0) + quantity
+    limit = _tickets.c.quantity_available
+    new_quantity_sold = db.execute(
+        update(_tickets)
+        .where(_tickets.c.id == ticket_id, (limit.is_(None)) | (sold <= limit))
+        .values(
+            quantity_sold=sold,
+            status=case(
+                (and_(limit.isnot(None), sold >= limit), TicketStatus.SOLD_OUT.name),
+                else_=_tickets.c.status,
+            ),
+        )
+        .returning(_tickets.c.quantity_sold)
+    ).scalar_one_or_none()
+    _expire_inventory(db, ticket_id)
+    return new_quantity_sold
+
+
+def release_tickets(db: Session, ticket_id: str, quantity: int = 1) -> None:
+    """Return ``quantity`` tickets to inventory, reopening sold-out tickets."""
+    remaining = case((_tickets.c.quantity_sold > quantity, _tickets.c.quantity_sold - quantity), else_=0)
+    db.execute(
+        update(_tickets)
+        .where(_tickets.c.id == ticket_id)
+        .values(
+            quantity_sold=remaining,
+            status=case(
+                (
+                    and_(
+                        _tickets.c.status == TicketStatus.SOLD_OUT.name,
+                        _tickets.c.quantity_available.isnot(None),
+                        remaining < _tickets.c.quantity_available,
+                    ),
+                    TicketStatus.ACTIVE.name,
+                ),
+                else_=_tickets.c.status,
+            ),
+        )
+    )
+    _expire_inventory(db, ticket_id)
+
+
+def _expire_inventory(db: Session, ticket_id: str) -> None:
+    # The statements above bypass the ORM; make loaded tickets reread the row.
+    for instance in db.identity_map.values():
+        if isinstance(instance, EventTicket) and instance.id == ticket_id:
+            db.expire(instance, ["quantity_sold", "status"])
+
+
+# ---------------------------------------------------------------------------
+# Checkout holds
+# ---------------------------------------------------------------------------
+
+
+def _hold_member(hold_id: str, ticket_id: str, quantity: int) -> str:
+    return f"{hold_id}|{ticket_id}|{quantity}"
+
+
+def _parse_hold_member(member) -> tuple[str, str, int]:
+    if isinstance(member, bytes):
+        member = member.decode()
+    hold_id, ticket_id, quantity = member.rsplit("|", 2)
+    return hold_id, ticket_id, int(quantity)
+
+
+def checkout_window_seconds() -> int:
+    """The configured checkout window, clamped to what Stripe accepts."""
+    return min(max(settings.ticket_hold_seconds, STRIPE_MIN_CHECKOUT_SECONDS), STRIPE_MAX_CHECKOUT_SECONDS)
+
+
+def holds_enabled(redis: Optional[redis_async.Redis] = None) -> bool:
+    return (redis or get_redis_client()) is not None
+
+
+async def place_hold(
+    hold_id: str,
+    ticket_id: str,
+    quantity: int,
+    *,
+    ttl: Optional[int] = None,
+    redis: Optional[redis_async.Redis] = None,
+) -> bool:
+    """
+    Record a hold on tickets already taken with :func:`reserve_tickets`.
+
+    The hold keeps the reserved inventory for the checkout window; if it is not
+    confirmed before it expires, :func:`release_expired_holds` returns the
+    tickets. By default it lasts :data:`HOLD_GRACE_SECONDS` longer than the
+    checkout window. Returns False when Redis is not configured.
+    """
+    redis = redis or get_redis_client()
+    if not redis:
+        return False
+    expires_at = time.time() + (ttl or checkout_window_seconds() + HOLD_GRACE_SECONDS)
+    await redis.zadd(HOLDS_KEY, {_hold_member(hold_id, ticket_id, quantity): expires_at})
+    return True
+
+
+async def claim_hold(
+    hold_id: str,
+    ticket_id: str,
+    quantity: int,
+    *,
+    redis: Optional[redis_async.Redis] = None,
+) -> bool:
+    """
+    Take ownership of a hold so no other worker releases it.
+
+    Returns True if the hold was still active, meaning its tickets are still
+    reserved for the caller; False if it never existed or already expired.
+    """
+    redis = redis or get_redis_client()
+    if not redis:
+        return False
+    return bool(await redis.zrem(HOLDS_KEY, _hold_member(hold_id, ticket_id, quantity)))
+
+
+async def cancel_hold(
+    db: Session,
+    hold_id: str,
+    ticket_id: str,
+    quantity: int,
+    *,
+    redis: Optional[redis_async.Redis] = None,
+) -> bool:
+    """Release a hold early (e.g. failed payment). Returns whether tickets were returned."""
+    if not await claim_hold(hold_id, ticket_id, quantity, redis=redis):
+        return False
+    release_tickets(db, ticket_id, quantity)
+    db.commit()
+    return True
+
+
+async def release_expired_holds(
+    db: Session,
+    *,
+    now: Optional[float] = None,
+    redis: Optional[redis_async.Redis] = None,
+) -> int:
+    """
+    Return the tickets of every expired hold to inventory.
+
+    Each hold is claimed with ZREM before its tickets are released, so
+    concurrent sweepers (or a late payment confirmation) never release the
+    same hold twice.
+
+    Returns:
+        Number of holds released
+    """
+    redis = redis or get_redis_client()
+    if not redis:
+        return 0
+    expired: List = await redis.zrangebyscore(HOLDS_KEY, "-inf", now if now is not None else time.time())
+    released = 0
+    for member in expired:
+        if not await redis.zrem(HOLDS_KEY, member):
+            continue
+        hold_id, ticket_id, quantity = _parse_hold_member(member)
+        release_tickets(db, ticket_id, quantity)
+        released += 1
+        logger.info("Released expired ticket hold %s (%d x %s)", hold_id, quantity, ticket_id)
+    if released:
+        db.commit()
+    return released
@@ -12,17 +12,19 @@ in financial contexts.
 
 from __future__ import annotations
 
-import math
-import random
+import hashlib
+import json
 import uuid
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal, getcontext
 from statistics import median
 from typing import Dict, Iterable, List, Optional, Tuple, Literal
 
+import numpy as np
 from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
+from app.core.cache import LocalLRUCache
 from app.core.config import settings
 from app.models.document import Document
 from app.models.organization import Organization
@@ -35,12 +37,22 @@ from app.models.valuation import (
     ValuationScenario,
 )
 from app.models.deal import Deal
+from app.services.monte_carlo_engine import (
+    MonteCarloConfig,
+    ShockSpec,
+    simulate_enterprise_values,
+    summarize_enterprise_values,
+)
 
 
 # Increase decimal precision to ensure stability for valuation calcs
 getcontext().prec = 12
 
 
+class InvalidBaseCaseError(ValueError):
+    """Raised when a valuation's own inputs give no finite enterprise value."""
+
+
 def _calculate_discount_factor(discount_rate: float, year: int) -> Decimal:
     """Calculate discount factor for a given year.
 
@@ -250,6 +262,210 @@ def generate_sensitivity_matrix(
     return matrix
 
 
+SENSITIVITY_DRIVERS = (
+    "discount_rate",
+    "terminal_growth_rate",
+    "terminal_ebitda_multiple",
+    "revenue_growth",
+)
+SENSITIVITY_MAX_CELLS = 250_000
+SENSITIVITY_CACHE_TTL = 600
+
+_sensitivity_cache = LocalLRUCache(max_entries=256)
+
+
+def _valuation_version(valuation: ValuationModel) -> str:
+    """Fingerprint of every input that affects the DCF, used as a cache version."""
+    inputs = [
+        list(valuation.cash_flows or []),
+        valuation.terminal_cash_flow,
+        valuation.discount_rate,
+        valuation.terminal_method,
+        valuation.terminal_growth_rate,
+        valuation.terminal_ebitda_multiple,
+    ]
+    return hashlib.sha256(json.dumps(inputs, default=float).encode("utf-8")).hexdigest()[:16]
+
+
+def _normalise_sensitivity_axes(
+    axes: Dict[str, Iterable[float]],
+    base_values: Dict[str, float],
+) -> Dict[str, np.ndarray]:
+    if not axes:
+        raise ValueError("at least one sensitivity axis is required")
+
+    normalised: Dict[str, np.ndarray] = {}
+    for driver, values in axes.items():
+        if driver not in base_values:
+            raise ValueError(f"unsupported sensitivity driver: {driver}")
+        # The base value is always on the axis so tornado deltas come from the same grid.
+        grid = np.unique(np.append(np.asarray(list(values), dtype=float), base_values[driver]))
+        if not np.isfinite(grid).all():
+            raise ValueError(f"{driver} values must be finite")
+        normalised[driver] = grid
+
+    cells = int(np.prod([grid.size for grid in normalised.values()]))
+    if cells > SENSITIVITY_MAX_CELLS:
+        raise ValueError(f"sensitivity grid has {cells} cells; the limit is {SENSITIVITY_MAX_CELLS}")
+    return normalised
+
+
+def evaluate_sensitivity_grid(
+    *,
+    cash_flows: List[float],
+    terminal_cash_flow: float,
+    discount_rate: float,
+    terminal_method: str,
+    terminal_growth_rate: Optional[float],
+    terminal_ebitda_multiple: Optional[float],
+    axes: Dict[str, Iterable[float]],
+) -> Dict[str, object]:
+    """Evaluate the DCF over the cartesian product of ``axes`` in one broadcast pass.
+
+    Supported drivers are ``discount_rate``, ``terminal_growth_rate`` (Gordon
+    Growth only), ``terminal_ebitda_multiple`` (exit multiple only) and
+    ``revenue_growth``, an extra annual growth rate compounded onto every
+    projected cash flow. Each axis is sorted and always contains the base
+    value. Cells where WACC does not exceed terminal growth are NaN; if the
+    base case itself is such a cell, ``InvalidBaseCaseError`` is raised.
+
+    Returns the axes used, the grid of enterprise values (one dimension per
+    axis, in the order given), the base enterprise value and tornado rows.
+    """
+    if discount_rate <= 0:
+        raise ValueError("discount_rate must be positive")
+    if not cash_flows:
+        raise ValueError("cash_flows must not be empty")
+
+    exit_multiple = terminal_method == "exit_multiple"
+    if exit_multiple and terminal_ebitda_multiple is None:
+        raise ValueError("terminal_ebitda_multiple required for exit_multiple method")
+    base_values = {"discount_rate": float(discount_rate), "revenue_growth": 0.0}
+    if exit_multiple:
+        base_values["terminal_ebitda_multiple"] = float(terminal_ebitda_multiple)
+    else:
+        base_values["terminal_growth_rate"] = float(terminal_growth_rate or 0.0)
+        if base_values["terminal_growth_rate"] >= base_values["discount_rate"]:
+            raise InvalidBaseCaseError("discount_rate must be greater than terminal_growth_rate")
+    grids = _normalise_sensitivity_axes(axes, base_values)
+
+    names = list(grids)
+    ndim = len(names)
+
+    def _driver(name: str) -> np.ndarray:
+        if name not in grids:
+            return np.asarray(base_values[name])
+        shape = [1] * ndim
+        shape[names.index(name)] = -1
+        return grids[name].reshape(shape)
+
+    flows = np.asarray(cash_flows, dtype=float)
+    years = np.arange(1, flows.size + 1, dtype=float)
+    rate = _driver("discount_rate")[..., None]
+    uplift = _driver("revenue_growth")[..., None]
+
+    discount_factors = np.power(1.0 + rate, -years)
+    growth_factors = np.power(1.0 + uplift, years)
+    pv_cash_flows = np.sum(flows * growth_factors * discount_factors, axis=-1)
+    terminal_flow = float(terminal_cash_flow) * growth_factors[..., -1]
+
+    if exit_multiple:
+        terminal_value = terminal_flow * _driver("terminal_ebitda_multiple")
+    else:
+        rate = rate[..., 0]
+        growth = _driver("terminal_growth_rate")
+        spread = rate - growth
+        with np.errstate(divide="ignore", invalid="ignore"):
+            terminal_value = np.where(spread > 0, terminal_flow * (1.0 + growth) / spread, np.nan)
+
+    values = np.broadcast_to(
+        pv_cash_flows + terminal_value * discount_factors[..., -1],
+        tuple(grid.size for grid in grids.values()),
+    )
+
+    base_index = tuple(int(np.searchsorted(grids[name], base_values[name])) for name in names)
+    base_enterprise_value = float(values[base_index])
+
+    tornado: List[dict] = []
+    for axis, name in enumerate(names):
+        index = list(base_index)
+        index[axis] = slice(None)
+        line = values[tuple(index)]
+        tornado.append(
+            {
+                "metric": name,
+                "base_value": base_values[name],
+                "low_value": float(grids[name][0]),
+                "high_value": float(grids[name][-1]),
+                "low_enterprise_value": _finite_or_none(line[0]),
+                "high_enterprise_value": _finite_or_none(line[-1]),
+                "delta": float(np.nanmax(np.abs(line - base_enterprise_value))),
+            }
+        )
+    tornado.sort(key=lambda item: item["delta"], reverse=True)
+
+    return {
+        "axes": {name: grids[name].tolist() for name in names},
+        "base_enterprise_value": base_enterprise_value,
+        "enterprise_values": values,
+        "tornado": tornado,
+    }
+
+
+def _finite_or_none(value: float) -> Optional[float]:
+    return float(value) if np.isfinite(value) else None
+
+
+def get_sensitivity_analysis(
+    *,
+    valuation: ValuationModel,
+    axes: Dict[str, Iterable[float]],
+) -> Dict[str, object]:
+    """Sensitivity grid and tornado for ``valuation``, cached per valuation version.
+
+    The cache key includes a fingerprint of the valuation's DCF inputs, so an
+    update never serves a stale grid; ``invalidate_sensitivity_cache`` just
+    releases memory early.
+    """
+    axes = {driver: [float(value) for value in values] for driver, values in axes.items()}
+    version = _valuation_version(valuation)
+    digest = hashlib.sha256(json.dumps(axes, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    key = f"sensitivity:{valuation.id}:{version}:{digest}"
+
+    entry = _sensitivity_cache.get(key)
+    if entry is not None:
+        return {**entry.value, "cached": True}
+
+    result = evaluate_sensitivity_grid(
+        cash_flows=list(valuation.cash_flows or []),
+        terminal_cash_flow=float(valuation.terminal_cash_flow or 0.0),
+        discount_rate=float(valuation.discount_rate),
+        terminal_method=valuation.terminal_method,
+        terminal_growth_rate=valuation.terminal_growth_rate,
+        terminal_ebitda_multiple=valuation.terminal_ebitda_multiple,
+        axes=axes,
+    )
+    grid = result["enterprise_values"]
+    payload = {
+        **result,
+        "valuation_id": valuation.id,
+        "version": version,
+        "enterprise_values": np.where(np.isfinite(grid), grid, None).tolist(),
+    }
+    _sensitivity_cache.set(
+        key,
+        payload,
+        ttl=SENSITIVITY_CACHE_TTL,
+        tags=(f"valuation:{valuation.id}",),
+    )
+    return {**payload, "cached": False}
+
+
+def invalidate_sensitivity_cache(valuation_id: str) -> None:
+    """Drop every cached sensitivity grid for ``valuation_id``."""
+    _sensitivity_cache.invalidate_tags((f"valuation:{valuation_id}",))
+
+
 def calculate_go_to_market_kpis(
     *,
     marketing_spend: float,
@@ -407,6 +623,7 @@ def update_valuation(
     db.add(valuation)
     db.commit()
     db.refresh(valuation)
+    invalidate_sensitivity_cache(valuation_id)
     return valuation
 
 
@@ -432,6 +649,7 @@ def delete_valuation(
     )
     db.delete(valuation)
     db.commit()
+    invalidate_sensitivity_cache(valuation_id)
     return True
 
 
@@ -835,54 +1053,42 @@ def run_monte_carlo_simulation(
     terminal_growth_rate: float,
     iterations: int = 100,
     seed: Optional[int] = None,
+    growth_volatility: float = 0.05,
+    margin_volatility: float = 0.0,
+    wacc_volatility: float = 0.0,
+    distribution: str = "normal",
+    degrees_of_freedom: float = 5.0,
+    correlation: Optional[List[List[float]]] = None,
+    histogram_bins: int = 50,
 ) -> dict:
+    """Simulate enterprise values with the vectorised Monte Carlo engine.
+
+    Growth, margin and WACC shocks share ``distribution`` and may be
+    correlated via a 3x3 matrix ordered (growth, margin, wacc). The same
+    ``seed`` always produces the same summary.
+    """
     if iterations <= 0:
         raise ValueError("iterations must be positive")
 
-    rng = random.Random(seed)
-    simulated_values: List[float] = []
-
-    for _ in range(iterations):
-        sampled_flows = [cash * (1 + rng.gauss(0, 0.05)) for cash in base_cash_flows]
-        terminal_cash = sampled_flows[-1] * (1 + terminal_growth_rate)
-        ev = _calculate_enterprise_value(
-            cash_flows=sampled_flows,
-            terminal_cash_flow=terminal_cash,
-            discount_rate=discount_rate,
-            terminal_method="gordon_growth",
-            terminal_growth_rate=terminal_growth_rate,
-            terminal_ebitda_multiple=None,
-        )
-        simulated_values.append(float(ev))
-
-
-    def _percentile(values: List[float], percentile: float) -> float:
-        if not values:
-            return 0.0
-        sorted_values = sorted(values)
-        k = (len(sorted_values) - 1) * percentile
-        f = math.floor(k)
-        c = math.ceil(k)
-        if f == c:
-            return float(sorted_values[int(k)])
-        lower = sorted_values[int(f)]
-        upper = sorted_values[int(c)]
-        return float(lower + (upper - lower) * (k - f))
-
-    mean_ev = sum(simulated_values) / len(simulated_values)
-    p10 = _percentile(simulated_values, 0.10)
-    p50 = _percentile(simulated_values, 0.50)
-    p90 = _percentile(simulated_values, 0.90)
+    config = MonteCarloConfig(
+        iterations=iterations,
+        growth=ShockSpec(growth_volatility, distribution, degrees_of_freedom),
+        margin=ShockSpec(margin_volatility, distribution, degrees_of_freedom),
+        wacc=ShockSpec(wacc_volatility, distribution, degrees_of_freedom),
+        correlation=correlation,
+        seed=seed,
+    )
+    values = simulate_enterprise_values(
+        base_cash_flows=list(base_cash_flows),
+        discount_rate=discount_rate,
+        terminal_growth_rate=terminal_growth_rate,
+        config=config,
+    )
 
     return {
         "iterations": iterations,
         "seed": seed,
-        "mean_enterprise_value": mean_ev,
-        "percentiles": {
-            "p10": p10,
-            "p50": p50,
-            "p90": p90,
-        },
+        **summarize_enterprise_values(values, histogram_bins=histogram_bins),
     }
 
 
@@ -1083,10 +1289,14 @@ def get_export_log_by_task(
 
 
 __all__ = [
+    "InvalidBaseCaseError",
     "calculate_dcf_present_value",
     "calculate_terminal_value_gordon_growth",
     "calculate_terminal_value_exit_multiple",
     "generate_sensitivity_matrix",
+    "evaluate_sensitivity_grid",
+    "get_sensitivity_analysis",
+    "invalidate_sensitivity_cache",
     "create_valuation",
     "list_valuations",
     "get_valuation",
@@ -27,6 +27,8 @@ from .pmi_notifications import (
     check_day_one_readiness_task,
 )
 from .document_exports import enqueue_export_processing, process_document_export_job
+from .dashboard_rollups import reconcile_dashboard_rollups_task
+from .ticket_holds import release_expired_ticket_holds_task
 
 __all__ = [
     "enqueue_manual_rule_run",
@@ -47,4 +49,6 @@ __all__ = [
     "check_day_one_readiness_task",
     "enqueue_export_processing",
     "process_document_export_job",
+    "reconcile_dashboard_rollups_task",
+    "release_expired_ticket_holds_task",
 ]
@@ -11,7 +11,7 @@ import asyncio
 from app.db import session as session_module
 from app.services import campaign_service
 from app.models.user import User
-from app.services.email_service import send_email, render_template, queue_email
+from app.services.email_service import close_transport, send_email, render_template, queue_email
 
 
 SessionLocal = None  # legacy alias retained for tests to override
@@ -97,7 +97,8 @@ def send_email_batch_task(emails: List[Dict]):
         emails: List of email dictionaries with 'to', 'subject', 'content', etc.
     """
     async def _deliver(payload: Dict) -> Dict[str, str]:
-        html_content = payload.get("html_content")
+        # Campaign batches carry pre-rendered HTML under "content"
+        html_content = payload.get("html_content") or payload.get("content")
         text_content = payload.get("text_content")
 
         if not html_content and payload.get("template_name"):
@@ -115,14 +116,23 @@ def send_email_batch_task(emails: List[Dict]):
             text_content=text_content,
         )
 
+    async def _deliver_all() -> List:
+        # One loop and one pooled client for the whole batch; the transport
+        # bounds how many requests are in flight.
+        try:
+            return await asyncio.gather(*(_deliver(email) for email in emails), return_exceptions=True)
+        finally:
+            await close_transport()
+
     sent_count = 0
     failures: List[str] = []
-    for email in emails:
-        try:
-            asyncio.run(_deliver(email))
+    for email, result in zip(emails, asyncio.run(_deliver_all())):
+        if isinstance(result, BaseException):
+            failures.append(f"{email.get('to')}: {result}")
+        elif result.get("status") != "sent":
+            failures.append(f"{email.get('to')}: {result.get('error', 'send failed')}")
+        else:
             sent_count += 1
-        except Exception as exc:  # pragma: no cover - logged for observability
-            failures.append(f"{email.get('to')}: {exc}")
 
     return {"sent_count": sent_count, "total": len(emails), "failures": failures}
 
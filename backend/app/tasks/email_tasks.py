@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 
 from app.db import session as session_module
 from app.models.email_queue import EmailQueue
-from app.services.email_service import MAX_RETRY_ATTEMPTS, retry_failed_email
+from app.services.email_service import MAX_RETRY_ATTEMPTS, close_transport, process_email_entries
 
 
 def _get_session() -> Session:
@@ -42,22 +42,29 @@ def _run_async(coro):
 
 
 def _deliver_batch(db: Session, emails: List[EmailQueue]) -> Dict[str, int]:
-    """Process a list of queued emails and summarize the outcomes."""
+    """Send a list of queued emails on one event loop and summarize the outcomes."""
 
     summary = {"processed": 0, "sent": 0, "failed": 0, "skipped": 0}
 
+    deliverable = []
     for email in emails:
         if email.retry_count >= MAX_RETRY_ATTEMPTS:
             summary["skipped"] += 1
-            continue
+        else:
+            deliverable.append(email)
 
-        summary["processed"] += 1
+    if not deliverable:
+        return summary
+
+    async def _send() -> List[Dict]:
         try:
-            result = _run_async(retry_failed_email(db=db, email_id=email.id))
-        except ValueError:
-            summary["skipped"] += 1
-            continue
+            return await process_email_entries(db=db, emails=deliverable)
+        finally:
+            await close_transport()
 
+    # Emails are grouped per template into batched provider requests
+    for result in _run_async(_send()):
+        summary["processed"] += 1
         if result.get("status") == "sent":
             summary["sent"] += 1
         else:
@@ -67,7 +74,7 @@ def _deliver_batch(db: Session, emails: List[EmailQueue]) -> Dict[str, int]:
 
 
 @shared_task(name="emails.process_queue")
-def process_email_queue_task(batch_size: int = 50) -> Dict[str, int]:
+def process_email_queue_task(batch_size: int = 500) -> Dict[str, int]:
     """Send pending queued emails in FIFO order."""
 
     db = _get_session()
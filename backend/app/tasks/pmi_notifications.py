@@ -1,21 +1,28 @@
 """
 PMI Notification Tasks - Scheduled notification checks
 Uses Celery for background task processing
+
+Each scanner is a single joined query selecting exactly the items that need a
+notification together with the recipient and their preference flag. Results
+are read in keyset-paginated batches; per batch, one ledger lookup drops
+notifications already sent, the rest are sent concurrently, and the ledger
+rows for successful sends are committed with the batch.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import and_, exists, or_, select
 
 try:
     from celery import shared_task
 except ModuleNotFoundError:  # pragma: no cover - allow tests without Celery
-    from typing import Any, Callable, TypeVar
+    from typing import Any, Callable
     F = TypeVar("F", bound=Callable[..., Any])
 
     def shared_task(func: F | None = None, **_kwargs: Any) -> F:
@@ -25,246 +32,422 @@ except ModuleNotFoundError:  # pragma: no cover - allow tests without Celery
             return decorator  # type: ignore[return-value]
         return func
 
-from app.db.session import SessionLocal
+from app.db import session as session_module
 from app.models.pmi import (
     PMIProject,
     PMIMilestone,
     PMIRisk,
     PMISynergy,
     PMIDayOneChecklist,
+    PMIDayOneChecklistStatus,
+    PMIProjectStatus,
     PMIRiskSeverity,
     PMIRiskStatus,
+    PMISynergyStatus,
     PMIWorkstream,
 )
+from app.models.user import User
 from app.models.user_notification_preferences import UserNotificationPreferences
 from app.services import pmi_notification_service
+from app.utils.export_stream import iter_keyset
 
 logger = logging.getLogger(__name__)
 
+# Rows per keyset page and per ledger lookup/commit
+SCAN_BATCH_SIZE = 200
+# Emails in flight at once within a batch
+SEND_CONCURRENCY = 8
+
+MILESTONE_REMINDER_DAYS = (3, 7)
+DAY_ONE_WARNING_DAYS = 1
+ACTIVE_PROJECT_STATUSES = (PMIProjectStatus.planning, PMIProjectStatus.active)
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class _Notification:
+    """One outgoing email plus the ledger entry recorded once it is sent."""
+
+    organization_id: str
+    subject_id: str
+    dedupe_key: str
+    recipient_user_id: str
+    to_email: str
+    subject: str
+    body: str
+
+
+def _batched(rows: Iterable[_T], size: int = SCAN_BATCH_SIZE) -> Iterator[List[_T]]:
+    batch: List[_T] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes for timezone-aware columns
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _owner_joins(statement, *, owner_column, preference_column):
+    """Join the project owner and require their preference flag to be on."""
+    return (
+        statement
+        .join(User, User.id == owner_column)
+        .join(UserNotificationPreferences, UserNotificationPreferences.user_id == owner_column)
+        .where(preference_column.is_(True), User.email.isnot(None))
+    )
+
+
+async def _deliver(db: Session, notification_type: str, notifications: Sequence[_Notification]) -> int:
+    """Send the notifications not yet in the ledger, record the successes, and commit."""
+    already_sent = pmi_notification_service.sent_keys(
+        db, notification_type, {notification.subject_id for notification in notifications}
+    )
+    pending = [n for n in notifications if (n.subject_id, n.dedupe_key) not in already_sent]
+    semaphore = asyncio.Semaphore(SEND_CONCURRENCY)
+
+    async def send(notification: _Notification) -> bool:
+        async with semaphore:
+            try:
+                return await pmi_notification_service.send_plain_email(
+                    notification.to_email, notification.subject, notification.body
+                )
+            except Exception as e:
+                logger.error(f"Failed to send {notification_type} for {notification.subject_id}: {e}")
+                return False
+
+    results = await asyncio.gather(*(send(notification) for notification in pending))
+    pmi_notification_service.record_sent(
+        db,
+        notification_type,
+        [
+            {
+                "organization_id": notification.organization_id,
+                "subject_id": notification.subject_id,
+                "dedupe_key": notification.dedupe_key,
+                "recipient_user_id": notification.recipient_user_id,
+            }
+            for notification, sent in zip(pending, results)
+            if sent
+        ],
+    )
+    db.commit()
+    return sum(results)
+
+
+def _get_session() -> Session:
+    """Create a database session using the latest SessionLocal factory."""
+
+    session_factory = session_module.SessionLocal
+    if session_factory is None:
+        from app.core.database import init_engine
+
+        init_engine()
+        session_factory = session_module.SessionLocal
+
+    if session_factory is None:
+        raise RuntimeError("Database session factory is not initialized")
+
+    return session_factory()
+
+
+async def _run_scanner(name: str, scan) -> int:
+    if not pmi_notification_service.settings.sendgrid_api_key:
+        logger.warning(f"SendGrid not configured, skipping {name}")
+        return 0
+    db: Session = _get_session()
+    try:
+        return await scan(db)
+    except Exception as e:
+        logger.error(f"Error in {name}: {e}")
+        db.rollback()
+        return 0
+    finally:
+        db.close()
+
 
 @shared_task
-def check_milestone_due_dates_task() -> None:
+def check_milestone_due_dates_task() -> int:
     """Celery task wrapper for milestone due date checks."""
-    asyncio.run(check_milestone_due_dates())
+    return asyncio.run(check_milestone_due_dates())
 
 
-async def check_milestone_due_dates() -> None:
+async def check_milestone_due_dates() -> int:
     """
     Daily check for milestones due in 3 or 7 days.
     Sends reminders to users who have milestone reminders enabled.
     """
-    db: Session = SessionLocal()
-    try:
-        # Get all active PMI projects
-        projects = db.scalars(
-            select(PMIProject).where(PMIProject.status.in_(['planning', 'active']))
-        ).all()
-        
-        for project in projects:
-            # Get user notification preferences
-            prefs = db.scalar(
-                select(UserNotificationPreferences).where(
-                    UserNotificationPreferences.user_id == project.created_by
+    return await _run_scanner("check_milestone_due_dates", scan_milestone_due_dates)
+
+
+async def scan_milestone_due_dates(db: Session, now: Optional[datetime] = None) -> int:
+    """Send each due-milestone reminder once per reminder window; returns emails sent."""
+    now = now or datetime.now(timezone.utc)
+    windows = or_(
+        *(
+            and_(
+                PMIMilestone.target_date >= now + timedelta(days=days),
+                PMIMilestone.target_date < now + timedelta(days=days + 1),
+            )
+            for days in MILESTONE_REMINDER_DAYS
+        )
+    )
+    statement = _owner_joins(
+        select(
+            PMIMilestone.id,
+            PMIMilestone.name,
+            PMIMilestone.target_date,
+            PMIWorkstream.name.label("workstream_name"),
+            PMIProject.name.label("project_name"),
+            PMIProject.organization_id,
+            User.id.label("owner_id"),
+            User.email.label("owner_email"),
+        )
+        .join(PMIWorkstream, PMIWorkstream.id == PMIMilestone.workstream_id)
+        .join(PMIProject, PMIProject.id == PMIWorkstream.project_id),
+        owner_column=PMIProject.created_by,
+        preference_column=UserNotificationPreferences.pmi_milestone_reminders,
+    ).where(
+        PMIProject.status.in_(ACTIVE_PROJECT_STATUSES),
+        PMIMilestone.status != "completed",
+        windows,
+    )
+
+    sent = 0
+    for rows in _batched(iter_keyset(db, statement, [PMIMilestone.id], batch_size=SCAN_BATCH_SIZE)):
+        notifications = []
+        for row in rows:
+            target_date = _aware(row.target_date)
+            days = (target_date - now).days
+            subject, body = pmi_notification_service.milestone_reminder_message(
+                owner_email=row.owner_email,
+                milestone_name=row.name,
+                workstream_name=row.workstream_name,
+                target_date=target_date,
+                project_name=row.project_name,
+                days_until_due=days,
+            )
+            notifications.append(
+                _Notification(
+                    organization_id=row.organization_id,
+                    subject_id=row.id,
+                    dedupe_key=f"{days}d:{target_date.date().isoformat()}",
+                    recipient_user_id=row.owner_id,
+                    to_email=row.owner_email,
+                    subject=subject,
+                    body=body,
                 )
             )
-            
-            if not prefs or not prefs.pmi_milestone_reminders:
-                continue
-            
-            # Get all milestones for this project's workstreams
-            workstreams = db.scalars(
-                select(PMIWorkstream).where(PMIWorkstream.project_id == project.id)
-            ).all()
-            
-            for workstream in workstreams:
-                milestones = db.scalars(
-                    select(PMIMilestone).where(
-                        PMIMilestone.workstream_id == workstream.id,
-                        PMIMilestone.status != 'completed',
-                    )
-                ).all()
-                
-                for milestone in milestones:
-                    if milestone.target_date:
-                        # Check for 3-day and 7-day reminders
-                        for days in [3, 7]:
-                            try:
-                                await pmi_notification_service.send_milestone_reminder(
-                                    milestone.id,
-                                    project.organization_id,
-                                    db,
-                                    days_until_due=days,
-                                )
-                            except Exception as e:
-                                logger.error(f"Failed to send milestone reminder: {e}")
-        
-        db.commit()
-    except Exception as e:
-        logger.error(f"Error in check_milestone_due_dates: {e}")
-        db.rollback()
-    finally:
-        db.close()
+        sent += await _deliver(db, pmi_notification_service.MILESTONE_REMINDER, notifications)
+    return sent
 
 
 @shared_task
-def check_risk_escalations_task() -> None:
+def check_risk_escalations_task() -> int:
     """Celery task wrapper for risk escalation checks."""
-    asyncio.run(check_risk_escalations())
+    return asyncio.run(check_risk_escalations())
 
 
-async def check_risk_escalations() -> None:
+async def check_risk_escalations() -> int:
     """
     Hourly check for risk status changes that require alerts.
     Sends alerts for high/critical severity risks.
     """
-    db: Session = SessionLocal()
-    try:
-        # Get all open high/critical risks
-        risks = db.scalars(
-            select(PMIRisk).where(
-                PMIRisk.severity.in_([PMIRiskSeverity.high, PMIRiskSeverity.critical]),
-                PMIRisk.status == PMIRiskStatus.open,
+    return await _run_scanner("check_risk_escalations", scan_risk_escalations)
+
+
+async def scan_risk_escalations(db: Session) -> int:
+    """Alert once per open high/critical risk and severity level; returns emails sent."""
+    statement = _owner_joins(
+        select(
+            PMIRisk.id,
+            PMIRisk.title,
+            PMIRisk.description,
+            PMIRisk.mitigation_plan,
+            PMIRisk.severity,
+            PMIRisk.status,
+            PMIProject.name.label("project_name"),
+            PMIProject.organization_id,
+            User.id.label("owner_id"),
+            User.email.label("owner_email"),
+        ).join(PMIProject, PMIProject.id == PMIRisk.project_id),
+        owner_column=PMIProject.created_by,
+        preference_column=UserNotificationPreferences.pmi_risk_alerts,
+    ).where(
+        PMIRisk.severity.in_([PMIRiskSeverity.high, PMIRiskSeverity.critical]),
+        PMIRisk.status == PMIRiskStatus.open,
+    )
+
+    sent = 0
+    for rows in _batched(iter_keyset(db, statement, [PMIRisk.id], batch_size=SCAN_BATCH_SIZE)):
+        notifications = []
+        for row in rows:
+            subject, body = pmi_notification_service.risk_alert_message(
+                title=row.title,
+                severity=row.severity,
+                status=row.status,
+                project_name=row.project_name,
+                description=row.description,
+                mitigation_plan=row.mitigation_plan,
             )
-        ).all()
-        
-        for risk in risks:
-            project = db.scalar(select(PMIProject).where(PMIProject.id == risk.project_id))
-            if not project:
-                continue
-            
-            # Get user notification preferences
-            prefs = db.scalar(
-                select(UserNotificationPreferences).where(
-                    UserNotificationPreferences.user_id == project.created_by
+            notifications.append(
+                _Notification(
+                    organization_id=row.organization_id,
+                    subject_id=row.id,
+                    dedupe_key=row.severity.value,
+                    recipient_user_id=row.owner_id,
+                    to_email=row.owner_email,
+                    subject=subject,
+                    body=body,
                 )
             )
-            
-            if not prefs or not prefs.pmi_risk_alerts:
-                continue
-            
-            try:
-                await pmi_notification_service.send_risk_escalation_alert(
-                    risk.id,
-                    project.organization_id,
-                    db,
-                )
-            except Exception as e:
-                logger.error(f"Failed to send risk alert: {e}")
-        
-        db.commit()
-    except Exception as e:
-        logger.error(f"Error in check_risk_escalations: {e}")
-        db.rollback()
-    finally:
-        db.close()
+        sent += await _deliver(db, pmi_notification_service.RISK_ALERT, notifications)
+    return sent
 
 
 @shared_task
-def check_synergy_targets_task() -> None:
+def check_synergy_targets_task() -> int:
     """Celery task wrapper for synergy target checks."""
-    asyncio.run(check_synergy_targets())
+    return asyncio.run(check_synergy_targets())
 
 
-async def check_synergy_targets() -> None:
+async def check_synergy_targets() -> int:
     """
     Daily check for synergies behind schedule.
     Sends alerts when synergy target dates have passed.
     """
-    db: Session = SessionLocal()
-    try:
-        # Get all synergies with passed target dates
-        synergies = db.scalars(
-            select(PMISynergy).where(
-                PMISynergy.target_date < datetime.now(timezone.utc),
-                PMISynergy.status.notin_(['realized', 'cancelled']),
+    return await _run_scanner("check_synergy_targets", scan_synergy_targets)
+
+
+async def scan_synergy_targets(db: Session, now: Optional[datetime] = None) -> int:
+    """Alert once per missed synergy target date; returns emails sent."""
+    now = now or datetime.now(timezone.utc)
+    statement = _owner_joins(
+        select(
+            PMISynergy.id,
+            PMISynergy.name,
+            PMISynergy.category,
+            PMISynergy.planned_value,
+            PMISynergy.target_date,
+            PMISynergy.status,
+            PMIProject.name.label("project_name"),
+            PMIProject.organization_id,
+            User.id.label("owner_id"),
+            User.email.label("owner_email"),
+        ).join(PMIProject, PMIProject.id == PMISynergy.project_id),
+        owner_column=PMIProject.created_by,
+        preference_column=UserNotificationPreferences.pmi_synergy_alerts,
+    ).where(
+        PMISynergy.target_date < now,
+        PMISynergy.status.notin_([PMISynergyStatus.realized, PMISynergyStatus.cancelled]),
+    )
+
+    sent = 0
+    for rows in _batched(iter_keyset(db, statement, [PMISynergy.id], batch_size=SCAN_BATCH_SIZE)):
+        notifications = []
+        for row in rows:
+            target_date = _aware(row.target_date)
+            subject, body = pmi_notification_service.synergy_alert_message(
+                name=row.name,
+                category=row.category,
+                planned_value=row.planned_value,
+                target_date=target_date,
+                status=row.status,
+                project_name=row.project_name,
             )
-        ).all()
-        
-        for synergy in synergies:
-            project = db.scalar(select(PMIProject).where(PMIProject.id == synergy.project_id))
-            if not project:
-                continue
-            
-            # Get user notification preferences
-            prefs = db.scalar(
-                select(UserNotificationPreferences).where(
-                    UserNotificationPreferences.user_id == project.created_by
+            notifications.append(
+                _Notification(
+                    organization_id=row.organization_id,
+                    subject_id=row.id,
+                    dedupe_key=target_date.date().isoformat(),
+                    recipient_user_id=row.owner_id,
+                    to_email=row.owner_email,
+                    subject=subject,
+                    body=body,
                 )
             )
-            
-            if not prefs or not prefs.pmi_synergy_alerts:
-                continue
-            
-            try:
-                await pmi_notification_service.send_synergy_target_alert(
-                    synergy.id,
-                    project.organization_id,
-                    db,
-                )
-            except Exception as e:
-                logger.error(f"Failed to send synergy alert: {e}")
-        
-        db.commit()
-    except Exception as e:
-        logger.error(f"Error in check_synergy_targets: {e}")
-        db.rollback()
-    finally:
-        db.close()
+        sent += await _deliver(db, pmi_notification_service.SYNERGY_ALERT, notifications)
+    return sent
 
 
 @shared_task
-def check_day_one_readiness_task() -> None:
+def check_day_one_readiness_task() -> int:
     """Celery task wrapper for Day 1 readiness checks."""
-    asyncio.run(check_day_one_readiness())
+    return asyncio.run(check_day_one_readiness())
 
 
-async def check_day_one_readiness() -> None:
+async def check_day_one_readiness() -> int:
     """
     Daily check for Day 1 items approaching deadline.
     Sends warnings for incomplete Day 1 checklist items.
     """
-    db: Session = SessionLocal()
-    try:
-        # Get all active PMI projects with Day 1 dates approaching
-        projects = db.scalars(
-            select(PMIProject).where(
-                PMIProject.status.in_(['planning', 'active']),
-                PMIProject.day_one_date.isnot(None),
+    return await _run_scanner("check_day_one_readiness", scan_day_one_readiness)
+
+
+async def scan_day_one_readiness(db: Session, now: Optional[datetime] = None) -> int:
+    """Warn once per project whose Day 1 is a day away with items outstanding; returns emails sent."""
+    now = now or datetime.now(timezone.utc)
+    incomplete = and_(
+        PMIDayOneChecklist.project_id == PMIProject.id,
+        PMIDayOneChecklist.status != PMIDayOneChecklistStatus.complete,
+    )
+    statement = _owner_joins(
+        select(
+            PMIProject.id,
+            PMIProject.name,
+            PMIProject.day_one_date,
+            PMIProject.organization_id,
+            User.id.label("owner_id"),
+            User.email.label("owner_email"),
+        ),
+        owner_column=PMIProject.created_by,
+        preference_column=UserNotificationPreferences.pmi_day_one_warnings,
+    ).where(
+        PMIProject.status.in_(ACTIVE_PROJECT_STATUSES),
+        PMIProject.day_one_date >= now + timedelta(days=DAY_ONE_WARNING_DAYS),
+        PMIProject.day_one_date < now + timedelta(days=DAY_ONE_WARNING_DAYS + 1),
+        exists().where(incomplete),
+    )
+
+    sent = 0
+    for rows in _batched(iter_keyset(db, statement, [PMIProject.id], batch_size=SCAN_BATCH_SIZE)):
+        # Outstanding items for the whole batch in one query
+        items: Dict[str, list] = {row.id: [] for row in rows}
+        for item in db.execute(
+            select(PMIDayOneChecklist.project_id, PMIDayOneChecklist.item, PMIDayOneChecklist.category)
+            .where(
+                PMIDayOneChecklist.project_id.in_(list(items)),
+                PMIDayOneChecklist.status != PMIDayOneChecklistStatus.complete,
             )
-        ).all()
-        
-        for project in projects:
-            if not project.day_one_date:
-                continue
-            
-            days_until = (project.day_one_date - datetime.now(timezone.utc)).days
-            
-            # Check 1 day before Day 1
-            if days_until == 1:
-                # Get user notification preferences
-                prefs = db.scalar(
-                    select(UserNotificationPreferences).where(
-                        UserNotificationPreferences.user_id == project.created_by
-                    )
-                )
-                
-                if not prefs or not prefs.pmi_day_one_warnings:
-                    continue
-                
-                try:
-                    await pmi_notification_service.send_day_one_warning(
-                        project.id,
-                        project.organization_id,
-                        db,
-                        days_before=1,
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send Day 1 warning: {e}")
-        
-        db.commit()
-    except Exception as e:
-        logger.error(f"Error in check_day_one_readiness: {e}")
-        db.rollback()
-    finally:
-        db.close()
+            .order_by(PMIDayOneChecklist.project_id, PMIDayOneChecklist.created_at)
+        ):
+            items[item.project_id].append((item.item, item.category))
 
+        notifications = []
+        for row in rows:
+            day_one_date = _aware(row.day_one_date)
+            subject, body = pmi_notification_service.day_one_warning_message(
+                items=items[row.id],
+                project_name=row.name,
+                day_one_date=day_one_date,
+                days_before=DAY_ONE_WARNING_DAYS,
+            )
+            notifications.append(
+                _Notification(
+                    organization_id=row.organization_id,
+                    subject_id=row.id,
+                    dedupe_key=f"{DAY_ONE_WARNING_DAYS}d:{day_one_date.date().isoformat()}",
+                    recipient_user_id=row.owner_id,
+                    to_email=row.owner_email,
+                    subject=subject,
+                    body=body,
+                )
+            )
+        sent += await _deliver(db, pmi_notification_service.DAY_ONE_WARNING, notifications)
+    return sent
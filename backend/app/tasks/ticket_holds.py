@@ -0,0 +1,76 @@
+"""Celery task that returns expired checkout holds to ticket inventory."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Callable, TypeVar
+
+from redis import asyncio as redis_async
+from sqlalchemy.orm import Session
+
+try:
+    from celery import shared_task
+except ModuleNotFoundError:  # pragma: no cover - allow tests without Celery
+    F = TypeVar("F", bound=Callable[..., Any])
+
+    def shared_task(func: F | None = None, **_kwargs: Any) -> F:
+        if func is None:
+            def decorator(inner: F) -> F:
+                return inner
+
+            return decorator  # type: ignore[return-value]
+        return func
+
+from app.core.config import settings
+from app.db import session as session_module
+from app.services.ticket_inventory_service import release_expired_holds
+
+logger = logging.getLogger(__name__)
+
+
+def _get_session() -> Session:
+    """Create a database session using the latest SessionLocal factory."""
+
+    session_factory = session_module.SessionLocal
+    if session_factory is None:
+        from app.core.database import init_engine
+
+        init_engine()
+        session_factory = session_module.SessionLocal
+
+    if session_factory is None:
+        raise RuntimeError("Database session factory is not initialized")
+
+    return session_factory()
+
+
+async def _release_with_private_client(db: Session) -> int:
+    # Each run gets a fresh event loop, so it cannot reuse the shared client.
+    client = redis_async.from_url(settings.redis_url, decode_responses=True)
+    try:
+        return await release_expired_holds(db, redis=client)
+    finally:
+        await client.aclose()
+
+
+@shared_task
+def release_expired_ticket_holds_task() -> int:
+    """Release abandoned checkout holds; schedule every minute via beat.
+
+    Checkout also releases expired holds before reserving, so inventory is
+    returned even when no beat schedule runs this task.
+    """
+    if not settings.redis_url:
+        return 0
+    db = _get_session()
+    try:
+        released = asyncio.run(_release_with_private_client(db))
+        if released:
+            logger.info("Released %d expired ticket holds", released)
+        return released
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,105 @@
+"""Keyset-paginated query iteration and incremental CSV/JSON encoders for exports."""
+from __future__ import annotations
+
+import csv
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_FLUSH_ROWS = 500
+
+
+def iter_keyset(
+    db: Session,
+    statement: Select,
+    key_columns: Sequence[Any],
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    descending: bool = False,
+) -> Iterator[Row]:
+    """
+    Yield the rows of ``statement`` page by page using keyset pagination.
+
+    Each page is a separate ``LIMIT`` query continuing after the last key seen,
+    so memory stays bounded and no page costs more than the first, unlike
+    ``OFFSET``. ``key_columns`` must be selected by ``statement`` and together
+    identify a row uniquely (e.g. ``(created_at, id)``).
+
+    Args:
+        db: Database session
+        statement: SELECT without ORDER BY/LIMIT; extra filters are fine
+        key_columns: Columns to order and page by
+        batch_size: Rows fetched per query
+        descending: Page from the highest key down
+    """
+    order_by = [column.desc() for column in key_columns] if descending else list(key_columns)
+    key = tuple_(*key_columns)
+    last: Optional[Sequence[Any]] = None
+    while True:
+        page = statement
+        if last is not None:
+            boundary = tuple_(*last)
+            page = page.where(key < boundary if descending else key > boundary)
+        rows = db.execute(page.order_by(*order_by).limit(batch_size)).all()
+        yield from rows
+        if len(rows) < batch_size:
+            return
+        last = [rows[-1]._mapping[column] for column in key_columns]
+
+
+class _Echo:
+    """File-like object whose ``write`` returns what it was given (for ``csv.writer``)."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _chunked(pieces: Iterable[str], *, flush_rows: int = DEFAULT_FLUSH_ROWS) -> Iterator[bytes]:
+    """Join encoded rows into UTF-8 chunks of ``flush_rows`` rows each."""
+    batch: List[str] = []
+    for piece in pieces:
+        batch.append(piece)
+        if len(batch) >= flush_rows:
+            yield "".join(batch).encode("utf-8")
+            batch.clear()
+    if batch:
+        yield "".join(batch).encode("utf-8")
+
+
+def csv_chunks(
+    header: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    *,
+    flush_rows: int = DEFAULT_FLUSH_ROWS,
+) -> Iterator[bytes]:
+    """Encode ``rows`` as CSV with a header line."""
+    writer = csv.writer(_Echo())
+
+    def lines() -> Iterator[str]:
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow(row)
+
+    return _chunked(lines(), flush_rows=flush_rows)
+
+
+def ndjson_chunks(records: Iterable[Dict[str, Any]], *, flush_rows: int = DEFAULT_FLUSH_ROWS) -> Iterator[bytes]:
+    """Encode ``records`` as newline-delimited JSON."""
+    return _chunked((json.dumps(record, default=str) + "\n" for record in records), flush_rows=flush_rows)
+
+
+def json_array_chunks(records: Iterable[Dict[str, Any]], *, flush_rows: int = DEFAULT_FLUSH_ROWS) -> Iterator[bytes]:
+    """Encode ``records`` as a single JSON array, one element per line."""
+
+    def pieces() -> Iterator[str]:
+        separator = "[\n  "
+        for record in records:
+            yield separator + json.dumps(record, default=str)
+            separator = ",\n  "
+        yield "[]" if separator.startswith("[") else "\n]"
+
+    return _chunked(pieces(), flush_rows=flush_rows)
@@ -0,0 +1,139 @@
+"""Compiled ``{{variable}}`` templates shared by campaign and document rendering."""
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Hashable, Iterable, List, Mapping, Optional, Pattern, Tuple
+
+VARIABLE_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+
+DEFAULT_CACHE_SIZE = 256
+
+_MISSING = object()
+
+
+class CompiledTemplate:
+    """
+    A template tokenized once into alternating literal text and variable names.
+
+    Rendering walks the segment list and joins the pieces in a single pass, so
+    its cost is proportional to the output length regardless of how many
+    variables the template uses. ``pattern`` must capture the variable name
+    in its first group; it defaults to ``{{name}}``.
+    """
+
+    __slots__ = ("source", "literals", "names", "placeholders", "variables")
+
+    def __init__(self, source: str, pattern: Pattern[str] = VARIABLE_PATTERN):
+        self.source = source
+        literals: List[str] = []
+        names: List[str] = []
+        placeholders: List[str] = []
+        position = 0
+        for match in pattern.finditer(source):
+            literals.append(source[position:match.start()])
+            names.append(match.group(1))
+            placeholders.append(match.group(0))
+            position = match.end()
+        literals.append(source[position:])
+        # One more literal than names: literal, name, literal, ..., literal
+        self.literals: Tuple[str, ...] = tuple(literals)
+        self.names: Tuple[str, ...] = tuple(names)
+        self.placeholders: Tuple[str, ...] = tuple(placeholders)
+        self.variables: Tuple[str, ...] = tuple(dict.fromkeys(self.names))
+
+    def missing(self, values: Mapping[str, Any]) -> List[str]:
+        """Variables used by the template that ``values`` does not provide."""
+        return [name for name in self.variables if name not in values]
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """Substitute ``values``; placeholders without a value are left as written."""
+        if not self.names:
+            return self.source
+        pieces = [self.literals[0]]
+        for name, placeholder, literal in zip(self.names, self.placeholders, self.literals[1:]):
+            value = values.get(name, _MISSING)
+            pieces.append(placeholder if value is _MISSING else str(value))
+            pieces.append(literal)
+        return "".join(pieces)
+
+    def render_many(self, value_sets: Iterable[Mapping[str, Any]]) -> List[str]:
+        """Render the template once per variable set."""
+        return [self.render(values) for values in value_sets]
+
+
+@lru_cache(maxsize=DEFAULT_CACHE_SIZE)
+def compile_template(source: str, pattern: Pattern[str] = VARIABLE_PATTERN) -> CompiledTemplate:
+    """Compile ``source``, reusing the result for identical template text."""
+    return CompiledTemplate(source, pattern)
+
+
+class _TemplateCache:
+    """Thread-safe LRU of compiled templates keyed by template identity and version."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, CompiledTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, source: str) -> CompiledTemplate:
+        with self._lock:
+            compiled = self._entries.get(key)
+            # Guard against edits that land within the timestamp's resolution
+            if compiled is not None and (compiled.source is source or compiled.source == source):
+                self._entries.move_to_end(key)
+                return compiled
+        compiled = CompiledTemplate(source)
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = _TemplateCache()
+
+
+def get_compiled(
+    template_id: Hashable,
+    updated_at: Optional[Any],
+    source: str,
+) -> CompiledTemplate:
+    """
+    Return the compiled form of a stored template.
+
+    Entries are keyed by ``template_id`` and ``updated_at`` so an edited
+    template is recompiled on its next render. Callers should namespace
+    ``template_id`` (e.g. ``("campaign", 12, "subject")``) when several
+    template tables or fields share the cache.
+    """
+    return _cache.get((template_id, updated_at), source)
+
+
+def render_many(
+    template_id: Hashable,
+    updated_at: Optional[Any],
+    source: str,
+    value_sets: Iterable[Mapping[str, Any]],
+) -> List[str]:
+    """Render one stored template against many variable sets."""
+    return get_compiled(template_id, updated_at, source).render_many(value_sets)
+
+
+def clear_cache() -> None:
+    """Drop every compiled template (tests and template migrations)."""
+    _cache.clear()
+    compile_template.cache_clear()
+
+
+def extract_variables(source: str) -> List[str]:
+    """Unique variable names used by ``source``, in order of first use."""
+    return list(compile_template(source).variables)
+
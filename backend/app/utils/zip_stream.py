@@ -0,0 +1,125 @@
+"""Incremental ZIP archive writer for streaming responses."""
+from __future__ import annotations
+
+import io
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Optional
+
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+# MIME types whose payloads are already compressed; deflating them again costs
+# CPU for little or no size benefit, so "auto" mode stores them as-is.
+PRECOMPRESSED_CONTENT_TYPES = {
+    "application/pdf",
+    "application/zip",
+    "application/x-zip-compressed",
+    "application/gzip",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+}
+PRECOMPRESSED_PREFIXES = ("image/", "video/", "audio/")
+
+COMPRESSION_AUTO = "auto"
+COMPRESSION_DEFLATE = "deflate"
+COMPRESSION_STORE = "store"
+
+
+def is_precompressed(content_type: Optional[str]) -> bool:
+    """Return True when deflating ``content_type`` is unlikely to help."""
+
+    if not content_type:
+        return False
+    content_type = content_type.lower()
+    return content_type in PRECOMPRESSED_CONTENT_TYPES or content_type.startswith(PRECOMPRESSED_PREFIXES)
+
+
+def resolve_compress_type(content_type: Optional[str], compression: str = COMPRESSION_AUTO) -> int:
+    """Map a compression mode + MIME type to a ``zipfile`` compression constant."""
+
+    if compression == COMPRESSION_STORE:
+        return zipfile.ZIP_STORED
+    if compression == COMPRESSION_DEFLATE:
+        return zipfile.ZIP_DEFLATED
+    return zipfile.ZIP_STORED if is_precompressed(content_type) else zipfile.ZIP_DEFLATED
+
+
+@dataclass
+class ZipStreamEntry:
+    """A single archive member whose bytes are pulled lazily."""
+
+    arcname: str
+    open_chunks: Callable[[], AsyncIterable[bytes]]
+    compress_type: int = zipfile.ZIP_DEFLATED
+    on_added: Optional[Callable[[], None]] = None
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable buffer that hands written bytes back out."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def stream_zip(entries: Iterable[ZipStreamEntry]) -> AsyncIterator[bytes]:
+    """Yield a ZIP archive chunk by chunk.
+
+    Memory use is bounded by the source chunk size: each member is copied from
+    its async chunk source straight into the archive and the compressed output
+    is yielded as soon as it is produced. Members whose source fails before the
+    first byte are skipped; the archive stays valid.
+    """
+
+    sink = _ChunkSink()
+    archive = zipfile.ZipFile(sink, mode="w", allowZip64=True)
+    try:
+        for entry in entries:
+            source = entry.open_chunks().__aiter__()
+            try:
+                first_chunk = await source.__anext__()
+            except StopAsyncIteration:
+                first_chunk = b""
+            except Exception:
+                continue
+
+            info = zipfile.ZipInfo(entry.arcname, date_time=time.localtime()[:6])
+            info.compress_type = entry.compress_type
+            info.external_attr = 0o644 << 16
+
+            with archive.open(info, mode="w", force_zip64=True) as member:
+                member.write(first_chunk)
+                pending = sink.drain()
+                if pending:
+                    yield pending
+                async for chunk in source:
+                    member.write(chunk)
+                    pending = sink.drain()
+                    if pending:
+                        yield pending
+
+            if entry.on_added is not None:
+                entry.on_added()
+            pending = sink.drain()
+            if pending:
+                yield pending
+    finally:
+        archive.close()
+
+    tail = sink.drain()
+    if tail:
+        yield tail
@@ -4,12 +4,14 @@ Tests for dashboard metrics API endpoints.
 Tests real metric queries with Redis caching for performance.
 """
 import json
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.orm import Session
 
+from app.api.routes.dashboard import METRICS_CACHE_TTL, METRICS_STALE_TTL
+from app.core.cache import get_local_cache
 from app.db.session import get_db
 from app.main import app
 from app.models.deal import Deal
@@ -66,6 +68,24 @@ async def test_get_dashboard_metrics_real_data(
     assert isinstance(data["documents_count"], int)
 
 
+@pytest.fixture(autouse=True)
+def _clear_local_cache():
+    get_local_cache().clear()
+    yield
+    get_local_cache().clear()
+
+
+def _mock_pipeline(mock_redis, *results):
+    """Make ``mock_redis.pipeline()`` replay ``results`` on successive execute() calls."""
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(side_effect=list(results))
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=pipe)
+    context.__aexit__ = AsyncMock(return_value=False)
+    mock_redis.pipeline = MagicMock(return_value=context)
+    return pipe
+
+
 @pytest.mark.asyncio
 async def test_get_dashboard_metrics_with_cache_hit(
     async_client: AsyncClient,
@@ -81,7 +101,7 @@ async def test_get_dashboard_metrics_with_cache_hit(
     }
 
     with patch('app.api.routes.dashboard.redis_client') as mock_redis:
-        mock_redis.get = AsyncMock(return_value=json.dumps(cached_metrics))
+        pipe = _mock_pipeline(mock_redis, [json.dumps(cached_metrics), 300_000])
 
         # Act
         response = await async_client.get("/api/dashboard/metrics", headers=auth_headers)
@@ -90,7 +110,7 @@ async def test_get_dashboard_metrics_with_cache_hit(
         assert response.status_code == 200
         data = response.json()
         assert data == cached_metrics
-        mock_redis.get.assert_called_once()
+        pipe.get.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -102,19 +122,19 @@ async def test_get_dashboard_metrics_cache_miss_sets_cache(
     """Test dashboard metrics query DB on cache miss and set cache."""
     # Arrange: Mock Redis cache miss, then set
     with patch('app.api.routes.dashboard.redis_client') as mock_redis:
-        mock_redis.get = AsyncMock(return_value=None)  # Cache miss
-        mock_redis.setex = AsyncMock()
+        pipe = _mock_pipeline(mock_redis, [None, -2], [True])  # Cache miss, then write
 
         # Act
         response = await async_client.get("/api/dashboard/metrics", headers=auth_headers)
 
         # Assert
         assert response.status_code == 200
-        mock_redis.get.assert_called_once()
-        mock_redis.setex.assert_called_once()
-        # Verify cache TTL is 5 minutes (300 seconds)
-        call_args = mock_redis.setex.call_args
-        assert call_args[0][1] == 300  # TTL
+        pipe.get.assert_called_once()
+        pipe.setex.assert_called_once()
+        # Entries live for the 5 minute TTL plus the stale-while-revalidate window
+        call_args = pipe.setex.call_args
+        assert call_args[0][1] == METRICS_CACHE_TTL + METRICS_STALE_TTL
+        assert METRICS_CACHE_TTL == 300
 
 
 @pytest.mark.asyncio
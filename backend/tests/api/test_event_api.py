@@ -16,6 +16,7 @@ Total: 19 API endpoints
 import pytest
 import io
 import csv
+import json
 from datetime import datetime, timedelta
 from starlette.testclient import TestClient
 from sqlalchemy.orm import Session
@@ -571,6 +572,23 @@ def test_export_registrations_empty_event_returns_200(client: TestClient, test_e
     assert len(rows) == 0, "Should have no registrations"
 
 
+def test_export_registrations_json_and_ndjson_include_ticket_name(
+    client: TestClient,
+    test_event: Event,
+    test_registration: EventRegistration,
+):
+    """Test JSON and NDJSON exports stream the same records with joined ticket names."""
+    json_response = client.get(f"/api/events/{test_event.id}/registrations/export?format=json")
+    ndjson_response = client.get(f"/api/events/{test_event.id}/registrations/export?format=ndjson")
+
+    assert json_response.status_code == 200
+    assert ndjson_response.headers["content-type"] == "application/x-ndjson"
+    records = json_response.json()
+    assert records == [json.loads(line) for line in ndjson_response.text.splitlines()]
+    assert records[0]["ticket_name"] == "Early Bird Pass"
+    assert records[0]["status"] == "confirmed"
+
+
 def test_create_registration_sends_confirmation_email(
     client: TestClient,
     test_event: Event,
@@ -17,8 +17,9 @@ from httpx import AsyncClient
 from jose import jwt
 from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 from _pytest.fixtures import FixtureLookupError
 from sqlalchemy.dialects.postgresql import JSONB, ARRAY, INET
 from sqlalchemy.ext.compiler import compiles
@@ -58,6 +59,7 @@ os.environ["CLERK_WEBHOOK_SECRET"] = "test_webhook_secret"
 os.environ["CLERK_JWT_ALGORITHM"] = "HS256"
 os.environ["SECRET_KEY"] = "test_api_secret"
 os.environ["DEBUG"] = "false"  # Disable init_db() in lifespan during tests
+os.environ["QUERY_BUDGET_STRICT"] = "true"  # Fail tests when a route exceeds its @query_budget
 os.environ.setdefault("STRIPE_API_KEY", "sk_test_dummy")
 os.environ.setdefault("STRIPE_SECRET_KEY", "sk_test_dummy")
 os.environ.setdefault("STRIPE_PUBLISHABLE_KEY", "pk_test_dummy")
@@ -80,6 +82,7 @@ os.environ.setdefault("SYNTHFLOW_API_KEY", "sk_test_synthflow_dummy")
 from tests import path_safety  # pytest namespace package (PEP 420)
 
 from app.core.config import get_settings, settings  # noqa: E402
+from app.core import database as database_module  # noqa: E402
 from app.db import session as session_module  # noqa: E402
 from app.db.base import Base  # noqa: E402
 from app.db.session import get_db  # noqa: E402
@@ -101,6 +104,8 @@ sys.modules.setdefault("openai", openai_mock)
 import importlib
 
 from app.main import app  # noqa: E402
+from app.api.dependencies.auth import clear_principal_cache  # noqa: E402
+from app.core.subscription import clear_tier_cache, reset_clerk_client  # noqa: E402
 from app.models.user import User, UserRole  # noqa: E402
 from app.models.organization import Organization  # noqa: E402
 from app.models.document import Document, Folder, DocumentPermission, DocumentAccessLog  # noqa: E402, F401
@@ -118,6 +123,37 @@ get_settings.cache_clear()
 
 
 
+class _SharedSQLiteConnection:
+    """Proxy over the in-memory sqlite3 connection that ignores ``close``."""
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def close(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+def _bridge_async_engine(engine):
+    """Build an aiosqlite engine that shares the sync engine's in-memory database.
+
+    Every async checkout wraps the single StaticPool sqlite3 connection, so rows
+    written through ``db_session`` are visible to ``get_async_db`` and vice versa.
+    """
+    import aiosqlite
+
+    proxy = engine.raw_connection()
+    raw_connection = proxy.driver_connection
+    proxy.close()
+
+    async def _creator():
+        return await aiosqlite.Connection(lambda: _SharedSQLiteConnection(raw_connection), 64)
+
+    return create_async_engine("sqlite+aiosqlite://", async_creator=_creator, poolclass=NullPool)
+
+
 @pytest.fixture()
 def engine():
     """Create an in-memory SQLite engine per test."""
@@ -134,9 +170,15 @@ def engine():
     session_module.engine = engine
     session_module.SessionLocal = session_factory
 
+    async_engine = _bridge_async_engine(engine)
+    database_module.async_engine = async_engine
+    database_module.AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
     try:
         yield engine
     finally:
+        database_module.async_engine = None
+        database_module.AsyncSessionLocal = None
         _safe_drop_schema(engine)
         engine.dispose()
 
@@ -210,6 +252,15 @@ def _reset_mocks():
             pass
 
 
+@pytest.fixture(autouse=True)
+def _reset_auth_caches():
+    """Drop cached principals, subscription tiers and the shared Clerk client."""
+    yield
+    clear_principal_cache()
+    clear_tier_cache()
+    reset_clerk_client()
+
+
 @pytest.fixture(autouse=True)
 def _cleanup_async_resources():
     """Clean up async resources between tests to prevent resource leaks."""
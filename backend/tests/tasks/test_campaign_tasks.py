@@ -9,7 +9,7 @@ from __future__ import annotations
 
 import importlib
 import sys
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from datetime import datetime, timezone
 import pytest
 import asyncio
@@ -136,15 +136,11 @@ class TestQueueCampaignEmailTask:
 class TestSendEmailBatchTask:
     """Test send_email_batch_task function."""
 
-    @patch('app.tasks.campaign_tasks.asyncio.run')
-    @patch('app.tasks.campaign_tasks.send_email')
-    def test_send_email_batch_success(self, mock_send_email, mock_asyncio_run):
-        """Test successful batch email sending."""
-        mock_asyncio_run.side_effect = [
-            {"status": "sent"},
-            {"status": "sent"},
-            {"status": "sent"}
-        ]
+    @patch('app.tasks.campaign_tasks.close_transport', new_callable=AsyncMock)
+    @patch('app.tasks.campaign_tasks.send_email', new_callable=AsyncMock)
+    def test_send_email_batch_success(self, mock_send_email, mock_close_transport):
+        """Test successful batch email sending on one event loop."""
+        mock_send_email.return_value = {"status": "sent"}
 
         emails = [
             {"to": "user1@example.com", "subject": "Test 1", "html_content": "<p>Content 1</p>"},
@@ -157,15 +153,17 @@ class TestSendEmailBatchTask:
         assert result["sent_count"] == 3
         assert result["total"] == 3
         assert len(result["failures"]) == 0
-        assert mock_asyncio_run.call_count == 3
+        assert mock_send_email.await_count == 3
+        mock_close_transport.assert_awaited_once()
 
-    @patch('app.tasks.campaign_tasks.asyncio.run')
-    def test_send_email_batch_partial_failure(self, mock_asyncio_run):
+    @patch('app.tasks.campaign_tasks.close_transport', new_callable=AsyncMock)
+    @patch('app.tasks.campaign_tasks.send_email', new_callable=AsyncMock)
+    def test_send_email_batch_partial_failure(self, mock_send_email, mock_close_transport):
         """Test batch email sending with partial failures."""
-        mock_asyncio_run.side_effect = [
+        mock_send_email.side_effect = [
             {"status": "sent"},
             Exception("SMTP error"),
-            {"status": "sent"}
+            {"status": "failed", "error": "rejected"},
         ]
 
         emails = [
@@ -176,20 +174,20 @@ class TestSendEmailBatchTask:
 
         result = campaign_tasks.send_email_batch_task(emails)
 
-        assert result["sent_count"] == 2
+        assert result["sent_count"] == 1
         assert result["total"] == 3
-        assert len(result["failures"]) == 1
+        assert len(result["failures"]) == 2
         assert "user2@example.com" in result["failures"][0]
+        assert "user3@example.com: rejected" in result["failures"][1]
+        mock_close_transport.assert_awaited_once()
 
-    @patch('app.tasks.campaign_tasks.asyncio.run')
-    @patch('app.tasks.campaign_tasks.render_template')
-    def test_send_email_batch_with_template(self, mock_render_template, mock_asyncio_run):
+    @patch('app.tasks.campaign_tasks.close_transport', new_callable=AsyncMock)
+    @patch('app.tasks.campaign_tasks.send_email', new_callable=AsyncMock)
+    @patch('app.tasks.campaign_tasks.render_template', new_callable=AsyncMock)
+    def test_send_email_batch_with_template(self, mock_render_template, mock_send_email, mock_close_transport):
         """Test batch email sending with template rendering."""
         mock_render_template.return_value = {"html_content": "<p>Rendered</p>", "text_content": "Rendered"}
-        mock_asyncio_run.side_effect = [
-            {"status": "sent"},
-            {"status": "sent"}
-        ]
+        mock_send_email.return_value = {"status": "sent"}
 
         emails = [
             {"to": "user1@example.com", "subject": "Test 1", "template_name": "test_template", "template_data": {"name": "User 1"}},
@@ -199,7 +197,7 @@ class TestSendEmailBatchTask:
         result = campaign_tasks.send_email_batch_task(emails)
 
         assert result["sent_count"] == 2
-        assert mock_asyncio_run.call_count == 2
+        assert mock_send_email.await_args.kwargs["html_content"] == "<p>Rendered</p>"
 
 
 class TestUpdateCampaignAnalyticsTask:
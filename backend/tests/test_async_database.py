@@ -0,0 +1,113 @@
+"""Tests for the native async database layer (AsyncEngine, get_async_db, run_db)."""
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app.core import database
+from app.core.config import settings
+from app.core.database import get_async_db, run_db, to_async_database_url
+from app.models.deal import Deal
+from app.models.podcast_usage import PodcastUsage
+from app.services import deal_service, quota_service
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("postgresql://u:p@db:5432/app", "postgresql+asyncpg://u:p@db:5432/app"),
+        ("postgres://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("postgresql+psycopg2://u:p@db/app?sslmode=require", "postgresql+asyncpg://u:p@db/app?ssl=require"),
+        ("sqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+    ],
+)
+def test_database_url_maps_to_async_driver(url, expected):
+    assert to_async_database_url(url) == expected
+
+
+def test_unsupported_backend_is_rejected():
+    with pytest.raises(ValueError, match="mysql"):
+        to_async_database_url("mysql://u:p@db/app")
+
+
+def test_pool_options_follow_settings(monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 25)
+    monkeypatch.setattr(settings, "db_max_overflow", 5)
+
+    options = database._pool_options("postgresql://u:p@db/app")
+
+    assert options["pool_size"] == 25
+    assert options["max_overflow"] == 5
+    assert options["pool_pre_ping"] is settings.db_pool_pre_ping
+    assert options["pool_recycle"] == settings.db_pool_recycle
+    assert database._pool_options("sqlite:///./app.db") == {}
+
+
+@pytest.mark.asyncio
+async def test_get_async_db_commits_on_success(db_session, create_deal_for_org):
+    deal, _, _ = create_deal_for_org()
+
+    sessions = get_async_db()
+    db = await sessions.__anext__()
+    loaded = await deal_service.get_deal_by_id_async(str(deal.id), deal.organization_id, db)
+    loaded.name = "Renamed asynchronously"
+    with pytest.raises(StopAsyncIteration):
+        await sessions.__anext__()
+
+    db_session.expire_all()
+    assert db_session.get(Deal, deal.id).name == "Renamed asynchronously"
+
+
+@pytest.mark.asyncio
+async def test_get_async_db_rolls_back_on_error(db_session, create_deal_for_org):
+    deal, _, _ = create_deal_for_org(name="Original")
+
+    sessions = get_async_db()
+    db = await sessions.__anext__()
+    loaded = await deal_service.get_deal_by_id_async(str(deal.id), deal.organization_id, db)
+    loaded.name = "Discarded"
+    with pytest.raises(RuntimeError):
+        await sessions.athrow(RuntimeError("boom"))
+
+    db_session.expire_all()
+    assert db_session.get(Deal, deal.id).name == "Original"
+
+
+@pytest.mark.asyncio
+async def test_run_db_accepts_sync_and_async_sessions(db_session, create_deal_for_org):
+    deal, _, _ = create_deal_for_org()
+
+    def count_deals(session, organization_id):
+        return session.scalar(select(func.count()).where(Deal.organization_id == organization_id))
+
+    assert await run_db(db_session, count_deals, deal.organization_id) == 1
+    async with database.AsyncSessionLocal() as db:
+        assert await run_db(db, count_deals, deal.organization_id) == 1
+
+
+@pytest.mark.asyncio
+async def test_list_deals_async_matches_sync_listing(db_session, create_deal_for_org):
+    deal, owner, org = create_deal_for_org(name="Alpha", deal_size=Decimal("1000000"))
+    create_deal_for_org(organization=org, owner=owner, name="Beta")
+
+    expected = deal_service.list_deals(org.id, db_session, search="alp")
+    async with database.AsyncSessionLocal() as db:
+        deals, total = await deal_service.list_deals_async(org.id, db, search="alp")
+
+    assert total == expected[1] == 1
+    assert [item.id for item in deals] == [item.id for item in expected[0]] == [deal.id]
+
+
+@pytest.mark.asyncio
+async def test_quota_usage_round_trips_through_async_session(db_session, create_organization):
+    org = create_organization()
+
+    async with database.AsyncSessionLocal() as db:
+        await quota_service.increment_episode_count(organization_id=org.id, db=db)
+        await quota_service.increment_episode_count(organization_id=org.id, db=db)
+        assert await quota_service.get_monthly_usage(org.id, db) == 2
+
+    usage = db_session.scalar(select(PodcastUsage).where(PodcastUsage.organization_id == org.id))
+    assert usage.episode_count == 2
+    assert usage.month.tzinfo is None
@@ -14,7 +14,13 @@ from uuid import uuid4
 
 import pytest
 
-from app.services.audio_chunking_service import AudioChunkingService
+from app.services.audio_chunking_service import (
+    AudioChunk,
+    AudioChunkingService,
+    format_srt,
+    group_words_into_cues,
+    transcript_from_response,
+)
 
 
 class TestAudioChunkingServiceInitialization:
@@ -82,36 +88,46 @@ class TestAudioChunkingServiceFileValidation:
         assert result is False
 
 
+def _process(returncode: int = 0, stdout: str = "", stderr: str = "") -> MagicMock:
+    """Fake asyncio subprocess."""
+    process = MagicMock(returncode=returncode)
+    process.communicate = AsyncMock(return_value=(stdout.encode(), stderr.encode()))
+    return process
+
+
 class TestAudioChunkingServiceChunking:
     """Test suite for audio file chunking operations."""
 
     @pytest.mark.asyncio
-    @patch('app.services.audio_chunking_service.subprocess.run')
+    @patch('app.services.audio_chunking_service.asyncio.create_subprocess_exec', new_callable=AsyncMock)
     async def test_chunk_audio_file_creates_multiple_chunks(self, mock_subprocess):
-        """Test chunking large audio file into multiple chunks."""
+        """Test chunking large audio file into multiple chunks with one ffmpeg run."""
         # Arrange
         service = AudioChunkingService()
         audio_path = Path("/tmp/large_audio.mp3")
 
         # Mock file exists
         with patch.object(Path, 'exists', return_value=True):
-            # Mock ffprobe returns 60 second duration
-            # Mock ffmpeg chunk extraction succeeds
+            # Mock ffprobe returns 3000 second duration (needs several chunks)
+            # Mock a single ffmpeg invocation writing every chunk
             mock_subprocess.side_effect = [
-                MagicMock(returncode=0, stdout="60.0\n"),  # ffprobe
-                MagicMock(returncode=0),  # ffmpeg chunk 0
-                MagicMock(returncode=0),  # ffmpeg chunk 1
+                _process(stdout="3000.0\n"),  # ffprobe
+                _process(),  # ffmpeg, all chunks
             ]
 
             # Act
             chunks = await service.chunk_audio_file(audio_path)
 
             # Assert
-            assert len(chunks) >= 1
+            assert len(chunks) == 3
             assert all(isinstance(chunk, Path) for chunk in chunks)
+            assert mock_subprocess.await_count == 2
+            ffmpeg_args = mock_subprocess.await_args_list[1].args
+            assert ffmpeg_args.count("-i") == 1
+            assert [arg for arg in ffmpeg_args if arg.endswith(".mp3")][1:] == [str(c) for c in chunks]
 
     @pytest.mark.asyncio
-    @patch('app.services.audio_chunking_service.subprocess.run')
+    @patch('app.services.audio_chunking_service.asyncio.create_subprocess_exec', new_callable=AsyncMock)
     async def test_chunk_audio_file_handles_mp3_format(self, mock_subprocess):
         """Test chunking MP3 files."""
         # Arrange
@@ -120,8 +136,8 @@ class TestAudioChunkingServiceChunking:
 
         with patch.object(Path, 'exists', return_value=True):
             mock_subprocess.side_effect = [
-                MagicMock(returncode=0, stdout="30.0\n"),  # ffprobe
-                MagicMock(returncode=0),  # ffmpeg chunk
+                _process(stdout="30.0\n"),  # ffprobe
+                _process(),  # ffmpeg
             ]
 
             # Act
@@ -129,9 +145,10 @@ class TestAudioChunkingServiceChunking:
 
             # Assert
             assert len(chunks) > 0
+            assert "copy" in mock_subprocess.await_args_list[1].args
 
     @pytest.mark.asyncio
-    @patch('app.services.audio_chunking_service.subprocess.run')
+    @patch('app.services.audio_chunking_service.asyncio.create_subprocess_exec', new_callable=AsyncMock)
     async def test_chunk_audio_file_handles_wav_format(self, mock_subprocess):
         """Test chunking WAV files."""
         # Arrange
@@ -140,8 +157,8 @@ class TestAudioChunkingServiceChunking:
 
         with patch.object(Path, 'exists', return_value=True):
             mock_subprocess.side_effect = [
-                MagicMock(returncode=0, stdout="30.0\n"),
-                MagicMock(returncode=0),
+                _process(stdout="30.0\n"),
+                _process(),
             ]
 
             # Act
@@ -149,9 +166,10 @@ class TestAudioChunkingServiceChunking:
 
             # Assert
             assert len(chunks) > 0
+            assert "libmp3lame" in mock_subprocess.await_args_list[1].args
 
     @pytest.mark.asyncio
-    @patch('app.services.audio_chunking_service.subprocess.run')
+    @patch('app.services.audio_chunking_service.asyncio.create_subprocess_exec', new_callable=AsyncMock)
     async def test_chunk_audio_file_applies_overlap(self, mock_subprocess):
         """Test chunks have overlap to prevent word splitting."""
         # Arrange
@@ -160,16 +178,38 @@ class TestAudioChunkingServiceChunking:
 
         with patch.object(Path, 'exists', return_value=True):
             mock_subprocess.side_effect = [
-                MagicMock(returncode=0, stdout="60.0\n"),
-                MagicMock(returncode=0),
-                MagicMock(returncode=0),
+                _process(stdout="3000.0\n"),
+                _process(),
             ]
 
             # Act
-            chunks = await service.chunk_audio_file(audio_path)
+            chunks = await service.chunk_audio(audio_path)
 
-            # Assert - verify ffmpeg was called with overlap parameters
-            assert len(chunks) >= 1
+            # Assert - each chunk starts a second before the previous one ends
+            assert chunks[0].start == 0.0
+            for previous, chunk in zip(chunks, chunks[1:]):
+                assert previous.end - chunk.start == pytest.approx(2.0)
+            assert chunks[-1].end == pytest.approx(3000.0)
+
+    @pytest.mark.asyncio
+    @patch('app.services.audio_chunking_service.asyncio.create_subprocess_exec', new_callable=AsyncMock)
+    async def test_chunk_audio_file_raises_when_ffmpeg_fails(self, mock_subprocess):
+        """Test a failed ffmpeg run raises and removes partial chunks."""
+        service = AudioChunkingService()
+        audio_path = Path("/tmp/audio.mp3")
+
+        with patch.object(Path, 'exists', return_value=True), patch.object(
+            service, 'cleanup_chunks', new_callable=AsyncMock
+        ) as mock_cleanup:
+            mock_subprocess.side_effect = [
+                _process(stdout="30.0\n"),
+                _process(returncode=1, stderr="Invalid data"),
+            ]
+
+            with pytest.raises(RuntimeError, match="Invalid data"):
+                await service.chunk_audio_file(audio_path)
+
+            assert mock_cleanup.await_count == 1
 
     @pytest.mark.asyncio
     async def test_chunk_audio_file_raises_error_for_missing_file(self):
@@ -273,6 +313,141 @@ class TestAudioChunkingServiceTranscription:
         assert kwargs.get("language") == "es"
 
 
+    @pytest.mark.asyncio
+    @patch('builtins.open', new_callable=mock_open, read_data=b"audio data")
+    async def test_transcribe_chunks_runs_concurrently_and_stitches_overlap(self, mock_file):
+        """Chunks are transcribed in parallel and overlap words kept once, on the file timeline."""
+        import asyncio
+
+        service = AudioChunkingService(max_concurrency=2)
+        chunks = [
+            AudioChunk(Path("/tmp/chunk_0.mp3"), 0.0, 11.0),
+            AudioChunk(Path("/tmp/chunk_1.mp3"), 9.0, 20.0),
+        ]
+        # Like the real API, word timings carry no punctuation; the text does
+        responses = iter([
+            {
+                "text": " Hello there. General Kenobi",
+                "words": [
+                    {"word": "Hello", "start": 0.5, "end": 0.9},
+                    {"word": "there", "start": 1.0, "end": 1.4},
+                    {"word": "General", "start": 9.2, "end": 9.8},
+                    {"word": "Kenobi", "start": 10.2, "end": 10.9},
+                ],
+                "segments": [
+                    {"start": 0.0, "end": 1.5, "text": " Hello there."},
+                    {"start": 9.0, "end": 11.0, "text": " General Kenobi"},
+                ],
+            },
+            {
+                "text": " General Kenobi, you are bold",
+                "words": [
+                    {"word": "General", "start": 0.2, "end": 0.8},
+                    {"word": "Kenobi", "start": 1.2, "end": 1.9},
+                    {"word": "you", "start": 2.5, "end": 2.7},
+                    {"word": "are", "start": 2.8, "end": 3.0},
+                    {"word": "bold", "start": 3.1, "end": 3.6},
+                ],
+                "segments": [
+                    {"start": 0.0, "end": 3.6, "text": " General Kenobi, you are bold"},
+                ],
+            },
+        ])
+        in_flight = 0
+        peak = 0
+
+        async def create(**kwargs):
+            nonlocal in_flight, peak
+            response = next(responses)  # Chunks start in order
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return response
+
+        with patch('openai.AsyncOpenAI') as mock_openai_class:
+            mock_client = MagicMock()
+            mock_client.audio.transcriptions.create = AsyncMock(side_effect=create)
+            mock_openai_class.return_value = mock_client
+
+            transcript = await service.transcribe_chunks(chunks, "test_api_key")
+
+        assert peak == 2
+        assert transcript == "Hello there. General Kenobi, you are bold"
+        assert [word["start"] for word in transcript.words] == [0.5, 1.0, 9.2, 10.2, 11.5, 11.8, 12.1]
+        assert [segment["end"] for segment in transcript.segments] == [1.5, 12.6]
+        assert transcript.cues() == [
+            {"time": 0.5, "end": 1.4, "text": "Hello there."},
+            {"time": 9.2, "end": 12.6, "text": "General Kenobi, you are bold"},
+        ]
+        kwargs = mock_client.audio.transcriptions.create.await_args_list[0].kwargs
+        assert kwargs["timestamp_granularities"] == ["word", "segment"]
+
+    @pytest.mark.asyncio
+    @patch('builtins.open', new_callable=mock_open, read_data=b"audio data")
+    async def test_transcribe_chunks_retries_transient_errors(self, mock_file):
+        """Rate limits and timeouts are retried with backoff before failing the chunk."""
+
+        class TransientError(Exception):
+            pass
+
+        service = AudioChunkingService(max_retries=3, retry_backoff_seconds=0)
+        with patch('openai.AsyncOpenAI') as mock_openai_class, patch(
+            'app.services.audio_chunking_service._retryable_errors', return_value=(TransientError,)
+        ):
+            mock_client = MagicMock()
+            mock_client.audio.transcriptions.create = AsyncMock(
+                side_effect=[TransientError("429"), TransientError("timeout"), "Recovered text"]
+            )
+            mock_openai_class.return_value = mock_client
+
+            transcript = await service.transcribe_chunks([Path("/tmp/chunk_0.mp3")], "test_api_key")
+
+        assert transcript == "Recovered text"
+        assert mock_client.audio.transcriptions.create.await_count == 3
+
+
+class TestTranscriptCues:
+    """Test suite for subtitle cues built from word timestamps."""
+
+    def test_group_words_into_cues_and_format_srt(self):
+        words = [
+            {"word": "Welcome", "start": 0.0, "end": 0.4},
+            {"word": "back.", "start": 0.5, "end": 0.9},
+            {"word": "Today", "start": 4.0, "end": 4.3},
+            {"word": "we", "start": 4.4, "end": 4.5},
+            {"word": "talk", "start": 4.6, "end": 5.0},
+        ]
+
+        cues = group_words_into_cues(words)
+
+        assert cues == [
+            {"time": 0.0, "end": 0.9, "text": "Welcome back."},
+            {"time": 4.0, "end": 5.0, "text": "Today we talk"},
+        ]
+        assert format_srt(cues) == (
+            "1\n00:00:00,000 --> 00:00:00,900\nWelcome back.\n\n"
+            "2\n00:00:04,000 --> 00:00:05,000\nToday we talk\n\n"
+        )
+
+    def test_cues_break_at_segment_boundaries(self):
+        transcript = transcript_from_response(
+            {
+                "text": "So anyway that was the news and now the weather",
+                "words": [
+                    {"word": word, "start": index * 0.3, "end": index * 0.3 + 0.25}
+                    for index, word in enumerate("So anyway that was the news and now the weather".split())
+                ],
+                "segments": [
+                    {"start": 0.0, "end": 1.7, "text": "So anyway that was the news"},
+                    {"start": 1.8, "end": 3.0, "text": "and now the weather"},
+                ],
+            }
+        )
+
+        assert [cue["text"] for cue in transcript.cues()] == ["So anyway that was the news", "and now the weather"]
+
+
 class TestAudioChunkingServiceCleanup:
     """Test suite for chunk cleanup operations."""
 
@@ -4,13 +4,27 @@ Tests for Redis HTTP Response Caching
 TDD RED Phase: Write failing tests first
 """
 
+import asyncio
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import patch
+from app.core import cache as cache_module
 from app.core.cache import (
+    CACHE_HIT,
+    CACHE_LOCAL,
+    CACHE_MISS,
+    CACHE_STALE,
+    DEALS_TAG,
+    LocalLRUCache,
     generate_cache_key,
     get_cache_stats,
-    invalidate_cache_pattern,
+    get_local_cache,
+    get_or_compute,
+    invalidate_cache_tags,
+    invalidate_tags_soon,
+    org_tag,
     cached_response,
+    store_tagged,
 )
 
 
@@ -73,32 +87,136 @@ class TestCacheKeyGeneration:
         assert "org-456" in key2
 
 
+class FakePipeline:
+    """Queues commands and replays them against FakeRedis on execute()."""
+
+    def __init__(self, redis: "FakeRedis"):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        results = []
+        for name, args, kwargs in self.commands:
+            results.append(getattr(self.redis, f"_{name}")(*args, **kwargs))
+        self.commands = []
+        return results
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeRedis:
+    """In-memory stand-in for ``redis.asyncio.Redis``; KEYS/SCAN are unsupported."""
+
+    def __init__(self):
+        self.store: dict = {}
+        self.ttls: dict = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        self.round_trips += 1
+        return self._get(key)
+
+    async def mget(self, *keys):
+        self.round_trips += 1
+        return [self._get(key) for key in keys]
+
+    async def delete(self, *keys):
+        self.round_trips += 1
+        return self._delete(*keys)
+
+    def _get(self, key):
+        return self.store.get(key)
+
+    def _pttl(self, key):
+        if key not in self.store:
+            return -2
+        ttl = self.ttls.get(key)
+        return ttl * 1000 if ttl is not None else -1
+
+    def _setex(self, key, ttl, value):
+        self.store[key] = value
+        self.ttls[key] = ttl
+        return True
+
+    def _incrby(self, key, amount):
+        self.store[key] = str(int(self.store.get(key, "0")) + amount)
+        return int(self.store[key])
+
+    def _sadd(self, key, *members):
+        self.store.setdefault(key, set()).update(members)
+        return len(members)
+
+    def _smembers(self, key):
+        return set(self.store.get(key, set()))
+
+    def _eval(self, script, numkeys, key, ttl):
+        assert script == cache_module.EXTEND_TTL_SCRIPT
+        current = self.ttls.get(key)
+        if current is not None and current >= ttl:
+            return 0
+        self.ttls[key] = ttl
+        return 1
+
+    def _delete(self, *keys):
+        deleted = 0
+        for key in keys:
+            if key in self.store:
+                del self.store[key]
+                self.ttls.pop(key, None)
+                deleted += 1
+        return deleted
+
+
+@pytest.fixture(autouse=True)
+def _reset_pending_stats():
+    for key in cache_module._pending_stats:
+        cache_module._pending_stats[key] = 0
+    get_local_cache().clear()
+    yield
+    get_local_cache().clear()
+    for key in cache_module._pending_stats:
+        cache_module._pending_stats[key] = 0
+
+
 class TestCacheStats:
     """Test cache statistics tracking."""
 
+    @pytest.mark.asyncio
     @patch("app.core.cache.get_redis_client")
-    def test_get_cache_stats_no_redis(self, mock_redis):
+    async def test_get_cache_stats_no_redis(self, mock_redis):
         """Should return zeros when Redis unavailable."""
         mock_redis.return_value = None
 
-        stats = get_cache_stats()
+        stats = await get_cache_stats()
 
         assert stats["hits"] == 0
         assert stats["misses"] == 0
         assert stats["hit_rate"] == 0.0
         assert stats["available"] is False
 
+    @pytest.mark.asyncio
     @patch("app.core.cache.get_redis_client")
-    def test_get_cache_stats_with_data(self, mock_redis):
+    async def test_get_cache_stats_with_data(self, mock_redis):
         """Should calculate hit rate correctly."""
-        mock_client = MagicMock()
-        mock_client.get.side_effect = lambda key: {
-            "cache:stats:hits": "80",
-            "cache:stats:misses": "20",
-        }.get(key, "0")
-        mock_redis.return_value = mock_client
+        redis_client = FakeRedis()
+        redis_client.store.update({"cache:stats:hits": "80", "cache:stats:misses": "20"})
+        mock_redis.return_value = redis_client
 
-        stats = get_cache_stats()
+        stats = await get_cache_stats()
 
         assert stats["hits"] == 80
         assert stats["misses"] == 20
@@ -106,72 +224,92 @@ class TestCacheStats:
         assert stats["hit_rate"] == 80.0
         assert stats["available"] is True
 
+    @pytest.mark.asyncio
+    @patch("app.core.cache.get_redis_client")
+    async def test_get_cache_stats_flushes_buffered_counters(self, mock_redis):
+        """Should include counters buffered in-process but not yet flushed."""
+        redis_client = FakeRedis()
+        redis_client.store["cache:stats:hits"] = "5"
+        mock_redis.return_value = redis_client
+        cache_module._pending_stats["cache:stats:hits"] = 3
+        cache_module._pending_stats["cache:stats:misses"] = 2
+
+        stats = await get_cache_stats()
+
+        assert stats["hits"] == 8
+        assert stats["misses"] == 2
+        assert cache_module._pending_stats == {"cache:stats:hits": 0, "cache:stats:misses": 0}
+
 
 class TestCacheInvalidation:
-    """Test cache invalidation functionality."""
+    """Test tag-based cache invalidation."""
 
-    @patch("app.core.cache.get_redis_client")
-    def test_invalidate_cache_pattern(self, mock_redis):
-        """Should delete keys matching pattern."""
-        mock_client = MagicMock()
-        mock_client.keys.return_value = [
-            "api:v1:deals:org-123:abc123",
-            "api:v1:deals:org-123:def456",
-        ]
-        mock_client.delete.return_value = 2
-        mock_redis.return_value = mock_client
+    @pytest.mark.asyncio
+    async def test_invalidate_cache_tags_deletes_only_tagged_keys(self):
+        """Should delete keys registered under the tag and leave others alone."""
+        redis_client = FakeRedis()
+        deals_tag = org_tag("org-123", "deals")
+        await store_tagged("api:v1:deals:org-123:abc123", "[]", 60, [deals_tag], redis=redis_client)
+        await store_tagged("api:v1:deals:org-123:def456", "[]", 60, [deals_tag], redis=redis_client)
+        await store_tagged(
+            "api:v1:deals:org-456:abc123", "[]", 60, [org_tag("org-456", "deals")], redis=redis_client
+        )
 
-        deleted = invalidate_cache_pattern("api:v1:deals:org-123:*")
+        deleted = await invalidate_cache_tags(deals_tag, redis=redis_client)
 
         assert deleted == 2
-        mock_client.keys.assert_called_once_with("api:v1:deals:org-123:*")
-        mock_client.delete.assert_called_once()
-
-    @patch("app.core.cache.get_redis_client")
-    def test_invalidate_cache_pattern_no_matches(self, mock_redis):
-        """Should return 0 when no keys match."""
-        mock_client = MagicMock()
-        mock_client.keys.return_value = []
-        mock_redis.return_value = mock_client
+        assert "api:v1:deals:org-123:abc123" not in redis_client.store
+        assert "api:v1:deals:org-123:def456" not in redis_client.store
+        assert "tag:org:org-123:deals" not in redis_client.store
+        assert "api:v1:deals:org-456:abc123" in redis_client.store
+
+    @pytest.mark.asyncio
+    async def test_invalidate_cache_tags_no_members(self):
+        """Should return 0 when nothing is registered under the tag."""
+        redis_client = FakeRedis()
 
-        deleted = invalidate_cache_pattern("api:v1:nonexistent:*")
+        deleted = await invalidate_cache_tags(org_tag("org-123", "deals"), redis=redis_client)
 
         assert deleted == 0
-        mock_client.delete.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_tag_ttl_only_extends(self):
+        """Tag sets should live as long as their longest-lived entry."""
+        redis_client = FakeRedis()
+        tag = org_tag("org-123", "deals")
 
-class DummyUser:
-    def __init__(self, organization_id="org-1", user_id="user-1"):
-        self.organization_id = organization_id
-        self.id = user_id
+        await store_tagged("long", "[]", 600, [tag], redis=redis_client)
+        await store_tagged("short", "[]", 60, [tag], redis=redis_client)
 
+        assert redis_client.ttls["tag:org:org-123:deals"] == 600
 
-class FakeRedis:
-    def __init__(self):
-        self.store: dict[str, str] = {}
+    def test_invalidate_tags_soon_without_redis_is_noop(self, monkeypatch):
+        """Should not touch Redis when it is not configured."""
+        monkeypatch.setattr(cache_module.settings, "redis_url", "")
+        with patch("app.core.cache.invalidate_cache_tags") as invalidate:
+            invalidate_tags_soon(org_tag("org-123", "deals"))
+        invalidate.assert_not_called()
 
-    def get(self, key: str):
-        return self.store.get(key)
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_soon_schedules_on_running_loop(self, monkeypatch):
+        """Sync callers inside the event loop should schedule a task."""
+        redis_client = FakeRedis()
+        tag = org_tag("org-123", "deals")
+        await store_tagged("api:v1:deals:org-123:abc", "[]", 60, [tag], redis=redis_client)
+        monkeypatch.setattr(cache_module.settings, "redis_url", "redis://example")
+        monkeypatch.setattr("app.core.cache.get_redis_client", lambda: redis_client)
 
-    def setex(self, key: str, ttl: int, value: str):
-        self.store[key] = value
+        invalidate_tags_soon(tag)
+        assert cache_module._background_tasks
+        await asyncio.gather(*cache_module._background_tasks)
 
-    def incr(self, key: str):
-        current = int(self.store.get(key, "0"))
-        self.store[key] = str(current + 1)
-        return self.store[key]
+        assert "api:v1:deals:org-123:abc" not in redis_client.store
 
-    def keys(self, pattern: str):
-        from fnmatch import fnmatch
-        return [k for k in self.store if fnmatch(k, pattern)]
 
-    def delete(self, *keys):
-        deleted = 0
-        for key in keys:
-            if key in self.store:
-                del self.store[key]
-                deleted += 1
-        return deleted
+class DummyUser:
+    def __init__(self, organization_id="org-1", user_id="user-1"):
+        self.organization_id = organization_id
+        self.id = user_id
 
 
 class TestCachedResponseDecorator:
@@ -180,7 +318,7 @@ class TestCachedResponseDecorator:
     def _build_client(self, monkeypatch, redis_client):
         from fastapi import FastAPI, Depends, Request
         from fastapi.testclient import TestClient
-        from app.core.cache import cached_response, get_redis_client
+        from app.core.cache import cached_response
 
         monkeypatch.setattr("app.core.cache.get_redis_client", lambda: redis_client)
 
@@ -191,7 +329,7 @@ class TestCachedResponseDecorator:
             return DummyUser()
 
         @app.get("/cached")
-        @cached_response(ttl=60)
+        @cached_response(ttl=60, tags=[DEALS_TAG])
         async def cached_endpoint(request: Request, current_user: DummyUser = Depends(get_user)):
             hit_counter["count"] += 1
             return {"hits": hit_counter["count"]}
@@ -261,6 +399,172 @@ class TestCachedResponseDecorator:
         ]
         assert cached_keys, f"No cached keys found in store: {redis_client.store}"
 
+    def test_registers_entry_under_formatted_tag(self, monkeypatch):
+        redis_client = FakeRedis()
+        client, counter = self._build_client(monkeypatch, redis_client)
+
+        client.get("/cached")
+
+        tagged = redis_client.store["tag:org:org-1:deals"]
+        assert len(tagged) == 1
+        assert next(iter(tagged)) in redis_client.store
+
+    def test_miss_writes_entry_tags_and_counters_in_one_round_trip(self, monkeypatch):
+        redis_client = FakeRedis()
+        client, counter = self._build_client(monkeypatch, redis_client)
+
+        client.get("/cached")
+
+        # One GET for the lookup, one pipeline for SETEX + tag set + INCRBY.
+        assert redis_client.round_trips == 2
+        assert redis_client.store["cache:stats:misses"] == "1"
+
+    def test_repeat_hits_are_served_from_local_tier(self, monkeypatch):
+        redis_client = FakeRedis()
+        client, counter = self._build_client(monkeypatch, redis_client)
+
+        client.get("/cached")
+        trips = redis_client.round_trips
+        second = client.get("/cached")
+
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.headers["X-Cache-Tier"] == "local"
+        assert redis_client.round_trips == trips
+
+    def test_hits_are_buffered_not_written_per_request(self, monkeypatch):
+        redis_client = FakeRedis()
+        client, counter = self._build_client(monkeypatch, redis_client)
+
+        client.get("/cached")
+        client.get("/cached")
+
+        assert "cache:stats:hits" not in redis_client.store
+        assert cache_module._pending_stats["cache:stats:hits"] == 1
+
+
+class TestLocalLRUCache:
+    """Test the in-process cache tier."""
+
+    def test_evicts_least_recently_used(self):
+        local = LocalLRUCache(max_entries=2)
+        local.set("a", "1", ttl=60)
+        local.set("b", "2", ttl=60)
+        local.get("a")
+        local.set("c", "3", ttl=60)
+
+        assert local.get("a") is not None
+        assert local.get("b") is None
+        assert len(local) == 2
+
+    def test_stale_entries_only_returned_when_allowed(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        local = LocalLRUCache()
+        local.set("a", "1", ttl=5, stale_ttl=30)
+
+        now[0] += 10
+        assert local.get("a") is None
+        assert local.get("a", allow_stale=True).value == "1"
+
+        now[0] += 30
+        assert local.get("a", allow_stale=True) is None
+
+    def test_invalidate_tags_evicts_tagged_entries(self):
+        local = LocalLRUCache()
+        local.set("a", "1", ttl=60, tags=["org:1:deals"])
+        local.set("b", "2", ttl=60, tags=["org:2:deals"])
+
+        assert local.invalidate_tags(["org:1:deals"]) == 1
+        assert local.get("a") is None
+        assert local.get("b") is not None
+
+
+class TestGetOrCompute:
+    """Test tiered lookups, request coalescing and stale-while-revalidate."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_computation(self):
+        redis_client = FakeRedis()
+        calls = {"count": 0}
+        release = asyncio.Event()
+
+        async def compute():
+            calls["count"] += 1
+            await release.wait()
+            return '{"ok": true}'
+
+        pending = [
+            asyncio.ensure_future(get_or_compute("k", compute, ttl=60, redis=redis_client))
+            for _ in range(50)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*pending)
+
+        assert calls["count"] == 1
+        assert {value for value, _ in results} == {'{"ok": true}'}
+        assert redis_client.store["k"] == '{"ok": true}'
+
+    @pytest.mark.asyncio
+    async def test_failed_computation_propagates_to_waiters(self):
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            raise RuntimeError("boom")
+
+        pending = [asyncio.ensure_future(get_or_compute("k", compute, ttl=60)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*pending, return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert not cache_module._inflight
+
+    @pytest.mark.asyncio
+    async def test_tiers_are_consulted_in_order(self):
+        redis_client = FakeRedis()
+
+        async def compute():
+            return "fresh"
+
+        assert await get_or_compute("k", compute, ttl=60, redis=redis_client) == ("fresh", CACHE_MISS)
+        assert await get_or_compute("k", compute, ttl=60, redis=redis_client) == ("fresh", CACHE_LOCAL)
+
+        get_local_cache().clear()
+        assert await get_or_compute("k", compute, ttl=60, redis=redis_client) == ("fresh", CACHE_HIT)
+
+    @pytest.mark.asyncio
+    async def test_stale_redis_value_served_while_refreshing(self):
+        redis_client = FakeRedis()
+        redis_client._setex("k", 30, "old")  # 30s left of a 60s stale window
+
+        async def compute():
+            return "new"
+
+        value, outcome = await get_or_compute("k", compute, ttl=300, stale_ttl=60, redis=redis_client)
+        assert (value, outcome) == ("old", CACHE_STALE)
+
+        await asyncio.gather(*cache_module._background_tasks)
+        assert redis_client.store["k"] == "new"
+        assert redis_client.ttls["k"] == 360
+
+    @pytest.mark.asyncio
+    async def test_invalidation_clears_local_tier(self):
+        redis_client = FakeRedis()
+        tag = org_tag("org-1", "deals")
+        calls = {"count": 0}
+
+        async def compute():
+            calls["count"] += 1
+            return str(calls["count"])
+
+        await get_or_compute("k", compute, ttl=60, tags=[tag], redis=redis_client)
+        await invalidate_cache_tags(tag, redis=redis_client)
+        value, outcome = await get_or_compute("k", compute, ttl=60, tags=[tag], redis=redis_client)
+
+        assert (value, outcome) == ("2", CACHE_MISS)
+
 
 class TestCacheMultiTenancy:
     """Test multi-tenant cache isolation."""
@@ -191,7 +191,7 @@ class TestExecuteCampaign:
         db.commit()
         
         # Mock Celery task - patch where it's imported
-        with patch('app.tasks.campaign_tasks.queue_campaign_email_task') as mock_task:
+        with patch('app.tasks.campaign_tasks.send_email_batch_task') as mock_task:
             mock_task.delay = Mock(return_value=Mock(id="task-123"))
             
             # Execute campaign
@@ -203,12 +203,82 @@ class TestExecuteCampaign:
             db.refresh(recipient2)
             
             # Assertions
-            assert mock_task.delay.call_count == 2  # Called for each recipient
+            assert mock_task.delay.call_count == 1  # One batch for both recipients
+            batch = mock_task.delay.call_args.args[0]
+            assert [email["to"] for email in batch] == ["john@example.com", "jane@example.com"]
+            assert result["sent_count"] == 2
             assert recipient1.sent is True
             assert recipient2.sent is True
             assert recipient1.sent_at is not None
             assert recipient2.sent_at is not None
     
+    def test_execute_email_campaign_batches_with_constant_queries(
+        self, db: Session, test_user: User, test_org: Organization, monkeypatch
+    ):
+        """Recipients are rendered from one compiled template and queued in fixed-size batches."""
+        from app.core.query_metrics import capture_queries
+        from app.models.master_admin import AdminLeadCapture
+
+        monkeypatch.setattr(campaign_service, "EMAIL_BATCH_SIZE", 2)
+        template = CampaignTemplate(
+            organization_id=str(test_org.id),
+            name="Batch Template",
+            subject="Hello {{first_name}}",
+            content="Hi {{first_name}} at {{company}}",
+            type="email",
+            variables=["first_name", "company"],
+            created_by=str(test_user.id),
+        )
+        db.add(template)
+        db.commit()
+
+        def run_campaign(count: int):
+            prospects = [
+                AdminProspect(
+                    user_id=str(test_user.id),
+                    name=f"Person{count}x{i} Example",
+                    email=f"person{count}x{i}@example.com",
+                    company="Acme",
+                )
+                for i in range(count)
+            ]
+            db.add_all(prospects)
+            db.commit()
+            campaign = AdminCampaign(
+                user_id=str(test_user.id),
+                name=f"Batch Campaign {count}",
+                type=CampaignType.EMAIL,
+                status=CampaignStatus.DRAFT,
+                subject="Fallback",
+                content="Fallback",
+                template_id=template.id,
+            )
+            db.add(campaign)
+            db.commit()
+            db.add_all(
+                AdminCampaignRecipient(campaign_id=campaign.id, prospect_id=prospect.id)
+                for prospect in prospects
+            )
+            db.commit()
+            campaign_id = campaign.id
+
+            with patch('app.tasks.campaign_tasks.send_email_batch_task') as mock_task:
+                with capture_queries() as stats:
+                    result = campaign_service.execute_campaign(campaign_id, test_user, db)
+            return campaign_id, result, mock_task.delay.call_args_list, stats.count
+
+        small_id, small, _, small_queries = run_campaign(3)
+        large_id, large, calls, large_queries = run_campaign(7)
+
+        assert small["sent_count"] == 3
+        assert large["sent_count"] == 7
+        assert large_queries == small_queries
+        assert [len(call.args[0]) for call in calls] == [2, 2, 2, 1]
+        assert calls[0].args[0][0]["subject"] == "Hello Person7x0"
+        assert calls[0].args[0][0]["template_data"]["content"] == "Hi Person7x0 at Acme"
+        assert db.query(CampaignActivity).filter(CampaignActivity.campaign_id == large_id).count() == 7
+        assert db.query(AdminLeadCapture).filter(AdminLeadCapture.source == f"campaign_{large_id}").count() == 7
+    
     def test_execute_voice_campaign(self, db: Session, test_user: User, test_org: Organization):
         """Test executing a voice campaign via Synthflow."""
         # Create prospect with phone
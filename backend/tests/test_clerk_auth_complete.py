@@ -12,6 +12,7 @@ from jose import jwt
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.query_metrics import capture_queries
 from app.models.organization import Organization
 from app.models.user import User, UserRole
 from app.models.rbac_audit_log import RBACAuditLog
@@ -693,3 +694,81 @@ def test_full_user_lifecycle(client, db_session: Session) -> None:
 
     db_session.refresh(user)
     assert user.is_active is False
+
+
+# ============================================================================
+# PRINCIPAL CACHE TESTS
+# ============================================================================
+
+
+def _post_webhook(client, payload: dict):
+    signature, body = _sign_payload(payload)
+    return client.post(
+        "/api/webhooks/clerk",
+        data=body,
+        headers={"svix-signature": signature, "content-type": "application/json"},
+    )
+
+
+def test_auth_me_reuses_principal_for_session(client, db_session: Session) -> None:
+    """Warm requests for the same session skip the user lookup entirely."""
+    user = User(clerk_user_id="user_cached", email="cached@example.com", role=UserRole.growth)
+    db_session.add(user)
+    db_session.commit()
+    token = _make_token("user_cached", {"sid": "sess_cached"})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+    with capture_queries() as stats:
+        response = client.get("/api/auth/me", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "cached@example.com"
+    assert stats.count == 0
+
+
+def test_principal_cache_is_keyed_by_checked_claims(client, db_session: Session) -> None:
+    """A changed role claim within the same session is re-checked, not served from cache."""
+    user = User(clerk_user_id="user_claims", email="claims@example.com", role=UserRole.growth)
+    db_session.add(user)
+    db_session.commit()
+
+    valid = _make_token("user_claims", {"sid": "sess_claims", "org_role": "growth"})
+    forged = _make_token("user_claims", {"sid": "sess_claims", "org_role": "admin"})
+
+    assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {valid}"}).status_code == 200
+    response = client.get("/api/auth/me", headers={"Authorization": f"Bearer {forged}"})
+
+    assert response.status_code == 401
+
+
+def test_user_webhook_evicts_cached_principal(client, db_session: Session) -> None:
+    """user.updated drops cached principals so the next request sees the change."""
+    user = User(clerk_user_id="user_evict", email="evict@example.com", first_name="Before", role=UserRole.solo)
+    db_session.add(user)
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {_make_token('user_evict', {'sid': 'sess_evict'})}"}
+    assert client.get("/api/auth/me", headers=headers).json()["first_name"] == "Before"
+
+    response = _post_webhook(
+        client,
+        {"type": "user.updated", "data": {"id": "user_evict", "first_name": "After"}},
+    )
+    assert response.status_code == 200
+
+    assert client.get("/api/auth/me", headers=headers).json()["first_name"] == "After"
+
+
+def test_session_ended_webhook_evicts_cached_principal(client, db_session: Session) -> None:
+    """session.ended forces the next request on that session back to the database."""
+    user = User(clerk_user_id="user_session_end", email="session-end@example.com", role=UserRole.solo)
+    db_session.add(user)
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {_make_token('user_session_end', {'sid': 'sess_end'})}"}
+    client.get("/api/auth/me", headers=headers)
+
+    _post_webhook(client, {"type": "session.ended", "data": {"id": "sess_end", "user_id": "user_session_end"}})
+
+    with capture_queries() as stats:
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+    assert stats.count >= 1
@@ -3,6 +3,7 @@ import uuid
 
 import pytest
 
+from app.core.query_metrics import capture_queries
 from app.models.community import (
     ModerationActionType,
     PostCategory,
@@ -456,6 +457,33 @@ def test_get_flagged_content(db_session, test_org_user):
     assert flagged[0]["flag_count"] == 1
 
 
+def test_get_flagged_content_uses_constant_queries(db_session, test_org_user):
+    """Flag counts are aggregated in SQL rather than queried per post."""
+    posts = []
+    for index in range(3):
+        post_data = PostCreate(title=f"Bad Post {index}", content="Inappropriate", category=PostCategory.general)
+        post = community_service.create_post(post_data, test_org_user, db_session)
+        for _ in range(index + 1):
+            moderation_data = ModerationActionCreate(
+                target_type=TargetType.post,
+                target_id=post.id,
+                action_type=ModerationActionType.flag,
+                reason="Spam",
+            )
+            community_service.moderate_content(moderation_data, test_org_user, db_session)
+        posts.append(post)
+    organization_id = test_org_user.organization_id
+    db_session.expire_all()
+
+    with capture_queries() as stats:
+        flagged = community_service.get_flagged_content(organization_id, db_session)
+
+    assert stats.count == 1
+    counts = {item["target_id"]: item["flag_count"] for item in flagged}
+    assert counts == {post.id: index + 1 for index, post in enumerate(posts)}
+    assert all(item["last_flagged_at"] is not None for item in flagged)
+
+
 # ============================================================================
 # Analytics Service Tests
 # ============================================================================
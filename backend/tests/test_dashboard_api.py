@@ -147,6 +147,27 @@ class TestDashboardAPI:
         } == set(data.keys())
         
     
+    def test_get_dashboard_metrics_keeps_seeded_rollup(
+        self,
+        client: TestClient,
+        db_session,
+        create_user,
+        create_organization,
+        auth_headers,
+    ):
+        """The metrics computation commits the rollup it seeds on first use."""
+        from app.models.dashboard_rollup import OrganizationDashboardRollup
+
+        org = create_organization(name="Metrics Org")
+        user = create_user(email="metrics@example.com", organization_id=str(org.id))
+        dependency_overrides(get_current_user, lambda: user)
+
+        response = client.get("/api/dashboard/metrics", headers=auth_headers)
+
+        assert response.status_code == 200
+        db_session.expire_all()
+        assert db_session.get(OrganizationDashboardRollup, str(org.id)) is not None
+
     def test_dashboard_endpoints_require_authentication(
         self,
         client: TestClient,
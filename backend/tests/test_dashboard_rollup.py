@@ -0,0 +1,174 @@
+"""Tests for the per-organization dashboard rollups."""
+from __future__ import annotations
+
+import importlib
+import sys
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from app.api.dependencies.auth import get_current_user
+from app.models.dashboard_rollup import OrganizationDashboardRollup, compute_rollups, empty_counters
+from app.models.deal import DealStage
+from app.models.document import Document
+from app.models.task import DealTask
+from app.services.dashboard_rollup_service import reconcile_dashboard_rollups
+
+# Ensure Celery's shared_task decorator becomes a no-op for these unit tests
+celery_module = sys.modules.get("celery")
+if celery_module is not None:
+    celery_module.shared_task.side_effect = (
+        lambda func=None, **kwargs: func if func is not None else (lambda f: f)
+    )
+
+dashboard_rollups = importlib.reload(importlib.import_module("app.tasks.dashboard_rollups"))
+
+
+def _stored(db_session, organization_id):
+    db_session.expire_all()
+    rollup = db_session.get(OrganizationDashboardRollup, organization_id)
+    assert rollup is not None
+    return rollup
+
+
+def _expected(db_session, organization_id):
+    return compute_rollups(db_session.connection(), [organization_id]).get(organization_id, empty_counters())
+
+
+def _add_document(db_session, deal, user, **overrides):
+    document = Document(
+        name="nda.pdf",
+        file_key=f"{deal.organization_id}/{uuid.uuid4()}.pdf",
+        file_size=100,
+        file_type="application/pdf",
+        deal_id=deal.id,
+        organization_id=deal.organization_id,
+        uploaded_by=user.id,
+        **overrides,
+    )
+    db_session.add(document)
+    db_session.commit()
+    return document
+
+
+def _add_task(db_session, deal, user, status="todo"):
+    task = DealTask(
+        id=str(uuid.uuid4()),
+        deal_id=deal.id,
+        organization_id=deal.organization_id,
+        title="Review NDA",
+        status=status,
+        created_by=user.id,
+    )
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+def test_flush_hooks_keep_counters_in_step_with_source_rows(db_session, create_deal_for_org):
+    deal, owner, org = create_deal_for_org(deal_size=Decimal("1000000"))
+    other, _, _ = create_deal_for_org(organization=org, owner=owner, stage=DealStage.won)
+
+    rollup = _stored(db_session, org.id)
+    assert rollup.deal_count == 2
+    assert rollup.sourcing_deals == 1
+    assert rollup.won_deals == 1
+    assert rollup.deal_value_total == Decimal("1000000")
+    assert rollup.deal_value_count == 1
+
+    deal.stage = DealStage.negotiation
+    deal.deal_size = Decimal("2500000")
+    other.deal_size = Decimal("500000")
+    db_session.commit()
+
+    document = _add_document(db_session, deal, owner)
+    _add_document(db_session, deal, owner)
+    task = _add_task(db_session, deal, owner)
+    _add_task(db_session, deal, owner, status="done")
+
+    document.archived_at = datetime.now(timezone.utc)
+    task.status = "done"
+    db_session.commit()
+
+    rollup = _stored(db_session, org.id)
+    assert rollup.sourcing_deals == 0
+    assert rollup.negotiation_deals == 1
+    assert rollup.deal_value_total == Decimal("3000000")
+    assert rollup.average_deal_value == Decimal("1500000")
+    assert rollup.document_count == 1
+    assert rollup.open_task_count == 0
+    assert rollup.counters() == _expected(db_session, org.id)
+
+    db_session.delete(other)
+    db_session.commit()
+
+    rollup = _stored(db_session, org.id)
+    assert rollup.deal_count == 1
+    assert rollup.won_deals == 0
+    assert rollup.counters() == _expected(db_session, org.id)
+
+
+def test_rolled_back_changes_leave_counters_untouched(db_session, create_deal_for_org):
+    deal, owner, org = create_deal_for_org()
+
+    _add_task(db_session, deal, owner)
+    db_session.add(
+        DealTask(
+            id=str(uuid.uuid4()),
+            deal_id=deal.id,
+            organization_id=org.id,
+            title="Draft",
+            created_by=owner.id,
+        )
+    )
+    db_session.flush()
+    db_session.rollback()
+
+    assert _stored(db_session, org.id).open_task_count == 1
+
+
+def test_reconcile_repairs_drift_from_bulk_writes(db_session, create_deal_for_org):
+    deal, owner, org = create_deal_for_org()
+    _add_task(db_session, deal, owner)
+    _add_task(db_session, deal, owner)
+
+    db_session.query(DealTask).filter(DealTask.organization_id == org.id).delete(synchronize_session=False)
+    db_session.commit()
+    assert _stored(db_session, org.id).open_task_count == 2
+
+    assert reconcile_dashboard_rollups(db_session, [org.id]) == 1
+    rollup = _stored(db_session, org.id)
+    assert rollup.open_task_count == 0
+    assert rollup.reconciled_at is not None
+
+    assert reconcile_dashboard_rollups(db_session, [org.id]) == 0
+
+
+def test_reconcile_task_repairs_drift(db_session, create_deal_for_org):
+    deal, owner, org = create_deal_for_org()
+    _add_task(db_session, deal, owner)
+    db_session.query(DealTask).filter(DealTask.organization_id == org.id).delete(synchronize_session=False)
+    db_session.commit()
+
+    assert dashboard_rollups.reconcile_dashboard_rollups_task() == 1
+    assert _stored(db_session, org.id).open_task_count == 0
+    assert dashboard_rollups.reconcile_dashboard_rollups_task() == 0
+
+
+def test_dashboard_seeds_missing_rollup_then_reads_one_row(
+    client, db_session, create_deal_for_org, dependency_overrides
+):
+    deal, owner, org = create_deal_for_org(deal_size=Decimal("750000"))
+    db_session.query(OrganizationDashboardRollup).delete()
+    db_session.commit()
+    dependency_overrides(get_current_user, lambda: owner)
+
+    first = client.get("/api/dashboard/summary")
+    second = client.get("/api/dashboard/summary")
+
+    assert first.status_code == 200
+    assert first.json() == second.json()
+    assert first.json()["deals"] == {"total": 1, "active": 1, "won": 0}
+    assert first.json()["financial"]["total_deal_value"] == 750000.0
+    assert 'desc="1 queries"' in second.headers["server-timing"]
+    assert db_session.get(OrganizationDashboardRollup, org.id) is not None
@@ -0,0 +1,164 @@
+"""Tests for cached deal embeddings and batched description scoring."""
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app.models.deal import DealEmbedding
+from app.schemas.deal import DealCreate, DealUpdate
+from app.services import deal_service
+from app.services.deal_embedding_service import (
+    HashingEmbeddingBackend,
+    content_hash,
+    cosine_scores,
+    embed_deals,
+)
+from app.services.deal_matching_service import DealMatchingService
+from app.models.deal_match import DealMatchCriteria
+
+
+class CountingBackend(HashingEmbeddingBackend):
+    """Local backend that records every batch it is asked to embed."""
+
+    def __init__(self):
+        super().__init__(dimensions=64)
+        self.batches = []
+
+    def embed(self, texts):
+        self.batches.append(list(texts))
+        return super().embed(texts)
+
+
+def _deal(create_deal_for_org, match_org, match_user, name, description):
+    deal, _, _ = create_deal_for_org(
+        organization=match_org,
+        owner=match_user,
+        name=name,
+        description=description,
+        industry="saas",
+        deal_size=Decimal("5000000"),
+    )
+    return deal
+
+
+def test_hashing_backend_is_deterministic_and_topical():
+    backend = HashingEmbeddingBackend()
+    first, second, third = backend.embed([
+        "fintech saas platform in the uk",
+        "uk fintech saas business",
+        "hardware manufacturing plant in asia",
+    ])
+
+    assert np.array_equal(first, backend.embed(["fintech saas platform in the uk"])[0])
+    scores = cosine_scores(np.vstack([second, third]), first)
+    assert scores[0] > scores[1]
+
+
+def test_cosine_scores_handles_zero_vectors():
+    matrix = np.array([[1.0, 0.0], [0.0, 0.0]], dtype=np.float32)
+
+    scores = cosine_scores(matrix, np.array([1.0, 0.0], dtype=np.float32))
+
+    assert scores.tolist() == [1.0, 0.0]
+
+
+def test_embeddings_are_persisted_and_reused(db_session, create_deal_for_org, match_org, match_user):
+    backend = CountingBackend()
+    deals = [
+        _deal(create_deal_for_org, match_org, match_user, "A", "Fintech SaaS platform"),
+        _deal(create_deal_for_org, match_org, match_user, "B", "Hardware manufacturer"),
+    ]
+
+    first = embed_deals(deals, backend, db=db_session)
+    db_session.commit()
+    second = embed_deals(deals, backend, db=db_session)
+
+    assert len(backend.batches) == 1
+    assert sorted(backend.batches[0]) == ["Fintech SaaS platform", "Hardware manufacturer"]
+    assert all(np.allclose(first[key], second[key]) for key in first)
+    rows = db_session.query(DealEmbedding).all()
+    assert {row.deal_id for row in rows} == {str(deal.id) for deal in deals}
+    assert all(row.model == backend.model_name for row in rows)
+
+
+def test_changed_description_is_reembedded(db_session, create_deal_for_org, match_org, match_user):
+    backend = CountingBackend()
+    deal = _deal(create_deal_for_org, match_org, match_user, "A", "Fintech SaaS platform")
+    embed_deals([deal], backend, db=db_session)
+
+    deal.description = "Logistics software"
+    embed_deals([deal], backend, db=db_session)
+
+    assert backend.batches == [["Fintech SaaS platform"], ["Logistics software"]]
+    row = db_session.get(DealEmbedding, str(deal.id))
+    assert row.content_hash == content_hash("Logistics software")
+
+
+def test_identical_descriptions_share_one_embedding(db_session, create_deal_for_org, match_org, match_user):
+    backend = CountingBackend()
+    original = _deal(create_deal_for_org, match_org, match_user, "A", "Fintech SaaS platform")
+    embed_deals([original], backend, db=db_session)
+
+    duplicate = _deal(create_deal_for_org, match_org, match_user, "B", "Fintech  SaaS platform")
+    embed_deals([duplicate], backend, db=db_session)
+
+    assert len(backend.batches) == 1
+    assert db_session.get(DealEmbedding, str(duplicate.id)) is not None
+
+
+def test_deal_service_embeds_on_create_and_description_update(db_session, match_user):
+    deal = deal_service.create_deal(
+        DealCreate(name="Embedded", target_company="Target", description="Fintech SaaS platform"),
+        match_user,
+        db_session,
+    )
+    row = db_session.get(DealEmbedding, str(deal.id))
+    assert row is not None
+    assert row.content_hash == content_hash("Fintech SaaS platform")
+
+    deal_service.update_deal(
+        str(deal.id), DealUpdate(description="Logistics software"), deal.organization_id, db_session
+    )
+    db_session.refresh(row)
+    assert row.content_hash == content_hash("Logistics software")
+
+
+@pytest.mark.asyncio
+async def test_find_matches_embeds_target_once_for_all_candidates(
+    db_session, create_deal_for_org, match_org, match_user
+):
+    backend = CountingBackend()
+    target = _deal(create_deal_for_org, match_org, match_user, "Target", "Fintech SaaS platform in the UK")
+    candidates = [
+        _deal(create_deal_for_org, match_org, match_user, f"Candidate {i}", f"SaaS company number {i}")
+        for i in range(20)
+    ]
+    criteria = DealMatchCriteria(
+        organization_id=match_org.id,
+        user_id=match_user.id,
+        name="Search",
+        deal_type="buy_side",
+        industries=["saas"],
+        min_deal_size=Decimal("1000000"),
+        max_deal_size=Decimal("10000000"),
+    )
+    service = DealMatchingService(embedding_backend=backend)
+
+    matches = await service.find_matches(
+        criteria=criteria,
+        target_deal=target,
+        candidate_deals=candidates,
+        db=db_session,
+    )
+    await service.find_matches(
+        criteria=criteria,
+        target_deal=target,
+        candidate_deals=candidates,
+        db=db_session,
+    )
+
+    assert len(matches) == 20
+    assert len(backend.batches) == 1
+    assert backend.batches[0].count("Fintech SaaS platform in the UK") == 1
+    assert all(0.0 <= match.explanation["description_match"]["score"] <= 1.0 for match in matches)
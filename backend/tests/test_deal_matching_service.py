@@ -8,6 +8,7 @@ from decimal import Decimal
 from unittest.mock import Mock, patch, AsyncMock
 from sqlalchemy.orm import Session
 
+from app.services.deal_embedding_service import OpenAIEmbeddingBackend
 from app.services.deal_matching_service import DealMatchingService, MatchResult
 from app.models.deal import Deal
 from app.models.deal_match import DealMatchCriteria
@@ -186,7 +187,7 @@ class TestDealMatchingService:
         assert score == 0.0  # No match
 
     @pytest.mark.asyncio
-    @patch("app.services.deal_matching_service.openai.Embedding.create")
+    @patch("app.services.deal_embedding_service.openai.Embedding.create")
     async def test_calculate_semantic_similarity(
         self, mock_embedding, matching_service: DealMatchingService
     ):
@@ -199,6 +200,7 @@ class TestDealMatchingService:
             ]
         }
 
+        matching_service = DealMatchingService(embedding_backend=OpenAIEmbeddingBackend())
         score = await matching_service._calculate_semantic_similarity(
             text1="Fintech SaaS platform",
             text2="Financial technology software",
@@ -253,7 +255,7 @@ class TestDealMatchingService:
         assert confidence == "low"
 
     @pytest.mark.asyncio
-    @patch("app.services.deal_matching_service.openai.Embedding.create")
+    @patch("app.services.deal_embedding_service.openai.Embedding.create")
     async def test_find_matches_returns_ranked_results(
         self,
         mock_embedding,
@@ -289,7 +291,7 @@ class TestDealMatchingService:
         assert matches[0].score >= matches[1].score >= matches[2].score  # Ranked
 
     @pytest.mark.asyncio
-    @patch("app.services.deal_matching_service.openai.Embedding.create")
+    @patch("app.services.deal_embedding_service.openai.Embedding.create")
     async def test_find_matches_filters_low_scores(
         self,
         mock_embedding,
@@ -323,7 +325,7 @@ class TestDealMatchingService:
         assert all(m.score >= 70.0 for m in matches)
 
     @pytest.mark.asyncio
-    @patch("app.services.deal_matching_service.openai.Embedding.create")
+    @patch("app.services.deal_embedding_service.openai.Embedding.create")
     async def test_match_result_contains_explanation(
         self,
         mock_embedding,
@@ -0,0 +1,154 @@
+"""Tests for the per-organization deal vector index and pre-filtered matching."""
+
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app.models.deal_match import DealMatchCriteria
+from app.services.deal_embedding_service import HashingEmbeddingBackend, embed_deals
+from app.services.deal_matching_service import DealMatchingService
+from app.services.deal_vector_index import (
+    DealVectorIndex,
+    get_deal_vector_index,
+    reset_deal_vector_indexes,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_indexes():
+    reset_deal_vector_indexes()
+    yield
+    reset_deal_vector_indexes()
+
+
+def _criteria(match_org, match_user, **overrides):
+    fields = dict(
+        organization_id=match_org.id,
+        user_id=match_user.id,
+        name="Search",
+        deal_type="buy_side",
+        industries=["saas"],
+        min_deal_size=Decimal("1000000"),
+        max_deal_size=Decimal("10000000"),
+    )
+    fields.update(overrides)
+    return DealMatchCriteria(**fields)
+
+
+def test_index_grows_and_updates_in_place():
+    index = DealVectorIndex("org-1", "test")
+    rng = np.random.default_rng(7)
+    vectors = rng.normal(size=(200, 16)).astype(np.float32)
+    for i, vector in enumerate(vectors):
+        index.upsert(f"deal-{i}", vector)
+
+    assert len(index) == 200
+    best = index.top_k(vectors[42], 3)
+    assert best[0][0] == "deal-42"
+    assert best[0][1] == pytest.approx(1.0, abs=1e-6)
+
+    index.upsert("deal-42", -vectors[42])
+    assert len(index) == 200
+    assert index.similarities(vectors[42], ["deal-42"])["deal-42"] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_top_k_respects_allowed_ids():
+    index = DealVectorIndex("org-1", "test")
+    index.upsert("a", np.array([1.0, 0.0]))
+    index.upsert("b", np.array([0.9, 0.1]))
+    index.upsert("c", np.array([0.0, 1.0]))
+
+    assert [deal_id for deal_id, _ in index.top_k(np.array([1.0, 0.0]), 2, deal_ids=["b", "c"])] == ["b", "c"]
+
+
+def test_index_syncs_incrementally(db_session, create_deal_for_org, match_org, match_user):
+    backend = HashingEmbeddingBackend()
+    first, _, _ = create_deal_for_org(organization=match_org, owner=match_user, description="Fintech SaaS")
+    embed_deals([first], backend, db=db_session)
+    db_session.commit()
+
+    index = get_deal_vector_index(db_session, str(match_org.id), backend.model_name)
+    assert str(first.id) in index
+
+    second, _, _ = create_deal_for_org(organization=match_org, owner=match_user, description="Logistics software")
+    embed_deals([second], backend, db=db_session)
+    db_session.commit()
+
+    assert get_deal_vector_index(db_session, str(match_org.id), backend.model_name) is index
+    assert str(second.id) in index
+    assert len(index) == 2
+
+
+def test_prefilter_keeps_related_industries_and_nearby_sizes(
+    db_session, create_deal_for_org, match_org, match_user
+):
+    def make(name, industry, size):
+        deal, _, _ = create_deal_for_org(
+            organization=match_org,
+            owner=match_user,
+            name=name,
+            industry=industry,
+            deal_size=Decimal(size) if size is not None else None,
+        )
+        return deal
+
+    target = make("Target", "saas", "5000000")
+    make("Exact", "saas", "5000000")
+    make("Related", "Software", "9000000")
+    make("Unrelated", "manufacturing", "5000000")
+    make("Too big", "saas", "50000000")
+    make("Archived", "saas", "5000000").is_archived = True
+    db_session.commit()
+
+    service = DealMatchingService(embedding_backend=HashingEmbeddingBackend())
+    candidates = service._prefilter_candidates(
+        db_session,
+        criteria=_criteria(match_org, match_user),
+        target_deal=target,
+    )
+
+    assert sorted(deal.name for deal in candidates) == ["Exact", "Related"]
+
+
+@pytest.mark.asyncio
+async def test_find_matches_in_organization_ranks_the_whole_pipeline(
+    db_session, create_deal_for_org, match_org, match_user
+):
+    target, _, _ = create_deal_for_org(
+        organization=match_org,
+        owner=match_user,
+        name="Target",
+        industry="saas",
+        deal_size=Decimal("5000000"),
+        description="Fintech SaaS platform for UK lenders",
+    )
+    for i in range(40):
+        create_deal_for_org(
+            organization=match_org,
+            owner=match_user,
+            name=f"Filler {i}",
+            industry="saas",
+            deal_size=Decimal("9500000"),
+            description=f"Generic business number {i}",
+        )
+    best, _, _ = create_deal_for_org(
+        organization=match_org,
+        owner=match_user,
+        name="Best",
+        industry="saas",
+        deal_size=Decimal("5500000"),
+        description="Fintech SaaS platform for UK lenders and brokers",
+    )
+
+    service = DealMatchingService(embedding_backend=HashingEmbeddingBackend())
+    matches = await service.find_matches_in_organization(
+        db_session,
+        criteria=_criteria(match_org, match_user),
+        target_deal=target,
+        top_n=5,
+    )
+
+    assert len(matches) == 5
+    assert matches[0].deal_id == str(best.id)
+    assert str(target.id) not in {match.deal_id for match in matches}
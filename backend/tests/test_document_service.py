@@ -12,9 +12,10 @@ from uuid import uuid4
 import pytest
 from fastapi import HTTPException, status
 
-from app.models.document import Document, DocumentAccessLog
+from app.models.document import Document, DocumentAccessLog, DocumentPermission, Folder, FolderClosure
 from app.models.user import User
-from app.services import document_service
+from app.schemas.document import DocumentListParams, FolderUpdate, PermissionLevel
+from app.services import blob_store, document_service
 
 
 class _StubStorage:
@@ -31,6 +32,14 @@ class _StubStorage:
     async def get_file_path(self, file_key: str, organization_id: str) -> Path:
         return self.paths[file_key]
 
+    async def file_exists(self, file_key: str, organization_id: str) -> bool:
+        return file_key in self.paths
+
+    async def iter_file(self, file_key: str, organization_id: str, chunk_size: int = 4):
+        with open(self.paths[file_key], "rb") as handle:
+            while chunk := handle.read(chunk_size):
+                yield chunk
+
 
 @pytest.mark.asyncio
 async def test_trim_document_versions_keeps_latest_twenty(db_session, create_deal_for_org):
@@ -82,13 +91,17 @@ async def test_trim_document_versions_keeps_latest_twenty(db_session, create_dea
 
     storage = _StubStorage()
 
-    await document_service._trim_document_versions(  # type: ignore[attr-defined]
-        db_session,
-        base_document=latest_document,
-        storage=storage,
-        max_versions=20,
-    )
-    db_session.commit()
+    changes = blob_store.BlobChanges(storage, organization.id)
+    async with changes.transaction(db_session):
+        await document_service._trim_document_versions(  # type: ignore[attr-defined]
+            db_session,
+            base_document=latest_document,
+            changes=changes,
+            max_versions=20,
+        )
+        db_session.commit()
+        # Files are only removed once the transaction has ended
+        assert not storage.deleted
 
     remaining = (
         db_session.query(Document)
@@ -153,13 +166,15 @@ async def test_trim_document_versions_noop_when_within_limit(db_session, create_
     )
     storage = _StubStorage()
 
-    await document_service._trim_document_versions(  # type: ignore[attr-defined]
-        db_session,
-        base_document=latest,
-        storage=storage,
-        max_versions=20,
-    )
-    db_session.commit()
+    changes = blob_store.BlobChanges(storage, organization.id)
+    async with changes.transaction(db_session):
+        await document_service._trim_document_versions(  # type: ignore[attr-defined]
+            db_session,
+            base_document=latest,
+            changes=changes,
+            max_versions=20,
+        )
+        db_session.commit()
 
     remaining = (
         db_session.query(Document)
@@ -277,3 +292,331 @@ async def test_bulk_download_documents_requires_viewer_permission(
         )
 
     assert exc_info.value.status_code == status.HTTP_403_FORBIDDEN
+
+
+def _make_folder(db_session, *, deal, organization, owner, name, parent=None) -> Folder:
+    folder = Folder(
+        id=str(uuid4()),
+        name=name,
+        deal_id=deal.id,
+        parent_folder_id=str(parent.id) if parent is not None else None,
+        organization_id=organization.id,
+        created_by=owner.id,
+    )
+    db_session.add(folder)
+    db_session.commit()
+    return folder
+
+
+def _make_document(db_session, *, deal, organization, uploaded_by, name, folder=None, created_at=None) -> Document:
+    document = Document(
+        id=str(uuid4()),
+        name=name,
+        file_key=f"key-{uuid4()}",
+        file_size=64,
+        file_type="application/pdf",
+        deal_id=deal.id,
+        folder_id=str(folder.id) if folder is not None else None,
+        organization_id=organization.id,
+        uploaded_by=uploaded_by.id,
+        created_at=created_at or datetime.now(timezone.utc),
+    )
+    db_session.add(document)
+    db_session.commit()
+    return document
+
+
+def _normalize(level):
+    return (level or PermissionLevel.NONE).lower()
+
+
+def test_permission_snapshot_inherits_grants_down_the_folder_tree(db_session, create_deal_for_org, create_user):
+    """Folder grants propagate to every descendant and document grants stay scoped."""
+
+    deal, owner, organization = create_deal_for_org()
+    viewer: User = create_user(role=owner.role, organization_id=organization.id)
+
+    root = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="Root")
+    child = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="Child", parent=root)
+    grandchild = _make_folder(
+        db_session, deal=deal, organization=organization, owner=owner, name="Grandchild", parent=child
+    )
+    sibling = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="Sibling")
+    granted_doc = _make_document(
+        db_session, deal=deal, organization=organization, uploaded_by=owner, name="nda.pdf", folder=sibling
+    )
+
+    db_session.add_all([
+        DocumentPermission(
+            folder_id=str(child.id),
+            user_id=viewer.id,
+            permission_level=PermissionLevel.VIEWER,
+            organization_id=organization.id,
+            granted_by=owner.id,
+        ),
+        DocumentPermission(
+            document_id=granted_doc.id,
+            user_id=viewer.id,
+            permission_level=PermissionLevel.EDITOR,
+            organization_id=organization.id,
+            granted_by=owner.id,
+        ),
+    ])
+    db_session.commit()
+
+    snapshot = document_service._DealPermissionSnapshot(db_session, deal=deal, user=viewer)  # type: ignore[attr-defined]
+
+    assert snapshot.folder_permission(str(root.id)) == PermissionLevel.NONE
+    assert snapshot.folder_permission(str(child.id)) == PermissionLevel.VIEWER
+    assert snapshot.folder_permission(str(grandchild.id)) == PermissionLevel.VIEWER
+    assert snapshot.folder_permission(str(sibling.id)) == PermissionLevel.NONE
+    assert snapshot.document_permission(granted_doc) == PermissionLevel.EDITOR
+
+    for folder in (root, child, grandchild):
+        legacy = document_service._resolve_folder_permission(  # type: ignore[attr-defined]
+            db_session, folder=folder, user=viewer, deal=deal
+        )
+        assert _normalize(legacy) == _normalize(snapshot.folder_permission(str(folder.id)))
+
+
+def test_list_documents_filters_and_paginates_in_sql(db_session, create_deal_for_org, create_user):
+    """Only documents visible via folder inheritance, grants or uploads are paged."""
+
+    deal, owner, organization = create_deal_for_org()
+    viewer: User = create_user(role=owner.role, organization_id=organization.id)
+
+    shared = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="Shared")
+    nested = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="Nested", parent=shared)
+    private = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="Private")
+
+    base_time = datetime.now(timezone.utc)
+    visible_names = []
+    for index in range(5):
+        doc = _make_document(
+            db_session,
+            deal=deal,
+            organization=organization,
+            uploaded_by=owner,
+            name=f"shared-{index}.pdf",
+            folder=nested,
+            created_at=base_time + timedelta(seconds=index),
+        )
+        visible_names.append(doc.name)
+    for index in range(3):
+        _make_document(
+            db_session,
+            deal=deal,
+            organization=organization,
+            uploaded_by=owner,
+            name=f"private-{index}.pdf",
+            folder=private,
+            created_at=base_time + timedelta(seconds=10 + index),
+        )
+    own = _make_document(
+        db_session,
+        deal=deal,
+        organization=organization,
+        uploaded_by=viewer,
+        name="own.pdf",
+        created_at=base_time + timedelta(seconds=20),
+    )
+    visible_names.append(own.name)
+
+    db_session.add(
+        DocumentPermission(
+            folder_id=str(shared.id),
+            user_id=viewer.id,
+            permission_level=PermissionLevel.VIEWER,
+            organization_id=organization.id,
+            granted_by=owner.id,
+        )
+    )
+    db_session.commit()
+
+    first_page, total = document_service.list_documents(
+        db_session,
+        deal_id=deal.id,
+        organization_id=organization.id,
+        params=DocumentListParams(page=1, per_page=4),
+        current_user=viewer,
+    )
+    second_page, _ = document_service.list_documents(
+        db_session,
+        deal_id=deal.id,
+        organization_id=organization.id,
+        params=DocumentListParams(page=2, per_page=4),
+        current_user=viewer,
+    )
+
+    assert total == 6
+    assert [item.name for item in first_page] == ["own.pdf", "shared-4.pdf", "shared-3.pdf", "shared-2.pdf"]
+    assert [item.name for item in second_page] == ["shared-1.pdf", "shared-0.pdf"]
+
+
+def test_bulk_delete_documents_uses_batched_ownership(db_session, create_deal_for_org, create_user):
+    """Deal owners archive everything; other users only their own uploads."""
+
+    deal, owner, organization = create_deal_for_org()
+    member: User = create_user(role=owner.role, organization_id=organization.id)
+
+    owners_doc = _make_document(db_session, deal=deal, organization=organization, uploaded_by=owner, name="a.pdf")
+    members_doc = _make_document(db_session, deal=deal, organization=organization, uploaded_by=member, name="b.pdf")
+    missing_id = str(uuid4())
+
+    deleted, failed, reasons = document_service.bulk_delete_documents(
+        db=db_session,
+        document_ids=[owners_doc.id, members_doc.id, missing_id],
+        organization_id=organization.id,
+        current_user=member,
+    )
+
+    assert deleted == [members_doc.id]
+    assert failed == [owners_doc.id, missing_id]
+    assert "Permission denied" in reasons[owners_doc.id]
+    assert "not found" in reasons[missing_id]
+
+
+def _closure_rows(db_session, deal_id):
+    return {
+        (row.ancestor_id, row.descendant_id, row.depth)
+        for row in db_session.query(FolderClosure).filter(FolderClosure.deal_id == deal_id).all()
+    }
+
+
+def test_folder_closure_tracks_inserts_and_moves(db_session, create_deal_for_org):
+    """Closure rows follow folder creation and re-parenting of whole subtrees."""
+
+    deal, owner, organization = create_deal_for_org()
+    a = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="A")
+    b = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="B", parent=a)
+    c = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="C", parent=b)
+    d = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="D")
+    a_id, b_id, c_id, d_id = (str(f.id) for f in (a, b, c, d))
+
+    assert _closure_rows(db_session, deal.id) == {
+        (a_id, a_id, 0), (b_id, b_id, 0), (c_id, c_id, 0), (d_id, d_id, 0),
+        (a_id, b_id, 1), (b_id, c_id, 1), (a_id, c_id, 2),
+    }
+
+    document_service.update_folder(
+        db_session,
+        folder=document_service.get_folder_by_id(db_session, folder_id=b_id, organization_id=organization.id),
+        folder_data=FolderUpdate(parent_folder_id=d_id),
+        current_user=owner,
+    )
+
+    assert _closure_rows(db_session, deal.id) == {
+        (a_id, a_id, 0), (b_id, b_id, 0), (c_id, c_id, 0), (d_id, d_id, 0),
+        (d_id, b_id, 1), (b_id, c_id, 1), (d_id, c_id, 2),
+    }
+
+
+def test_update_folder_rejects_moving_into_own_subtree(db_session, create_deal_for_org):
+    deal, owner, organization = create_deal_for_org()
+    parent = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="Parent")
+    child = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="Child", parent=parent)
+
+    with pytest.raises(HTTPException) as exc_info:
+        document_service.update_folder(
+            db_session,
+            folder=document_service.get_folder_by_id(
+                db_session, folder_id=str(parent.id), organization_id=organization.id
+            ),
+            folder_data=FolderUpdate(parent_folder_id=str(child.id)),
+            current_user=owner,
+        )
+
+    assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_delete_folder_recursive_removes_empty_subtree(db_session, create_deal_for_org):
+    deal, owner, organization = create_deal_for_org()
+    root = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="Root")
+    child = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="Child", parent=root)
+    _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="Leaf", parent=child)
+    keep = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="Keep")
+    root_response = document_service.get_folder_by_id(
+        db_session, folder_id=str(root.id), organization_id=organization.id
+    )
+
+    with pytest.raises(ValueError, match="subfolders"):
+        document_service.delete_folder(db_session, folder=root_response, current_user=owner)
+
+    document_service.delete_folder(db_session, folder=root_response, current_user=owner, recursive=True)
+
+    assert [str(f.id) for f in db_session.query(Folder).filter(Folder.deal_id == deal.id).all()] == [str(keep.id)]
+    assert _closure_rows(db_session, deal.id) == {(str(keep.id), str(keep.id), 0)}
+
+
+def test_delete_folder_blocks_documents_anywhere_in_subtree(db_session, create_deal_for_org):
+    deal, owner, organization = create_deal_for_org()
+    root = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="Root")
+    leaf = _make_folder(db_session, deal=deal, organization=organization, owner=owner, name="Leaf", parent=root)
+    _make_document(db_session, deal=deal, organization=organization, uploaded_by=owner, name="x.pdf", folder=leaf)
+
+    with pytest.raises(ValueError, match="documents"):
+        document_service.delete_folder(
+            db_session,
+            folder=document_service.get_folder_by_id(
+                db_session, folder_id=str(root.id), organization_id=organization.id
+            ),
+            current_user=owner,
+            recursive=True,
+        )
+
+
+def test_list_folders_tree_nests_deep_hierarchies(db_session, create_deal_for_org):
+    deal, owner, organization = create_deal_for_org()
+    parent = None
+    for depth in range(6):
+        parent = _make_folder(
+            db_session, deal=deal, organization=organization, owner=owner, name=f"L{depth}", parent=parent
+        )
+
+    tree = document_service.list_folders(
+        db_session, deal_id=deal.id, organization_id=organization.id, include_tree=True
+    )
+
+    names = []
+    nodes = tree
+    while nodes:
+        assert len(nodes) == 1
+        names.append(nodes[0].name)
+        nodes = nodes[0].children
+    assert names == [f"L{depth}" for depth in range(6)]
+
+
+@pytest.mark.asyncio
+async def test_stream_bulk_download_yields_chunks_and_stores_pdfs(monkeypatch, tmp_path, db_session, create_deal_for_org):
+    """Streaming mode emits the archive incrementally and skips missing blobs."""
+
+    deal, owner, organization = create_deal_for_org()
+    pdf_path = tmp_path / "deck.pdf"
+    pdf_path.write_bytes(b"%PDF-1.7 " + b"p" * 64)
+    txt_path = tmp_path / "notes.txt"
+    txt_path.write_bytes(b"meeting notes " * 8)
+
+    pdf_doc = _make_document(db_session, deal=deal, organization=organization, uploaded_by=owner, name="deck.pdf")
+    txt_doc = _make_document(db_session, deal=deal, organization=organization, uploaded_by=owner, name="notes.txt")
+    txt_doc.file_type = "text/plain"
+    missing_doc = _make_document(db_session, deal=deal, organization=organization, uploaded_by=owner, name="gone.pdf")
+    db_session.commit()
+
+    storage = _StubStorage(paths={pdf_doc.file_key: pdf_path, txt_doc.file_key: txt_path})
+    monkeypatch.setattr(document_service, "get_storage_service", lambda: storage)
+
+    chunks, filename = await document_service.stream_bulk_download(
+        db=db_session,
+        document_ids=[pdf_doc.id, txt_doc.id, missing_doc.id],
+        organization_id=str(organization.id),
+        current_user=owner,
+    )
+    received = [chunk async for chunk in chunks]
+
+    assert filename == "documents.zip"
+    assert len(received) > 2
+    with zipfile.ZipFile(io.BytesIO(b"".join(received))) as zf:
+        assert zf.namelist() == ["deck.pdf", "notes.txt"]
+        assert zf.getinfo("deck.pdf").compress_type == zipfile.ZIP_STORED
+        assert zf.getinfo("notes.txt").compress_type == zipfile.ZIP_DEFLATED
+        assert zf.read("notes.txt") == b"meeting notes " * 8
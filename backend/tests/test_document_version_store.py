@@ -0,0 +1,177 @@
+"""Tests for delta-compressed document version storage."""
+from __future__ import annotations
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.document_generation import DocumentTemplate, DocumentVersion, GeneratedDocument
+from app.schemas.document_generation import GeneratedDocumentUpdate
+from app.services import document_version_store
+from app.services.document_generation_service import DocumentGenerationService
+
+
+def _clause(number: int) -> str:
+    return f"Clause {number}: the parties agree to standard terms and conditions.\n"
+
+
+def _document(db_session: Session, org_id: str, user_id: str, content: str) -> GeneratedDocument:
+    template = DocumentTemplate(
+        name="Services Agreement",
+        content="{{body}}",
+        organization_id=org_id,
+        created_by_user_id=user_id,
+    )
+    db_session.add(template)
+    db_session.flush()
+    document = GeneratedDocument(
+        template_id=template.id,
+        generated_content=content,
+        variable_values={},
+        organization_id=org_id,
+        generated_by_user_id=user_id,
+    )
+    db_session.add(document)
+    db_session.commit()
+    return document
+
+
+def test_delta_round_trip():
+    base = "".join(_clause(i) for i in range(200))
+    target = base.replace(_clause(50), "Clause 50: amended.\n") + "Signature block"
+
+    delta = document_version_store.encode_delta(base, target)
+
+    assert document_version_store.apply_delta(base, delta) == target
+    assert len(delta) < len(target) // 20
+    assert document_version_store.apply_delta("", document_version_store.encode_delta("", "new")) == "new"
+
+
+def test_edits_store_keyframes_and_deltas(db_session: Session, create_user, create_organization):
+    org = create_organization()
+    user = create_user(organization_id=str(org.id))
+    contents = ["".join(_clause(i) for i in range(100))]
+    document = _document(db_session, str(org.id), str(user.id), contents[0])
+
+    for revision in range(1, 25):
+        contents.append(contents[-1] + f"Amendment {revision}.\n")
+        DocumentGenerationService.update_generated_document(
+            db_session,
+            str(document.id),
+            str(org.id),
+            GeneratedDocumentUpdate(generated_content=contents[-1]),
+            user_id=str(user.id),
+        )
+
+    versions = db_session.scalars(
+        select(DocumentVersion)
+        .where(DocumentVersion.document_id == document.id)
+        .order_by(DocumentVersion.version_number)
+    ).all()
+    assert [v.version_number for v in versions if v.content is not None] == [1, 11, 21]
+    assert all(v.delta is not None for v in versions if v.content is None)
+    # Each version snapshots the content before its edit
+    for version in versions:
+        assert document_version_store.get_version_content(db_session, version) == contents[version.version_number - 1]
+
+    diff = document_version_store.diff_versions(db_session, document.id, 18, 23)
+    assert diff.additions == 5
+    assert diff.deletions == 0
+    assert "+Amendment 22.\n" in diff.diff
+
+
+def test_add_version_retries_a_number_taken_concurrently(
+    db_session: Session, create_user, create_organization, monkeypatch
+):
+    org = create_organization()
+    user = create_user(organization_id=str(org.id))
+    base = "".join(_clause(i) for i in range(50))
+    document = _document(db_session, str(org.id), str(user.id), base)
+    owner = {"organization_id": str(org.id), "created_by_user_id": str(user.id)}
+    first = document_version_store.add_version(db_session, document_id=document.id, content=base, **owner)
+    db_session.commit()
+
+    real_latest = document_version_store._latest_version
+    raced = []
+
+    def racing_latest(db, document_id):
+        if raced:
+            return real_latest(db, document_id)
+        # Another writer takes version 2 after this writer read the history
+        raced.append(True)
+        db.add(DocumentVersion(document_id=document_id, version_number=2, content=base + "Theirs.\n", **owner))
+        db.flush()
+        return first
+
+    monkeypatch.setattr(document_version_store, "_latest_version", racing_latest)
+    mine = document_version_store.add_version(
+        db_session, document_id=document.id, content=base + "Theirs.\nMine.\n", **owner
+    )
+    db_session.commit()
+
+    assert mine.version_number == 3
+    assert mine.delta is not None
+    assert document_version_store.get_version_content(db_session, mine) == base + "Theirs.\nMine.\n"
+    numbers = db_session.scalars(
+        select(DocumentVersion.version_number).where(DocumentVersion.document_id == document.id)
+    ).all()
+    assert sorted(numbers) == [1, 2, 3]
+
+
+def test_compact_history_converts_full_copies(db_session: Session, create_user, create_organization):
+    org = create_organization()
+    user = create_user(organization_id=str(org.id))
+    base = "".join(_clause(i) for i in range(50))
+    document = _document(db_session, str(org.id), str(user.id), base)
+    for number in range(1, 14):
+        db_session.add(
+            DocumentVersion(
+                document_id=document.id,
+                version_number=number,
+                content=base + f"Revision {number}\n",
+                organization_id=str(org.id),
+                created_by_user_id=str(user.id),
+            )
+        )
+    db_session.commit()
+
+    assert document_version_store.compact_history(db_session, document.id) == 11
+    db_session.commit()
+
+    assert document_version_store.get_content_by_number(db_session, document.id, 13) == base + "Revision 13\n"
+    assert document_version_store.get_content_by_number(db_session, document.id, 14) is None
+
+
+def test_diff_versions_endpoint(client, db_session: Session, create_user, create_organization, dependency_overrides):
+    org = create_organization()
+    user = create_user(organization_id=str(org.id))
+    document = _document(db_session, str(org.id), str(user.id), "Intro\nTerms\n")
+    for content in ("Intro\nTerms\nPayment\n", "Intro\nRevised terms\nPayment\n"):
+        DocumentGenerationService.update_generated_document(
+            db_session,
+            str(document.id),
+            str(org.id),
+            GeneratedDocumentUpdate(generated_content=content),
+            user_id=str(user.id),
+        )
+
+    from app.api.dependencies.auth import get_current_user
+    dependency_overrides(get_current_user, lambda: user)
+
+    listing = client.get(f"/api/document-generation/documents/{document.id}/versions")
+    assert [item["version_number"] for item in listing.json()] == [2, 1]
+
+    response = client.get(
+        f"/api/document-generation/documents/{document.id}/versions/diff",
+        params={"from_version": 1, "to_version": 2},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["additions"] == 1
+    assert data["deletions"] == 0
+    assert "+Payment\n" in data["diff"]
+
+    missing = client.get(
+        f"/api/document-generation/documents/{document.id}/versions/diff",
+        params={"from_version": 1, "to_version": 9},
+    )
+    assert missing.status_code == 404
@@ -6,14 +6,22 @@ Following TDD RED → GREEN → REFACTOR methodology.
 """
 from __future__ import annotations
 
+import asyncio
+import json
+
+import httpx
 import pytest
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import patch, AsyncMock
 from datetime import datetime, timezone
 
 from sqlalchemy.orm import Session
 
+from app.services import email_service
 from app.services.email_service import (
+    BatchRecipient,
+    EmailTransport,
     send_email,
+    send_template_batch,
     render_template,
     queue_email,
     retry_failed_email,
@@ -43,6 +51,25 @@ def test_user(db_session: Session, create_organization):
     return user
 
 
+@pytest.fixture
+def provider_requests():
+    """Route the shared email transport to an in-memory provider; yields sent payloads."""
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        if payload.get("fail"):
+            return httpx.Response(500)
+        sent.append(payload)
+        return httpx.Response(202)
+
+    email_service.set_transport(
+        EmailTransport(transport=httpx.MockTransport(handler), requests_per_second=0)
+    )
+    yield sent
+    email_service.set_transport(None)
+
+
 # ============================================================================
 # Tests: send_email
 # ============================================================================
@@ -51,6 +78,7 @@ def test_user(db_session: Session, create_organization):
 async def test_send_email_success(
     db_session: Session,
     test_user,
+    provider_requests,
 ):
     """
     RED: Test sending email successfully.
@@ -62,27 +90,26 @@ async def test_send_email_success(
     html_content = "<h1>Test</h1>"
     text_content = "Test"
 
-    with patch('app.services.email_service.httpx.post') as mock_post:
-        mock_post.return_value = Mock(status_code=202)
-
-        # Act
-        result = await send_email(
-            to_email=to_email,
-            subject=subject,
-            html_content=html_content,
-            text_content=text_content,
-        )
+    # Act
+    result = await send_email(
+        to_email=to_email,
+        subject=subject,
+        html_content=html_content,
+        text_content=text_content,
+    )
 
-        # Assert
-        assert result is not None
-        assert result['status'] == 'sent'
-        assert result['to_email'] == to_email
-        mock_post.assert_called_once()
+    # Assert
+    assert result is not None
+    assert result['status'] == 'sent'
+    assert result['to_email'] == to_email
+    assert result['provider_status'] == 202
+    assert len(provider_requests) == 1
 
 
 @pytest.mark.asyncio
 async def test_send_email_failure(
     db_session: Session,
+    provider_requests,
 ):
     """
     RED: Test email sending failure handling.
@@ -93,9 +120,7 @@ async def test_send_email_failure(
     subject = "Test Email"
     html_content = "<h1>Test</h1>"
 
-    with patch('app.services.email_service.httpx.post') as mock_post:
-        mock_post.side_effect = Exception("SendGrid API error")
-
+    with patch.object(EmailTransport, 'post', new=AsyncMock(side_effect=Exception("SendGrid API error"))):
         # Act
         result = await send_email(
             to_email=to_email,
@@ -103,10 +128,86 @@ async def test_send_email_failure(
             html_content=html_content,
         )
 
-        # Assert
-        assert result is not None
-        assert result['status'] == 'failed'
-        assert 'error' in result
+    # Assert
+    assert result is not None
+    assert result['status'] == 'failed'
+    assert 'error' in result
+
+
+@pytest.mark.asyncio
+async def test_send_template_batch_packs_personalizations(provider_requests, monkeypatch):
+    """One request per MAX_PERSONALIZATIONS recipients, with per-recipient substitutions."""
+    monkeypatch.setattr(email_service, "MAX_PERSONALIZATIONS", 2)
+    recipients = [
+        BatchRecipient(f"user{i}@example.com", f"Hi {i}", {"user_name": f"User {i}", "event_name": "Summit"})
+        for i in range(3)
+    ]
+    recipients[2].template_data.pop("event_name")
+
+    results = await send_template_batch(template_name="event_ticket_confirmation", recipients=recipients)
+
+    assert [r["status"] for r in results] == ["sent"] * 3
+    assert [len(p["personalizations"]) for p in provider_requests] == [2, 1]
+    content = provider_requests[0]["content"][0]["value"]
+    assert "[%user_name%]" in content and "{{ {" not in content
+    first, last = provider_requests[0]["personalizations"][0], provider_requests[1]["personalizations"][0]
+    assert first["subject"] == "Hi 0"
+    assert first["substitutions"]["[%user_name%]"] == "User 0"
+    # Missing values keep the placeholder, as render_template does
+    assert last["substitutions"]["[%event_name%]"] == "{{ { event_name } }}"
+
+
+@pytest.mark.asyncio
+async def test_send_template_batch_isolates_rejected_recipients(monkeypatch):
+    """A 4xx for one bad address must not fail the rest of its batch."""
+    request_sizes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        personalizations = json.loads(request.content)["personalizations"]
+        request_sizes.append(len(personalizations))
+        if any(p["to"][0]["email"] == "not-an-address" for p in personalizations):
+            return httpx.Response(400)
+        return httpx.Response(202)
+
+    email_service.set_transport(EmailTransport(transport=httpx.MockTransport(handler), requests_per_second=0))
+    monkeypatch.setattr(email_service, "MAX_PERSONALIZATIONS", 8)
+    recipients = [BatchRecipient(f"user{i}@example.com", "Hi", {"user_name": f"User {i}"}) for i in range(8)]
+    recipients[5] = BatchRecipient("not-an-address", "Hi", {"user_name": "Bad"})
+
+    try:
+        results = await send_template_batch(template_name="event_ticket_confirmation", recipients=recipients)
+    finally:
+        email_service.set_transport(None)
+
+    assert [r["status"] for r in results] == ["sent"] * 5 + ["failed"] + ["sent"] * 2
+    assert results[5]["to_email"] == "not-an-address"
+    # Halving isolates the address in log2(8) rounds instead of 8 single sends
+    assert sorted(request_sizes, reverse=True) == [8, 4, 4, 2, 2, 1, 1]
+
+
+def test_transport_closes_each_loops_client(provider_requests, monkeypatch):
+    """Successive asyncio.run() sends must not leave a client open per loop."""
+    clients = []
+
+    class RecordingClient(httpx.AsyncClient):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            clients.append(self)
+
+    monkeypatch.setattr(email_service.httpx, "AsyncClient", RecordingClient)
+
+    for index in range(3):
+        result = asyncio.run(send_email(to_email=f"user{index}@example.com", subject="Hi", html_content="<p>Hi</p>"))
+        assert result["status"] == "sent"
+
+    async def send_and_close():
+        await send_email(to_email="last@example.com", subject="Hi", html_content="<p>Hi</p>")
+        await email_service.close_transport()
+        return clients[-1].is_closed
+
+    assert asyncio.run(send_and_close())
+    assert len(clients) == 4
+    assert all(client.is_closed for client in clients)
 
 
 # ============================================================================
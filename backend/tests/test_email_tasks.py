@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import importlib
+import json
 import sys
-from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 from sqlalchemy.orm import Session
 
 from app.models.email_queue import EmailQueue
-from app.services.email_service import MAX_RETRY_ATTEMPTS
+from app.services import email_service
+from app.services.email_service import MAX_RETRY_ATTEMPTS, EmailTransport
 
 # Ensure Celery's shared_task decorator becomes a no-op for these unit tests
 celery_module = sys.modules.get("celery")
@@ -20,35 +22,66 @@ if celery_module is not None:
 email_tasks = importlib.reload(importlib.import_module("app.tasks.email_tasks"))
 
 
-def test_process_email_queue_task_sends_pending_messages(db_session: Session) -> None:
-    pending = EmailQueue(
-        to_email="queue@example.com",
-        subject="Queued Message",
-        template_name="test_template",
-        template_data='{"user_name": "Queue"}',
+@pytest.fixture
+def provider():
+    """In-memory email provider; set ``status`` to change its response code."""
+
+    class _Provider:
+        status = 202
+        payloads: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        _Provider.payloads.append(json.loads(request.content))
+        return httpx.Response(_Provider.status)
+
+    _Provider.payloads = []
+    email_service.set_transport(EmailTransport(transport=httpx.MockTransport(handler), requests_per_second=0))
+    yield _Provider
+    email_service.set_transport(None)
+
+
+def test_process_email_queue_task_sends_pending_messages(db_session: Session, provider) -> None:
+    pending = [
+        EmailQueue(
+            to_email=f"queue{index}@example.com",
+            subject="Queued Message",
+            template_name="event_ticket_confirmation",
+            template_data=json.dumps({"user_name": f"Queue {index}"}),
+            status="pending",
+        )
+        for index in range(3)
+    ]
+    missing_template = EmailQueue(
+        to_email="nobody@example.com",
+        subject="Broken",
+        template_name="does_not_exist",
+        template_data="{}",
         status="pending",
     )
-    db_session.add(pending)
+    db_session.add_all([*pending, missing_template])
     db_session.commit()
 
-    with patch(
-        "app.services.email_service.render_template",
-        new=AsyncMock(return_value={"html_content": "<p>Hi</p>", "text_content": "Hi"}),
-    ), patch(
-        "app.services.email_service.send_email",
-        new=AsyncMock(return_value={"status": "sent"}),
-    ) as send_mock:
-        summary = email_tasks.process_email_queue_task(batch_size=10)
-
-    db_session.refresh(pending)
-    assert summary == {"processed": 1, "sent": 1, "failed": 0, "skipped": 0}
-    assert pending.status == "sent"
-    assert pending.retry_count == 1
-    assert pending.error_message is None
-    send_mock.assert_called_once()
-
-
-def test_retry_failed_emails_task_skips_maxed_entries(db_session: Session) -> None:
+    summary = email_tasks.process_email_queue_task(batch_size=10)
+
+    assert summary == {"processed": 4, "sent": 3, "failed": 1, "skipped": 0}
+    # One provider request carries every recipient of the template
+    assert len(provider.payloads) == 1
+    assert [p["to"][0]["email"] for p in provider.payloads[0]["personalizations"]] == [
+        "queue0@example.com",
+        "queue1@example.com",
+        "queue2@example.com",
+    ]
+    for email in pending:
+        db_session.refresh(email)
+        assert email.status == "sent"
+        assert email.retry_count == 1
+        assert email.error_message is None
+    db_session.refresh(missing_template)
+    assert missing_template.status == "failed"
+    assert missing_template.error_message == "Template not found"
+
+
+def test_retry_failed_emails_task_skips_maxed_entries(db_session: Session, provider) -> None:
     retriable = EmailQueue(
         to_email="retry@example.com",
         subject="Retry Me",
@@ -70,17 +103,8 @@ def test_retry_failed_emails_task_skips_maxed_entries(db_session: Session) -> No
     db_session.add_all([retriable, exhausted])
     db_session.commit()
 
-    render_patch = patch(
-        "app.services.email_service.render_template",
-        new=AsyncMock(return_value={"html_content": "<p>Hi</p>", "text_content": "Hi"}),
-    )
-    send_patch = patch(
-        "app.services.email_service.send_email",
-        new=AsyncMock(return_value={"status": "failed", "error": "provider down"}),
-    )
-
-    with render_patch, send_patch:
-        summary = email_tasks.retry_failed_emails_task(batch_size=10)
+    provider.status = 503
+    summary = email_tasks.retry_failed_emails_task(batch_size=10)
 
     db_session.refresh(retriable)
     db_session.refresh(exhausted)
@@ -90,7 +114,7 @@ def test_retry_failed_emails_task_skips_maxed_entries(db_session: Session) -> No
     assert summary["sent"] == 0
     assert summary["skipped"] == 1
     assert retriable.retry_count == MAX_RETRY_ATTEMPTS
-    assert retriable.error_message == "provider down"
+    assert "503" in retriable.error_message
     assert exhausted.retry_count == MAX_RETRY_ATTEMPTS
     assert exhausted.error_message == "permanent failure"
 
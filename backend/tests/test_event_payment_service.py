@@ -17,6 +17,7 @@ from app.models.event import Event, EventTicket, EventRegistration, EventStatus,
 from app.models.user import User
 from app.models.organization import Organization
 
+from app.services.event_service import EventService
 from app.services.event_payment_service import (
     create_checkout_session,
     handle_webhook,
@@ -453,3 +454,26 @@ async def test_process_refund_partial(
         assert result['status'] == 'succeeded'
         assert result['amount'] == refund_amount
 
+
+@pytest.mark.asyncio
+async def test_assign_tickets_updates_event_analytics(
+    db_session: Session,
+    test_event: Event,
+    test_ticket: EventTicket,
+    test_user: User,
+):
+    """Paid ticket assignment adds its registrations and revenue to existing analytics."""
+    EventService.get_event_analytics(db_session, test_event.id, test_event.organization_id)
+
+    await assign_tickets(
+        db=db_session,
+        payment_intent_id="pi_analytics_123",
+        event_id=test_event.id,
+        user_id=test_user.id,
+        ticket_type="vip",
+        quantity=3,
+    )
+
+    analytics = EventService.get_event_analytics(db_session, test_event.id, test_event.organization_id)
+    assert analytics.total_registrations == 3
+    assert analytics.total_revenue == Decimal("600.00")
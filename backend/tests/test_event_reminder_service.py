@@ -61,14 +61,14 @@ class TestEventReminderService:
 
         called = {}
 
-        async def fake_send_notification(db, notification_type, user_id, data, channel="email"):
-            called["args"] = (notification_type, user_id, data)
-            return {"status": "sent"}
+        async def fake_send_notifications(db, items):
+            called["items"] = items
+            return [{"status": "sent"} for _ in items]
 
         monkeypatch.setattr(
             event_reminder_service.notification_service,
-            "send_notification",
-            fake_send_notification,
+            "send_notifications",
+            fake_send_notifications,
         )
 
         processed = event_reminder_service.send_due_event_reminders(db_session)
@@ -76,4 +76,8 @@ class TestEventReminderService:
         assert processed == 1
         db_session.refresh(reminder)
         assert reminder.status == "sent"
-        assert called["args"][0] == "event_reminder_24h"
+        assert reminder.attempts == 1
+        [item] = called["items"]
+        assert item.notification_type == "event_reminder_24h"
+        assert item.user_id == solo_user.id
+        assert item.data["event_name"] == "Due Reminder Event"
@@ -28,7 +28,9 @@ from app.schemas.event import (
     EventSessionCreate,
     EventTicketCreate,
     EventRegistrationCreate,
+    EventRegistrationUpdate,
 )
+from app.core.query_metrics import capture_queries
 from app.services.event_service import EventService
 
 
@@ -493,3 +495,109 @@ class TestEventAnalyticsService:
         assert len(analytics.session_metrics) == 2
         assert analytics.session_metrics[str(session1.id)]["registrations"] == 1
         assert analytics.session_metrics[str(session2.id)]["registrations"] == 1
+
+    def _conference(self, db_session, solo_user, session_count):
+        event = Event(
+            id=str(uuid4()),
+            name="Conference",
+            start_date=datetime.now(UTC) + timedelta(days=30),
+            end_date=datetime.now(UTC) + timedelta(days=31),
+            event_type=EventType.VIRTUAL,
+            organization_id=solo_user.organization_id,
+            created_by_user_id=solo_user.id,
+        )
+        sessions = [
+            EventSession(
+                id=str(uuid4()),
+                event_id=event.id,
+                name=f"Session {index}",
+                start_time=datetime.now(UTC) + timedelta(days=30, hours=index),
+                end_time=datetime.now(UTC) + timedelta(days=30, hours=index + 1),
+                organization_id=solo_user.organization_id,
+                created_by_user_id=solo_user.id,
+            )
+            for index in range(session_count)
+        ]
+        registrations = [
+            EventRegistration(
+                id=str(uuid4()),
+                event_id=event.id,
+                session_id=session.id,
+                attendee_name="Attendee",
+                attendee_email=f"attendee{index}@example.com",
+                payment_status="paid",
+                payment_amount=Decimal("25.00"),
+                status=RegistrationStatus.CONFIRMED,
+                organization_id=solo_user.organization_id,
+            )
+            for index, session in enumerate(sessions)
+        ]
+        db_session.add_all([event, *sessions, *registrations])
+        db_session.commit()
+        return event, sessions
+
+    def test_analytics_queries_do_not_grow_with_sessions(self, db_session, solo_user):
+        """Building analytics costs the same for 2 sessions as for 40"""
+        small, _ = self._conference(db_session, solo_user, 2)
+        large, sessions = self._conference(db_session, solo_user, 40)
+
+        with capture_queries() as small_stats:
+            EventService.get_event_analytics(db_session, small.id, solo_user.organization_id)
+        with capture_queries() as large_stats:
+            analytics = EventService.get_event_analytics(db_session, large.id, solo_user.organization_id)
+
+        assert large_stats.count == small_stats.count
+        assert analytics.total_registrations == 40
+        assert analytics.total_revenue == Decimal("1000.00")
+        assert analytics.session_metrics[str(sessions[-1].id)] == {
+            "registrations": 1,
+            "attendees": 0,
+            "revenue": 25.0,
+        }
+
+        event_id, organization_id = large.id, solo_user.organization_id
+        with capture_queries() as warm_stats:
+            EventService.get_event_analytics(db_session, event_id, organization_id)
+        assert warm_stats.count == 2  # event lookup + analytics row
+
+    def test_registration_changes_update_analytics_incrementally(self, db_session, solo_user):
+        """Registrations, check-ins and cancellations adjust existing analytics"""
+        event, sessions = self._conference(db_session, solo_user, 1)
+        session_id = str(sessions[0].id)
+        EventService.get_event_analytics(db_session, event.id, solo_user.organization_id)
+
+        registration = EventService.create_registration(
+            db_session,
+            EventRegistrationCreate(
+                event_id=event.id,
+                session_id=session_id,
+                attendee_name="Jane Doe",
+                attendee_email="jane@example.com",
+                organization_id=solo_user.organization_id,
+            ),
+        )
+        EventService.update_registration(
+            db_session,
+            registration.id,
+            solo_user.organization_id,
+            EventRegistrationUpdate(checked_in=True, payment_status="paid"),
+        )
+
+        analytics = EventService.get_event_analytics(db_session, event.id, solo_user.organization_id)
+        assert registration.status == RegistrationStatus.ATTENDED
+        assert analytics.total_registrations == 2
+        assert analytics.total_attendees == 1
+        assert analytics.session_metrics[session_id]["attendees"] == 1
+
+        EventService.delete_registration(db_session, registration.id, solo_user.organization_id)
+
+        analytics = EventService.get_event_analytics(db_session, event.id, solo_user.organization_id)
+        assert analytics.total_registrations == 2
+        assert analytics.total_attendees == 0
+        assert analytics.session_metrics[session_id]["attendees"] == 0
+
+        from app.services.event_analytics_service import compute_event_metrics
+
+        expected = compute_event_metrics(db_session, event.id)
+        assert analytics.total_revenue == expected["total_revenue"]
+        assert analytics.session_metrics == expected["session_metrics"]
@@ -0,0 +1,88 @@
+"""Unit tests for the keyset pagination and streaming encoders used by exports."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta, UTC
+from uuid import uuid4
+
+from sqlalchemy import select
+
+from app.core.query_metrics import capture_queries
+from app.models.event import Event, EventRegistration, EventType, RegistrationStatus
+from app.utils.export_stream import csv_chunks, iter_keyset, json_array_chunks, ndjson_chunks
+
+
+def _registrations(db_session, organization_id, count):
+    event = Event(
+        id=str(uuid4()),
+        name="Export Event",
+        start_date=datetime.now(UTC) + timedelta(days=30),
+        end_date=datetime.now(UTC) + timedelta(days=31),
+        event_type=EventType.VIRTUAL,
+        organization_id=organization_id,
+        created_by_user_id="user-123",
+    )
+    created_at = datetime(2025, 1, 1, tzinfo=UTC)
+    registrations = [
+        EventRegistration(
+            id=f"reg-{index:03d}",
+            event_id=event.id,
+            attendee_name=f"Attendee {index}",
+            attendee_email=f"attendee{index}@example.com",
+            status=RegistrationStatus.CONFIRMED,
+            organization_id=organization_id,
+            # Pairs share a timestamp so paging must fall back to the id
+            created_at=created_at + timedelta(minutes=index // 2),
+        )
+        for index in range(count)
+    ]
+    db_session.add_all([event, *registrations])
+    db_session.commit()
+    return event
+
+
+def test_iter_keyset_pages_through_every_row_once(db_session, create_organization):
+    org = create_organization()
+    event = _registrations(db_session, str(org.id), 25)
+    statement = select(EventRegistration.id, EventRegistration.created_at).where(
+        EventRegistration.event_id == event.id
+    )
+
+    with capture_queries() as stats:
+        rows = list(
+            iter_keyset(
+                db_session,
+                statement,
+                (EventRegistration.created_at, EventRegistration.id),
+                batch_size=10,
+                descending=True,
+            )
+        )
+
+    assert stats.count == 3
+    assert [row.id for row in rows] == [f"reg-{index:03d}" for index in reversed(range(25))]
+
+    ascending = iter_keyset(
+        db_session,
+        statement,
+        (EventRegistration.created_at, EventRegistration.id),
+        batch_size=5,
+    )
+    assert [row.id for row in ascending] == [f"reg-{index:03d}" for index in range(25)]
+
+
+def test_encoders_stream_in_row_batches():
+    records = [{"id": index, "name": f"Name, {index}"} for index in range(5)]
+
+    csv_parts = list(csv_chunks(["id", "name"], ([r["id"], r["name"]] for r in records), flush_rows=2))
+    assert len(csv_parts) == 3  # header + 5 rows in batches of two
+    rows = list(csv.DictReader(io.StringIO(b"".join(csv_parts).decode())))
+    assert rows[4] == {"id": "4", "name": "Name, 4"}
+
+    ndjson = b"".join(ndjson_chunks(records, flush_rows=2)).decode()
+    assert [json.loads(line) for line in ndjson.splitlines()] == records
+
+    assert json.loads(b"".join(json_array_chunks(iter(records), flush_rows=2))) == records
+    assert json.loads(b"".join(json_array_chunks([]))) == []
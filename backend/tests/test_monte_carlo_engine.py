@@ -0,0 +1,112 @@
+"""Tests for the vectorised Monte Carlo valuation engine."""
+
+import time
+
+import numpy as np
+import pytest
+
+from app.services.monte_carlo_engine import (
+    MonteCarloConfig,
+    ShockSpec,
+    correlation_matrix,
+    simulate_enterprise_values,
+    summarize_enterprise_values,
+)
+from app.services.valuation_service import _calculate_enterprise_value
+
+CASH_FLOWS = [500000.0, 650000.0, 800000.0, 950000.0, 1100000.0]
+
+
+def _simulate(**config):
+    config.setdefault("iterations", 20_000)
+    config.setdefault("seed", 42)
+    return simulate_enterprise_values(
+        base_cash_flows=CASH_FLOWS,
+        discount_rate=0.12,
+        terminal_growth_rate=0.03,
+        config=MonteCarloConfig(**config),
+    )
+
+
+def test_same_seed_is_deterministic():
+    first = _simulate(batch_size=5_000)
+    second = _simulate(batch_size=5_000)
+
+    assert np.array_equal(first, second)
+    assert not np.array_equal(first, _simulate(seed=43))
+
+
+def test_zero_volatility_matches_deterministic_dcf():
+    values = _simulate(iterations=10, growth=ShockSpec(), margin=ShockSpec(), wacc=ShockSpec())
+
+    expected = _calculate_enterprise_value(
+        cash_flows=CASH_FLOWS,
+        terminal_cash_flow=CASH_FLOWS[-1],
+        discount_rate=0.12,
+        terminal_method="gordon_growth",
+        terminal_growth_rate=0.03,
+        terminal_ebitda_multiple=None,
+    )
+    assert values == pytest.approx([float(expected)] * 10, rel=1e-9)
+
+
+def test_per_path_wacc_shocks_widen_the_distribution():
+    baseline = _simulate()
+    shocked = _simulate(wacc=ShockSpec(volatility=0.02))
+
+    assert shocked.std() > baseline.std()
+    assert np.isfinite(shocked).all()
+
+
+def test_positive_growth_margin_correlation_widens_the_distribution():
+    growth, margin = ShockSpec(volatility=0.05), ShockSpec(volatility=0.05)
+    independent = _simulate(growth=growth, margin=margin)
+    correlated = _simulate(growth=growth, margin=margin, correlation=correlation_matrix(growth_margin=0.9))
+    hedged = _simulate(growth=growth, margin=margin, correlation=correlation_matrix(growth_margin=-0.9))
+
+    assert hedged.std() < independent.std() < correlated.std()
+
+
+@pytest.mark.parametrize("distribution", ["normal", "lognormal", "student_t"])
+def test_distributions_keep_mean_near_base_case(distribution):
+    values = _simulate(iterations=50_000, growth=ShockSpec(volatility=0.05, distribution=distribution))
+    centred = _simulate(iterations=1, growth=ShockSpec())
+
+    # Growth compounds, so the mean drifts only slightly above the base case.
+    assert values.mean() == pytest.approx(centred[0], rel=0.02)
+
+
+def test_invalid_correlation_is_rejected():
+    with pytest.raises(ValueError, match="positive semi-definite"):
+        _simulate(correlation=correlation_matrix(growth_margin=0.9, growth_wacc=0.9, margin_wacc=-0.9))
+    with pytest.raises(ValueError, match="3x3"):
+        _simulate(correlation=[[1.0, 0.0], [0.0, 1.0]])
+    with pytest.raises(ValueError, match="degrees_of_freedom"):
+        ShockSpec(volatility=0.1, distribution="student_t", degrees_of_freedom=2)
+
+
+def test_summary_reports_ordered_percentiles_and_histogram():
+    values = _simulate()
+
+    summary = summarize_enterprise_values(values, histogram_bins=25)
+
+    percentiles = list(summary["percentiles"].values())
+    assert list(summary["percentiles"]) == ["p5", "p10", "p25", "p50", "p75", "p90", "p95"]
+    assert percentiles == sorted(percentiles)
+    assert len(summary["histogram"]["bin_edges"]) == 26
+    assert sum(summary["histogram"]["counts"]) == values.size
+
+
+def test_one_million_paths_run_quickly():
+    started = time.perf_counter()
+    values = _simulate(
+        iterations=1_000_000,
+        margin=ShockSpec(volatility=0.03),
+        wacc=ShockSpec(volatility=0.01),
+        correlation=correlation_matrix(growth_margin=0.4, growth_wacc=-0.2),
+    )
+    elapsed = time.perf_counter() - started
+
+    assert values.shape == (1_000_000,)
+    # Generous bound for shared CI runners; typically well under a second.
+    assert elapsed < 5.0
@@ -399,6 +399,54 @@ async def test_send_notification_user_not_found(db_session):
         )
 
 
+@pytest.mark.asyncio
+async def test_send_notifications_batches_with_constant_queries(db_session):
+    """Fan-out prefetches users/preferences and sends one batch per template."""
+    from app.core.query_metrics import capture_queries
+    from app.models.organization import Organization
+
+    org = Organization(id="org-notif-fanout", name="Fanout Org", slug="fanout-org")
+    users = [
+        User(
+            id=f"user-fanout-{index}",
+            clerk_user_id=f"user-fanout-{index}-clerk",
+            email=f"fanout{index}@example.com",
+            first_name="Fan",
+            last_name=str(index),
+            role="solo",
+            organization_id=org.id,
+            is_active=True,
+        )
+        for index in range(6)
+    ]
+    db_session.add(org)
+    db_session.add_all(users)
+    db_session.add(UserNotificationPreferences(user_id=users[0].id, event_reminders=False))
+    db_session.commit()
+
+    items = [
+        notification_service.NotificationItem(user.id, "event_reminder_24h", {"event_name": "Summit"})
+        for user in users
+    ]
+    items.append(notification_service.NotificationItem(users[1].id, "new_comment", {"commenter_name": "Ada"}))
+    items.append(notification_service.NotificationItem("missing-user", "event_reminder_24h", {}))
+
+    batch_mock = AsyncMock(side_effect=lambda template_name, recipients: [{"status": "sent"} for _ in recipients])
+    with patch.object(notification_service.email_service, "send_template_batch", new=batch_mock), capture_queries() as stats:
+        results = await notification_service.send_notifications(db_session, items)
+
+    assert [r["status"] for r in results] == ["skipped"] + ["sent"] * 6 + ["failed"]
+    # users, preferences, default-preference insert: independent of recipient count
+    assert stats.count <= 4
+    calls = {call.kwargs["template_name"]: call.kwargs["recipients"] for call in batch_mock.await_args_list}
+    assert sorted(calls) == ["community_comment", "event_reminder_24h"]
+    reminders = calls["event_reminder_24h"]
+    assert [r.to_email for r in reminders] == [f"fanout{index}@example.com" for index in range(1, 6)]
+    assert reminders[0].template_data["user_name"] == "Fan 1"
+    assert reminders[0].subject == "Event Reminder: Summit starts in 24 hours"
+    assert db_session.query(UserNotificationPreferences).count() == 6
+
+
 # Test _get_template_name()
 def test_get_template_name_maps_correctly():
     """Test _get_template_name maps notification types to template names."""
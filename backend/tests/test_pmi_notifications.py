@@ -0,0 +1,220 @@
+"""Tests for the set-based PMI notification scanners and their sent-reminder ledger."""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.models.deal import Deal, DealStage
+from app.models.pmi import (
+    PMIDayOneCategory,
+    PMIDayOneChecklist,
+    PMIDayOneChecklistStatus,
+    PMIMilestone,
+    PMINotificationLog,
+    PMIProject,
+    PMIProjectStatus,
+    PMIRisk,
+    PMIRiskSeverity,
+    PMIRiskStatus,
+    PMISynergy,
+    PMISynergyCategory,
+    PMISynergyStatus,
+    PMIWorkstream,
+    PMIWorkstreamType,
+)
+from app.models.user_notification_preferences import UserNotificationPreferences
+from app.services import pmi_notification_service
+
+# Ensure Celery's shared_task decorator becomes a no-op so tasks run directly
+celery_module = sys.modules.get("celery")
+if celery_module is not None:
+    celery_module.shared_task.side_effect = (
+        lambda func=None, **kwargs: func if func is not None else (lambda f: f)
+    )
+
+pmi_notifications = importlib.reload(importlib.import_module("app.tasks.pmi_notifications"))
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    """Record outgoing PMI emails instead of calling SendGrid."""
+    sent = []
+
+    async def fake_send(to_email, subject, body):
+        sent.append((to_email, subject))
+        return True
+
+    monkeypatch.setattr(pmi_notification_service, "send_plain_email", fake_send)
+    return sent
+
+
+def _project(db_session, organization, owner, *, suffix, milestone_reminders=True, **fields):
+    db_session.add(UserNotificationPreferences(user_id=owner.id, pmi_milestone_reminders=milestone_reminders))
+    deal = Deal(
+        id=f"deal-{suffix}",
+        organization_id=organization.id,
+        name="Deal",
+        target_company="Target",
+        owner_id=owner.id,
+        stage=DealStage.won,
+    )
+    project = PMIProject(
+        id=f"project-{suffix}",
+        organization_id=organization.id,
+        deal_id=deal.id,
+        name=f"Project {suffix}",
+        status=PMIProjectStatus.active,
+        created_by=owner.id,
+        **fields,
+    )
+    workstream = PMIWorkstream(
+        id=f"workstream-{suffix}",
+        project_id=project.id,
+        organization_id=organization.id,
+        name="IT",
+        workstream_type=PMIWorkstreamType.it,
+    )
+    db_session.add_all([deal, project, workstream])
+    db_session.commit()
+    return project, workstream
+
+
+def _milestone(db_session, workstream, name, target_date, status="not_started"):
+    db_session.add(
+        PMIMilestone(
+            workstream_id=workstream.id,
+            organization_id=workstream.organization_id,
+            name=name,
+            target_date=target_date,
+            status=status,
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_scanners_select_due_items_and_skip_ledgered(db_session, create_organization, create_user, outbox):
+    now = datetime.now(timezone.utc)
+    organization = create_organization()
+    owner = create_user(organization_id=organization.id, email="owner@example.com")
+    muted = create_user(organization_id=organization.id, email="muted@example.com")
+    project, workstream = _project(
+        db_session, organization, owner, suffix="a", day_one_date=now + timedelta(days=1, hours=2)
+    )
+    _, muted_workstream = _project(db_session, organization, muted, suffix="b", milestone_reminders=False)
+
+    _milestone(db_session, workstream, "Three", now + timedelta(days=3, hours=2))
+    _milestone(db_session, workstream, "Seven", now + timedelta(days=7, hours=2))
+    _milestone(db_session, workstream, "Five", now + timedelta(days=5, hours=2))
+    _milestone(db_session, workstream, "Done", now + timedelta(days=3, hours=2), status="completed")
+    _milestone(db_session, muted_workstream, "Muted", now + timedelta(days=3, hours=2))
+    db_session.add_all(
+        [
+            PMIRisk(
+                project_id=project.id,
+                organization_id=organization.id,
+                title="Key staff leaving",
+                severity=PMIRiskSeverity.critical,
+                status=PMIRiskStatus.open,
+                created_by=owner.id,
+            ),
+            PMIRisk(
+                project_id=project.id,
+                organization_id=organization.id,
+                title="Minor",
+                severity=PMIRiskSeverity.low,
+                status=PMIRiskStatus.open,
+                created_by=owner.id,
+            ),
+            PMISynergy(
+                project_id=project.id,
+                organization_id=organization.id,
+                name="Shared procurement",
+                category=PMISynergyCategory.cost_synergy,
+                planned_value=Decimal("250000"),
+                target_date=now - timedelta(days=2),
+                status=PMISynergyStatus.in_progress,
+            ),
+            PMIDayOneChecklist(
+                project_id=project.id,
+                organization_id=organization.id,
+                category=PMIDayOneCategory.it,
+                item="Email migration",
+                status=PMIDayOneChecklistStatus.in_progress,
+            ),
+            PMIDayOneChecklist(
+                project_id=project.id,
+                organization_id=organization.id,
+                category=PMIDayOneCategory.hr,
+                item="Payroll",
+                status=PMIDayOneChecklistStatus.complete,
+            ),
+        ]
+    )
+    db_session.commit()
+
+    assert await pmi_notifications.scan_milestone_due_dates(db_session, now=now) == 2
+    assert await pmi_notifications.scan_risk_escalations(db_session) == 1
+    assert await pmi_notifications.scan_synergy_targets(db_session, now=now) == 1
+    assert await pmi_notifications.scan_day_one_readiness(db_session, now=now) == 1
+
+    subjects = sorted(subject for _, subject in outbox)
+    assert subjects == [
+        "PMI Day 1 Warning: 1 incomplete items",
+        "PMI Milestone Reminder: Seven due in 7 days",
+        "PMI Milestone Reminder: Three due in 3 days",
+        "PMI Risk Alert: Key staff leaving - CRITICAL Severity",
+        "PMI Synergy Alert: Shared procurement - Target Date Passed",
+    ]
+    assert {to for to, _ in outbox} == {"owner@example.com"}
+    assert db_session.query(PMINotificationLog).count() == 5
+
+    # A second run finds everything in the ledger
+    outbox.clear()
+    assert await pmi_notifications.scan_milestone_due_dates(db_session, now=now) == 0
+    assert await pmi_notifications.scan_risk_escalations(db_session) == 0
+    assert await pmi_notifications.scan_synergy_targets(db_session, now=now) == 0
+    assert await pmi_notifications.scan_day_one_readiness(db_session, now=now) == 0
+    assert outbox == []
+
+
+@pytest.mark.asyncio
+async def test_failed_sends_are_retried_next_run(db_session, create_organization, create_user, monkeypatch):
+    now = datetime.now(timezone.utc)
+    organization = create_organization()
+    owner = create_user(organization_id=organization.id, email="owner@example.com")
+    _, workstream = _project(db_session, organization, owner, suffix="c")
+    _milestone(db_session, workstream, "Three", now + timedelta(days=3, hours=2))
+    db_session.commit()
+
+    outcomes = iter([False, True])
+
+    async def flaky_send(to_email, subject, body):
+        return next(outcomes)
+
+    monkeypatch.setattr(pmi_notification_service, "send_plain_email", flaky_send)
+    monkeypatch.setattr(pmi_notifications, "SCAN_BATCH_SIZE", 1)
+
+    assert await pmi_notifications.scan_milestone_due_dates(db_session, now=now) == 0
+    assert db_session.query(PMINotificationLog).count() == 0
+    assert await pmi_notifications.scan_milestone_due_dates(db_session, now=now) == 1
+    [entry] = db_session.query(PMINotificationLog).all()
+    assert entry.notification_type == pmi_notification_service.MILESTONE_REMINDER
+    assert entry.dedupe_key.startswith("3d:")
+
+
+def test_celery_task_opens_its_own_session(db_session, create_organization, create_user, outbox, monkeypatch):
+    monkeypatch.setattr(pmi_notification_service.settings, "sendgrid_api_key", "SG.test")
+    organization = create_organization()
+    owner = create_user(organization_id=organization.id, email="owner@example.com")
+    _, workstream = _project(db_session, organization, owner, suffix="d")
+    _milestone(db_session, workstream, "Seven", datetime.now(timezone.utc) + timedelta(days=7, hours=2))
+    db_session.commit()
+
+    assert pmi_notifications.check_milestone_due_dates_task() == 1
+    assert outbox == [("owner@example.com", "PMI Milestone Reminder: Seven due in 7 days")]
+    assert pmi_notifications.check_milestone_due_dates_task() == 0
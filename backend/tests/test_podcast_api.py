@@ -2132,6 +2132,50 @@ class TestTranscriptDownload:
         finally:
             _clear_override()
 
+    def test_download_transcript_srt_uses_word_timestamps(
+        self, client, create_user, create_organization
+    ):
+        """Test SRT cues come from stored Whisper timings when available."""
+        org = create_organization(subscription_tier="professional")
+        professional_user = create_user(
+            role=UserRole.growth, organization_id=org.id
+        )
+        professional_user.subscription_tier = (
+            SubscriptionTier.PROFESSIONAL.value
+        )
+
+        _override_user(professional_user)
+        try:
+            with patch(
+                "app.api.dependencies.auth.check_feature_access",
+                new_callable=AsyncMock,
+            ) as mock_feature, patch(
+                "app.api.routes.podcasts.podcast_service.get_episode"
+            ) as mock_get_episode, patch(
+                "app.api.routes.podcasts.podcast_service.get_transcript_timestamps"
+            ) as mock_timestamps:
+                mock_feature.return_value = True
+                mock_get_episode.return_value = SimpleNamespace(
+                    id="ep-123",
+                    organization_id=professional_user.organization_id,
+                    title="Test Episode",
+                    transcript="Welcome back. Today we talk deals.",
+                )
+                mock_timestamps.return_value = [
+                    {"time": 0.0, "end": 1.25, "text": "Welcome back."},
+                    {"time": 3725.5, "end": 3727.0, "text": "Today we talk deals."},
+                ]
+
+                response = client.get(
+                    "/api/podcasts/episodes/ep-123/transcript.srt"
+                )
+
+            assert response.status_code == status.HTTP_200_OK
+            assert "00:00:00,000 --> 00:00:01,250\nWelcome back." in response.text
+            assert "2\n01:02:05,500 --> 01:02:07,000\nToday we talk deals." in response.text
+        finally:
+            _clear_override()
+
     def test_download_transcript_requires_transcript(
         self, client, create_user, create_organization
     ):
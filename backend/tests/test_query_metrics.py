@@ -0,0 +1,163 @@
+"""Tests for per-request query instrumentation, Server-Timing and query budgets."""
+
+import logging
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.api.dependencies.auth import get_current_user
+from app.core.config import settings
+from app.core.query_metrics import (
+    QueryBudgetExceeded,
+    QueryMetricsMiddleware,
+    capture_queries,
+    check_query_budget,
+    exclude_from_budget,
+    get_query_metrics,
+    query_budget,
+    reset_query_metrics,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_metrics():
+    reset_query_metrics()
+    yield
+    reset_query_metrics()
+
+
+@pytest.fixture()
+def budget_app(engine):
+    """Minimal app whose routes issue a known number of queries."""
+    application = FastAPI()
+    application.add_middleware(QueryMetricsMiddleware)
+
+    def run_queries(count: int) -> None:
+        with engine.connect() as connection:
+            for _ in range(count):
+                connection.execute(text("SELECT 1"))
+
+    @application.get("/within")
+    @query_budget(2)
+    def within_budget():
+        run_queries(2)
+        return {"ok": True}
+
+    @application.get("/over")
+    @query_budget(1)
+    def over_budget():
+        run_queries(3)
+        return {"ok": True}
+
+    @application.get("/shared-overhead")
+    @query_budget(1)
+    def shared_overhead():
+        with exclude_from_budget():
+            run_queries(3)
+        run_queries(1)
+        return {"ok": True}
+
+    @application.get("/undeclared")
+    def undeclared(_: None = Depends(lambda: run_queries(1))):
+        run_queries(4)
+        return {"ok": True}
+
+    return application
+
+
+def test_server_timing_reports_query_count_and_duration(client, create_user, create_organization, dependency_overrides):
+    org = create_organization()
+    user = create_user(organization_id=str(org.id))
+    dependency_overrides(get_current_user, lambda: user)
+
+    client.get("/api/dashboard/financial-summary")  # seeds the rollup row
+    response = client.get("/api/dashboard/financial-summary")
+
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="1 queries"' in timing
+    assert "db-slowest;dur=" in timing
+
+
+def test_health_db_exposes_route_aggregates_and_pools(
+    client, create_user, create_organization, master_admin_user, dependency_overrides
+):
+    org = create_organization()
+    user = create_user(organization_id=str(org.id))
+    dependency_overrides(get_current_user, lambda: user)
+    client.get("/api/dashboard/activity")
+    client.get("/api/dashboard/activity")
+
+    # Statement text and pool state are for master admins only
+    assert client.get("/health/db").status_code == 403
+    dependency_overrides(get_current_user, lambda: master_admin_user)
+    payload = client.get("/health/db").json()
+
+    route = payload["routes"]["GET /api/dashboard/activity"]
+    assert route["requests"] == 2
+    assert route["queries"] == 2
+    assert route["max_queries"] == 1
+    assert route["budget"] == 3
+    assert route["budget_violations"] == 0
+    assert route["slowest_statement"].startswith("SELECT")
+    assert set(payload["pools"]) == {"sync", "async"}
+
+
+def test_route_within_budget_passes(budget_app):
+    with TestClient(budget_app) as test_client:
+        response = test_client.get("/within")
+
+    assert response.status_code == 200
+    assert 'desc="2 queries"' in response.headers["server-timing"]
+
+
+def test_route_over_budget_fails_in_strict_mode(budget_app):
+    assert settings.query_budget_strict is True
+
+    with TestClient(budget_app) as test_client, pytest.raises(QueryBudgetExceeded, match=r"GET /over issued 3 queries \(budget 1\)"):
+        test_client.get("/over")
+
+    assert get_query_metrics()["GET /over"]["budget_violations"] == 1
+
+
+def test_route_over_budget_only_warns_outside_strict_mode(budget_app, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "query_budget_strict", False)
+
+    with caplog.at_level(logging.WARNING, logger="app.core.query_metrics"):
+        with TestClient(budget_app) as test_client:
+            response = test_client.get("/over")
+
+    assert response.status_code == 200
+    assert "Query budget exceeded: GET /over issued 3 queries (budget 1)" in caplog.text
+
+
+def test_excluded_queries_are_timed_but_not_budgeted(budget_app):
+    with TestClient(budget_app) as test_client:
+        response = test_client.get("/shared-overhead")
+
+    assert response.status_code == 200
+    assert 'desc="4 queries"' in response.headers["server-timing"]
+    assert get_query_metrics()["GET /shared-overhead"]["budget_violations"] == 0
+
+
+def test_dependency_queries_count_towards_the_request(budget_app):
+    with TestClient(budget_app) as test_client:
+        response = test_client.get("/undeclared")
+
+    assert 'desc="5 queries"' in response.headers["server-timing"]
+    assert get_query_metrics()["GET /undeclared"]["budget"] is None
+
+
+def test_capture_queries_lists_statements_on_failure(engine):
+    with capture_queries() as stats:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+
+    assert stats.count == 2
+    check_query_budget(stats, 2)
+    with pytest.raises(QueryBudgetExceeded, match="SELECT 2"):
+        check_query_budget(stats, 1, label="listing")
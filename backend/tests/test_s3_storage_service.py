@@ -550,3 +550,95 @@ class TestS3StorageServiceContentTypes:
 
         # Assert
         assert content_type == "application/octet-stream"
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+@pytest.fixture
+def streaming_service():
+    with patch('app.services.s3_storage_service.boto3.client') as mock_boto_client, \
+            patch('app.services.s3_storage_service.get_settings') as mock_settings:
+        mock_settings_obj = Mock()
+        mock_settings_obj.R2_ENDPOINT_URL = "https://test.r2.cloudflarestorage.com"
+        mock_settings_obj.R2_ACCESS_KEY_ID = "test_key"
+        mock_settings_obj.R2_SECRET_ACCESS_KEY = "test_secret"
+        mock_settings_obj.R2_BUCKET_NAME = "test-bucket"
+        mock_settings.return_value = mock_settings_obj
+
+        mock_client = MagicMock()
+        mock_client.create_multipart_upload.return_value = {'UploadId': 'upload-1'}
+        mock_client.upload_part.side_effect = lambda **kwargs: {'ETag': f"etag-{kwargs['PartNumber']}"}
+        mock_boto_client.return_value = mock_client
+        yield S3StorageService(), mock_client
+
+
+class TestS3StorageServiceStreamingUploads:
+    """Test suite for chunked streaming uploads (single PUT and multipart)."""
+
+    @pytest.mark.asyncio
+    async def test_small_stream_uses_single_put(self, streaming_service):
+        import hashlib
+
+        service, mock_client = streaming_service
+        org_id = str(uuid4())
+        data = b"small body"
+
+        stored = await service.save_stream("doc.pdf", _chunks(data, 4), org_id)
+
+        assert stored.size == len(data)
+        assert stored.sha256 == hashlib.sha256(data).hexdigest()
+        assert stored.location == f"s3://test-bucket/{org_id}/doc.pdf"
+        put_kwargs = mock_client.put_object.call_args[1]
+        assert put_kwargs['Body'] == data
+        assert put_kwargs['ContentType'] == "application/pdf"
+        mock_client.create_multipart_upload.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_large_stream_uploads_parts_in_order(self, streaming_service):
+        from app.services import s3_storage_service as s3_module
+
+        service, mock_client = streaming_service
+        part_size = s3_module.MULTIPART_PART_SIZE
+        data = bytes(range(256)) * ((part_size * 2 + 1000) // 256 + 1)
+
+        stored = await service.save_stream("big.bin", _chunks(data, 1024 * 1024), str(uuid4()))
+
+        assert stored.size == len(data)
+        bodies = {call[1]['PartNumber']: call[1]['Body'] for call in mock_client.upload_part.call_args_list}
+        assert sorted(bodies) == [1, 2, 3]
+        assert b"".join(bodies[number] for number in (1, 2, 3)) == data
+        parts = mock_client.complete_multipart_upload.call_args[1]['MultipartUpload']['Parts']
+        assert parts == [{'PartNumber': n, 'ETag': f"etag-{n}"} for n in (1, 2, 3)]
+        mock_client.put_object.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_oversized_stream_aborts_multipart_upload(self, streaming_service):
+        from app.services import s3_storage_service as s3_module
+        from app.services.storage_service import FileTooLargeError
+
+        service, mock_client = streaming_service
+        part_size = s3_module.MULTIPART_PART_SIZE
+        data = b"x" * (part_size * 2)
+
+        with pytest.raises(FileTooLargeError):
+            await service.save_stream("big.bin", _chunks(data, 1024 * 1024), str(uuid4()), max_size=part_size + 10)
+
+        mock_client.abort_multipart_upload.assert_called_once()
+        mock_client.complete_multipart_upload.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_part_raises_ioerror_and_aborts(self, streaming_service):
+        from app.services import s3_storage_service as s3_module
+
+        service, mock_client = streaming_service
+        error_response = {'Error': {'Code': 'InternalError', 'Message': 'Part failed'}}
+        mock_client.upload_part.side_effect = ClientError(error_response, 'upload_part')
+        data = b"x" * (s3_module.MULTIPART_PART_SIZE + 1)
+
+        with pytest.raises(IOError, match="Part failed"):
+            await service.save_stream("big.bin", _chunks(data, 1024 * 1024), str(uuid4()))
+
+        mock_client.abort_multipart_upload.assert_called_once()
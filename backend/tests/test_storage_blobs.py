@@ -0,0 +1,118 @@
+"""Tests for content-addressed, deduplicated data room storage."""
+from __future__ import annotations
+
+from io import BytesIO
+
+import pytest
+from fastapi import UploadFile
+from sqlalchemy import select
+
+from app.models.document import Document
+from app.models.storage_blob import StorageBlob
+from app.services import blob_store, document_service
+from app.services import storage_service as storage_module
+
+
+@pytest.fixture()
+def storage(tmp_path):
+    storage_module._storage_service = storage_module.LocalStorageService(base_path=tmp_path)  # type: ignore[attr-defined]
+    yield storage_module._storage_service
+    storage_module._storage_service = None  # type: ignore[attr-defined]
+
+
+async def _upload(db_session, deal, owner, payload: bytes, filename: str = "nda.pdf"):
+    upload = UploadFile(filename=filename, file=BytesIO(payload))
+    type(upload).content_type = property(lambda self: "application/pdf")
+    return await document_service.upload_document(db_session, file=upload, deal_id=deal.id, current_user=owner)
+
+
+def _stored_files(storage, organization_id):
+    return sorted(path.name for path in (storage.base_path / str(organization_id)).iterdir())
+
+
+@pytest.mark.asyncio
+async def test_duplicate_uploads_share_one_file(db_session, create_deal_for_org, storage):
+    deal, owner, organization = create_deal_for_org()
+    other_deal, _, _ = create_deal_for_org(organization=organization, owner=owner, name="Second Deal")
+
+    first = await _upload(db_session, deal, owner, b"same bytes")
+    second = await _upload(db_session, other_deal, owner, b"same bytes", filename="copy.pdf")
+    await _upload(db_session, deal, owner, b"different", filename="other.pdf")
+
+    first_doc = db_session.get(Document, str(first.id))
+    second_doc = db_session.get(Document, str(second.id))
+    assert first_doc.file_key == second_doc.file_key
+    blob = db_session.scalar(select(StorageBlob).where(StorageBlob.file_key == first_doc.file_key))
+    assert blob.ref_count == 2
+    assert blob.size == len(b"same bytes")
+    # Two distinct contents, no temporary files left behind
+    assert len(_stored_files(storage, organization.id)) == 2
+
+    changes = blob_store.BlobChanges(storage, str(organization.id))
+    async with changes.transaction(db_session):
+        assert not await blob_store.release(db_session, changes, first_doc.file_key)
+        db_session.refresh(blob)
+        assert blob.ref_count == 1
+        assert await blob_store.release(db_session, changes, first_doc.file_key)
+        db_session.commit()
+        assert len(_stored_files(storage, organization.id)) == 2
+    assert db_session.scalar(select(StorageBlob).where(StorageBlob.file_key == first_doc.file_key)) is None
+    assert len(_stored_files(storage, organization.id)) == 1
+
+
+@pytest.mark.asyncio
+async def test_rollback_keeps_released_files_and_drops_created_ones(db_session, create_deal_for_org, storage):
+    deal, owner, organization = create_deal_for_org()
+    kept = await _upload(db_session, deal, owner, b"kept")
+    kept_key = db_session.get(Document, str(kept.id)).file_key
+
+    changes = blob_store.BlobChanges(storage, str(organization.id))
+    with pytest.raises(RuntimeError):
+        async with changes.transaction(db_session):
+            new_key, _ = await blob_store.save_blob(db_session, changes, _chunks(b"new content"))
+            assert await blob_store.release(db_session, changes, kept_key)
+            raise RuntimeError("commit failed")
+
+    blob = db_session.scalar(select(StorageBlob).where(StorageBlob.file_key == kept_key))
+    assert blob.ref_count == 1
+    assert db_session.scalar(select(StorageBlob).where(StorageBlob.file_key == new_key)) is None
+    assert _stored_files(storage, organization.id) == [kept_key]
+
+
+@pytest.mark.asyncio
+async def test_restore_references_existing_blob(db_session, create_deal_for_org, storage):
+    deal, owner, organization = create_deal_for_org()
+    v1 = await _upload(db_session, deal, owner, b"first draft")
+    v2 = await _upload(db_session, deal, owner, b"second draft")
+
+    restored = await document_service.restore_document_version(
+        db_session,
+        document_id=str(v2.id),
+        version_id=str(v1.id),
+        organization_id=str(organization.id),
+        current_user=owner,
+    )
+
+    original = db_session.get(Document, str(v1.id))
+    restored_doc = db_session.get(Document, str(restored.id))
+    assert restored_doc.version == 3
+    assert restored_doc.file_key == original.file_key
+    assert restored_doc.checksum_sha256 == original.checksum_sha256
+    blob = db_session.scalar(select(StorageBlob).where(StorageBlob.file_key == original.file_key))
+    assert blob.ref_count == 2
+    assert len(_stored_files(storage, organization.id)) == 2
+
+
+@pytest.mark.asyncio
+async def test_release_deletes_legacy_files(db_session, create_organization, storage):
+    organization = create_organization()
+    await storage.save_stream("legacy-key", _chunks(b"legacy"), str(organization.id))
+
+    changes = blob_store.BlobChanges(storage, str(organization.id))
+    async with changes.transaction(db_session):
+        assert await blob_store.release(db_session, changes, "legacy-key")
+    assert _stored_files(storage, organization.id) == []
+
+
+async def _chunks(payload: bytes):
+    yield payload
@@ -0,0 +1,63 @@
+"""Tests for streamed saves in the local filesystem storage service."""
+from __future__ import annotations
+
+import hashlib
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from app.services.storage_service import (
+    FileTooLargeError,
+    LocalStorageService,
+    iter_upload_chunks,
+)
+
+
+async def _chunks(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+@pytest.mark.asyncio
+async def test_save_stream_writes_atomically_with_checksum(tmp_path):
+    service = LocalStorageService(base_path=str(tmp_path))
+
+    stored = await service.save_stream("file-key", _chunks(b"hello ", b"world"), "org-1")
+
+    assert stored.size == 11
+    assert stored.sha256 == hashlib.sha256(b"hello world").hexdigest()
+    assert (tmp_path / "org-1" / "file-key").read_bytes() == b"hello world"
+    assert [path.name for path in (tmp_path / "org-1").iterdir()] == ["file-key"]
+
+
+@pytest.mark.asyncio
+async def test_save_stream_over_limit_leaves_no_file(tmp_path):
+    service = LocalStorageService(base_path=str(tmp_path))
+    (tmp_path / "org-1").mkdir()
+    (tmp_path / "org-1" / "file-key").write_bytes(b"previous")
+
+    with pytest.raises(FileTooLargeError):
+        await service.save_stream("file-key", _chunks(b"x" * 8, b"x" * 8), "org-1", max_size=10)
+
+    assert (tmp_path / "org-1" / "file-key").read_bytes() == b"previous"
+    assert [path.name for path in (tmp_path / "org-1").iterdir()] == ["file-key"]
+
+
+@pytest.mark.asyncio
+async def test_save_file_streams_file_objects(tmp_path):
+    service = LocalStorageService(base_path=str(tmp_path))
+
+    location = await service.save_file("file-key", io.BytesIO(b"payload"), "org-1")
+
+    assert location == str(tmp_path / "org-1" / "file-key")
+    assert (tmp_path / "org-1" / "file-key").read_bytes() == b"payload"
+
+
+@pytest.mark.asyncio
+async def test_iter_upload_chunks_reads_in_blocks():
+    upload = UploadFile(file=io.BytesIO(b"abcdefghij"), filename="doc.pdf")
+
+    chunks = [chunk async for chunk in iter_upload_chunks(upload, chunk_size=4)]
+
+    assert chunks == [b"abcd", b"efgh", b"ij"]
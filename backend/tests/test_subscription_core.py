@@ -181,6 +181,51 @@ class TestGetOrganizationTier:
             assert org_id in str(exc_info.value)
 
 
+class TestTierCacheSharing:
+    """Test single-flight refresh and Clerk client reuse"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_clerk_call(self):
+        """Test concurrent lookups for a cold organization hit Clerk once."""
+        org_id = "org_concurrent"
+
+        mock_org = Mock()
+        mock_org.public_metadata = {"subscription_tier": "enterprise"}
+
+        async def slow_get(_org_id):
+            await asyncio.sleep(0.01)
+            return mock_org
+
+        mock_clerk = AsyncMock()
+        mock_clerk.organizations.get.side_effect = slow_get
+
+        with patch("app.core.subscription.Clerk", return_value=mock_clerk):
+            clear_tier_cache(org_id)
+
+            tiers = await asyncio.gather(*(get_organization_tier(org_id) for _ in range(10)))
+
+        assert tiers == [SubscriptionTier.ENTERPRISE] * 10
+        assert mock_clerk.organizations.get.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_clerk_client_is_reused_across_lookups(self):
+        """Test one Clerk client serves lookups for different organizations."""
+        mock_org = Mock()
+        mock_org.public_metadata = {"subscription_tier": "professional"}
+
+        mock_clerk = AsyncMock()
+        mock_clerk.organizations.get.return_value = mock_org
+
+        with patch("app.core.subscription.Clerk", return_value=mock_clerk) as clerk_factory:
+            clear_tier_cache()
+
+            await get_organization_tier("org_reuse_1")
+            await get_organization_tier("org_reuse_2")
+
+        assert clerk_factory.call_count == 1
+        assert mock_clerk.organizations.get.call_count == 2
+
+
 class TestClearTierCache:
     """Test clear_tier_cache function"""
     
@@ -0,0 +1,42 @@
+"""Tests for the shared compiled-template engine."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from app.utils import template_engine
+from app.utils.template_engine import CompiledTemplate
+
+
+def test_compiled_template_renders_segments_in_one_pass():
+    compiled = CompiledTemplate("Hi {{first_name}}, welcome to {{company}}. Bye {{first_name}}!")
+
+    assert compiled.variables == ("first_name", "company")
+    assert compiled.render({"first_name": "Ada", "company": "Acme"}) == "Hi Ada, welcome to Acme. Bye Ada!"
+    # Unknown placeholders survive and values are never re-scanned for placeholders
+    assert compiled.render({"first_name": "{{company}}"}) == "Hi {{company}}, welcome to {{company}}. Bye {{company}}!"
+    assert compiled.missing({"first_name": "Ada"}) == ["company"]
+    assert compiled.render_many([{"first_name": "A", "company": 1}, {"first_name": "B", "company": 2}]) == [
+        "Hi A, welcome to 1. Bye A!",
+        "Hi B, welcome to 2. Bye B!",
+    ]
+    assert CompiledTemplate("no variables").render({"x": 1}) == "no variables"
+
+
+def test_get_compiled_caches_by_id_and_updated_at():
+    template_engine.clear_cache()
+    first = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    second = datetime(2025, 1, 2, tzinfo=timezone.utc)
+
+    compiled = template_engine.get_compiled(("doc", "t1"), first, "Dear {{name}}")
+    assert template_engine.get_compiled(("doc", "t1"), first, "Dear " + "{{name}}") is compiled
+
+    edited = template_engine.get_compiled(("doc", "t1"), second, "Hello {{name}}")
+    assert edited is not compiled
+    assert edited.render({"name": "Ada"}) == "Hello Ada"
+
+    # Same version key but different text (edit within timestamp resolution) recompiles
+    assert template_engine.get_compiled(("doc", "t1"), second, "Yo {{name}}").render({"name": "Ada"}) == "Yo Ada"
+    assert template_engine.render_many(("doc", "t1"), second, "Yo {{name}}", [{"name": "A"}, {"name": "B"}]) == [
+        "Yo A",
+        "Yo B",
+    ]
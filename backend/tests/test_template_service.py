@@ -82,6 +82,34 @@ class TestRenderTemplate:
         assert rendered["subject"] == "Hello John"
         assert rendered["content"] == "Hi John, welcome to Acme Corp!"
     
+    def test_render_template_batch(self, db: Session, test_user: User, test_org: Organization):
+        """Test rendering one template for many contacts, picking up edits."""
+        template = CampaignTemplate(
+            organization_id=str(test_org.id),
+            name="Batch Template",
+            subject="Hello {{first_name}}",
+            content="Hi {{first_name}} from {{company}}",
+            type="email",
+            variables=["first_name", "company"],
+            created_by=str(test_user.id),
+        )
+        db.add(template)
+        db.commit()
+        db.refresh(template)
+        
+        contacts = [
+            {"first_name": "John", "company": "Acme"},
+            {"first_name": "Jane", "company": "Tech Inc"},
+        ]
+        rendered = template_service.render_template_batch(template.id, contacts, db)
+        
+        assert [item["subject"] for item in rendered] == ["Hello John", "Hello Jane"]
+        assert rendered[1]["content"] == "Hi Jane from Tech Inc"
+        
+        template_service.update_template(template, {"subject": "Welcome {{first_name}}"}, db)
+        rendered = template_service.render_template_batch(template.id, contacts[:1], db)
+        assert rendered[0]["subject"] == "Welcome John"
+    
     def test_render_template_missing_variable(self, db: Session, test_user: User, test_org: Organization):
         """Test that rendering with missing variables raises an error."""
         template = CampaignTemplate(
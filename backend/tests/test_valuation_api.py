@@ -3,6 +3,7 @@
 from datetime import datetime, timezone
 from uuid import uuid4
 
+import pytest
 from fastapi import status
 
 from app.services import valuation_service
@@ -480,6 +481,115 @@ class TestValuationApi:
         detail = response.json()["detail"]
         if isinstance(detail, dict):
             assert detail.get("code") == "INVALID_MONTE_CARLO"
+
+    def test_run_monte_carlo_with_correlated_shocks(self, client, create_deal_for_org, auth_headers_growth):
+        deal, _, _ = create_deal_for_org()
+        create_resp = _create_valuation(client, deal.id, auth_headers_growth, VALUATION_PAYLOAD)
+        valuation_id = create_resp.json()["id"]
+
+        response = client.post(
+            f"/api/deals/{deal.id}/valuations/{valuation_id}/monte-carlo",
+            json={
+                "iterations": 5000,
+                "seed": 7,
+                "margin_volatility": 0.03,
+                "wacc_volatility": 0.01,
+                "distribution": "student_t",
+                "correlation": {"growth_margin": 0.5, "growth_wacc": -0.2},
+                "histogram_bins": 20,
+            },
+            headers=auth_headers_growth,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        percentiles = body["percentiles"]
+        assert percentiles["p5"] <= percentiles["p50"] <= percentiles["p95"]
+        assert len(body["histogram"]["counts"]) == 20
+        assert sum(body["histogram"]["counts"]) == 5000
+
+    def test_sensitivity_grid_is_served_and_cached(self, client, create_deal_for_org, auth_headers_growth):
+        deal, _, _ = create_deal_for_org()
+        create_resp = _create_valuation(client, deal.id, auth_headers_growth, VALUATION_PAYLOAD)
+        valuation_id = create_resp.json()["id"]
+        payload = {
+            "axes": {
+                "discount_rate": {"start": 0.08, "stop": 0.16, "steps": 50},
+                "terminal_growth_rate": {"start": 0.0, "stop": 0.049, "steps": 50},
+            }
+        }
+        url = f"/api/deals/{deal.id}/valuations/{valuation_id}/sensitivity"
+
+        first = client.post(url, json=payload, headers=auth_headers_growth)
+        second = client.post(url, json=payload, headers=auth_headers_growth)
+
+        assert first.status_code == status.HTTP_200_OK
+        body = first.json()
+        assert body["cached"] is False
+        assert second.json()["cached"] is True
+        rows = len(body["axes"]["discount_rate"])
+        columns = len(body["axes"]["terminal_growth_rate"])
+        assert 0.12 in body["axes"]["discount_rate"]
+        assert len(body["enterprise_values"]) == rows
+        assert all(len(row) == columns for row in body["enterprise_values"])
+        assert body["base_enterprise_value"] == pytest.approx(create_resp.json()["enterprise_value"], rel=1e-6)
+        assert {row["metric"] for row in body["tornado"]} == {"discount_rate", "terminal_growth_rate"}
+
+    def test_sensitivity_rejects_driver_for_other_terminal_method(
+        self, client, create_deal_for_org, auth_headers_growth
+    ):
+        deal, _, _ = create_deal_for_org()
+        create_resp = _create_valuation(client, deal.id, auth_headers_growth, VALUATION_PAYLOAD)
+        valuation_id = create_resp.json()["id"]
+
+        response = client.post(
+            f"/api/deals/{deal.id}/valuations/{valuation_id}/sensitivity",
+            json={"axes": {"terminal_ebitda_multiple": {"values": [6, 8, 10]}}},
+            headers=auth_headers_growth,
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"]["code"] == "INVALID_SENSITIVITY"
+
+    def test_sensitivity_rejects_base_case_without_terminal_value(
+        self, client, db_session, create_deal_for_org, auth_headers_growth
+    ):
+        from app.models.valuation import ValuationModel
+
+        deal, _, _ = create_deal_for_org()
+        create_resp = _create_valuation(client, deal.id, auth_headers_growth, VALUATION_PAYLOAD)
+        valuation_id = create_resp.json()["id"]
+        valuation = db_session.get(ValuationModel, valuation_id)
+        valuation.discount_rate = 0.05
+        valuation.terminal_growth_rate = 0.06
+        db_session.commit()
+
+        response = client.post(
+            f"/api/deals/{deal.id}/valuations/{valuation_id}/sensitivity",
+            json={"axes": {"discount_rate": {"values": [0.08, 0.12]}}},
+            headers=auth_headers_growth,
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"]["code"] == "INVALID_BASE_CASE"
+
+    def test_run_monte_carlo_rejects_inconsistent_correlation(self, client, create_deal_for_org, auth_headers_growth):
+        deal, _, _ = create_deal_for_org()
+        create_resp = _create_valuation(client, deal.id, auth_headers_growth, VALUATION_PAYLOAD)
+        valuation_id = create_resp.json()["id"]
+
+        response = client.post(
+            f"/api/deals/{deal.id}/valuations/{valuation_id}/monte-carlo",
+            json={
+                "iterations": 100,
+                "correlation": {"growth_margin": 0.9, "growth_wacc": 0.9, "margin_wacc": -0.9},
+            },
+            headers=auth_headers_growth,
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert response.json()["detail"]["code"] == "INVALID_MONTE_CARLO"
+
     def test_get_scenario_summary_via_api(
         self,
         client,
@@ -10,6 +10,7 @@ from decimal import Decimal
 from uuid import uuid4
 from typing import List
 
+import numpy as np
 import pytest
 
 from app.services import valuation_service
@@ -64,6 +65,123 @@ class TestSensitivityMatrix:
         assert matrix[0][3] > matrix[2][1]
 
 
+class TestSensitivityGrid:
+    CASH_FLOWS = [500000, 650000, 800000, 950000, 1100000]
+
+    def _grid(self, axes, **overrides):
+        inputs = dict(
+            cash_flows=self.CASH_FLOWS,
+            terminal_cash_flow=1200000,
+            discount_rate=0.12,
+            terminal_method="gordon_growth",
+            terminal_growth_rate=0.03,
+            terminal_ebitda_multiple=None,
+        )
+        inputs.update(overrides)
+        return valuation_service.evaluate_sensitivity_grid(axes=axes, **inputs)
+
+    def _valuation(self, **overrides):
+        fields = dict(
+            id=str(uuid4()),
+            cash_flows=self.CASH_FLOWS,
+            terminal_cash_flow=1200000,
+            discount_rate=0.12,
+            terminal_method="gordon_growth",
+            terminal_growth_rate=0.03,
+            terminal_ebitda_multiple=None,
+        )
+        fields.update(overrides)
+        return ValuationModel(**fields)
+
+    def test_grid_cells_match_scalar_dcf(self):
+        result = self._grid(
+            {
+                "discount_rate": [0.10, 0.14],
+                "terminal_growth_rate": [0.01, 0.04],
+                "revenue_growth": [-0.02, 0.05],
+            }
+        )
+
+        assert result["axes"]["discount_rate"] == [0.10, 0.12, 0.14]
+        values = result["enterprise_values"]
+        assert values.shape == (3, 3, 3)
+        for i, wacc in enumerate(result["axes"]["discount_rate"]):
+            for j, growth in enumerate(result["axes"]["terminal_growth_rate"]):
+                for k, uplift in enumerate(result["axes"]["revenue_growth"]):
+                    flows = [cf * (1 + uplift) ** year for year, cf in enumerate(self.CASH_FLOWS, start=1)]
+                    expected = valuation_service._calculate_enterprise_value(
+                        cash_flows=flows,
+                        terminal_cash_flow=1200000 * (1 + uplift) ** len(flows),
+                        discount_rate=wacc,
+                        terminal_method="gordon_growth",
+                        terminal_growth_rate=growth,
+                        terminal_ebitda_multiple=None,
+                    )
+                    assert values[i, j, k] == pytest.approx(float(expected), rel=1e-9)
+
+    def test_exit_multiple_axis_and_invalid_cells(self):
+        exit_result = self._grid(
+            {"terminal_ebitda_multiple": [6.0, 10.0]},
+            terminal_method="exit_multiple",
+            terminal_ebitda_multiple=8.0,
+        )
+        assert exit_result["axes"]["terminal_ebitda_multiple"] == [6.0, 8.0, 10.0]
+        assert list(exit_result["enterprise_values"]) == sorted(exit_result["enterprise_values"])
+
+        gordon_result = self._grid({"discount_rate": [0.02, 0.12]})
+        assert np.isnan(gordon_result["enterprise_values"][0])
+
+        with pytest.raises(ValueError, match="unsupported sensitivity driver"):
+            self._grid({"terminal_ebitda_multiple": [6.0]})
+
+        with pytest.raises(valuation_service.InvalidBaseCaseError):
+            self._grid({"discount_rate": [0.10, 0.14]}, discount_rate=0.05, terminal_growth_rate=0.06)
+
+    def test_tornado_comes_from_the_same_grid(self):
+        result = self._grid(
+            {
+                "discount_rate": [0.10, 0.14],
+                "terminal_growth_rate": [0.02, 0.04],
+                "revenue_growth": [-0.01, 0.01],
+            }
+        )
+
+        tornado = result["tornado"]
+        assert [row["metric"] for row in tornado][0] == "discount_rate"
+        assert [row["delta"] for row in tornado] == sorted((row["delta"] for row in tornado), reverse=True)
+        wacc_row = tornado[0]
+        assert wacc_row["low_enterprise_value"] == pytest.approx(float(result["enterprise_values"][0, 1, 1]))
+        assert result["base_enterprise_value"] == pytest.approx(float(result["enterprise_values"][1, 1, 1]))
+
+    def test_grid_limit_is_enforced(self):
+        with pytest.raises(ValueError, match="limit"):
+            self._grid(
+                {
+                    "discount_rate": list(np.linspace(0.05, 0.2, 100)),
+                    "terminal_growth_rate": list(np.linspace(0.0, 0.04, 100)),
+                    "revenue_growth": list(np.linspace(-0.05, 0.05, 100)),
+                }
+            )
+
+    def test_analysis_is_cached_per_valuation_version(self):
+        valuation = self._valuation()
+        axes = {"discount_rate": [0.10, 0.14], "terminal_growth_rate": [0.02, 0.04]}
+
+        first = valuation_service.get_sensitivity_analysis(valuation=valuation, axes=axes)
+        second = valuation_service.get_sensitivity_analysis(valuation=valuation, axes=axes)
+        assert first["cached"] is False
+        assert second["cached"] is True
+        assert second["enterprise_values"] == first["enterprise_values"]
+
+        valuation.cash_flows = [cf * 2 for cf in self.CASH_FLOWS]
+        changed = valuation_service.get_sensitivity_analysis(valuation=valuation, axes=axes)
+        assert changed["cached"] is False
+        assert changed["version"] != first["version"]
+
+        valuation_service.invalidate_sensitivity_cache(valuation.id)
+        assert valuation_service.get_sensitivity_analysis(valuation=valuation, axes=axes)["cached"] is False
+
+
 class TestExitMultipleTerminalValue:
     def test_calculate_terminal_value_exit_multiple(self):
         """Test terminal value calculation using exit multiple method."""
@@ -0,0 +1,97 @@
+"""Unit tests for the incremental ZIP writer used by bulk downloads."""
+from __future__ import annotations
+
+import io
+import zipfile
+
+import pytest
+
+from app.utils.zip_stream import (
+    COMPRESSION_AUTO,
+    COMPRESSION_DEFLATE,
+    COMPRESSION_STORE,
+    ZipStreamEntry,
+    resolve_compress_type,
+    stream_zip,
+)
+
+
+def _chunks(*parts: bytes):
+    async def _iter():
+        for part in parts:
+            yield part
+
+    return _iter
+
+
+def _failing_source():
+    async def _iter():
+        raise FileNotFoundError("gone")
+        yield b""  # pragma: no cover - makes this an async generator
+
+    return _iter
+
+
+async def _collect(entries) -> list[bytes]:
+    return [chunk async for chunk in stream_zip(entries)]
+
+
+@pytest.mark.asyncio
+async def test_stream_zip_produces_valid_archive_incrementally():
+    added: list[str] = []
+    payload = b"x" * 10_000
+    entries = [
+        ZipStreamEntry(
+            arcname="big.txt",
+            open_chunks=_chunks(payload[:4000], payload[4000:]),
+            compress_type=zipfile.ZIP_DEFLATED,
+            on_added=lambda: added.append("big.txt"),
+        ),
+        ZipStreamEntry(
+            arcname="scan.pdf",
+            open_chunks=_chunks(b"%PDF-1.7 data"),
+            compress_type=zipfile.ZIP_STORED,
+        ),
+    ]
+
+    chunks = await _collect(entries)
+
+    assert len(chunks) > 1
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.namelist() == ["big.txt", "scan.pdf"]
+        assert archive.read("big.txt") == payload
+        assert archive.read("scan.pdf") == b"%PDF-1.7 data"
+        assert archive.getinfo("scan.pdf").compress_type == zipfile.ZIP_STORED
+        assert archive.getinfo("big.txt").compress_type == zipfile.ZIP_DEFLATED
+    assert added == ["big.txt"]
+
+
+@pytest.mark.asyncio
+async def test_stream_zip_skips_entries_whose_source_fails_before_first_byte():
+    entries = [
+        ZipStreamEntry(arcname="missing.txt", open_chunks=_failing_source()),
+        ZipStreamEntry(arcname="empty.txt", open_chunks=_chunks()),
+        ZipStreamEntry(arcname="ok.txt", open_chunks=_chunks(b"ok")),
+    ]
+
+    data = b"".join(await _collect(entries))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.namelist() == ["empty.txt", "ok.txt"]
+        assert archive.read("empty.txt") == b""
+        assert archive.read("ok.txt") == b"ok"
+
+
+@pytest.mark.parametrize(
+    ("content_type", "compression", "expected"),
+    [
+        ("application/pdf", COMPRESSION_AUTO, zipfile.ZIP_STORED),
+        ("image/png", COMPRESSION_AUTO, zipfile.ZIP_STORED),
+        ("text/plain", COMPRESSION_AUTO, zipfile.ZIP_DEFLATED),
+        (None, COMPRESSION_AUTO, zipfile.ZIP_DEFLATED),
+        ("application/pdf", COMPRESSION_DEFLATE, zipfile.ZIP_DEFLATED),
+        ("text/plain", COMPRESSION_STORE, zipfile.ZIP_STORED),
+    ],
+)
+def test_resolve_compress_type(content_type, compression, expected):
+    assert resolve_compress_type(content_type, compression) == expected